@@ -0,0 +1,78 @@
+"""
+Benchmark of the different ways of obtaining several copies of one configured fit, e.g. for
+fitting many datasets in parallel.
+
+For each method the time needed to create one copy and to evaluate its cost function once and the memory
+allocated per copy are measured:
+
+* constructing a new :py:obj:`~kafe2.XYFit` and adding the uncertainties again,
+* :py:func:`copy.deepcopy` of the configured fit,
+* :py:meth:`~kafe2.XYFit.clone` with ``share_errors=False`` (deep-copied uncertainties),
+* :py:meth:`~kafe2.XYFit.clone` with ``share_errors=True`` (uncertainties shared by reference).
+
+The fit uses a full covariance matrix, so copies which share the uncertainties (and the cached
+inverse of the covariance matrix) need considerably less memory.
+"""
+
+import timeit
+import tracemalloc
+from copy import deepcopy
+
+import numpy as np
+
+from kafe2 import XYFit
+
+N_POINTS = 400
+N_COPIES = 20
+
+
+def quadratic_model(x, a=1.0, b=0.0, c=0.0):
+    return a * x ** 2 + b * x + c
+
+
+x_data = np.linspace(-1, 1, N_POINTS)
+y_data = quadratic_model(x_data, 1.2, -0.3, 0.5) + np.random.normal(0, 0.1, N_POINTS)
+_y_cor_mat = 0.5 * np.eye(N_POINTS) + 0.5  # uncorrelated part + fully correlated part
+
+
+def make_fit():
+    _fit = XYFit(xy_data=[x_data, y_data], model_function=quadratic_model)
+    _fit.add_matrix_error(axis='y', err_matrix=_y_cor_mat, matrix_type='cor', err_val=0.1)
+    _fit.add_error(axis='y', err_val=0.02, relative=True)
+    return _fit
+
+
+reference_fit = make_fit()
+# populate the cached covariance matrices and their inverses
+# (a fit which has already been minimized cannot be deep-copied because of the minimizer backend)
+reference_fit.cost_function_value
+
+METHODS = (
+    ('constructor', make_fit),
+    ('deepcopy', lambda: deepcopy(reference_fit)),
+    ('clone(share_errors=False)', lambda: reference_fit.clone(share_errors=False)),
+    ('clone(share_errors=True)', lambda: reference_fit.clone(share_errors=True)),
+)
+
+
+def measure_memory(factory):
+    """memory allocated per copy in kB, including the matrices calculated for the first cost evaluation"""
+    tracemalloc.start()
+    _snapshot_before = tracemalloc.take_snapshot()
+    _copies = []
+    for _ in range(N_COPIES):
+        _copy = factory()
+        _copy.cost_function_value
+        _copies.append(_copy)
+    _snapshot_after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    _size_diff = sum(_stat.size_diff for _stat in _snapshot_after.compare_to(_snapshot_before, 'filename'))
+    return _size_diff / N_COPIES / 1024.0
+
+
+if __name__ == '__main__':
+    print("{:<28} {:>18} {:>22}".format("method", "time per copy [ms]", "memory per copy [kB]"))
+    for _name, _factory in METHODS:
+        _time = min(timeit.repeat(lambda: _factory().cost_function_value, number=N_COPIES, repeat=3)) / N_COPIES
+        _memory = measure_memory(_factory)
+        print("{:<28} {:>18.2f} {:>22.1f}".format(_name, 1000 * _time, _memory))
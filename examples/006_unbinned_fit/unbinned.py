@@ -42,9 +42,7 @@ def pdf(t, tau=2.2, fbg=0.1, a=1., b=9.75):
 
 # load the data from the experiment
 infile = "tau_mu.dat"
-dT = np.loadtxt(infile)
-
-data = UnbinnedContainer(dT)  # create the kafe data object
+data = UnbinnedContainer.from_columns(infile)  # create the kafe data object
 data.label = 'lifetime measurements'
 data.axis_labels = ['life time $\\tau$ (µs)', 'Density']
 
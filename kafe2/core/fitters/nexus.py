@@ -1098,6 +1098,8 @@ class NodeCycleChecker(object):
     """
     def __init__(self, root_node):
         self._root = root_node
+        # nodes whose subgraphs have already been checked
+        self._checked = set()
 
     def visit(self, node, seen):
         if node in seen:
@@ -1113,6 +1115,10 @@ class NodeCycleChecker(object):
         # visit current node
         self.visit(node, seen)
 
+        # a cycle through an already checked subgraph would have been detected when checking it
+        if node in self._checked:
+            return
+
         # keep track of nodes encountered
         seen += (node,)
 
@@ -1120,6 +1126,8 @@ class NodeCycleChecker(object):
         for _c in node.iter_children():
             self.run(node=_c, seen=seen)
 
+        self._checked.add(node)
+
 
 # -- Nexus
 
@@ -1510,6 +1518,27 @@ class Nexus(object):
         """
         return self._nodes.get(node_name, None)
 
+    def adopt_cached_values(self, other):
+        """Take over the cached values of the function nodes of another nexus.
+
+        For each stale function node in this nexus, the value of the function
+        node with the same name in `other` is used if that node is up to date.
+        The caller must ensure that both nodes would evaluate to the same
+        value, e.g. because this nexus was built for a copy of the object
+        that `other` belongs to.
+
+        :param other: the nexus from which to take the cached values
+        :type other: Nexus
+        """
+        for _name, _node in six.iteritems(self._nodes):
+            _other_node = other.get(_name)
+            if not isinstance(_node, Function) or not isinstance(_other_node, Function):
+                continue
+            if _node.stale and not _other_node.stale:
+                _node._par_cache = _other_node._par_cache
+                _node._value = _other_node._value
+                _node._stale = False
+
     def get_value_dict(self, node_names=None, error_behavior='fail'):
         """Return a mapping of node names to their current values.
 
@@ -96,7 +96,9 @@ class NexusFitter(object):
         # set fit parameter values
         assert(len(fit_par_value_list) == len(self._fit_pars))
         for _par, _new_value in zip(self._fit_pars, fit_par_value_list):
-            _par.value = _new_value
+            # only changed parameters notify the nodes depending on them
+            if _par.value != _new_value:
+                _par.value = _new_value
 
         # evaluate function and return value
         return self._min_par.value
@@ -199,6 +201,15 @@ class NexusFitter(object):
 
         return self._minimizer.contour(parameter_name_1, parameter_name_2, sigma=sigma, **kwargs)
 
+    def contours(self, parameter_name_1, parameter_name_2, sigma_values=(1.0,), n_workers=1, **kwargs):
+        if not self.__state_is_from_minimizer:
+            raise NexusFitterException(
+                "To calculate contours the do_fit method has to be called first."
+            )
+
+        return self._minimizer.contours(parameter_name_1, parameter_name_2, sigma_values=sigma_values,
+                                        n_workers=n_workers, **kwargs)
+
     def profile(self, parameter_name, bins=20, bound=2, args=None, subtract_min=False):
         if not self.__state_is_from_minimizer:
             raise NexusFitterException(
@@ -253,5 +264,8 @@ class NexusFitter(object):
         # set flags
         self.__state_is_from_minimizer = False
 
-    def reset_minimizer(self):
-        self._minimizer.reset()
+    def reset_minimizer(self, warm_restart=False):
+        if warm_restart:
+            self._minimizer.warm_restart()
+        else:
+            self._minimizer.reset()
@@ -308,6 +308,11 @@ class MinimizerIMinuit(MinimizerBase):
         super(MinimizerIMinuit, self).reset()
         self.__iminuit = None
 
+    def warm_restart(self):
+        # keep the Minuit object: MIGRAD resumes from the last parameter values, step sizes and covariance
+        self._invalidate_cache()
+        self._did_fit = False
+
     def contour(self, parameter_name_1, parameter_name_2, sigma=1.0, **minimizer_contour_kwargs):
         if not self.did_fit:
             raise MinimizerIMinuitException("Need to perform a fit before calling contour()!")
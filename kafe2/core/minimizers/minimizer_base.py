@@ -6,12 +6,18 @@ import numdifftools as nd
 from scipy.optimize import brentq
 
 from ..error import CovMat
+from ...tools import parallel_map
 
 
 class MinimizerException(Exception):
     pass
 
 
+def _calculate_contour(minimizer, parameter_name_1, parameter_name_2, sigma, minimizer_contour_kwargs):
+    """Worker function for :py:meth:`MinimizerBase.contours`."""
+    return minimizer.contour(parameter_name_1, parameter_name_2, sigma=sigma, **dict(minimizer_contour_kwargs))
+
+
 @six.add_metaclass(ABCMeta)
 class MinimizerBase(object):
 
@@ -47,6 +53,7 @@ class MinimizerBase(object):
         self._save_state_dict = dict()
         self._did_fit = False
         self._printed_inf_cost_warning = False
+        self._n_function_calls = 0
 
     def _invalidate_cache(self):
         """
@@ -116,6 +123,7 @@ class MinimizerBase(object):
         :return: the cost function value.
         :rtype: float
         """
+        self._n_function_calls += 1
         _fval = self._func_handle(*args)
         if not self._printed_inf_cost_warning and np.isinf(_fval):
             print('Warning: the cost function has been evaluated as infinite. '
@@ -236,6 +244,14 @@ class MinimizerBase(object):
         """
         return self._did_fit
 
+    @property
+    def n_function_calls(self):
+        """
+        :return: Total number of cost function evaluations performed by this minimizer.
+        :rtype: int
+        """
+        return self._n_function_calls
+
     @property
     def errordef(self):
         """
@@ -414,6 +430,15 @@ class MinimizerBase(object):
         self._invalidate_cache()
         self._did_fit = False
 
+    def warm_restart(self):
+        """
+        Clears caches after the cost function has changed so that the next minimization starts from
+        the current parameter values. Unlike :py:meth:`reset` backends may keep their internal state
+        (e.g. step sizes and covariance estimates) to speed up the next minimization.
+        By default this is the same as :py:meth:`reset`.
+        """
+        self.reset()
+
     @abstractmethod
     def set(self, parameter_name, parameter_value):
         """
@@ -524,6 +549,30 @@ class MinimizerBase(object):
         :rtype: kafe2.core.contour.Contour
         """
 
+    def contours(self, parameter_name_1, parameter_name_2, sigma_values=(1.0,), n_workers=1,
+                 **minimizer_contour_kwargs):
+        """
+        Calculate 2D contours for several sigma values. By default one contour is calculated for each
+        sigma value, optionally distributed across several worker processes. Backends may override
+        this method to extract all contours from a single calculation.
+        :param parameter_name_1: the name of the first parameter to fix.
+        :type parameter_name_1: str
+        :param parameter_name_2: the name of the second parameter to fix.
+        :type parameter_name_2: str
+        :param sigma_values: differences between the cost function minimum and the contours.
+        :type sigma_values: iterable of float
+        :param n_workers: number of worker processes to use.
+        :type n_workers: int
+        :param minimizer_contour_kwargs: backend-specific kwargs.
+        :return: the calculated contours in the same order as **sigma_values**.
+        :rtype: list of kafe2.core.contour.Contour
+        """
+        if not self.did_fit:
+            raise MinimizerException("Need to perform a fit before calling contours()!")
+        _args_list = [(parameter_name_1, parameter_name_2, _sigma, minimizer_contour_kwargs)
+                      for _sigma in sigma_values]
+        return parallel_map(_calculate_contour, _args_list, n_workers=n_workers, shared_state=self)
+
     @abstractmethod
     def profile(self, parameter_name, bins=20, bound=2, subtract_min=False):
         """
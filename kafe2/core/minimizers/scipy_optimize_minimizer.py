@@ -4,6 +4,7 @@ import logging
 
 from .minimizer_base import MinimizerBase, MinimizerException
 from ..contour import ContourFactory
+from ...tools import worker_pool
 
 try:
     import scipy.optimize as opt
@@ -19,6 +20,13 @@ class MinimizerScipyOptimizeException(MinimizerException):
     pass
 
 
+def _calc_fun_on_grid_point(minimizer, ids, value_1, value_2):
+    """Worker function: profiled cost function value with two parameters fixed to the given values."""
+    _local_constraints = [{'type': 'eq', 'fun': lambda x: x[ids[0]] - value_1},
+                          {'type': 'eq', 'fun': lambda x: x[ids[1]] - value_2}]
+    return minimizer._calc_fun_with_constraints(_local_constraints)
+
+
 class MinimizerScipyOptimize(MinimizerBase):
     def __init__(self,
                  parameter_names, parameter_values, parameter_errors,
@@ -215,8 +223,14 @@ class MinimizerScipyOptimize(MinimizerBase):
         self._par_err = np.sqrt(np.diag(self.cov_mat))
 
     def contour(self, parameter_name_1, parameter_name_2, sigma=1.0, **minimizer_contour_kwargs):
+        return self.contours(parameter_name_1, parameter_name_2, sigma_values=(sigma,),
+                             **minimizer_contour_kwargs)[0]
+
+    def contours(self, parameter_name_1, parameter_name_2, sigma_values=(1.0,), n_workers=1,
+                 **minimizer_contour_kwargs):
         if not self.did_fit:
             raise MinimizerScipyOptimizeException("Need to perform a fit before calling contour()!")
+        minimizer_contour_kwargs = dict(minimizer_contour_kwargs)
         _algorithm = minimizer_contour_kwargs.pop("algorithm", "heuristic_grid")
 
         if _algorithm == "beacon":
@@ -233,14 +247,22 @@ class MinimizerScipyOptimize(MinimizerBase):
                 "Unknown parameters for {}: {}".format(_algorithm, minimizer_contour_kwargs.keys()))
 
         if _algorithm == "beacon":
-            return self._contour_beacon(parameter_name_1, parameter_name_2, sigma=sigma)
+            return [self._contour_beacon(parameter_name_1, parameter_name_2, sigma=_sigma)
+                    for _sigma in sigma_values]
         if _algorithm == "heuristic_grid":
-            return self._contour_heuristic_grid(parameter_name_1, parameter_name_2, sigma=sigma,
+            # a single grid is used for all sigma values
+            return self._contour_heuristic_grid(parameter_name_1, parameter_name_2, sigma_values=sigma_values,
                                                 initial_points=_initial_points, iterations=_iterations,
-                                                area_scale_factor=_area_scale_factor)
+                                                area_scale_factor=_area_scale_factor, n_workers=n_workers)
 
-    def _contour_heuristic_grid(self, parameter_name_1, parameter_name_2, sigma=1.0, initial_points=1,
-                                iterations=5, area_scale_factor=1.5):
+    @staticmethod
+    def _evaluate_grid_points(map_func, ids, coords, x_values, y_values):
+        """Calculate the profiled cost function value for each grid point in **coords**."""
+        _args_list = [(ids, x_values[_x], y_values[_y]) for _x, _y in coords]
+        return map_func(_calc_fun_on_grid_point, _args_list)
+
+    def _contour_heuristic_grid(self, parameter_name_1, parameter_name_2, sigma_values=(1.0,), initial_points=1,
+                                iterations=5, area_scale_factor=1.5, n_workers=1):
         initial_points = int(initial_points)
         iterations = int(iterations)
 
@@ -249,16 +271,19 @@ class MinimizerScipyOptimize(MinimizerBase):
         if iterations < 0:
             raise MinimizerScipyOptimize("iterations must be a >= 0")
 
+        _max_sigma = max(sigma_values)
         _initial_points_per_axis = 1 + initial_points * 2
         _target_points_per_axis = 1 + initial_points * 2 ** (iterations + 1)
         _ids = (self._par_names.index(parameter_name_1), self._par_names.index(parameter_name_2))
         _minimum = np.asarray([self._par_val[_ids[0]], self._par_val[_ids[1]]])
         _err = np.asarray([self.parameter_errors[_ids[0]], self.parameter_errors[_ids[1]]])
 
-        _x_values = np.linspace(start=-area_scale_factor * sigma * _err[0], stop=area_scale_factor * sigma * _err[0],
+        _x_values = np.linspace(start=-area_scale_factor * _max_sigma * _err[0],
+                                stop=area_scale_factor * _max_sigma * _err[0],
                                 num=_target_points_per_axis, endpoint=True)
         _x_values += _minimum[0]
-        _y_values = np.linspace(start=-area_scale_factor * sigma * _err[1], stop=area_scale_factor * sigma * _err[1],
+        _y_values = np.linspace(start=-area_scale_factor * _max_sigma * _err[1],
+                                stop=area_scale_factor * _max_sigma * _err[1],
                                 num=_target_points_per_axis, endpoint=True)
         _y_values += _minimum[1]
 
@@ -270,68 +295,51 @@ class MinimizerScipyOptimize(MinimizerBase):
         _confirmed_coords = set()
         _unsure_coords = set()
 
-        for _x in range(0, _target_points_per_axis, _x_step):
-            for _y in range(0, _target_points_per_axis, _y_step):
-                _local_constraints = [{'type': 'eq', 'fun': lambda x: x[_ids[0]] - _x_values[_x]},
-                                      {'type': 'eq', 'fun': lambda x: x[_ids[1]] - _y_values[_y]}]
-                _grid[_x, _y] = self._calc_fun_with_constraints(_local_constraints)
-
-        _min_fun = min(self.function_value, _grid[_min_coords, _min_coords])
-        _contour_fun = _min_fun + sigma ** 2
-
-        _iterations = 0
-        while _x_step > 0 and _y_step > 1:
-            if _iterations % 2 == 0:
-                _x_0 = int(_x_step / 2)
-                _y_0 = int(_y_step / 2)
-                _vector_1 = (int(_x_step / 2), int(_y_step / 2))
-                _vector_2 = (int(_x_step / 2), -int(_y_step / 2))
-            else:
-                _x_0 = 0
-                _y_0 = 0
-                _vector_1 = (_x_step, 0)
-                _vector_2 = (0, int(_y_step / 2))
-
-            for _x in range(_x_0, _target_points_per_axis, _x_step):
-                if _iterations % 2 == 1 and _x % (2 * _x_step) == 0:
-                    _current_y_0 = _y_0 + int(_y_step / 2)
+        # the worker pool is kept alive for all evaluations of the grid
+        with worker_pool(n_workers=n_workers, shared_state=self) as _map:
+            _initial_coords = [(_x, _y) for _x in range(0, _target_points_per_axis, _x_step)
+                               for _y in range(0, _target_points_per_axis, _y_step)]
+            for _coords, _fun in zip(_initial_coords, self._evaluate_grid_points(
+                    _map, _ids, _initial_coords, _x_values, _y_values)):
+                _grid[_coords] = _fun
+
+            _min_fun = min(self.function_value, _grid[_min_coords, _min_coords])
+            _contour_funs = _min_fun + np.asarray(sigma_values) ** 2
+            _max_contour_fun = np.max(_contour_funs)
+
+            _iterations = 0
+            while _x_step > 0 and _y_step > 1:
+                if _iterations % 2 == 0:
+                    _x_0 = int(_x_step / 2)
+                    _y_0 = int(_y_step / 2)
+                    _vector_1 = (int(_x_step / 2), int(_y_step / 2))
+                    _vector_2 = (int(_x_step / 2), -int(_y_step / 2))
                 else:
-                    _current_y_0 = _y_0
-                for _y in range(_current_y_0, _target_points_per_axis, _y_step):
-                    _point_value = self._heuristic_point_evaluation(_contour_fun, _grid, _x, _y, _vector_1, _vector_2)
-                    if _point_value == -1:
-                        _local_constraints = [{'type': 'eq', 'fun': lambda x: x[_ids[0]] - _x_values[_x]},
-                                              {'type': 'eq', 'fun': lambda x: x[_ids[1]] - _y_values[_y]}]
-                        _grid[_x, _y] = self._calc_fun_with_constraints(_local_constraints)
-                        _confirmed_coords.add((_x, _y))
-                        if _iterations % 2 == 0:
-                            _unsure_coords.add((_x - _x_step, _y))
-                            _unsure_coords.add((_x, _y - _y_step))
-                            _unsure_coords.add((_x + _x_step, _y))
-                            _unsure_coords.add((_x, _y + _y_step))
-                        else:
-                            _unsure_coords.add((_x - _x_step, _y - int(_y_step / 2)))
-                            _unsure_coords.add((_x - _x_step, _y + int(_y_step / 2)))
-                            _unsure_coords.add((_x + _x_step, _y - int(_y_step / 2)))
-                            _unsure_coords.add((_x + _x_step, _y + int(_y_step / 2)))
+                    _x_0 = 0
+                    _y_0 = 0
+                    _vector_1 = (_x_step, 0)
+                    _vector_2 = (0, int(_y_step / 2))
+
+                # points whose neighbors lie on the same side of all contours are interpolated,
+                # all others are calculated
+                _coords_to_calculate = []
+                for _x in range(_x_0, _target_points_per_axis, _x_step):
+                    if _iterations % 2 == 1 and _x % (2 * _x_step) == 0:
+                        _current_y_0 = _y_0 + int(_y_step / 2)
                     else:
-                        _grid[_x, _y] = _point_value
-
-            while _unsure_coords:
-                _current_coords = _unsure_coords.pop()
-                if (_current_coords[0] < 0 or _current_coords[0] >= _target_points_per_axis or
-                        _current_coords[1] < 0 or _current_coords[1] >= _target_points_per_axis):
-                    continue
-                if _current_coords in _confirmed_coords:
-                    continue
-                _x = _current_coords[0]
-                _y = _current_coords[1]
-                _local_constraints = [{'type': 'eq', 'fun': lambda x: x[_ids[0]] - _x_values[_x]},
-                                      {'type': 'eq', 'fun': lambda x: x[_ids[1]] - _y_values[_y]}]
-                _current_fun = self._calc_fun_with_constraints(_local_constraints)
-                _grid_fun = _grid[_current_coords[0], _current_coords[1]]
-                if ((_current_fun > _contour_fun and _grid_fun < _contour_fun) or
-                        (_current_fun < _contour_fun and _grid_fun > _contour_fun)):
+                        _current_y_0 = _y_0
+                    for _y in range(_current_y_0, _target_points_per_axis, _y_step):
+                        _point_value = self._heuristic_point_evaluation(_contour_funs, _grid, _x, _y, _vector_1, _vector_2)
+                        if _point_value == -1:
+                            _coords_to_calculate.append((_x, _y))
+                        else:
+                            _grid[_x, _y] = _point_value
+
+                for _coords, _fun in zip(_coords_to_calculate, self._evaluate_grid_points(
+                        _map, _ids, _coords_to_calculate, _x_values, _y_values)):
+                    _x, _y = _coords
+                    _grid[_x, _y] = _fun
+                    _confirmed_coords.add((_x, _y))
                     if _iterations % 2 == 0:
                         _unsure_coords.add((_x - _x_step, _y))
                         _unsure_coords.add((_x, _y - _y_step))
@@ -342,14 +350,41 @@ class MinimizerScipyOptimize(MinimizerBase):
                         _unsure_coords.add((_x - _x_step, _y + int(_y_step / 2)))
                         _unsure_coords.add((_x + _x_step, _y - int(_y_step / 2)))
                         _unsure_coords.add((_x + _x_step, _y + int(_y_step / 2)))
-                _grid[_current_coords[0], _current_coords[1]] = _current_fun
-                _confirmed_coords.add(_current_coords)
 
-            if _iterations % 2 == 0:
-                _x_step = int(_x_step / 2)
-            else:
-                _y_step = int(_y_step / 2)
-            _iterations += 1
+                # calculate interpolated points next to calculated points in waves until no more
+                # interpolated points are found on the wrong side of a contour
+                while _unsure_coords:
+                    _wave_coords = sorted(
+                        _coords for _coords in _unsure_coords
+                        if 0 <= _coords[0] < _target_points_per_axis and 0 <= _coords[1] < _target_points_per_axis
+                        and _coords not in _confirmed_coords
+                    )
+                    _unsure_coords = set()
+                    _wave_funs = self._evaluate_grid_points(_map, _ids, _wave_coords, _x_values, _y_values)
+                    for _current_coords, _current_fun in zip(_wave_coords, _wave_funs):
+                        _x = _current_coords[0]
+                        _y = _current_coords[1]
+                        _grid_fun = _grid[_x, _y]
+                        if np.any(((_current_fun > _contour_funs) & (_grid_fun < _contour_funs)) |
+                                  ((_current_fun < _contour_funs) & (_grid_fun > _contour_funs))):
+                            if _iterations % 2 == 0:
+                                _unsure_coords.add((_x - _x_step, _y))
+                                _unsure_coords.add((_x, _y - _y_step))
+                                _unsure_coords.add((_x + _x_step, _y))
+                                _unsure_coords.add((_x, _y + _y_step))
+                            else:
+                                _unsure_coords.add((_x - _x_step, _y - int(_y_step / 2)))
+                                _unsure_coords.add((_x - _x_step, _y + int(_y_step / 2)))
+                                _unsure_coords.add((_x + _x_step, _y - int(_y_step / 2)))
+                                _unsure_coords.add((_x + _x_step, _y + int(_y_step / 2)))
+                        _grid[_x, _y] = _current_fun
+                        _confirmed_coords.add(_current_coords)
+
+                if _iterations % 2 == 0:
+                    _x_step = int(_x_step / 2)
+                else:
+                    _y_step = int(_y_step / 2)
+                _iterations += 1
 
         _left_cutoff = 0
         _right_cutoff = _target_points_per_axis - 1
@@ -357,12 +392,12 @@ class MinimizerScipyOptimize(MinimizerBase):
         _top_cutoff = _target_points_per_axis - 1
         _padding = int(3 / area_scale_factor * max(1, 2 ** (iterations - 4)))
 
-        while _right_cutoff > 0 and np.min(_grid[_right_cutoff]) > _contour_fun:
+        while _right_cutoff > 0 and np.min(_grid[_right_cutoff]) > _max_contour_fun:
             _right_cutoff -= 1
         _right_cutoff += _padding
         _right_cutoff = min(_right_cutoff, _target_points_per_axis - 1)
 
-        while _left_cutoff < _right_cutoff and np.min(_grid[_left_cutoff]) > _contour_fun:
+        while _left_cutoff < _right_cutoff and np.min(_grid[_left_cutoff]) > _max_contour_fun:
             _left_cutoff += 1
         _left_cutoff -= _padding
         _left_cutoff = max(_left_cutoff, 0)
@@ -370,12 +405,12 @@ class MinimizerScipyOptimize(MinimizerBase):
         _grid = _grid[_left_cutoff:_right_cutoff]
         _grid = _grid.T
 
-        while _top_cutoff > 0 and np.min(_grid[_top_cutoff]) > _contour_fun:
+        while _top_cutoff > 0 and np.min(_grid[_top_cutoff]) > _max_contour_fun:
             _top_cutoff -= 1
         _top_cutoff += _padding
         _top_cutoff = min(_top_cutoff, _target_points_per_axis - 1)
 
-        while _bottom_cutoff < _top_cutoff and np.min(_grid[_bottom_cutoff]) > _contour_fun:
+        while _bottom_cutoff < _top_cutoff and np.min(_grid[_bottom_cutoff]) > _max_contour_fun:
             _bottom_cutoff += 1
         _bottom_cutoff -= _padding
         _bottom_cutoff = max(_bottom_cutoff, 0)
@@ -388,16 +423,15 @@ class MinimizerScipyOptimize(MinimizerBase):
 
         _grid = np.sqrt(_grid - _min_fun)
         self._func_wrapper_unpack_args(self._par_val)
-        return ContourFactory.create_grid_contour(_x_values, _y_values, _grid, sigma)
+        return [ContourFactory.create_grid_contour(_x_values, _y_values, _grid, _sigma) for _sigma in sigma_values]
 
     @staticmethod
-    def _heuristic_point_evaluation(contour_fun, grid, x, y, vector_1, vector_2):
+    def _heuristic_point_evaluation(contour_funs, grid, x, y, vector_1, vector_2):
         _adjacent_points = MinimizerScipyOptimize._get_adjacent_grid_points(grid, x, y, vector_1, vector_2)
-        if np.max(_adjacent_points) < contour_fun:
-            return np.mean(_adjacent_points)
-        if np.min(_adjacent_points) > contour_fun:
-            return np.mean(_adjacent_points)
-        return -1
+        _contour_funs = np.atleast_1d(contour_funs)
+        if np.any((np.min(_adjacent_points) <= _contour_funs) & (_contour_funs <= np.max(_adjacent_points))):
+            return -1
+        return np.mean(_adjacent_points)
 
     @staticmethod
     def _get_adjacent_grid_points(grid, x_0, y_0, vector_1, vector_2):
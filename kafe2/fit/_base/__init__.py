@@ -6,8 +6,9 @@
 
 from .container import *
 from .cost import *
-from .ensemble import *
 from .fit import *
 from .format import *
 from .model import *
 from .plot import *
+# import last: imports `kafe2.fit.tools`, which depends on the other modules in this package
+from .ensemble import *
@@ -1,7 +1,7 @@
 from __future__ import print_function
 
 import abc
-from copy import copy
+from copy import copy, deepcopy
 
 import numpy as np
 import six
@@ -38,6 +38,26 @@ class DataContainerBase(FileIOMixin, object):
     def _get_base_class(cls):
         return DataContainerBase
 
+    @staticmethod
+    def _as_data_array(data, dtype=float):
+        """
+        Convert data to a :py:obj:`numpy.ndarray`. Memory-mapped arrays of the requested type are used without
+        copying them into memory and are made read-only. A string is interpreted as the path of a ``.npy``
+        file, which is opened memory-mapped.
+
+        :param data: the data, a memory-mapped array or the path of a ``.npy`` file
+        :param dtype: data type of the returned array
+        :type dtype: type
+        :rtype: numpy.ndarray
+        """
+        if isinstance(data, six.string_types):
+            data = np.load(data, mmap_mode='r')
+        if isinstance(data, np.memmap) and data.dtype == np.dtype(dtype):
+            _data = data.view()
+            _data.flags.writeable = False  # never write into the file
+            return _data
+        return np.array(data, dtype=dtype)
+
     @classmethod
     def _get_object_type_name(cls):
         return 'container'
@@ -50,6 +70,38 @@ class DataContainerBase(FileIOMixin, object):
     def _clear_total_error_cache(self):
         pass
 
+    @abc.abstractmethod
+    def _update_error_references(self):
+        """reset the references of all error sources to the current data values"""
+        pass
+
+    def _copy_errors_from(self, container, share_errors=True):
+        """
+        Replace the error sources of this container with copies of the error sources of another container.
+
+        :param container: the container from which to copy the error sources
+        :type container: DataContainerBase
+        :param share_errors: if ``True``, the error objects are copied shallowly: the error values, covariance
+                             matrices and their cached factorizations are shared with the original error objects
+                             until they are recalculated (e.g. for relative errors after a change of the
+                             reference values). Otherwise, the error objects are deep-copied.
+        :type share_errors: bool
+        """
+        _copy_error = copy if share_errors else deepcopy
+        self._error_dicts = dict()
+        for _name, _err_dict in six.iteritems(container._error_dicts):
+            self._error_dicts[_name] = dict(_err_dict, err=_copy_error(_err_dict['err']))
+        _total_error = container._total_error
+        if share_errors and _total_error is not None:
+            # xy containers have one total error per axis
+            if isinstance(_total_error, list):
+                self._total_error = [copy(_err) for _err in _total_error]
+            else:
+                self._total_error = copy(_total_error)
+        else:
+            self._total_error = None
+        self._update_error_references()
+
     def _add_error_object(self, name, error_object, **additional_error_dict_keys):
         """create a new entry <name> under self._error_dicts,
         with keys err=<ErrorObject> and arbitrary additional keys"""
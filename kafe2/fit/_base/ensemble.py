@@ -1,10 +1,42 @@
 import abc
+import numpy as np
+import os
 import six
 
+from matplotlib import pyplot as plt
+from matplotlib import gridspec as gs
+
+from ..tools.ensemble import EnsembleVariable, draw_random_seed, spawn_random_generators
+from ...tools import worker_pool
+
 
 __all__ = ["FitEnsembleBase", "FitEnsembleException"]
 
 
+def _run_toy_fit_block(ensemble, random_generator, n_toys):
+    return ensemble._run_toy_fit_block(random_generator, n_toys)
+
+
+def _heuristic_optimal_subplot_grid_size(n_subplots, aspect_ratio_priority=0.5):
+    def f2(s, k):
+        if n_subplots > s * (s + k):
+            return 100000
+        return ((s * (s + k) - n_subplots) ** 2 * (1.0 - aspect_ratio_priority)
+                + (float(k) / float(s)) ** 2 * (aspect_ratio_priority))
+
+    _optimal_f = np.inf
+    _optimal_sk = n_subplots, 0
+    for s in six.moves.range(1, n_subplots):
+        for k in six.moves.range(0, n_subplots):
+            _f = f2(s, k)
+            if _f < _optimal_f:
+                _optimal_f = _f
+                _optimal_sk = s, k
+
+    s, k = _optimal_sk
+    return s, s+k
+
+
 class FitEnsembleException(Exception):
     pass
 
@@ -16,7 +48,591 @@ class FitEnsembleBase(object):
     specified uncertainty model.
 
     This is a purely abstract class implementing the minimal interface required by all
-    types of fit ensembles.
+    types of fit ensembles. It handles the distribution of the pseudo-experiments across
+    worker processes, the storage of the results, checkpoints and the evaluation of the results.
+    Derived classes define how the pseudo-data is generated and which results are available.
+    Before calling the constructor of this class, they must set up the fit object used for all toy fits
+    (``_toy_fit``), the reference parameter values (``_model_parameters``), their number (``_n_par``)
+    and the initial step sizes of the minimizer (``_toy_fit_initial_step_sizes``).
     """
 
     FIT_TYPE = None
+    EXCEPTION_TYPE = FitEnsembleException
+
+    AVAILABLE_RESULTS = {}
+    _DEFAULT_RESULTS = set()
+
+    AVAILABLE_STATISTICS = {
+        'mean': EnsembleVariable.mean,
+        'mean_error': EnsembleVariable.mean_error,
+        'std': EnsembleVariable.std,
+        'std_error': EnsembleVariable.std_error,
+        'skew': EnsembleVariable.skew,
+        'kurtosis': EnsembleVariable.kurtosis,
+        'cor_mat': EnsembleVariable.cor_mat,
+        'cov_mat': EnsembleVariable.cov_mat,
+    }
+    _DEFAULT_STATISTICS = {'mean', 'std'}
+
+    # statistics for which a target precision can be specified (see `run`) and their standard errors
+    _STATISTIC_ERRORS = {
+        'mean': EnsembleVariable.mean_error,
+        'std': EnsembleVariable.std_error,
+    }
+
+    # number of pseudo-experiments for which the pseudo-data is drawn at once
+    # the blocks are also the units of work distributed across worker processes
+    _PSEUDODATA_BLOCK_SIZE = 100
+
+    def __init__(self, n_experiments, requested_results=None, store_values=True, storage_dir=None):
+        """
+        Initialize the parts common to all fit ensembles. Must be called by derived classes after
+        the toy fit has been set up.
+
+        :param n_experiments: number of pseudoexperiments to perform
+        :type n_experiments: int
+        :param requested_results: list of result variables to collect for each toy fit
+        :type requested_results: iterable of str
+        :param store_values: if ``False``, the results of the individual toy fits are not stored. Only the
+                             statistics of the result variables are accumulated online, so the memory
+                             needed does not grow with **n_experiments**.
+        :type store_values: bool
+        :param storage_dir: if given, the results of the individual toy fits are stored in ``.npy`` files
+                            in this directory (one file per result variable) instead of in memory
+        :type storage_dir: str or ``None``
+        """
+        self._n_exp = n_experiments
+        self._n_exp_performed = 0
+        self._store_values = store_values
+        self._storage_dir = storage_dir
+
+        # store and validate names of requested ensemble variables
+        self._requested_results = requested_results
+        if self._requested_results is None:
+            self._requested_results = self._DEFAULT_RESULTS
+        else:
+            # validate list of results requested by user
+            _unavailable_results = set(self._requested_results) - set(self.AVAILABLE_RESULTS.keys())
+            if _unavailable_results:
+                raise ValueError("Requested unavailable result variable(s): %r"
+                                 % (_unavailable_results,))
+
+        # initialize `EnsembleVariable` objects to store ensembles
+        # files in `storage_dir` are only opened by `run`, so that existing results are not overwritten
+        self._initialize_ensemble_variables(open_storage=False)
+
+    # -- private methods
+
+    @abc.abstractmethod
+    def _initialize_ensemble_variables(self, resume=False, open_storage=True):
+        """create the `EnsembleVariable` objects (and plotters) for the requested results"""
+        pass
+
+    @abc.abstractmethod
+    def _generate_pseudodata_block(self, random_generator, n_toys):
+        """draw the random numbers needed for the pseudo-data of a block of pseudo-experiments at once"""
+        pass
+
+    @abc.abstractmethod
+    def _set_toy_fit_pseudodata(self, pseudodata_block, i_toy):
+        """commit the pseudo-data of the `i_toy`-th pseudo-experiment in a block to the toy fit"""
+        pass
+
+    def _prepare_run(self):
+        """called by `run` before performing the pseudo-experiments"""
+        self._set_toy_fit_parameters_to_reference()
+
+    def _set_toy_fit_parameters_to_reference(self):
+        """set the model parameters of the toy fit to the reference values"""
+        self._toy_fit.set_all_parameter_values(self._model_parameters)
+        self._toy_fit._param_model._model_parameters = self._model_parameters
+        self._toy_fit._param_model._pm_calculation_stale = True
+
+    def _run_toy_fit_block(self, random_generator, n_toys):
+        """perform a block of pseudo-experiments and return the requested result variables for each of them"""
+        _block_results = dict((_var_name, []) for _var_name in self._requested_results)
+        _pseudodata_block = self._generate_pseudodata_block(random_generator, n_toys)
+        for _i_toy in six.moves.range(n_toys):
+            self._set_toy_fit_pseudodata(_pseudodata_block, _i_toy)
+            self._do_toy_fit()
+            for _var_name in self._requested_results:
+                _block_results[_var_name].append(self._get_var(_var_name))
+        return dict((_var_name, np.array(_values)) for _var_name, _values in six.iteritems(_block_results))
+
+    def _gather_results_from_toy_fit_block(self, i_first_exp, block_results):
+        for _var_name in self._requested_results:
+            _n_toys = len(block_results[_var_name])
+            self._ensemble_variables[_var_name].set_value(index=slice(i_first_exp, i_first_exp + _n_toys),
+                                                          variable_value=block_results[_var_name])
+
+    def _do_toy_fit(self):
+        """run fit with current pseudo-data"""
+        # start from the reference values and initial step sizes
+        # so that the result does not depend on previous toy fits
+        self._toy_fit.set_all_parameter_values(self._model_parameters)
+        self._toy_fit._fitter.minimizer.parameter_errors = self._toy_fit_initial_step_sizes
+        self._toy_fit.do_fit()
+
+    def _get_var(self, var_name):
+        """get the value of the result variables for the current fit"""
+        return self.AVAILABLE_RESULTS[var_name].fget(self)
+
+    def _make_ensemble_variable(self, var_name, variable_shape, resume=False, open_storage=True, **kwargs):
+        """create an `EnsembleVariable` using the storage mode specified for the ensemble"""
+        _total_shape = (self._n_exp,) + tuple(variable_shape)
+        if not self._store_values:
+            return EnsembleVariable(sample_size=self._n_exp, variable_shape=variable_shape, **kwargs)
+        if self._storage_dir is None or not open_storage:
+            return EnsembleVariable(ensemble_array=np.zeros(_total_shape), **kwargs)
+
+        if not os.path.isdir(self._storage_dir):
+            os.makedirs(self._storage_dir)
+        _file_path = os.path.join(self._storage_dir, var_name + '.npy')
+        if resume and os.path.exists(_file_path):
+            _array = np.lib.format.open_memmap(_file_path, mode='r+')
+            if _array.shape != _total_shape:
+                raise self.EXCEPTION_TYPE("Cannot resume: stored results in '{}' have shape {}, "
+                                          "expected {}!".format(_file_path, _array.shape, _total_shape))
+        else:
+            _array = np.lib.format.open_memmap(_file_path, mode='w+', dtype=float, shape=_total_shape)
+        return EnsembleVariable(ensemble_array=_array, **kwargs)
+
+    def _validate_target_precision(self, target_precision):
+        """check that a target precision can be evaluated for all requested statistics"""
+        for _result_name, _statistic_precisions in six.iteritems(target_precision):
+            if _result_name not in self._requested_results:
+                raise self.EXCEPTION_TYPE("Cannot use target precision for result '{}': "
+                                          "variable not collected!".format(_result_name))
+            for _stat_name in _statistic_precisions:
+                if _stat_name not in self._STATISTIC_ERRORS:
+                    raise self.EXCEPTION_TYPE("Cannot use target precision for statistic '{}'! "
+                                              "Available: {}".format(_stat_name,
+                                                                     ', '.join(sorted(self._STATISTIC_ERRORS))))
+
+    def _target_precision_reached(self, target_precision, n_exp_done):
+        """check if the standard errors of all statistics in `target_precision` are below their targets"""
+        for _result_name, _statistic_precisions in six.iteritems(target_precision):
+            _var = self._ensemble_variables[_result_name]
+            if _var.stores_values:
+                # only use the pseudo-experiments performed so far
+                _var = EnsembleVariable(ensemble_array=_var.values[:n_exp_done])
+            for _stat_name, _precision in six.iteritems(_statistic_precisions):
+                _error = self._STATISTIC_ERRORS[_stat_name].__get__(_var, EnsembleVariable)
+                if not np.all(np.asarray(_error) <= _precision):
+                    return False
+        return True
+
+    def _make_figure_gs(self, figsize=(8, 8), nrows=1, ncols=1,
+                        left=0.1, bottom=0.1,
+                        right=0.9, top=0.9):
+        """create a new matplotlib figure with a GridSpec controlling the subplot layout"""
+        _fig = plt.figure(figsize=figsize)  # defaults from matplotlibrc
+        _gs = gs.GridSpec(nrows=nrows,
+                          ncols=ncols,
+                          left=left,
+                          bottom=bottom,
+                          right=right,
+                          top=top,
+                          wspace=None,
+                          hspace=None,
+                          height_ratios=None)
+        return _fig, _gs
+
+    def _save_checkpoint(self, checkpoint_file, seed, n_blocks_done):
+        """write the state of a partially completed run to a file, replacing it atomically"""
+        _state = dict(
+            seed=np.array(str(seed)),
+            n_blocks_done=np.array(n_blocks_done),
+            n_exp=np.array(self._n_exp),
+            block_size=np.array(self._PSEUDODATA_BLOCK_SIZE),
+            requested_results=np.array(sorted(self._requested_results)),
+        )
+        for _var_name, _var in six.iteritems(self._ensemble_variables):
+            if not _var.stores_values:
+                for _key, _value in six.iteritems(_var.moments.get_state()):
+                    _state['{}/{}'.format(_var_name, _key)] = _value
+            elif isinstance(_var.values, np.memmap):
+                _var.flush()  # values are already stored on disk
+            else:
+                _state['{}/values'.format(_var_name)] = _var.values
+
+        _tmp_file = checkpoint_file + '.tmp'
+        with open(_tmp_file, 'wb') as _f:
+            np.savez(_f, **_state)
+        try:
+            os.replace(_tmp_file, checkpoint_file)
+        except AttributeError:
+            # Python 2
+            if os.path.exists(checkpoint_file):
+                os.remove(checkpoint_file)
+            os.rename(_tmp_file, checkpoint_file)
+
+    def _load_checkpoint(self, checkpoint_file, seed):
+        """restore the state of a partially completed run and return the seed and number of completed blocks"""
+        with np.load(checkpoint_file) as _state:
+            _checks = [('n_exp', int(_state['n_exp']), self._n_exp),
+                       ('block_size', int(_state['block_size']), self._PSEUDODATA_BLOCK_SIZE),
+                       ('requested_results', list(_state['requested_results']), sorted(self._requested_results))]
+            for _name, _stored, _current in _checks:
+                if _stored != _current:
+                    raise self.EXCEPTION_TYPE("Cannot resume from checkpoint '{}': mismatch in '{}' "
+                                              "(stored {!r}, got {!r})!".format(checkpoint_file, _name,
+                                                                               _stored, _current))
+            _stored_seed = int(str(_state['seed']))
+            if seed is not None and seed != _stored_seed:
+                raise self.EXCEPTION_TYPE("Cannot resume from checkpoint '{}': it was created with "
+                                          "seed {}, got {}!".format(checkpoint_file, _stored_seed, seed))
+
+            for _var_name, _var in six.iteritems(self._ensemble_variables):
+                if not _var.stores_values:
+                    _prefix = _var_name + '/'
+                    _var.moments.set_state(dict((_key[len(_prefix):], _state[_key]) for _key in _state.files
+                                                if _key.startswith(_prefix)))
+                elif not isinstance(_var.values, np.memmap):
+                    _var.values[...] = _state['{}/values'.format(_var_name)]
+            return _stored_seed, int(_state['n_blocks_done'])
+
+    # -- public properties
+
+    @property
+    def n_exp(self):
+        """the number of pseudo-experiments to perform"""
+        return self._n_exp
+
+    @property
+    def n_exp_performed(self):
+        """the number of pseudo-experiments performed in the last run (less than `n_exp` if stopped early)"""
+        return self._n_exp_performed
+
+    @property
+    def n_par(self):
+        """the number of parameters"""
+        return self._n_par
+
+    # -- public methods
+
+    def run(self, seed=None, n_workers=1, checkpoint_file=None, checkpoint_interval=10, resume=False,
+            target_precision=None, precision_check_interval=10):
+        """Perform the pseudo-experiments. Retrieve and store the requested fit result variables.
+
+        The pseudo-experiments are grouped into blocks. The pseudo-data for each block is drawn at once
+        using a random number generator derived from **seed** and the block index. If **n_workers** is
+        greater than one, the blocks are distributed across worker processes. For a given **seed**, the
+        results do not depend on the number of workers.
+
+        If a **checkpoint_file** is given, the state of the run is saved to it every **checkpoint_interval**
+        blocks. An interrupted run can be continued by calling this method again with ``resume=True``.
+        Since the pseudo-data only depends on the seed and the block index, the results are the same as for
+        an uninterrupted run. If ``storage_dir`` was specified, the results stored there are reused.
+
+        If a **target_precision** is given, the standard errors of the specified statistics are checked every
+        **precision_check_interval** blocks. The run stops as soon as all of them are below their targets. In
+        this case, the results only contain the pseudo-experiments performed so far and their number is
+        available as :py:attr:`n_exp_performed`.
+
+        :param seed: seed for generating the pseudo-data. If ``None``, the results are not reproducible
+                     (unless resuming from a checkpoint, which stores the seed).
+        :type seed: int or None
+        :param n_workers: number of worker processes. If ``None``, use all available CPUs.
+        :type n_workers: int or None
+        :param checkpoint_file: path of the checkpoint file to write (``.npz`` format)
+        :type checkpoint_file: str or ``None``
+        :param checkpoint_interval: number of blocks of pseudo-experiments after which to write a checkpoint
+        :type checkpoint_interval: int
+        :param resume: if ``True`` and **checkpoint_file** exists, continue the run stored in it
+        :type resume: bool
+        :param target_precision: mapping of result variable names to mappings of statistic names
+                                 (``'mean'`` or ``'std'``) to the maximum standard error of the statistic, e.g.
+                                 ``{'parameter_pulls': {'mean': 0.005}}``. For result variables with multiple
+                                 entries, the target applies to each of them.
+        :type target_precision: dict or ``None``
+        :param precision_check_interval: number of blocks of pseudo-experiments after which to check if the
+                                         target precision has been reached
+        :type precision_check_interval: int
+        """
+        if target_precision is not None:
+            self._validate_target_precision(target_precision)
+        _resume = resume and checkpoint_file is not None and os.path.exists(checkpoint_file)
+
+        self._prepare_run()
+        self._initialize_ensemble_variables(resume=_resume)
+
+        _n_blocks_done = 0
+        if _resume:
+            seed, _n_blocks_done = self._load_checkpoint(checkpoint_file, seed)
+        elif seed is None and checkpoint_file is not None:
+            # store the seed in the checkpoint to be able to resume
+            seed = draw_random_seed()
+
+        _block_size = self._PSEUDODATA_BLOCK_SIZE
+        _n_blocks = (self.n_exp + _block_size - 1) // _block_size
+        _random_generators = spawn_random_generators(seed, _n_blocks)
+        _block_starts = [_i_block * _block_size for _i_block in six.moves.range(_n_blocks)]
+        _args_list = [(_random_generator, min(_block_size, self.n_exp - _i_first_exp))
+                      for _random_generator, _i_first_exp in zip(_random_generators, _block_starts)]
+
+        _n_blocks_per_step = _n_blocks
+        if checkpoint_file is not None:
+            _n_blocks_per_step = max(1, int(checkpoint_interval))
+        if target_precision is not None:
+            _n_blocks_per_step = min(_n_blocks_per_step, max(1, int(precision_check_interval)))
+        if n_workers is not None:
+            n_workers = min(int(n_workers), _n_blocks - _n_blocks_done)
+
+        self._n_exp_performed = min(_n_blocks_done * _block_size, self.n_exp)
+        with worker_pool(n_workers=n_workers, shared_state=self) as _map:
+            for _i_step_start in six.moves.range(_n_blocks_done, _n_blocks, _n_blocks_per_step):
+                _i_step_stop = min(_i_step_start + _n_blocks_per_step, _n_blocks)
+                _step_block_results = _map(_run_toy_fit_block, _args_list[_i_step_start:_i_step_stop])
+                for _i_first_exp, _block_results in zip(_block_starts[_i_step_start:_i_step_stop],
+                                                        _step_block_results):
+                    self._gather_results_from_toy_fit_block(_i_first_exp, _block_results)
+                if checkpoint_file is not None:
+                    self._save_checkpoint(checkpoint_file, seed, _i_step_stop)
+                self._n_exp_performed = min(_i_step_stop * _block_size, self.n_exp)
+                if target_precision is not None and self._target_precision_reached(target_precision,
+                                                                                   self._n_exp_performed):
+                    break
+
+        for _var in six.itervalues(self._ensemble_variables):
+            _var.flush()
+            if self._n_exp_performed < self.n_exp:
+                _var.truncate(self._n_exp_performed)
+
+    def get_results(self, *results):
+        """
+        Return a dictionary containing the ensembles of result variables.
+
+        :param results: names of result variables to retrieve
+        :type results: iterable of str. Calling without arguments retrieves *all* collected results.
+        :return: dict
+        """
+        if not results:
+            results = self._requested_results
+        else:
+            # validate list of results requested by user
+            _unavailable_results = set(self._requested_results) - set(self.AVAILABLE_RESULTS.keys())
+            if _unavailable_results:
+                raise ValueError("Requested unavailable result variable(s): %r"
+                                 % (_unavailable_results,))
+
+        _dict_to_return = dict()
+        for _result_name in results:
+            _var = self._ensemble_variables.get(_result_name, None)
+            if _var is None:
+                raise self.EXCEPTION_TYPE("Cannot retrieve result '{}': "
+                                          "variable not collected!".format(_result_name))
+            _dict_to_return[_result_name] = _var.values
+
+        return _dict_to_return
+
+    def get_results_statistics(self, results='all', statistics='all'):
+        """
+        Return a dictionary containing statistics (e.g. mean) of the result variables.
+
+        :param results: names of retrieved fit variable for which to return statistics
+        :type results: iterable of str or ``'all'`` (get statistics for all retrieved variables)
+        :param statistics: names of statistics to retrieve for each result variable
+        :type statistics: iterable of str or ``'all'`` (get all statistics for each retrieved variable)
+        :return: dict
+        """
+        if results == 'all':
+            results = self._requested_results
+
+        if statistics == 'all':
+            statistics = self.__class__._DEFAULT_STATISTICS
+
+        _dict_to_return = dict()
+        for _result_name in results:
+            #_result_array = self._result_array_dicts.get(_result_name, None)
+            _result_variable = self._ensemble_variables.get(_result_name, None)
+            if _result_variable is None:
+                raise self.EXCEPTION_TYPE("Cannot retrieve statistics for result "
+                                          "variable '{}': variable not collected!".format(_result_name))
+
+            _current_result_dict = _dict_to_return[_result_name] = dict()
+
+            # calculate and store statistics
+            for _stat_name in statistics:
+                _stat_unbound_method = self.__class__.AVAILABLE_STATISTICS.get(_stat_name, None)
+                if _stat_unbound_method is None:
+                    raise self.EXCEPTION_TYPE(
+                        "Unknown statistic '%s' requested!" % (_stat_name,))
+                _stat = _stat_unbound_method.__get__(_result_variable, EnsembleVariable)
+                _current_result_dict[_stat_name] = _stat
+
+        return _dict_to_return
+
+    def plot_result_distributions(self, results='all',
+                                  show_legend=True):
+        """
+        Make plots with histograms of the requested fit variable values across all pseudo-experiments.
+
+        :param results: names of retrieved fit variable for which to generate plots
+        :type results: iterable of str or ``'all'`` (make plots for all retrieved variables)
+        :param show_legend: if ``True``, show a plot legend on each figure
+        :type show_legend: bool
+        """
+        if results == 'all':
+            results = self._requested_results
+        else:
+            # validate list of results requested by user
+            _unavailable_results = set(self._requested_results) - set(self.AVAILABLE_RESULTS.keys())
+            if _unavailable_results:
+                raise ValueError("Requested unavailable result variable(s): %r"
+                                 % (_unavailable_results,))
+
+        for _result_name in results:
+            _result_variable = self._ensemble_variables.get(_result_name, None)
+
+            if _result_variable is None:
+                raise self.EXCEPTION_TYPE("Cannot plot result for variable '%s': "
+                                          "variable not collected!" % (_result_name,))
+
+            _result_variable_plotter = self._ensemble_variable_plotters.get(_result_name, None)
+
+            if _result_variable_plotter is None:
+                raise self.EXCEPTION_TYPE("Cannot plot result for variable '%s': "
+                                          "no plotter defined!" % (_result_name,))
+
+            # -- decide how to lay out plots depending on the result variable dimensionality
+            if _result_variable.ndim == 0:
+                # if the ensemble variable is a scalar,
+                # plot it into a single `Axes` object
+                _fig, _gs = self._make_figure_gs(figsize=(8, 8), nrows=1, ncols=1)
+                _ax = plt.subplot(_gs[0, 0])
+                # call the plotting routine on the axes grid
+                _plot_result_dict = _result_variable_plotter.plot_hist(_ax)
+
+            elif _result_variable.ndim == 1:
+                # if the ensemble variable is a one-dimensional vector,
+                # plot each entry into a separate `Axes` object and display
+                # them in a grid-like layout
+                _nplots = int(_result_variable.shape[0])
+                _nrows, _ncols = _heuristic_optimal_subplot_grid_size(_nplots, aspect_ratio_priority=0.8)
+                _fig, _gs = self._make_figure_gs(figsize=(8, 8), nrows=_nrows, ncols=_ncols)
+
+                # create an array 'a' with a[i, j] = [i, j]
+                _axes_grid = np.dstack((np.meshgrid(np.arange(_nrows), np.arange(_ncols))))
+                # replace [i, j] by the `Axes` object for _gs[i, j] -> array of `Axes`
+                _axes_grid = np.apply_along_axis(
+                    lambda irow_icol: plt.subplot(_gs[irow_icol[0], irow_icol[1]]) if irow_icol[0]*_ncols+irow_icol[1] < _nplots else None,
+                    -1, _axes_grid)
+                # reshape the `Axes` array to match the variable shape
+                _axes_grid = _axes_grid.T.flatten()[:_result_variable.shape[0]]
+                # call the plotting routine on the axes grid
+                _plot_result_dict = _result_variable_plotter.plot_hist(_axes_grid)
+
+            elif _result_variable.ndim == 2:
+                # if the ensemble variable is a two-dimensional vector,
+                # plot the (i,j)-th entry into a an `Axes` object at the
+                # (i,j)-th position in a grid
+
+                _nrows = _result_variable.shape[0]
+                _ncols = _result_variable.shape[1]
+
+                _fig, _gs = self._make_figure_gs(figsize=(8, 8), nrows=_nrows, ncols=_ncols)
+
+                # create an array 'a' with a[i, j] = [i, j]
+                _axes_grid = np.dstack(reversed(np.meshgrid(np.arange(_nrows), np.arange(_ncols))))
+                # replace [i, j] by the `Axes` object for _gs[i, j] -> array of `Axes`
+                _axes_grid = np.apply_along_axis(
+                    lambda irow_icol: plt.subplot(_gs[irow_icol[0], irow_icol[1]]),
+                    -1, _axes_grid)
+                # do not reshape _axes_grid -> its shape already matches variable shape
+
+                # call the plotting routine on the axes grid
+                _plot_result_dict = _result_variable_plotter.plot_hist(_axes_grid)
+            else:
+                # cannot plot variables with 3 or more dimensions...
+                raise self.EXCEPTION_TYPE("Cannot plot result for variable '%s': variable entry dimensionality "
+                                          "too high (%d)!" % (_result_name, _result_variable.ndim))
+
+            if show_legend:
+                _fig.legend(_plot_result_dict['legend_handles'],
+                            _plot_result_dict['legend_labels'], loc='lower center')
+                # add extra space at figure bottom for legend
+                _figure_extra_bottom = 0.05 * len(_plot_result_dict['legend_labels'])
+            else:
+                # no extra space at figure bottom
+                _figure_extra_bottom = 0.0
+
+            _fig.canvas.set_window_title(_result_name)
+
+            _gs.tight_layout(_fig,
+                             pad=0.0, w_pad=0, h_pad=-0.2,
+                             rect=(0.01, 0.02+_figure_extra_bottom, 0.98, 0.98))
+
+        return _plot_result_dict
+
+    def plot_result_scatter(self, results='all',
+                                  show_legend=True):
+        """
+        Make plots with histograms of the requested fit variable values across all pseudo-experiments.
+
+        :param results: names of retrieved fit variable for which to generate plots
+        :type results: iterable of str or ``'all'`` (make plots for all retrieved variables)
+        :param show_legend: if ``True``, show a plot legend on each figure
+        :type show_legend: bool
+        """
+        if results == 'all':
+            results = self._requested_results
+        else:
+            # validate list of results requested by user
+            _unavailable_results = set(self._requested_results) - set(self.AVAILABLE_RESULTS.keys())
+            if _unavailable_results:
+                raise ValueError("Requested unavailable result variable(s): %r"
+                                 % (_unavailable_results,))
+
+        for _result_name in results:
+            _result_variable = self._ensemble_variables.get(_result_name, None)
+
+            if _result_variable is None:
+                raise self.EXCEPTION_TYPE("Cannot plot result for variable '%s': "
+                                          "variable not collected!" % (_result_name,))
+
+            _result_variable_plotter = self._ensemble_variable_plotters.get(_result_name, None)
+
+            if _result_variable_plotter is None:
+                raise self.EXCEPTION_TYPE("Cannot plot result for variable '%s': "
+                                          "no plotter defined!" % (_result_name,))
+
+            # -- decide how to lay out plots depending on the result variable dimensionality
+            if _result_variable.ndim != 1:
+                raise ValueError()
+
+            # if the ensemble variable is a one-dimensional vector,
+            # plot each entry into a separate `Axes` object and display
+            # them in a grid-like layout
+            _nrows = _ncols = int(_result_variable.shape[0])
+            if _nrows <= 1:
+                raise self.EXCEPTION_TYPE("Cannot create scatter plot for result variable '%s': "
+                                          "vector has less than two entries!" % (_result_name,))
+            _fig, _gs = self._make_figure_gs(figsize=(8, 8), nrows=_nrows-1, ncols=_ncols-1)
+
+            # create an array 'a' with a[i, j] = [i, j]
+            _axes_grid = np.dstack((np.meshgrid(np.arange(_nrows), np.arange(_ncols))))
+            # replace [i, j] by the `Axes` object for _gs[i, j] -> array of `Axes`
+            _axes_grid = np.apply_along_axis(
+                lambda irow_icol: plt.subplot(_gs[irow_icol[0] - 1, irow_icol[1]]) if irow_icol[0] > irow_icol[1] else None,
+                -1, _axes_grid)
+
+            # call the plotting routine on the axes grid
+            _plot_result_dict = _result_variable_plotter.plot_scatter(_axes_grid)
+
+            if show_legend:
+                _fig.legend(_plot_result_dict['legend_handles'],
+                            _plot_result_dict['legend_labels'], loc='lower center')
+                # add extra space at figure bottom for legend
+                _figure_extra_bottom = 0.05 * len(_plot_result_dict['legend_labels'])
+            else:
+                # no extra space at figure bottom
+                _figure_extra_bottom = 0.0
+
+            _fig.canvas.set_window_title(_result_name)
+
+            _gs.tight_layout(_fig,
+                             pad=0.0, w_pad=0, h_pad=-0.2,
+                             rect=(0.01, 0.02+_figure_extra_bottom, 0.98, 0.98))
+
+        return _plot_result_dict
@@ -2,6 +2,7 @@ import abc
 import sys
 import warnings
 from collections import OrderedDict
+from copy import copy
 from functools import partial
 
 import numpy as np
@@ -43,6 +44,7 @@ class FitBase(FileIOMixin, object):
     _AXES = (None,)  # axes for which to for example create data nexus nodes
     _MODEL_NAME = "model"
     _MODEL_ERROR_NODE_NAMES = ["model_error", "model_cov_mat"]
+    _DATA_NODE_NAMES = ("data",)  # nexus nodes depending directly on the data values
 
     def __init__(
             self, data, model_function, cost_function, minimizer=None, minimizer_kwargs=None,
@@ -65,6 +67,7 @@ class FitBase(FileIOMixin, object):
         self._fit_param_names = []  # names of all fit parameters
         self._fit_param_constraints = []
         self._loaded_result_dict = None  # contains potential fit results from a file or multifit
+        self._fit_iteration_function_calls = []  # cost function evaluations per minimization in do_fit
 
         # save minimizer, minimizer_kwargs for serialization
         self._minimizer = minimizer
@@ -120,14 +123,51 @@ class FitBase(FileIOMixin, object):
         if data is not None:
             self.data = data
 
+    def __getstate__(self):
+        _state = self.__dict__.copy()
+        # the nexus and the fitter contain closures bound to this fit which cannot be pickled
+        # -> only store what is needed to rebuild them when unpickling
+        del _state['_nexus']
+        del _state['_fitter']
+        _state['_fit_param_names'] = []
+        _state['_fitter_state'] = dict(
+            parameter_values=self.parameter_values,
+            fixed_parameters=self._fitter.fixed_parameters,
+            limited_parameters=self._fitter.limited_parameters,
+        )
+        # the minimizer is not pickled either -> keep the fit results like fits loaded from a file
+        if self._loaded_result_dict is None and self.did_fit:
+            _state['_loaded_result_dict'] = dict(
+                did_fit=True,
+                parameter_errors=self.parameter_errors,
+                parameter_cov_mat=self.parameter_cov_mat,
+                parameter_cor_mat=self.parameter_cor_mat,
+                asymmetric_parameter_errors=self._fitter.asymmetric_fit_parameter_errors_if_calculated
+            )
+        return _state
+
+    def __setstate__(self, state):
+        _fitter_state = state.pop('_fitter_state')
+        _loaded_result_dict = state['_loaded_result_dict']
+        self.__dict__.update(state)
+        self._init_nexus()
+        self._initialize_fitter()
+        self.set_all_parameter_values(_fitter_state['parameter_values'])
+        for _par_name, _limits in six.iteritems(_fitter_state['limited_parameters']):
+            self.limit_parameter(_par_name, *_limits)
+        for _par_name, _par_value in six.iteritems(_fitter_state['fixed_parameters']):
+            self.fix_parameter(_par_name, _par_value)
+        self._loaded_result_dict = _loaded_result_dict
+
     # -- private methods
 
-    def _add_property_to_nexus(self, prop, obj=None, name=None, depends_on=None):
+    def _add_property_to_nexus(self, prop, obj=None, name=None, depends_on=None, existing_behavior='fail'):
         """register a property of this object in the nexus as a function node"""
         obj = obj if obj is not None else self
         _node = self._nexus.add_function(
             partial(getattr(obj.__class__, prop).fget, obj),
-            func_name=name or prop
+            func_name=name or prop,
+            existing_behavior=existing_behavior
         )
         if depends_on is not None:
             self._nexus.add_dependency(name=_node.name, depends_on=depends_on)
@@ -356,6 +396,32 @@ class FitBase(FileIOMixin, object):
         for _error_name in self._BASIC_ERROR_NAMES:
             self._nexus.get(_error_name).mark_for_update()
 
+    def _on_data_values_change(self, data_node_names=None):
+        """Mark the data nodes for updates in the nexus after the data values were replaced in place.
+
+        The minimizer is restarted from the current parameter values. Unless there are relative data errors,
+        the data error nodes are left untouched so that cached error matrices and their inverses are reused.
+
+        :param data_node_names: names of the nexus nodes to update. If ``None``, :py:attr:`~_DATA_NODE_NAMES`
+            is used.
+        :type data_node_names: iterable of str
+        """
+        self._fitter.reset_minimizer(warm_restart=True)
+        if data_node_names is None:
+            data_node_names = self._DATA_NODE_NAMES
+        for _node_name in data_node_names:
+            self._nexus.get(_node_name).mark_for_update()
+        if self._data_container.get_matching_errors({"relative": True}):
+            for _error_name in self._BASIC_ERROR_NAMES:
+                if 'data' in _error_name:
+                    self._nexus.get(_error_name).mark_for_update()
+        self._loaded_result_dict = None
+
+    def _check_data_compatible_with_cost_function(self):
+        _data_and_cost_compatible, _reason = self._cost_function.is_data_compatible(self.data)
+        if not _data_and_cost_compatible:
+            raise self.EXCEPTION_TYPE('Fit data and cost function are not compatible: %s' % _reason)
+
     def _set_data_as_model_ref(self):
         for _err in self._param_model.get_matching_errors({"relative": True}).values():
             _old_ref = _err.reference
@@ -389,6 +455,70 @@ class FitBase(FileIOMixin, object):
             _node.update()
             _node.notify_parents()
 
+    def _do_fit_iteration(self, first_fit=False):
+        """Perform a single minimization as part of :py:meth:`do_fit`.
+
+        :param bool first_fit: If :py:obj:`True`, start the minimization from scratch. Otherwise the
+            minimizer is restarted from the previous minimum.
+        """
+        self._pre_fit_iteration(first_fit=first_fit)
+        if not first_fit:
+            # flush iminuit cache
+            self._fitter.reset_minimizer(warm_restart=kc("fit", "iterative_do_fit", "warm_restart"))
+        _n_calls_before = self._fitter.minimizer.n_function_calls
+        self._fitter.do_fit()  # TODO specify other node to minimize
+        self._fit_iteration_function_calls.append(self._fitter.minimizer.n_function_calls - _n_calls_before)
+        self._post_fit_iteration(first_fit=first_fit)
+
+    @staticmethod
+    def _get_error_fingerprint_items(error_dicts):
+        """Return the quantities defining the enabled uncertainties in **error_dicts**.
+
+        Error names are omitted because they are generated randomly if not specified by the user.
+        """
+        _items = []
+        for _err_dict in error_dicts.values():
+            if not _err_dict.get('enabled', True):
+                continue
+            _err = _err_dict['err']
+            _items.append((type(_err).__name__, _err_dict.get('axis'), _err.relative,
+                           _err.cov_mat_rel if _err.relative else _err.cov_mat))
+        return _items
+
+    def _get_input_fingerprint_items(self):
+        """Return the data, uncertainties and model function of this fit as (name, value) tuples."""
+        return [
+            ('data', self.data),
+            ('data_errors', self._get_error_fingerprint_items(self._data_container._error_dicts)),
+            ('model_errors', self._get_error_fingerprint_items(self._param_model._error_dicts)),
+            ('model_function', self._model_function),
+            ('cost_function', self._cost_function),
+        ]
+
+    def _get_fingerprint_items(self):
+        """Return everything that determines the result of :py:meth:`do_fit` as (name, value) tuples.
+
+        Used to compute the fingerprint of the fit inputs for caching fit results, see
+        :py:obj:`~kafe2.fit.tools.FitResultCache`.
+        """
+        _constraints = []
+        for _constraint in self._fit_param_constraints:
+            if isinstance(_constraint, GaussianSimpleParameterConstraint):
+                _constraints.append(('simple', _constraint.index, _constraint.value, _constraint.uncertainty))
+            else:
+                _constraints.append(('matrix', list(_constraint.indices), _constraint.values, _constraint.cov_mat))
+        return [
+            ('fit_type', self.__class__.__name__),
+            ('parameter_names', list(self.parameter_names)),
+            ('parameter_values', self.parameter_values),
+            ('fixed_parameters', self._fitter.fixed_parameters),
+            ('limited_parameters', self._fitter.limited_parameters),
+            ('parameter_constraints', _constraints),
+            ('minimizer', type(self._fitter.minimizer).__name__),
+            ('minimizer_kwargs', self._minimizer_kwargs),
+            ('dynamic_error_algorithm', self._dynamic_error_algorithm),
+        ] + self._get_input_fingerprint_items()
+
     def _check_dynamic_error_compatibility(self):
         if not self._dynamic_error_warning_printed and self._iterative_fits_needed():
             warnings.warn(
@@ -407,9 +537,7 @@ class FitBase(FileIOMixin, object):
     def data(self, new_data):
         self._set_new_data(new_data)
         # validate cost function
-        _data_and_cost_compatible, _reason = self._cost_function.is_data_compatible(self.data)
-        if not _data_and_cost_compatible:
-            raise self.EXCEPTION_TYPE('Fit data and cost function are not compatible: %s' % _reason)
+        self._check_data_compatible_with_cost_function()
         self._set_new_parametric_model()
         self._param_model._on_error_change_callbacks = [self._on_error_change]
 
@@ -634,6 +762,15 @@ class FitBase(FileIOMixin, object):
         """
         return 1
 
+    @property
+    def fit_iteration_function_calls(self):
+        """Number of cost function evaluations for each minimization performed by the last call of
+        :py:meth:`do_fit`. Fits with dynamic errors perform more than one minimization.
+
+        :rtype: list[int]
+        """
+        return list(self._fit_iteration_function_calls)
+
     @property
     def did_fit(self):
         """Whether a fit was performed for the given data and model.
@@ -951,13 +1088,119 @@ class FitBase(FileIOMixin, object):
             _ret = self._param_model.enable_error(err_id)  # TODO: this call does not return anything
         return _ret
 
-    def do_fit(self, asymmetric_parameter_errors=False):
+    def update_data(self, data, copy=False):
+        """Replace the data values of this fit in place.
+
+        Unlike setting :py:attr:`~data`, the data container, its error objects and the nexus are kept.
+        Cached quantities which do not depend on the data values (e.g. absolute error matrices and
+        their inverses) are reused and the next call to :py:meth:`do_fit` starts from the current
+        parameter values. This makes refitting a stream of same-shaped datasets considerably cheaper.
+
+        :param data: the new data values, must have the same shape as the current data
+        :type data: iterable of float
+        :param bool copy: if :py:obj:`False`, a float :py:obj:`numpy.ndarray` passed as **data** is used
+            directly without copying it and must not be modified afterwards. Otherwise, the values are
+            copied into the existing data array.
+        """
+        if np.shape(data) != (self._data_container.size,):
+            raise self.EXCEPTION_TYPE("Cannot update data of shape %r with data of shape %r! "
+                                      "Use the 'data' setter to change the number of data points."
+                                      % ((self._data_container.size,), np.shape(data)))
+        self._data_container._set_data_in_place(data, copy=copy)
+        self._check_data_compatible_with_cost_function()
+        self._on_data_values_change()
+
+    def _set_batch_dataset(self, dataset):
+        """replace the data in place with one dataset of a :py:obj:`~kafe2.fit.tools.FitBatch`"""
+        self.update_data(dataset)
+
+    def clone(self, share_errors=True):
+        """Create a new fit with the same configuration which can be modified and fitted independently.
+
+        Unlike :py:func:`copy.deepcopy` or constructing a new fit, the model function is not parsed again and
+        the cost function and parameter constraints are shared with this fit by reference. Only the data, the
+        parameter values, limits and fixed parameters as well as the nexus and the minimizer are created anew.
+        Quantities that this fit has already calculated (e.g. the inverse of the total covariance matrix) are
+        taken over by the nexus of the clone. The clone starts from the current parameter values but does not
+        inherit any fit results.
+
+        :param bool share_errors: If :py:obj:`True`, the uncertainty sources of the clone share their error
+            values, covariance matrices and cached factorizations with the uncertainty sources of this fit.
+            Shared quantities are only recalculated separately once they change in one of the fits (e.g.
+            relative errors after :py:meth:`update_data`). If :py:obj:`False`, the uncertainty sources are
+            deep-copied.
+        :return: The new fit.
+        :rtype: FitBase
+        """
+        _clone = copy(self)
+        if self._model_function is not None:
+            _clone._model_function = self._model_function._clone()
+        _clone._fit_param_names = []
+        _clone._fit_param_constraints = list(self._fit_param_constraints)
+        _clone._loaded_result_dict = None
+        _clone._fit_iteration_function_calls = []
+        _clone._init_nexus()
+        _clone._initialize_fitter()
+
+        _clone._data_container = self._data_container._clone(share_errors=share_errors)
+        _clone._data_container._on_error_change_callback = _clone._on_error_change
+        _clone._set_new_parametric_model()
+        _clone._param_model._copy_errors_from(self._param_model, share_errors=share_errors)
+        _clone._param_model._on_error_change_callbacks = [_clone._on_error_change]
+
+        _clone.set_all_parameter_values(self.parameter_values)
+        for _par_name, _limits in six.iteritems(self._fitter.limited_parameters):
+            _clone.limit_parameter(_par_name, *_limits)
+        for _par_name in self._fitter.fixed_parameters:
+            _clone.fix_parameter(_par_name)
+        # data and parameter values are identical: reuse the values already computed by this fit
+        _clone._nexus.adopt_cached_values(self._nexus)
+        return _clone
+
+    def fit_many(self, datasets, n_workers=1, chunk_size=None, warm_start=True):
+        """Fit the model of this fit to many datasets with the same number of data points.
+
+        The datasets are fitted by copies of this fit whose data is replaced in place, see
+        :py:obj:`~kafe2.fit.tools.FitBatch`. This fit itself is not modified.
+
+        :param datasets: The datasets to fit, see :py:meth:`~kafe2.fit.tools.FitBatch.run`.
+        :type datasets: typing.Iterable
+        :param n_workers: Number of worker processes. If :py:obj:`None`, use all available CPUs.
+        :type n_workers: int or None
+        :param chunk_size: Number of datasets fitted one after another by the same copy of this fit. If
+            :py:obj:`None`, the datasets are split evenly across the workers.
+        :type chunk_size: int or None
+        :param bool warm_start: If :py:obj:`True`, each fit starts from the result of the previous fit in the
+            same chunk. Otherwise, each fit starts from the current parameter values of this fit.
+        :return: Structured array with the fields ``'parameter_values'``, ``'parameter_errors'``,
+            ``'parameter_cov_mat'``, ``'cost'`` and ``'did_fit'`` with one entry per dataset.
+        :rtype: numpy.ndarray
+        """
+        from ..tools.batch import FitBatch
+        return FitBatch(self, warm_start=warm_start).run(datasets, n_workers=n_workers, chunk_size=chunk_size)
+
+    def do_fit(self, asymmetric_parameter_errors=False, cache=None):
         """Perform the minimization of the cost function.
 
         :param bool asymmetric_parameter_errors: If :py:obj:`True`, calculate asymmetric parameter errors.
+        :param cache: Directory for caching fit results on disk or a :py:obj:`~kafe2.fit.tools.FitResultCache`.
+            If a fit with identical data, uncertainties, model function, parameter settings, cost function and
+            minimizer has been cached before, the minimization is skipped and the cached results are loaded
+            like results from a file. Otherwise the results of this fit are added to the cache.
+        :type cache: str or kafe2.fit.tools.FitResultCache or None
         :return: A dictionary containing the fit results.
         :rtype: dict
         """
+        if cache is not None:
+            from ..tools.cache import FitResultCache
+            if not isinstance(cache, FitResultCache):
+                cache = FitResultCache(cache)
+            _fingerprint = cache.fingerprint(self)
+            if cache.load(self, _fingerprint, asymmetric_parameter_errors=asymmetric_parameter_errors):
+                self._fit_iteration_function_calls = []
+                self._update_parameter_formatters()
+                return self.get_result_dict(asymmetric_parameter_errors=asymmetric_parameter_errors)
+
         if self._cost_function.needs_errors and not self.has_errors:
             warnings.warn("Cost function expects errors but no errors were specified.")
 
@@ -965,30 +1208,26 @@ class FitBase(FileIOMixin, object):
         self._set_data_as_model_ref()
 
         # Initial fit:
-        self._pre_fit_iteration(first_fit=True)
-        self._fitter.do_fit()  # TODO specify other node to minimize
-        self._post_fit_iteration(first_fit=True)
+        self._fit_iteration_function_calls = []
+        self._do_fit_iteration(first_fit=True)
 
         if self._iterative_fits_needed():
             _convergence_limit = float(kc("fit", "iterative_do_fit", "convergence_limit"))
             _previous_cost = self.cost_function_value
             for i in range(kc("fit", "iterative_do_fit", "max_iterations")):
-                self._pre_fit_iteration()
-                self._fitter.reset_minimizer()  # flush iminuit cache
-                self._fitter.do_fit()
-                self._post_fit_iteration()
+                self._do_fit_iteration()
                 if abs(self.cost_function_value - _previous_cost) < _convergence_limit:
                     break
                 _previous_cost = self.cost_function_value
         elif self._second_fit_needed():
-            self._pre_fit_iteration()
-            self._fitter.reset_minimizer()  # flush iminuit cache
-            self._fitter.do_fit()
-            self._post_fit_iteration()
+            self._do_fit_iteration()
 
         self._loaded_result_dict = None
         self._update_parameter_formatters()
-        return self.get_result_dict(asymmetric_parameter_errors=asymmetric_parameter_errors)
+        _result_dict = self.get_result_dict(asymmetric_parameter_errors=asymmetric_parameter_errors)
+        if cache is not None:
+            cache.store(self, _fingerprint)
+        return _result_dict
 
     def assign_model_function_name(self, name):
         """Assign a string to be the model function name.
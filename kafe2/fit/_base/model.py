@@ -3,6 +3,7 @@ import inspect
 import numpy as np
 import six
 from collections import OrderedDict
+from copy import copy, deepcopy
 
 from .format import ParameterFormatter, ModelFunctionFormatter
 from ..io.file import FileIOMixin
@@ -82,6 +83,22 @@ class ModelFunctionBase(FileIOMixin, object):
         self._source_code = None
         super(ModelFunctionBase, self).__init__()
 
+    def __getstate__(self):
+        _state = self.__dict__.copy()
+        if self._source_code is not None:
+            # functions defined by source code strings (e.g. in files) cannot be pickled
+            # -> parse the source code again when unpickling
+            del _state['_model_function_handle']
+            del _state['_callable']
+        return _state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if '_callable' not in state:
+            from ..representation.model.yaml_drepr import _parse_function
+            self._model_function_handle = _parse_function(self._source_code)
+            self._callable = self._model_function_handle
+
     @classmethod
     def _get_base_class(cls):
         return ModelFunctionBase
@@ -131,6 +148,12 @@ class ModelFunctionBase(FileIOMixin, object):
     def _assign_function_formatter(self):
         self._formatter = self.__class__.FORMATTER_TYPE(self.name, arg_formatters=self._get_argument_formatters())
 
+    def _clone(self):
+        """copy sharing the parsed model function and signature but with its own formatter"""
+        _clone = copy(self)
+        _clone._formatter = deepcopy(self._formatter)
+        return _clone
+
     def __call__(self, *args, **kwargs):
         return self._callable(*args, **kwargs)
 
@@ -1,7 +1,9 @@
 import numpy as np
+import six
 
 from ..indexed import IndexedContainer
 from ..indexed.container import IndexedContainerException
+from ..io.columns import iter_column_chunks
 
 
 __all__ = ['HistContainer', 'HistContainerException']
@@ -24,6 +26,8 @@ class HistContainer(IndexedContainer):
     ..    :parts: 1
 
     """
+    _FILL_CHUNK_SIZE = 2 ** 20  # number of memory-mapped entries loaded into memory at once when filling
+
     def __init__(self, n_bins, bin_range, bin_edges=None, fill_data=None, dtype=int):
         """
         Construct a histogram:
@@ -34,8 +38,8 @@ class HistContainer(IndexedContainer):
         :type bin_range: tuple of floats
         :param bin_edges: the bin edges (if ``None``, each bin will have the same width)
         :type bin_edges: list of floats
-        :param fill_data: entries to fill into the histogram
-        :type fill_data: list of floats
+        :param fill_data: entries to fill into the histogram, see :py:meth:`fill`
+        :type fill_data: list of floats or str
         :param dtype: data type of histogram entries
         :type dtype: type
         """
@@ -43,6 +47,7 @@ class HistContainer(IndexedContainer):
         self._manual_heights = False
         self._processed_entries = []
         self._unprocessed_entries = []
+        self._memory_mapped_entries = []  # read-only arrays, already counted in the bins
         # TODO: think of a way to implement weights
 
         if len(bin_range) != 2:
@@ -77,6 +82,18 @@ class HistContainer(IndexedContainer):
 
     # -- private methods
 
+    def _get_read_only_arrays(self):
+        return super(HistContainer, self)._get_read_only_arrays() + list(self._memory_mapped_entries)
+
+    def _fill_memory_mapped(self, entries):
+        """count memory-mapped entries chunk by chunk without loading all of them into memory"""
+        for _chunk_start in six.moves.range(0, len(entries), self._FILL_CHUNK_SIZE):
+            _chunk = entries[_chunk_start:_chunk_start + self._FILL_CHUNK_SIZE]
+            # same convention as _fill_unprocessed: entries on a bin edge belong to the upper bin,
+            # entries on the upper edge of the histogram are overflows
+            _bin_indices = np.searchsorted(self._bin_edges, _chunk, side='right')
+            self._data += np.bincount(_bin_indices, minlength=len(self._data))
+
     def _fill_unprocessed(self):
         """fill any entries marked as unprocessed into the histogram"""
         if self._manual_heights:
@@ -155,9 +172,14 @@ class HistContainer(IndexedContainer):
 
     @property
     def raw_data(self):
-        """the number of entries in each bin"""
+        """the raw entries filled into the histogram, a :py:obj:`numpy.ndarray` if it contains memory-mapped
+        entries and a list otherwise"""
         # TODO: commit unprocessed entries (?)
-        return self._processed_entries + self._unprocessed_entries
+        _raw_data = self._processed_entries + self._unprocessed_entries
+        if self._memory_mapped_entries:
+            # avoid copying memory-mapped entries into a list
+            return np.concatenate([np.asarray(_raw_data, dtype=float)] + list(self._memory_mapped_entries))
+        return _raw_data
 
     @property
     def low(self):
@@ -208,16 +230,57 @@ class HistContainer(IndexedContainer):
 
     # -- public methods
 
+    @classmethod
+    def from_columns(cls, file_path, n_bins, bin_range, column=0, bin_edges=None, file_format=None,
+                     delimiter=None, chunk_size=None):
+        """
+        Construct a histogram from the entries in a column of a text, ``.npy``, ``.npz`` or HDF5 file. See
+        :py:func:`~kafe2.fit.io.iter_column_chunks` for details on the supported file formats.
+
+        :param file_path: path of the file
+        :type file_path: str
+        :param n_bins: number of bins
+        :type n_bins: int
+        :param bin_range: the lower and upper edges of the entire histogram
+        :type bin_range: tuple of floats
+        :param column: name or zero-based index of the column containing the entries
+        :type column: str or int
+        :param bin_edges: the bin edges (if ``None``, each bin will have the same width)
+        :type bin_edges: list of floats
+        :param file_format: file format. If ``None``, it is inferred from the file name extension.
+        :type file_format: str or None
+        :param delimiter: column delimiter for text files. If ``None``, detect it automatically.
+        :type delimiter: str or None
+        :param chunk_size: number of entries to read and fill at once. If ``None``, read the whole file at once.
+        :type chunk_size: int or None
+        :return: the new histogram
+        """
+        _container = cls(n_bins, bin_range, bin_edges=bin_edges)
+        for _entries, in iter_column_chunks(file_path, [column], file_format=file_format, delimiter=delimiter,
+                                            chunk_size=chunk_size):
+            _container.fill(_entries)
+        return _container
+
     def fill(self, entries):
         """
         Fill new entries into the histogram.
 
-        :param entries: list of entries
-        :type entries: list of floats
+        Memory-mapped arrays (e.g. opened with ``numpy.load(file_path, mmap_mode='r')``) and the paths of
+        ``.npy`` files are counted in chunks without loading all entries into memory. The entries are kept
+        memory-mapped for rebinning.
+
+        :param entries: list of entries, a memory-mapped array or the path of a ``.npy`` file
+        :type entries: list of floats or str
         """
         if self._manual_heights:
             raise HistContainerException("The bin heights have been set manually. Filling additional data is not "
                                          "possible anymore. Please construct a new HistContainer!")
+        if isinstance(entries, six.string_types):
+            entries = np.load(entries, mmap_mode='r')
+        if isinstance(entries, np.memmap):
+            self._memory_mapped_entries.append(entries)
+            self._fill_memory_mapped(entries)
+            return
         try:
             self._unprocessed_entries += list(entries)
         except TypeError:
@@ -244,6 +307,43 @@ class HistContainer(IndexedContainer):
         # mark all entries as unprocessed
         self._unprocessed_entries += self._processed_entries
         self._processed_entries = []
+        for _entries in self._memory_mapped_entries:
+            self._fill_memory_mapped(_entries)
+
+    def _clone(self, share_errors=True):
+        _clone = super(HistContainer, self)._clone(share_errors=share_errors)
+        _clone._processed_entries = list(self._processed_entries)
+        _clone._unprocessed_entries = list(self._unprocessed_entries)
+        _clone._memory_mapped_entries = list(self._memory_mapped_entries)
+        return _clone
+
+    def _set_bins_in_place(self, bin_heights, underflow=0, overflow=0):
+        """
+        Write new bin heights into the existing data array. Unlike :py:meth:`set_bins`, the error objects
+        are kept and only quantities depending on the data values (e.g. relative errors) are recalculated.
+
+        :param bin_heights: Heights of the bins, must have the same length as the current data
+        :type bin_heights: list of int
+        :param underflow: Number of entries in the underflow bin
+        :type underflow: int
+        :param overflow: Number of entries in the overflow bin
+        :type overflow: int
+        """
+        _bin_heights = np.asarray(bin_heights)
+        if _bin_heights.shape != (self.size,):
+            raise HistContainerException('Length of bin entries does not match binning. '
+                                         'Got {}, expected {}'.format(_bin_heights.shape, (self.size,)))
+        if not np.can_cast(_bin_heights.dtype, self._data.dtype, casting='same_kind'):
+            # e.g. non-integer bin heights for an integer histogram
+            self._data = self._data.astype(np.result_type(self._data, _bin_heights))
+        self._data[1:-1] = _bin_heights
+        self._data[0] = underflow
+        self._data[-1] = overflow
+        self._manual_heights = True
+        self._processed_entries = []
+        self._unprocessed_entries = []
+        self._memory_mapped_entries = []
+        self._update_error_references()
 
     def set_bins(self, bin_heights, underflow=0, overflow=0):
         """
@@ -267,3 +367,4 @@ class HistContainer(IndexedContainer):
         self._data = _new_data
         self._processed_entries = []
         self._unprocessed_entries = []
+        self._memory_mapped_entries = []
@@ -0,0 +1,255 @@
+import numpy as np
+import scipy.stats
+import six
+
+from .._base import FitEnsembleBase, FitEnsembleException
+from .._base.cost import CostFunction_NegLogLikelihood
+from ..tools.ensemble import EnsembleVariablePlotter
+from .container import HistContainer
+from .fit import HistFit
+
+
+__all__ = ["HistFitEnsemble"]
+
+
+class HistFitEnsembleException(FitEnsembleException):
+    pass
+
+
+class HistFitEnsemble(FitEnsembleBase):
+    """
+    Object for generating ensembles of fits to histogram pseudo-data generated according to the
+    specified model density.
+
+    The bin contents of the pseudo-experiments are drawn from Poisson distributions around the expected
+    number of entries in each bin or, if the total number of entries is fixed, from a multinomial
+    distribution. The bin contents for a whole block of pseudo-experiments are drawn at once and a single
+    :py:obj:`~kafe2.fit.HistFit` object is reused for all toy fits.
+
+    The fit ensemble is generated by using the :py:meth:`~kafe2.fit.HistFitEnsemble.run` method.
+    """
+    FIT_TYPE = HistFit
+    EXCEPTION_TYPE = HistFitEnsembleException
+
+    SAMPLING_METHODS = ('poisson', 'multinomial')
+
+    def __init__(self, n_experiments, n_bins, bin_range, model_density_function, model_parameters, n_entries,
+                 bin_edges=None,
+                 cost_function=CostFunction_NegLogLikelihood(data_point_distribution='poisson', ratio=True),
+                 bin_evaluation="simpson", sampling='poisson',
+                 requested_results=None, store_values=True, storage_dir=None):
+        """
+        Construct a :py:obj:`~kafe2.fit.HistFitEnsemble` object.
+
+        :param n_experiments: number of pseudoexperiments to perform
+        :type n_experiments: int
+        :param n_bins: number of bins
+        :type n_bins: int
+        :param bin_range: the lower and upper edges of the entire histogram
+        :type bin_range: tuple of floats
+        :param model_density_function: the model density function
+        :type model_density_function: :py:class:`~kafe2.fit.hist.HistModelFunction` or unwrapped native Python
+            function
+        :param model_parameters: parameters of the "true" model
+        :type model_parameters: iterable of float
+        :param n_entries: (expected) total number of entries in each pseudo-experiment, including entries
+            outside the bin range
+        :type n_entries: int
+        :param bin_edges: the bin edges (if ``None``, each bin will have the same width)
+        :type bin_edges: list of floats
+        :param cost_function: the cost function. By default, the Poisson likelihood ratio is used, which yields
+            the same parameter estimates as the plain negative log-likelihood but approximately follows a
+            chi2 distribution.
+        :type cost_function: :py:class:`~kafe2.fit._base.CostFunctionBase`-derived or unwrapped native Python
+            function
+        :param bin_evaluation: how the model evaluates bin heights (see :py:obj:`~kafe2.fit.HistFit`)
+        :type bin_evaluation: str, callable, or numpy.vectorize
+        :param sampling: how the bin contents are drawn. With ``'poisson'``, the contents of all bins
+            fluctuate independently. With ``'multinomial'``, the total number of entries is fixed.
+        :type sampling: str
+        :param requested_results: list of result variables to collect for each toy fit
+        :type requested_results: iterable of str
+        :param store_values: if ``False``, the results of the individual toy fits are not stored. Only the
+                             statistics of the result variables are accumulated online.
+        :type store_values: bool
+        :param storage_dir: if given, the results of the individual toy fits are stored in ``.npy`` files
+                            in this directory (one file per result variable) instead of in memory
+        :type storage_dir: str or ``None``
+        """
+        if sampling not in self.SAMPLING_METHODS:
+            raise HistFitEnsembleException("Unknown sampling method '{}'! Available: {}".format(
+                sampling, ', '.join(self.SAMPLING_METHODS)))
+        self._sampling = sampling
+        self._n_entries = int(n_entries)
+        self._model_parameters = np.asarray(model_parameters, dtype=float)
+        self._n_par = len(self._model_parameters)
+
+        # initialize a `HistFit` object for performing the toy fits
+        # need some dummy initial bin contents with the right total number of entries
+        _container = HistContainer(n_bins=n_bins, bin_range=bin_range, bin_edges=bin_edges)
+        _dummy_bin_heights = np.full(_container.size, self._n_entries // _container.size)
+        _dummy_bin_heights[:self._n_entries % _container.size] += 1
+        _container.set_bins(_dummy_bin_heights)
+        self._toy_fit = HistFit(data=_container,
+                                model_density_function=model_density_function,
+                                cost_function=cost_function,
+                                bin_evaluation=bin_evaluation)
+
+        # set the model parameters of the toy fit to the reference values
+        self._set_toy_fit_parameters_to_reference()
+        # initial step sizes of the minimizer, restored before each toy fit
+        self._toy_fit_initial_step_sizes = self._toy_fit._fitter.minimizer.parameter_errors
+
+        self._update_reference_quantities_from_toy_fit()
+
+        super(HistFitEnsemble, self).__init__(n_experiments=n_experiments, requested_results=requested_results,
+                                              store_values=store_values, storage_dir=storage_dir)
+
+    # -- private methods
+
+    def _update_reference_quantities_from_toy_fit(self):
+        # probability for an entry to fall into each of the bins
+        self._ref_bin_probabilities = self._toy_fit.model / self._toy_fit.data_container.n_entries
+        _p_outside = 1.0 - np.sum(self._ref_bin_probabilities)
+        if np.any(self._ref_bin_probabilities < 0) or _p_outside < -1e-6:
+            raise HistFitEnsembleException("Cannot generate fit ensemble: bin probabilities of the model are "
+                                           "negative or add up to more than one!")
+        # the last category contains the entries outside the bin range
+        self._ref_category_probabilities = np.append(self._ref_bin_probabilities, max(_p_outside, 0.0))
+        self._ref_category_probabilities /= np.sum(self._ref_category_probabilities)
+        self._ref_data = self._n_entries * self._ref_bin_probabilities
+
+    def _generate_pseudodata_block(self, random_generator, n_toys):
+        """draw the contents of all bins (and of the overflow bin) for a block of pseudo-experiments at once"""
+        if self._sampling == 'multinomial':
+            return random_generator.multinomial(self._n_entries, self._ref_category_probabilities, size=n_toys)
+        return random_generator.poisson(self._n_entries * self._ref_category_probabilities,
+                                        size=(n_toys, len(self._ref_category_probabilities)))
+
+    def _set_toy_fit_pseudodata(self, pseudodata_block, i_toy):
+        _counts = pseudodata_block[i_toy]
+        # entries outside the bin range only enter the fit through the total number of entries
+        self._toy_fit.update_data(_counts[:-1], overflow=_counts[-1])
+
+    def _initialize_ensemble_variables(self, resume=False, open_storage=True):
+        self._ensemble_variables = {}
+        self._ensemble_variable_plotters = {}
+        _bin_labels = ['bin %d' % (_i,) for _i in six.moves.range(1, self.n_dat+1)]
+        # approximate the bin content distributions by normal distributions for plotting
+        _ref_std = np.sqrt(self._ref_data)
+        if 'pulls' in self._requested_results:
+            self._ensemble_variables['pulls'] = self._make_ensemble_variable(
+                'pulls', (self.n_dat,), resume=resume, open_storage=open_storage,
+                distribution=scipy.stats.norm,
+                distribution_parameters=dict(loc=0, scale=1)
+            )
+            self._ensemble_variable_plotters['pulls'] = EnsembleVariablePlotter(
+                ensemble_variable=self._ensemble_variables['pulls'],
+                value_ranges=(-3, 3),
+                variable_labels=['Pull ' + _label for _label in _bin_labels]
+            )
+
+        for _result_name in ('data', 'model'):
+            if _result_name not in self._requested_results:
+                continue
+            self._ensemble_variables[_result_name] = self._make_ensemble_variable(
+                _result_name, (self.n_dat,), resume=resume, open_storage=open_storage,
+                distribution=scipy.stats.norm,
+                distribution_parameters=dict(loc=self._ref_data, scale=_ref_std)
+            )
+            self._ensemble_variable_plotters[_result_name] = EnsembleVariablePlotter(
+                ensemble_variable=self._ensemble_variables[_result_name],
+                value_ranges=np.array([self._ref_data - 3 * _ref_std, self._ref_data + 3 * _ref_std]).T,
+                variable_labels=['{} {}'.format(_result_name.capitalize(), _label) for _label in _bin_labels]
+            )
+
+        if 'parameter_pulls' in self._requested_results:
+            self._ensemble_variables['parameter_pulls'] = self._make_ensemble_variable(
+                'parameter_pulls', (self._n_par,), resume=resume, open_storage=open_storage,
+                with_comoments=True,
+                distribution=scipy.stats.norm,
+                distribution_parameters=dict(loc=0, scale=1)
+            )
+            self._ensemble_variable_plotters['parameter_pulls'] = EnsembleVariablePlotter(
+                ensemble_variable=self._ensemble_variables['parameter_pulls'],
+                value_ranges=(-3, 3),
+                variable_labels=["Pull ${}$".format(_arg_formatter.latex_name)
+                                 for _arg_formatter in self._toy_fit._model_function.formatter.arg_formatters]
+            )
+
+        if 'cost' in self._requested_results:
+            self._ensemble_variables['cost'] = self._make_ensemble_variable(
+                'cost', (), resume=resume, open_storage=open_storage,
+                distribution=scipy.stats.chi2,  # FIXME: assume chi2 for all cost functions -> change
+                distribution_parameters=dict(loc=0, df=self.n_df)
+            )
+            self._ensemble_variable_plotters['cost'] = EnsembleVariablePlotter(
+                ensemble_variable=self._ensemble_variables['cost'],
+                value_ranges=(0, 3*self.n_df),
+                variable_labels="${}$".format(self._toy_fit._cost_function.formatter.latex_name)
+            )
+
+    def _prepare_run(self):
+        self._set_toy_fit_parameters_to_reference()
+        self._update_reference_quantities_from_toy_fit()
+
+    # -- private properties
+
+    @property
+    def _parameter_pulls(self):
+        """property for ensemble variable 'parameter_pulls'"""
+        return (self._toy_fit.parameter_values - self._model_parameters)/self._toy_fit.parameter_errors
+
+    @property
+    def _data(self):
+        """property for ensemble variable 'data'"""
+        return self._toy_fit.data
+
+    @property
+    def _model(self):
+        """property for ensemble variable 'model'"""
+        return self._toy_fit.model
+
+    @property
+    def _pulls(self):
+        """property for ensemble variable 'pulls'"""
+        _model = self._toy_fit.model
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (self._toy_fit.data - _model) / np.sqrt(_model)
+
+    @property
+    def _cost(self):
+        """property for ensemble variable 'cost'"""
+        return self._toy_fit.cost_function_value
+
+    # -- public properties
+
+    @property
+    def n_dat(self):
+        """the number of bins"""
+        return self._toy_fit.data_container.size
+
+    @property
+    def n_df(self):
+        """the number of degrees of freedom for the fit"""
+        # FIXME: not generally true -> update to handle constrained parameters
+        return self.n_dat - self.n_par
+
+    @property
+    def n_entries(self):
+        """the (expected) total number of entries in each pseudo-experiment"""
+        return self._n_entries
+
+    @property
+    def sampling(self):
+        """how the bin contents of the pseudo-experiments are drawn"""
+        return self._sampling
+
+    AVAILABLE_RESULTS = {
+        'parameter_pulls': _parameter_pulls,
+        'pulls': _pulls,
+        'cost': _cost,
+        'data': _data,
+        'model': _model,
+    }
+    _DEFAULT_RESULTS = {'pulls', 'parameter_pulls', 'cost'}
@@ -1,5 +1,7 @@
 from copy import deepcopy
 
+import numpy as np
+
 from .._base import FitException, FitBase, DataContainerBase
 from .container import HistContainer
 from .._base.cost import CostFunction_NegLogLikelihood
@@ -25,6 +27,7 @@ class HistFit(FitBase):
                           'data_cov_mat', 'model_cov_mat', 'total_cov_mat',
                           'data_cor_mat', 'model_cor_mat', 'total_cor_mat'}
     _BASIC_ERROR_NAMES = {'data_error', 'model_error', 'data_cov_mat', 'model_cov_mat'}
+    _DATA_NODE_NAMES = ('data', 'model')  # the model depends on the total number of entries
 
     def __init__(self,
                  data,
@@ -95,6 +98,13 @@ class HistFit(FitBase):
             self.parameter_values, self._data_container.bin_edges,
             bin_evaluation=self._bin_evaluation)
 
+    def _get_input_fingerprint_items(self):
+        return super(HistFit, self)._get_input_fingerprint_items() + [
+            ('bin_edges', self._data_container.bin_edges),
+            ('n_entries', self._data_container.n_entries),
+            ('bin_evaluation', self._bin_evaluation),
+        ]
+
     # -- public properties
 
     @property
@@ -107,6 +117,27 @@ class HistFit(FitBase):
 
     # -- public methods
 
+    def update_data(self, bin_heights, underflow=0, overflow=0):
+        """Replace the bin heights of this fit in place.
+
+        Unlike setting :py:attr:`~data`, the data container, its error objects and the nexus are kept
+        and the next call to :py:meth:`do_fit` starts from the current parameter values.
+
+        :param bin_heights: the new bin heights, must have the same length as the current data
+        :type bin_heights: iterable of int
+        :param underflow: number of entries in the underflow bin
+        :type underflow: int
+        :param overflow: number of entries in the overflow bin
+        :type overflow: int
+        """
+        if np.shape(bin_heights) != (self._data_container.size,):
+            raise HistFitException("Cannot update data of shape {} with bin heights of shape {}! "
+                                   "Use the 'data' setter to change the binning."
+                                   .format((self._data_container.size,), np.shape(bin_heights)))
+        self._data_container._set_bins_in_place(bin_heights, underflow=underflow, overflow=overflow)
+        self._check_data_compatible_with_cost_function()
+        self._on_data_values_change()
+
     ## add_error... methods inherited from FitBase ##
 
     def eval_model_function_density(self, x, model_parameters=None):
@@ -1,7 +1,10 @@
+from copy import copy, deepcopy
+
 import numpy as np
 
 from ...core.error import MatrixGaussianError, SimpleGaussianError
 from .._base import DataContainerException, DataContainerBase
+from ..io.columns import read_columns
 
 
 __all__ = ['IndexedContainer', 'IndexedContainerException']
@@ -20,16 +23,37 @@ class IndexedContainer(DataContainerBase):
         """
         Construct a container for indexed data:
 
-        :param data: a one-dimensional array of measurements
-        :type data: iterable of type <dtype>
+        :param data: a one-dimensional array of measurements. Memory-mapped arrays (e.g. opened with
+            ``numpy.load(file_path, mmap_mode='r')``) or the path of a ``.npy`` file are used without loading
+            the data into memory, see :py:attr:`is_memory_mapped`.
+        :type data: iterable of type <dtype> or str
         :param dtype: data type of the measurements
         :type dtype: type
         """
         super(IndexedContainer, self).__init__()
-        self._data = np.array(data, dtype=dtype)
+        self._data = self._as_data_array(data, dtype=dtype)
+
+    def __deepcopy__(self, memo):
+        # read-only (e.g. memory-mapped) arrays cannot be modified -> share them instead of loading them into memory
+        for _array in self._get_read_only_arrays():
+            memo[id(_array)] = _array
+        _copy = self.__class__.__new__(self.__class__)
+        memo[id(self)] = _copy
+        for _key, _value in self.__dict__.items():
+            _copy.__dict__[_key] = deepcopy(_value, memo)
+        return _copy
 
     # -- private methods
 
+    def _get_read_only_arrays(self):
+        """arrays which can be shared by copies of this container"""
+        return [self._data] if not self._data.flags.writeable else []
+
+    def _make_data_writeable(self):
+        """load read-only (e.g. memory-mapped) data into memory before modifying it"""
+        if not self._data.flags.writeable:
+            self._data = np.array(self._data)
+
     def _calculate_total_error(self):
         _sz = self.size
         _tmp_cov_mat = np.zeros((_sz, _sz))
@@ -44,6 +68,61 @@ class IndexedContainer(DataContainerBase):
     def _clear_total_error_cache(self):
         self._total_error = None
 
+    def _set_data_in_place(self, data, copy=True):
+        """
+        Replace the data values without changing the number of data points. The error objects are kept
+        and only quantities depending on the data values (e.g. relative errors) are recalculated.
+
+        :param data: the new data values, must have the same shape as the current data
+        :type data: iterable of float
+        :param copy: if ``False``, **data** is used as the container data without copying it (provided
+                     it already is a :py:obj:`numpy.ndarray` of the right type). Otherwise, the values are
+                     written into the existing data array.
+        :type copy: bool
+        """
+        _data = np.asarray(data, dtype=self._data.dtype)
+        if _data.shape != self._data.shape:
+            raise IndexedContainerException("Cannot replace data of shape %r in place with data of shape %r!"
+                                            % (self._data.shape, _data.shape))
+        if copy:
+            self._make_data_writeable()
+            self._data[:] = _data
+        else:
+            self._data = _data
+        self._update_error_references()
+
+    def _clone(self, share_errors=True):
+        """
+        Create a copy of this container with its own data array and error sources.
+
+        :param share_errors: if ``True``, the error sources of the copy share their error values, covariance
+                             matrices and cached factorizations with the error sources of this container
+        :type share_errors: bool
+        :return: the copy
+        """
+        _clone = copy(self)
+        if self._data.flags.writeable:
+            _clone._data = self._data.copy()
+        _clone._on_error_change_callback = None
+        _clone._copy_errors_from(self, share_errors=share_errors)
+        return _clone
+
+    def _get_error_reference(self):
+        # bound method instead of a lambda so that error objects referencing the data can be pickled
+        return self._data
+
+    def _update_error_references(self):
+        """reset member error references to the current data values"""
+        _has_relative_errors = False
+        for _err_dict in self._error_dicts.values():
+            _err_dict['err'].reference = self._data
+            _has_relative_errors = _has_relative_errors or _err_dict['err'].relative
+        if _has_relative_errors:
+            self._clear_total_error_cache()
+        elif self._total_error is not None:
+            # the absolute total error does not depend on the data values
+            self._total_error.reference = self._data
+
     # -- public properties
 
     @property
@@ -54,6 +133,8 @@ class IndexedContainer(DataContainerBase):
     @property
     def data(self):
         """container data (one-dimensional :py:obj:`numpy.ndarray`)"""
+        if not self._data.flags.writeable:
+            return self._data  # read-only data cannot be modified by the user, don't load it into memory
         return self._data.copy()  # copy to ensure no modification by user
 
     @data.setter
@@ -61,6 +142,7 @@ class IndexedContainer(DataContainerBase):
         _data = np.squeeze(np.array(data, dtype=float))
         if len(_data.shape) > 1:
             raise IndexedContainerException("IndexedContainer data must be 1-d array of floats! Got shape: %r..." % (_data.shape,))
+        self._make_data_writeable()
         self._data[:] = _data
         # reset member error references to the new data values
         for _err_dict in self._error_dicts.values():
@@ -91,6 +173,11 @@ class IndexedContainer(DataContainerBase):
         _total_error = self.get_total_error()
         return _total_error.cor_mat
 
+    @property
+    def is_memory_mapped(self):
+        """whether the data is read from a memory-mapped file instead of being held in memory"""
+        return isinstance(self._data, np.memmap)
+
     @property
     def data_range(self):
         """
@@ -101,6 +188,36 @@ class IndexedContainer(DataContainerBase):
 
     # -- public methods
 
+    @classmethod
+    def from_columns(cls, file_path, data_column=0, error_column=None, file_format=None, delimiter=None,
+                     chunk_size=None):
+        """
+        Construct a container from a column of a text, ``.npy``, ``.npz`` or HDF5 file. See
+        :py:func:`~kafe2.fit.io.iter_column_chunks` for details on the supported file formats.
+
+        :param file_path: path of the file
+        :type file_path: str
+        :param data_column: name or zero-based index of the column containing the data
+        :type data_column: str or int
+        :param error_column: name or index of a column containing pointwise uncertainties. If not ``None``, they
+                             are added as an uncorrelated error.
+        :type error_column: str or int or None
+        :param file_format: file format. If ``None``, it is inferred from the file name extension.
+        :type file_format: str or None
+        :param delimiter: column delimiter for text files. If ``None``, detect it automatically.
+        :type delimiter: str or None
+        :param chunk_size: number of rows to parse at once, see :py:func:`~kafe2.fit.io.read_columns`
+        :type chunk_size: int or None
+        :return: the new container
+        """
+        _columns = [data_column] if error_column is None else [data_column, error_column]
+        _arrays = read_columns(file_path, _columns, file_format=file_format, delimiter=delimiter,
+                               chunk_size=chunk_size)
+        _container = cls(_arrays[0])
+        if error_column is not None:
+            _container.add_error(err_val=_arrays[1])
+        return _container
+
     def add_error(self, err_val,
                   name=None, correlation=0, relative=False):
         """
@@ -124,7 +241,7 @@ class IndexedContainer(DataContainerBase):
             name=name,
             correlation=correlation,
             relative=relative,
-            reference=lambda: self._data  # set the reference appropriately
+            reference=self._get_error_reference  # set the reference appropriately
         )
 
     def add_matrix_error(self, err_matrix, matrix_type,
@@ -153,5 +270,5 @@ class IndexedContainer(DataContainerBase):
             name=name,
             err_val=err_val,
             relative=relative,
-            reference=lambda: self._data  # set the reference appropriately
+            reference=self._get_error_reference  # set the reference appropriately
         )
@@ -0,0 +1,227 @@
+import numpy as np
+import scipy.stats
+import six
+
+from .._base import FitEnsembleBase, FitEnsembleException
+from .._base.cost import CostFunction_Chi2
+from ..tools.ensemble import EnsembleVariablePlotter, MultivariateNormalSampler
+from .fit import IndexedFit
+
+
+__all__ = ["IndexedFitEnsemble"]
+
+
+class IndexedFitEnsembleException(FitEnsembleException):
+    pass
+
+
+class IndexedFitEnsemble(FitEnsembleBase):
+    """
+    Object for generating ensembles of fits to indexed pseudo-data generated according to the
+    specified uncertainty model.
+
+    After constructing an :py:obj:`~kafe2.fit.IndexedFitEnsemble` object, an error model should be added
+    to it. This is done as for :py:obj:`~kafe2.fit.IndexedFit` objects by using the
+    :py:meth:`~kafe2.fit.IndexedFitEnsemble.add_error` or
+    :py:meth:`~kafe2.fit.IndexedFitEnsemble.add_matrix_error` methods.
+
+    The pseudo-data for a whole block of pseudo-experiments is drawn at once from a multivariate normal
+    distribution with the total covariance matrix and a single :py:obj:`~kafe2.fit.IndexedFit` object is
+    reused for all toy fits. The fit ensemble is generated by using the
+    :py:meth:`~kafe2.fit.IndexedFitEnsemble.run` method.
+    """
+    FIT_TYPE = IndexedFit
+    EXCEPTION_TYPE = IndexedFitEnsembleException
+
+    def __init__(self, n_experiments, model_function, model_parameters,
+                 cost_function=CostFunction_Chi2(errors_to_use='covariance', fallback_on_singular=True),
+                 requested_results=None, store_values=True, storage_dir=None):
+        """
+        Construct an :py:obj:`~kafe2.fit.IndexedFitEnsemble` object.
+
+        :param n_experiments: number of pseudoexperiments to perform
+        :type n_experiments: int
+        :param model_function: the model function
+        :type model_function: :py:class:`~kafe2.fit.indexed.IndexedModelFunction` or unwrapped native Python
+            function
+        :param model_parameters: parameters of the "true" model
+        :type model_parameters: iterable of float
+        :param cost_function: the cost function
+        :type cost_function: :py:class:`~kafe2.fit._base.CostFunctionBase`-derived or unwrapped native Python
+            function
+        :param requested_results: list of result variables to collect for each toy fit
+        :type requested_results: iterable of str
+        :param store_values: if ``False``, the results of the individual toy fits are not stored. Only the
+                             statistics of the result variables are accumulated online.
+        :type store_values: bool
+        :param storage_dir: if given, the results of the individual toy fits are stored in ``.npy`` files
+                            in this directory (one file per result variable) instead of in memory
+        :type storage_dir: str or ``None``
+        """
+        self._model_function = model_function
+        self._model_parameters = np.asarray(model_parameters, dtype=float)
+        self._n_par = len(self._model_parameters)
+
+        # initialize an `IndexedFit` object for performing the toy fits
+        # need some dummy initial data values in order to initialize a Fit object
+        self._ref_data = np.asarray(self._model_function(*self._model_parameters), dtype=float)
+        self._toy_fit = IndexedFit(data=self._ref_data,
+                                   model_function=self._model_function,
+                                   cost_function=cost_function)
+
+        # set the model parameters of the toy fit to the reference values
+        self._set_toy_fit_parameters_to_reference()
+        # initial step sizes of the minimizer, restored before each toy fit
+        self._toy_fit_initial_step_sizes = self._toy_fit._fitter.minimizer.parameter_errors
+
+        # get reference quantities (data, covariance matrix...) from toy fit
+        self._update_reference_quantities_from_toy_fit()
+
+        super(IndexedFitEnsemble, self).__init__(n_experiments=n_experiments, requested_results=requested_results,
+                                                 store_values=store_values, storage_dir=storage_dir)
+
+    # -- private methods
+
+    def _update_reference_quantities_from_toy_fit(self):
+        self._ref_data = np.asarray(self._toy_fit.model, dtype=float)
+        self._ref_cov_mat = self._toy_fit.total_cov_mat
+        self._ref_err = self._toy_fit.total_error
+        # factorize the covariance matrix once for generating the pseudo-data
+        self._jitter_sampler = MultivariateNormalSampler(self._ref_cov_mat)
+
+    def _generate_pseudodata_block(self, random_generator, n_toys):
+        """draw the jitter for a block of pseudo-experiments at once"""
+        return self._ref_data + self._jitter_sampler.sample(random_generator, n_toys)
+
+    def _set_toy_fit_pseudodata(self, pseudodata_block, i_toy):
+        self._toy_fit.update_data(pseudodata_block[i_toy])
+
+    def _initialize_ensemble_variables(self, resume=False, open_storage=True):
+        self._ensemble_variables = {}
+        self._ensemble_variable_plotters = {}
+        if 'pulls' in self._requested_results:
+            self._ensemble_variables['pulls'] = self._make_ensemble_variable(
+                'pulls', (self.n_dat,), resume=resume, open_storage=open_storage,
+                distribution=scipy.stats.norm,
+                distribution_parameters=dict(loc=0, scale=1)
+            )
+            self._ensemble_variable_plotters['pulls'] = EnsembleVariablePlotter(
+                ensemble_variable=self._ensemble_variables['pulls'],
+                value_ranges=(-3, 3),
+                variable_labels=['Pull $d_{%d}$' % (_i,) for _i in six.moves.range(self.n_dat)]
+            )
+
+        for _result_name, _label in (('data', '$d_{%d}$'), ('model', '$m_{%d}$')):
+            if _result_name not in self._requested_results:
+                continue
+            self._ensemble_variables[_result_name] = self._make_ensemble_variable(
+                _result_name, (self.n_dat,), resume=resume, open_storage=open_storage,
+                distribution=scipy.stats.norm,
+                distribution_parameters=dict(loc=self._ref_data, scale=self._ref_err)
+            )
+            self._ensemble_variable_plotters[_result_name] = EnsembleVariablePlotter(
+                ensemble_variable=self._ensemble_variables[_result_name],
+                value_ranges=np.array([self._ref_data - 3 * self._ref_err,
+                                       self._ref_data + 3 * self._ref_err]).T,
+                variable_labels=[_label % (_i,) for _i in six.moves.range(self.n_dat)]
+            )
+
+        if 'parameter_pulls' in self._requested_results:
+            self._ensemble_variables['parameter_pulls'] = self._make_ensemble_variable(
+                'parameter_pulls', (self._n_par,), resume=resume, open_storage=open_storage,
+                with_comoments=True,
+                distribution=scipy.stats.norm,
+                distribution_parameters=dict(loc=0, scale=1)
+            )
+            self._ensemble_variable_plotters['parameter_pulls'] = EnsembleVariablePlotter(
+                ensemble_variable=self._ensemble_variables['parameter_pulls'],
+                value_ranges=(-3, 3),
+                variable_labels=["Pull ${}$".format(_arg_formatter.latex_name)
+                                 for _arg_formatter in self._toy_fit._model_function.formatter.arg_formatters]
+            )
+
+        if 'cost' in self._requested_results:
+            self._ensemble_variables['cost'] = self._make_ensemble_variable(
+                'cost', (), resume=resume, open_storage=open_storage,
+                distribution=scipy.stats.chi2,  # FIXME: assume chi2 for all cost functions -> change
+                distribution_parameters=dict(loc=0, df=self.n_df)
+            )
+            self._ensemble_variable_plotters['cost'] = EnsembleVariablePlotter(
+                ensemble_variable=self._ensemble_variables['cost'],
+                value_ranges=(0, 3*self.n_df),
+                variable_labels="${}$".format(self._toy_fit._cost_function.formatter.latex_name)
+            )
+
+    def _prepare_run(self):
+        if not self._toy_fit.has_errors:
+            raise IndexedFitEnsembleException("Cannot generate fit ensemble: no error model specified!")
+
+        self._set_toy_fit_parameters_to_reference()
+        self._update_reference_quantities_from_toy_fit()
+
+    # -- private properties
+
+    @property
+    def _parameter_pulls(self):
+        """property for ensemble variable 'parameter_pulls'"""
+        return (self._toy_fit.parameter_values - self._model_parameters)/self._toy_fit.parameter_errors
+
+    @property
+    def _data(self):
+        """property for ensemble variable 'data'"""
+        return self._toy_fit.data
+
+    @property
+    def _model(self):
+        """property for ensemble variable 'model'"""
+        return self._toy_fit.model
+
+    @property
+    def _pulls(self):
+        """property for ensemble variable 'pulls'"""
+        return (self._toy_fit.data - self._toy_fit.model) / self._toy_fit.total_error
+
+    @property
+    def _cost(self):
+        """property for ensemble variable 'cost'"""
+        return self._toy_fit.cost_function_value
+
+    # -- public properties
+
+    @property
+    def n_dat(self):
+        """the number of data points"""
+        return self._toy_fit.data_container.size
+
+    @property
+    def n_df(self):
+        """the number of degrees of freedom for the fit"""
+        # FIXME: not generally true -> update to handle constrained parameters
+        return self.n_dat - self.n_par
+
+    # -- public methods
+
+    def add_error(self, err_val, name=None, correlation=0, relative=False, reference='data'):
+        self._toy_fit.add_error(err_val=err_val, name=name, correlation=correlation, relative=relative,
+                                reference=reference)
+        self._update_reference_quantities_from_toy_fit()  # recompute reference errors
+
+    # "inherit" docstring
+    add_error.__doc__ = IndexedFit.add_error.__doc__
+
+    def add_matrix_error(self, err_matrix, matrix_type, name=None, err_val=None, relative=False, reference='data'):
+        self._toy_fit.add_matrix_error(err_matrix=err_matrix, matrix_type=matrix_type, name=name, err_val=err_val,
+                                       relative=relative, reference=reference)
+        self._update_reference_quantities_from_toy_fit()  # recompute reference errors
+
+    # "inherit" docstring
+    add_matrix_error.__doc__ = IndexedFit.add_matrix_error.__doc__
+
+    AVAILABLE_RESULTS = {
+        'parameter_pulls': _parameter_pulls,
+        'pulls': _pulls,
+        'cost': _cost,
+        'data': _data,
+        'model': _model,
+    }
+    _DEFAULT_RESULTS = {'pulls', 'parameter_pulls', 'cost'}
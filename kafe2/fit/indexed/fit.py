@@ -41,8 +41,9 @@ class IndexedFit(FitBase):
         """
         Construct a fit of a model to a series of indexed measurements.
 
-        :param data: the measurement values
-        :type data: iterable of float
+        :param data: the measurement values. A memory-mapped array or the path of a ``.npy`` file is used
+            without loading the data into memory.
+        :type data: iterable of float or str
         :param model_function: the model function
         :type model_function: :py:class:`~kafe2.fit.indexed.IndexedModelFunction` or unwrapped native Python function
         :param cost_function: the cost function
@@ -6,3 +6,4 @@
 """
 
 from .handle import *
+from .columns import *
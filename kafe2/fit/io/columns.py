@@ -0,0 +1,229 @@
+import itertools
+import os
+import warnings
+
+import numpy as np
+import six
+
+__all__ = ['ColumnReaderException', 'iter_column_chunks', 'read_columns']
+
+
+_FILE_FORMAT_ALIASES = {'txt': 'txt', 'dat': 'txt', 'csv': 'txt', 'tsv': 'txt',
+                        'npy': 'npy', 'npz': 'npz',
+                        'hdf5': 'hdf5', 'h5': 'hdf5', 'hdf': 'hdf5'}
+
+# number of lines of a text file which are parsed at once if the file is not read in chunks
+_TEXT_BLOCK_SIZE = 100000
+
+
+class ColumnReaderException(Exception):
+    pass
+
+
+def _get_file_format(file_path, file_format=None):
+    """determine the file format from the file name extension, text is assumed for unknown extensions"""
+    if file_format is None:
+        file_format = os.path.splitext(file_path)[1][1:]
+    return _FILE_FORMAT_ALIASES.get(file_format.lower(), 'txt')
+
+
+def _get_column_indices(columns, column_names, file_path):
+    """translate column names and integer indices to integer indices"""
+    _indices = []
+    for _column in columns:
+        if isinstance(_column, six.string_types):
+            if column_names is None or _column not in column_names:
+                raise ColumnReaderException("Column '%s' not found in file '%s'! Available columns: %r"
+                                            % (_column, file_path, column_names))
+            _indices.append(column_names.index(_column))
+        else:
+            _n_columns = len(column_names) if column_names is not None else None
+            if _n_columns is not None and not -_n_columns <= _column < _n_columns:
+                raise ColumnReaderException("Column index %d out of range for file '%s' with %d columns!"
+                                            % (_column, file_path, _n_columns))
+            _indices.append(int(_column))
+    return _indices
+
+
+def _parse_lines(lines, n_columns, delimiter, comment, file_path):
+    """parse lines of delimited text into a 2D array with **n_columns** columns, rows with a different number
+    of values are rejected"""
+    with warnings.catch_warnings():
+        # numpy warns if the lines do not contain any data
+        warnings.simplefilter('ignore', UserWarning)
+        try:
+            _data = np.loadtxt(lines, dtype=float, delimiter=delimiter, comments=comment, ndmin=2)
+        except ValueError as _e:
+            raise ColumnReaderException("Cannot parse file '%s': %s" % (file_path, _e))
+    if _data.size == 0:
+        return np.zeros((0, n_columns))
+    if _data.shape[1] != n_columns:
+        raise ColumnReaderException("Cannot parse file '%s': all rows must have %d columns! Found rows "
+                                    "with %d columns." % (file_path, n_columns, _data.shape[1]))
+    return _data
+
+
+def _iter_text_chunks(file_path, columns, chunk_size, delimiter=None, comment='#'):
+    with open(file_path) as _f:
+        # skip leading comments and find the first line containing data or column names
+        _header_comment = None
+        _first_line = None
+        for _line in _f:
+            _stripped = _line.strip()
+            if _stripped.startswith(comment):
+                _header_comment = _stripped[len(comment):]
+            elif _stripped:
+                _first_line = _line
+                break
+        if _first_line is None:
+            raise ColumnReaderException("File '%s' does not contain any data!" % (file_path,))
+
+        _first_line_data = _first_line.split(comment, 1)[0]
+        if delimiter is None and ',' in _first_line_data:
+            delimiter = ','
+        _tokens = [_token.strip() for _token in _first_line_data.split(delimiter)]
+        try:
+            [float(_token) for _token in _tokens]
+        except ValueError:
+            # the first line contains the column names
+            _column_names = _tokens
+            _first_line = ''
+        else:
+            # otherwise, the column names may be given by the last comment line of the file header
+            _column_names = None
+            if _header_comment is not None:
+                _header_tokens = [_token.strip() for _token in _header_comment.split(delimiter)]
+                if len(_header_tokens) == len(_tokens):
+                    _column_names = _header_tokens
+        _n_columns = len(_tokens)
+        _indices = _get_column_indices(columns, _column_names or list(range(_n_columns)), file_path)
+
+        # numpy parses lists of lines faster than file objects, so the whole file is also parsed in blocks
+        _lines = itertools.chain([_first_line] if _first_line else [], _f)
+        _blocks = []
+        while True:
+            _block_lines = list(itertools.islice(_lines, chunk_size or _TEXT_BLOCK_SIZE))
+            if not _block_lines:
+                break
+            _data = _parse_lines(_block_lines, _n_columns, delimiter, comment, file_path)
+            if chunk_size is None:
+                _blocks.append(_data)
+            else:
+                yield [_data[:, _index] for _index in _indices]
+        if chunk_size is None:
+            _data = np.concatenate(_blocks) if _blocks else np.zeros((0, _n_columns))
+            yield [_data[:, _index] for _index in _indices]
+
+
+def _iter_array_chunks(arrays, chunk_size):
+    """iterate over chunks of equally long arrays, only copying the chunks into memory"""
+    _n_rows = len(arrays[0]) if arrays else 0
+    if chunk_size is None:
+        chunk_size = max(_n_rows, 1)
+    for _start in range(0, _n_rows, chunk_size):
+        yield [np.array(_array[_start:_start + chunk_size], dtype=float) for _array in arrays]
+
+
+def _iter_npy_chunks(file_path, columns, chunk_size):
+    _array = np.load(file_path, mmap_mode='r', allow_pickle=False)
+    if _array.dtype.names is not None:
+        _column_names = list(_array.dtype.names)
+        _indices = _get_column_indices(columns, _column_names, file_path)
+        _arrays = [_array[_column_names[_index]] for _index in _indices]
+    elif _array.ndim == 1:
+        _indices = _get_column_indices(columns, [0], file_path)
+        _arrays = [_array for _ in _indices]
+    elif _array.ndim == 2:
+        _indices = _get_column_indices(columns, list(range(_array.shape[1])), file_path)
+        _arrays = [_array[:, _index] for _index in _indices]
+    else:
+        raise ColumnReaderException("Cannot read columns from %d-dimensional array in file '%s'!"
+                                    % (_array.ndim, file_path))
+    for _chunk in _iter_array_chunks(_arrays, chunk_size):
+        yield _chunk
+
+
+def _iter_npz_chunks(file_path, columns, chunk_size):
+    with np.load(file_path, allow_pickle=False) as _npz_file:
+        _column_names = list(_npz_file.files)
+        _indices = _get_column_indices(columns, _column_names, file_path)
+        _arrays = [_npz_file[_column_names[_index]] for _index in _indices]
+    for _chunk in _iter_array_chunks(_arrays, chunk_size):
+        yield _chunk
+
+
+def _iter_hdf5_chunks(file_path, columns, chunk_size):
+    try:
+        import h5py
+    except ImportError:
+        raise ColumnReaderException("Cannot read HDF5 file '%s': h5py is not installed!" % (file_path,))
+    with h5py.File(file_path, 'r') as _hdf5_file:
+        _column_names = [_name for _name in _hdf5_file.keys() if isinstance(_hdf5_file[_name], h5py.Dataset)]
+        _indices = _get_column_indices(columns, _column_names, file_path)
+        # datasets are only read chunk by chunk
+        _datasets = [_hdf5_file[_column_names[_index]] for _index in _indices]
+        for _chunk in _iter_array_chunks(_datasets, chunk_size):
+            yield _chunk
+
+
+def iter_column_chunks(file_path, columns, file_format=None, delimiter=None, chunk_size=None):
+    """
+    Read columns of numbers from a file chunk by chunk. Supported formats are:
+
+    * delimited text (``txt``, ``dat``, ``csv``): the columns are separated by whitespace or by **delimiter**.
+      If the first line containing data has a comma, a comma is used as the delimiter. Comments start with
+      ``#``. Column names are taken from the first line if it does not contain numbers or from the last
+      comment line before the data if it has one entry per column.
+    * ``npy``: a one- or two-dimensional array or a structured array with named fields. The file is
+      memory-mapped, so only the requested chunks are loaded into memory.
+    * ``npz``: an archive of one-dimensional arrays, the array names are the column names.
+    * ``hdf5`` (``h5``): a file with one-dimensional datasets, the dataset names are the column names.
+      Requires *h5py*.
+
+    :param file_path: path of the file
+    :type file_path: str
+    :param columns: column names or zero-based column indices
+    :type columns: list of str or int
+    :param file_format: file format, see above. If ``None``, it is inferred from the file name extension.
+    :type file_format: str or None
+    :param delimiter: column delimiter for text files. If ``None``, detect it automatically.
+    :type delimiter: str or None
+    :param chunk_size: maximum number of rows per chunk. If ``None``, read the whole file at once.
+    :type chunk_size: int or None
+    :return: generator yielding a list with one :py:obj:`numpy.ndarray` per requested column for each chunk
+    """
+    if chunk_size is not None and int(chunk_size) < 1:
+        raise ColumnReaderException("Chunk size must be a positive integer! Got: %r" % (chunk_size,))
+    _format = _get_file_format(file_path, file_format)
+    if _format == 'npy':
+        return _iter_npy_chunks(file_path, columns, chunk_size)
+    if _format == 'npz':
+        return _iter_npz_chunks(file_path, columns, chunk_size)
+    if _format == 'hdf5':
+        return _iter_hdf5_chunks(file_path, columns, chunk_size)
+    return _iter_text_chunks(file_path, columns, chunk_size, delimiter=delimiter)
+
+
+def read_columns(file_path, columns, file_format=None, delimiter=None, chunk_size=None):
+    """
+    Read columns of numbers from a file, see :py:func:`iter_column_chunks` for the supported formats.
+
+    :param file_path: path of the file
+    :type file_path: str
+    :param columns: column names or zero-based column indices
+    :type columns: list of str or int
+    :param file_format: file format. If ``None``, it is inferred from the file name extension.
+    :type file_format: str or None
+    :param delimiter: column delimiter for text files. If ``None``, detect it automatically.
+    :type delimiter: str or None
+    :param chunk_size: number of rows to parse at once. Reading large text files in chunks reduces the
+                       memory needed for parsing. If ``None``, read the whole file at once.
+    :type chunk_size: int or None
+    :return: one one-dimensional :py:obj:`numpy.ndarray` per requested column
+    :rtype: list of numpy.ndarray
+    """
+    _chunks = list(iter_column_chunks(file_path, columns, file_format=file_format, delimiter=delimiter,
+                                      chunk_size=chunk_size))
+    if not _chunks:
+        return [np.zeros(0) for _ in columns]
+    return [np.concatenate([_chunk[_i] for _chunk in _chunks]) for _i in range(len(columns))]
@@ -10,11 +10,31 @@ class SharedCostFunction(CostFunction_Chi2):
     def __init__(self, fallback_on_singular=True):
         self._DATA_NAME = "y_data"
         self._MODEL_NAME = "y_model"
-        self._COV_MAT_INVERSE_NAME = "total_cov_mat_inverse"
+        self._COV_MAT_INVERSE_NAME = "total_cov_mat"
         super(SharedCostFunction, self).__init__(
             errors_to_use="covariance", fallback_on_singular=fallback_on_singular,
             add_constraint_cost=False)
 
+    def chi2_covariance(self, data, model, total_cov_mat):
+        r"""A least-squares cost function for the combined data and model of several fits with shared
+        errors. Instead of the inverse of the combined covariance matrix, the block-diagonal and low-rank
+        parts of the covariance matrix are used to calculate the cost.
+
+        :param data: measurement data :math:`{\bf d}`
+        :param model: model predictions :math:`{\bf m}`
+        :param total_cov_mat: total covariance matrix :math:`{\bf V}`
+        :type total_cov_mat: kafe2.fit.multi.cov_mat.BlockLowRankCovMat
+
+        :return: cost function value
+        """
+        _cost = total_cov_mat.inv_quad(np.asarray(data) - np.asarray(model))
+        if _cost is None:
+            # singular covariance matrix
+            return self._chi2(data=data, model=model)
+        if np.isnan(_cost):
+            _cost = np.inf
+        return _cost
+
 
 class MultiCostFunction(CostFunction):
 
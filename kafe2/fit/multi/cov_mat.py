@@ -0,0 +1,147 @@
+import warnings
+
+import numpy as np
+import scipy.linalg
+
+__all__ = ['BlockLowRankCovMat', 'CachedMatrixFunction', 'low_rank_factor']
+
+
+def low_rank_factor(cov_mat, rtol=1e-12):
+    """Return a matrix :math:`L` with as few columns as possible so that :math:`L L^T` is equal to the
+    positive semi-definite matrix **cov_mat**.
+
+    :param cov_mat: symmetric positive semi-definite matrix
+    :type cov_mat: numpy.ndarray
+    :param rtol: eigenvalues smaller than **rtol** times the largest eigenvalue are treated as zero
+    :type rtol: float
+    :rtype: numpy.ndarray
+    """
+    _eigenvalues, _eigenvectors = np.linalg.eigh(cov_mat)
+    _max_eigenvalue = np.max(_eigenvalues) if len(_eigenvalues) > 0 else 0.0
+    _keep = _eigenvalues > rtol * _max_eigenvalue
+    return _eigenvectors[:, _keep] * np.sqrt(_eigenvalues[_keep])
+
+
+class CachedMatrixFunction(object):
+    """
+    Wrapper for a function of a single matrix. The function is only evaluated again if the values of the
+    matrix have changed since the last call.
+    """
+
+    def __init__(self, func):
+        """
+        :param func: the function to wrap
+        :type func: typing.Callable
+        """
+        self._func = func
+        self._mat = None
+        self._result = None
+
+    def __call__(self, mat):
+        if self._mat is None or not np.array_equal(self._mat, mat):
+            self._result = self._func(mat)
+            self._mat = np.array(mat)
+        return self._result
+
+
+class BlockLowRankCovMat(object):
+    """
+    Covariance matrix consisting of a block-diagonal part and a low-rank part:
+
+    .. math::
+        V = \\mathrm{diag}(A_1, \\ldots, A_m) + U U^T
+
+    The blocks are factorized separately with Cholesky decompositions and quadratic forms with the inverse
+    of :math:`V` are calculated with the Woodbury identity. For a low-rank part with a fixed number of columns
+    the effort scales linearly with the number of blocks instead of cubically with the total size of
+    :math:`V`. If one of the blocks is singular, the Cholesky decomposition of the full matrix is used instead.
+    """
+
+    def __init__(self, blocks, low_rank_factor, block_cholesky_factors=None):
+        """
+        :param blocks: the diagonal blocks :math:`A_i`
+        :type blocks: list of numpy.ndarray
+        :param low_rank_factor: the matrix :math:`U` with one row per row of :math:`V`
+        :type low_rank_factor: numpy.ndarray
+        :param block_cholesky_factors: already calculated lower Cholesky factors of the blocks. Entries that
+            are ``None`` are calculated from the blocks.
+        :type block_cholesky_factors: list of numpy.ndarray or None
+        """
+        self._blocks = blocks
+        self._low_rank_factor = low_rank_factor
+        self._block_edges = np.concatenate([[0], np.cumsum([len(_block) for _block in blocks])]).astype(int)
+        if block_cholesky_factors is None:
+            block_cholesky_factors = [None] * len(blocks)
+        self._block_cholesky_factors = []
+        for _block, _factor in zip(blocks, block_cholesky_factors):
+            if _factor is None:
+                _factor = self.cholesky(_block)
+            if _factor is None:
+                # singular block -> fall back to the Cholesky decomposition of the full matrix
+                self._block_cholesky_factors = None
+                break
+            self._block_cholesky_factors.append(_factor)
+        self._capacitance_cholesky_factor = None
+        self._cholesky_factor = None  # of the full matrix, only calculated if a block is singular
+
+    # -- private methods
+
+    def _solve_blocks(self, rhs):
+        """calculate :math:`A^{-1}` times a vector or matrix **rhs** block by block"""
+        _result = np.empty_like(rhs, dtype=float)
+        for _i, _factor in enumerate(self._block_cholesky_factors):
+            _lower, _upper = self._block_edges[_i], self._block_edges[_i + 1]
+            _result[_lower:_upper] = scipy.linalg.cho_solve((_factor, True), rhs[_lower:_upper])
+        return _result
+
+    def _get_capacitance_cholesky_factor(self):
+        """lower Cholesky factor of :math:`I + U^T A^{-1} U`"""
+        if self._capacitance_cholesky_factor is None:
+            _u = self._low_rank_factor
+            _capacitance = np.eye(_u.shape[1]) + _u.T.dot(self._solve_blocks(_u))
+            self._capacitance_cholesky_factor = np.linalg.cholesky(_capacitance)
+        return self._capacitance_cholesky_factor
+
+    # -- public methods
+
+    @staticmethod
+    def cholesky(mat):
+        """Return the lower Cholesky factor of **mat** or ``None`` if it is not positive definite."""
+        try:
+            return np.linalg.cholesky(mat)
+        except np.linalg.LinAlgError:
+            return None
+
+    @property
+    def mat(self):
+        """the full covariance matrix"""
+        _mat = scipy.linalg.block_diag(*self._blocks) if self._blocks else np.zeros((0, 0))
+        return _mat + self._low_rank_factor.dot(self._low_rank_factor.T)
+
+    def inv_quad(self, vector):
+        """Calculate :math:`r^T V^{-1} r` for a vector :math:`r`.
+
+        :param vector: the vector :math:`r`
+        :type vector: numpy.ndarray
+        :return: the value of the quadratic form or ``None`` if the covariance matrix is singular
+        :rtype: float or None
+        """
+        if self._block_cholesky_factors is None:
+            if self._cholesky_factor is None:
+                self._cholesky_factor = self.cholesky(self.mat)
+                if self._cholesky_factor is None:
+                    warnings.warn("Singular covariance matrix. Are the errors for some data points equal to zero?")
+                    return None
+            _w = scipy.linalg.solve_triangular(self._cholesky_factor, vector, lower=True)
+            return _w.dot(_w)
+        _a_inv_r = self._solve_blocks(vector)
+        _result = vector.dot(_a_inv_r)
+        if self._low_rank_factor.shape[1] > 0:
+            try:
+                _capacitance_factor = self._get_capacitance_cholesky_factor()
+            except np.linalg.LinAlgError:
+                return None
+            _w = scipy.linalg.solve_triangular(
+                _capacitance_factor, self._low_rank_factor.T.dot(_a_inv_r), lower=True)
+            _result -= _w.dot(_w)
+        return _result
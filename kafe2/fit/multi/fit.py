@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 import warnings
 from collections import OrderedDict
@@ -6,15 +7,39 @@ from copy import copy
 import numpy as np
 
 from .cost import SharedCostFunction, MultiCostFunction
+from .cov_mat import BlockLowRankCovMat, CachedMatrixFunction, low_rank_factor
 from .._base import FitBase
 from ...core import NexusFitter
 from ...core.error import SimpleGaussianError, MatrixGaussianError
 from ...core.fitters.nexus import Alias, Function, Array, Parameter
-from ...tools import random_alphanumeric
+from ...tools import random_alphanumeric, thread_pool
 
 __all__ = ['MultiFit']
 
 
+def _get_node_value(node):
+    return node.value
+
+
+class _MultiCostNode(Function):
+    """
+    Function node for the combined cost of a :py:obj:`MultiFit`. If a thread pool map function is set, the
+    stale nodes in :py:attr:`concurrent_nodes` are evaluated concurrently before the cost is calculated.
+    """
+
+    def __init__(self, func, name=None, parameters=None):
+        super(_MultiCostNode, self).__init__(func=func, name=name, parameters=parameters)
+        self.concurrent_nodes = []
+        self.thread_map = None
+
+    def update(self):
+        if self.thread_map is not None:
+            _stale_nodes = [_node for _node in self.concurrent_nodes if _node.stale]
+            if len(_stale_nodes) > 1:
+                self.thread_map(_get_node_value, _stale_nodes)
+        super(_MultiCostNode, self).update()
+
+
 class MultiFit(FitBase):
     """A MultiFit combines several regular fits into a combined fit object.
     Calling do_fit on the MultiFit will result in a numerical minimization of the sum of the cost functions of the
@@ -27,7 +52,7 @@ class MultiFit(FitBase):
 
     def __init__(
             self, fit_list, minimizer=None, minimizer_kwargs=None,
-            dynamic_error_algorithm="nonlinear"):
+            dynamic_error_algorithm="nonlinear", n_threads=1, min_thread_data_size=200):
         """
         :param fit_list: List or Iterable of the individual fits from which to create the MultiFit.
         :type fit_list: collections.Iterable[FitBase]
@@ -36,6 +61,12 @@ class MultiFit(FitBase):
         :type minimizer: str or None
         :param minimizer_kwargs: Dictionary with kwargs for the minimizer.
         :type minimizer_kwargs: dict
+        :param n_threads: Number of threads for evaluating the individual fits concurrently during
+            :py:meth:`do_fit`. If ``None``, use the number of available CPUs.
+        :type n_threads: int or None
+        :param min_thread_data_size: Individual fits with fewer data points are always evaluated in the main
+            thread.
+        :type min_thread_data_size: int
 
         :raises TypeError: If **fit_list** is not iterable.
         """
@@ -44,10 +75,22 @@ class MultiFit(FitBase):
         self._shared_error_dicts = dict()
         self._shared_error_nodes_initialized = False
         self._min_x_error = None
+        self._x_cov_mat_names = []
+        self._derivative_names = []
+        self._n_threads = n_threads
+        self._min_thread_data_size = min_thread_data_size
         super(MultiFit, self).__init__(
             data=None, model_function=None, cost_function=None, minimizer=minimizer,
             minimizer_kwargs=minimizer_kwargs, dynamic_error_algorithm=dynamic_error_algorithm)
 
+    def __getstate__(self):
+        _state = super(MultiFit, self).__getstate__()
+        # the parameter nodes belong to the nexus objects of the individual fits
+        del _state['_combined_parameter_node_dict']
+        # the combined cost function is created together with the nexus
+        _state['_cost_function'] = None
+        return _state
+
     # -- private methods
 
     def _get_model_function_argument_formatters(self):
@@ -76,32 +119,37 @@ class MultiFit(FitBase):
     def _mark_errors_for_update(self):
         pass
 
-    def _get_parameter_indices(self, singular_fit):
-        return [self.parameter_names.index(_parameter_name) for _parameter_name in singular_fit.parameter_names]
+    def _get_input_fingerprint_items(self):
+        _items = []
+        for _i, _fit in enumerate(self._fits):
+            _items.append(('fit%s' % _i, _fit._get_input_fingerprint_items()))
+        _shared_errors = [(_error_dict['reference_name'], _error_dict['err'].fit_indices, _error_item)
+                          for _error_dict, _error_item in zip(
+                              self._shared_error_dicts.values(),
+                              self._get_error_fingerprint_items(self._shared_error_dicts))]
+        _items.append(('shared_errors', _shared_errors))
+        return _items
 
     def _update_parameter_formatters(self, update_asymmetric_errors=False):
         for _fit in self._fits:
             _fit._update_parameter_formatters(update_asymmetric_errors=update_asymmetric_errors)
 
     def _update_singular_fits(self):
-        _parameter_name_value_dict = self.parameter_name_value_dict
-        for _fit in self._fits:
-            _parameter_indices = self._get_parameter_indices(singular_fit=_fit)
-            _asymmetric_parameter_errors = self._fitter.asymmetric_fit_parameter_errors_if_calculated
-            if _asymmetric_parameter_errors is not None:
-                _asymmetric_parameter_errors = _asymmetric_parameter_errors[_parameter_indices]
-            _par_cor_mat = self.parameter_cor_mat
-            if _par_cor_mat is not None:
-                _par_cor_mat = _par_cor_mat[_parameter_indices][:, _parameter_indices]
-            _par_cov_mat = self.parameter_cov_mat
-            if _par_cov_mat is not None:
-                _par_cov_mat = _par_cov_mat[_parameter_indices][:, _parameter_indices]
+        # fetch the combined results once and only slice them for the individual fits
+        _parameter_errors = self.parameter_errors
+        _par_cor_mat = self.parameter_cor_mat
+        _par_cov_mat = self.parameter_cov_mat
+        _asymmetric_parameter_errors = self._fitter.asymmetric_fit_parameter_errors_if_calculated
+        for _fit, _parameter_indices in zip(self._fits, self._fit_parameter_indices):
             _fit._loaded_result_dict = dict(
                 did_fit=self.did_fit,
-                parameter_errors=self.parameter_errors[_parameter_indices],
-                parameter_cor_mat=_par_cor_mat,
-                parameter_cov_mat=_par_cov_mat,
-                asymmetric_parameter_errors=_asymmetric_parameter_errors
+                parameter_errors=_parameter_errors[_parameter_indices],
+                parameter_cor_mat=(_par_cor_mat[np.ix_(_parameter_indices, _parameter_indices)]
+                                   if _par_cor_mat is not None else None),
+                parameter_cov_mat=(_par_cov_mat[np.ix_(_parameter_indices, _parameter_indices)]
+                                   if _par_cov_mat is not None else None),
+                asymmetric_parameter_errors=(_asymmetric_parameter_errors[_parameter_indices]
+                                             if _asymmetric_parameter_errors is not None else None)
             )
         self._update_parameter_formatters()
 
@@ -118,9 +166,14 @@ class MultiFit(FitBase):
                 self._combined_parameter_node_dict[_par_node] = _fit_i._nexus.get(_par_node)
         for _par_node in self._combined_parameter_node_dict.values():
             self._nexus.add(_par_node)
-            for _fit in self._fits:
-                if _par_node.name in _fit.parameter_names:
-                    _fit._nexus.add(node=_par_node, existing_behavior='replace')
+        _combined_parameter_indices = dict(
+            (_par_name, _i) for _i, _par_name in enumerate(self._combined_parameter_node_dict))
+        self._fit_parameter_indices = []  # index arrays of the parameters of each fit in the combined fit
+        for _fit in self._fits:
+            for _par_name in _fit.parameter_names:
+                _fit._nexus.add(node=self._combined_parameter_node_dict[_par_name], existing_behavior='replace')
+            self._fit_parameter_indices.append(np.array(
+                [_combined_parameter_indices[_par_name] for _par_name in _fit.parameter_names], dtype=int))
         self._nexus.add(
             Array(nodes=self._combined_parameter_node_dict.values(), name='parameter_values'),
             existing_behavior="replace"
@@ -149,16 +202,16 @@ class MultiFit(FitBase):
         _cost_names = ['cost%s' % _i for _i in range(len(self._fits))]
         self._cost_function = MultiCostFunction(
             singular_cost_functions=_cost_functions, cost_function_names=_cost_names)
-        _cost_function_node = self._nexus.add_function(
-            func=self._cost_function,
-            func_name=self._cost_function.name,
-            par_names=self._cost_function.arg_names
-        )
+        _cost_function_node = self._add_cost_function_node()
         self._nexus.add_alias(
             name='cost', alias_for=_cost_function_node.name)
 
         self._initialize_fitter()
 
+        if self._shared_error_nodes_initialized:
+            # rebuilding the nexus of an unpickled fit
+            self._init_shared_error_nodes()
+
     def _init_shared_error_nodes(self):
         """
         initializes nexus nodes needed calculating cost with shared errors
@@ -197,8 +250,9 @@ class MultiFit(FitBase):
                     self._nexus.add(
                         Function(func=_get_derivatives_func(_fit_i), name=_derivatives_name),
                         add_children=False)
+                    # only the parameters of this fit move the derivatives
                     self._nexus.add_dependency(
-                        name=_derivatives_name, depends_on='parameter_values')
+                        name=_derivatives_name, depends_on=_fit_i.parameter_names)
                 else:
                     self._nexus.add(Parameter(
                         np.zeros(_fit_i.data_size), name=_derivatives_name))
@@ -233,38 +287,6 @@ class MultiFit(FitBase):
                 _combined_property[_lower:_upper] = _single_fit_property
             return _combined_property
 
-        # Combines cov mats of single fits.
-        # Shared errors are not added to the main diagonal blocks because they have already been
-        # added to the individual fits.
-        def _combine_cov_mats(axis_name, *single_fit_properties):
-            _combined_property = np.zeros(shape=(_data_indices[-1], _data_indices[-1]))
-            for _j, _single_fit_property in enumerate(single_fit_properties):
-                _lower = _data_indices[_j]
-                _upper = _data_indices[_j + 1]
-                _combined_property[_lower:_upper, _lower:_upper] = _single_fit_property
-            for _error_dict in self._shared_error_dicts.values():
-                if _error_dict['axis'] != axis_name:
-                    continue
-                _error = _error_dict['err']
-                for _j, _fit_index_j in enumerate(_error.fit_indices):
-                    _data_index_j = _fit_index_to_data_index[_fit_index_j]
-                    _lower_j = _data_indices[_data_index_j]
-                    _upper_j = _data_indices[_data_index_j + 1]
-                    for _k in range(_j):
-                        _data_index_k = _fit_index_to_data_index[_error.fit_indices[_k]]
-                        _lower_k = _data_indices[_data_index_k]
-                        _upper_k = _data_indices[_data_index_k + 1]
-                        _combined_property[_lower_j:_upper_j, _lower_k:_upper_k] += _error.cov_mat
-                        _combined_property[_lower_k:_upper_k, _lower_j:_upper_j] += _error.cov_mat
-            return _combined_property
-
-        self._nexus.add_function(
-            func=lambda *p: _combine_cov_mats('x', *p),
-            func_name='x_cov_mat', par_names=_x_cov_mat_names, add_children=False)
-        self._nexus.add_function(
-            func=_combine_1d_property, func_name='derivatives', par_names=_derivative_names,
-            add_children=False)
-
         self._nexus.add_function(
             func=_combine_1d_property, func_name='y_data',
             par_names=_y_data_names, add_children=False)
@@ -273,18 +295,109 @@ class MultiFit(FitBase):
             func=_combine_1d_property, func_name='y_model',
             par_names=_y_model_names, add_children=False)
         self._nexus.add_alias(name='model', alias_for='y_model')
+
+        # The combined covariance matrix consists of the covariance matrices of the individual fits on the
+        # diagonal and of the shared errors coupling different fits. It is represented as a block-diagonal
+        # matrix without the shared errors plus a low-rank matrix containing the shared errors of all fits
+        # (including the diagonal blocks) so that the effort scales linearly with the number of fits.
+        # The low-rank factors and the Cholesky factors of the blocks are only recalculated if the
+        # corresponding matrices change, not every time the nodes are marked for an update.
+        _low_rank_factor_functions = dict()
+
+        def _shared_error_factors(*single_fit_cov_mats):
+            _factors = []
+            for _name, _error_dict in self._shared_error_dicts.items():
+                _error = _error_dict['err']
+                _targets = [self._fits[_fit_index].data_container if _error_dict['reference_name'] == 'data'
+                            else self._fits[_fit_index]._param_model for _fit_index in _error.fit_indices]
+                if not all(_target._error_dicts[_name]['enabled'] for _target in _targets):
+                    continue
+                _cov_mat = _error.cov_mat
+                _data_index_list = [_fit_index_to_data_index[_fit_index] for _fit_index in _error.fit_indices]
+                if _name not in _low_rank_factor_functions:
+                    _low_rank_factor_functions[_name] = CachedMatrixFunction(low_rank_factor)
+                _factors.append((_error_dict['axis'], _data_index_list, _cov_mat,
+                                 _low_rank_factor_functions[_name](_cov_mat)))
+            return _factors
+
         self._nexus.add_function(
-            func=lambda *p: _combine_cov_mats('y', *p),
-            func_name='y_cov_mat', par_names=_y_cov_mat_names, add_children=False)
+            func=_shared_error_factors, func_name='shared_error_factors',
+            par_names=_x_cov_mat_names + _y_cov_mat_names, add_children=False)
+
+        # The blocks without shared errors only change if the errors of the individual fits change.
+        def _get_cov_block_func(data_index):
+            def _cov_block(x_cov_mat, y_cov_mat, shared_error_factors):
+                _x_block = np.array(x_cov_mat, dtype=float)
+                _y_block = np.array(y_cov_mat, dtype=float)
+                for _axis, _data_index_list, _cov_mat, _ in shared_error_factors:
+                    if data_index in _data_index_list:
+                        if _axis == 'x':
+                            _x_block -= _cov_mat
+                        else:
+                            _y_block -= _cov_mat
+                return _x_block, _y_block
+            return _cov_block
+
+        def _get_cov_block_cholesky_func():
+            _cholesky = CachedMatrixFunction(BlockLowRankCovMat.cholesky)
+            return lambda cov_block: _cholesky(cov_block[1])
+
+        _cov_block_names = []
+        _cov_block_cholesky_names = []
+        for _data_index, (_x_cov_mat_name, _y_cov_mat_name) in enumerate(zip(_x_cov_mat_names, _y_cov_mat_names)):
+            _cov_block_name = 'cov_block%s' % _data_index
+            self._nexus.add_function(
+                func=_get_cov_block_func(_data_index), func_name=_cov_block_name,
+                par_names=[_x_cov_mat_name, _y_cov_mat_name, 'shared_error_factors'], add_children=False)
+            _cov_block_names.append(_cov_block_name)
+            _cov_block_cholesky_name = 'cov_block_cholesky%s' % _data_index
+            self._nexus.add_function(
+                func=_get_cov_block_cholesky_func(), func_name=_cov_block_cholesky_name,
+                par_names=[_cov_block_name], add_children=False)
+            _cov_block_cholesky_names.append(_cov_block_cholesky_name)
+
+        # Only the blocks with x errors and the shared x errors depend on the model derivatives.
+        _n_blocks = len(_cov_block_names)
+
+        def total_cov_mat(*args):
+            _cov_blocks = args[:_n_blocks]
+            _cov_block_cholesky_factors = list(args[_n_blocks:2 * _n_blocks])
+            _derivatives = args[2 * _n_blocks:3 * _n_blocks]
+            _shared_error_factors = args[-1]
+            _x_errors_used = self._min_x_error is not None
+
+            _blocks = []
+            for _j, (_x_block, _y_block) in enumerate(_cov_blocks):
+                if _x_errors_used and np.any(_x_block != 0):
+                    _blocks.append(_y_block + _x_block * np.outer(_derivatives[_j], _derivatives[_j]))
+                    _cov_block_cholesky_factors[_j] = None
+                else:
+                    _blocks.append(_y_block)
 
-        def total_cov_mat_inverse(x_cov_mat, derivatives, y_cov_mat):
-            if self._min_x_error is not None:
-                _cov_mat = y_cov_mat + x_cov_mat * np.outer(derivatives, derivatives)
-            else:
-                _cov_mat = y_cov_mat
-            return np.linalg.inv(_cov_mat)
+            _low_rank_columns = []
+            for _axis, _data_index_list, _, _factor in _shared_error_factors:
+                if _axis == 'x' and not _x_errors_used:
+                    continue
+                _columns = np.zeros((_data_indices[-1], _factor.shape[1]))
+                for _data_index in _data_index_list:
+                    _lower = _data_indices[_data_index]
+                    _upper = _data_indices[_data_index + 1]
+                    if _axis == 'x':
+                        _columns[_lower:_upper] = _derivatives[_data_index][:, np.newaxis] * _factor
+                    else:
+                        _columns[_lower:_upper] = _factor
+                _low_rank_columns.append(_columns)
+            _low_rank_factor = np.hstack([np.zeros((_data_indices[-1], 0))] + _low_rank_columns)
+            return BlockLowRankCovMat(
+                _blocks, _low_rank_factor, block_cholesky_factors=_cov_block_cholesky_factors)
+
+        self._nexus.add_function(
+            func=total_cov_mat,
+            par_names=_cov_block_names + _cov_block_cholesky_names + _derivative_names + ['shared_error_factors'],
+            add_children=False)
+        self._x_cov_mat_names = _x_cov_mat_names
+        self._derivative_names = _derivative_names
 
-        self._nexus.add_function(total_cov_mat_inverse)
         _shared_cost_function = SharedCostFunction()
         self._nexus.add_function(
             func=_shared_cost_function, func_name=_shared_cost_function.name,
@@ -294,14 +407,31 @@ class MultiFit(FitBase):
         _cost_names.append(_shared_cost_function.name)
         self._cost_function = MultiCostFunction(
             singular_cost_functions=_cost_functions, cost_function_names=_cost_names)
-        self._nexus.add_function(
-            func=self._cost_function,
-            func_name=self._cost_function.name,
-            par_names=self._cost_function.arg_names,
-            existing_behavior='replace'
-        )
+        self._add_cost_function_node(existing_behavior='replace')
         self._initialize_fitter()
 
+    def _add_cost_function_node(self, existing_behavior='fail'):
+        _parameters = [self._nexus.get(_par_name) for _par_name in self._cost_function.arg_names]
+        return self._nexus.add(
+            _MultiCostNode(func=self._cost_function, name=self._cost_function.name, parameters=_parameters),
+            add_children=False, existing_behavior=existing_behavior)
+
+    def _get_concurrent_nodes(self):
+        """the nodes of the individual fits which can be evaluated in separate threads"""
+        _nodes = []
+        for _fit in self._fits:
+            if _fit.data_size < self._min_thread_data_size:
+                continue
+            if self._shared_error_nodes_initialized and _fit._cost_function.is_chi2:
+                # the cost is calculated from the combined data -> evaluate the model only
+                _node = _fit._nexus.get('y_model')
+            else:
+                _node = _fit._nexus.get(_fit._cost_function.name)
+            while isinstance(_node, Alias):
+                _node = _node.ref
+            _nodes.append(_node)
+        return _nodes
+
     def _initialize_fitter(self):
         self._fitter = NexusFitter(
             nexus=self._nexus, parameters_to_fit=list(self._combined_parameter_node_dict.keys()),
@@ -401,9 +531,15 @@ class MultiFit(FitBase):
         for _fit in self._fits:
             _fit._on_error_change()
 
-        _x_errors = np.sqrt(np.diag(self._nexus.get("x_cov_mat").value))
+        _x_errors = np.sqrt(np.concatenate(
+            [np.zeros(0)] + [np.diag(self._nexus.get(_name).value) for _name in self._x_cov_mat_names]))
         _non_zero_x_errors = _x_errors[_x_errors > 0.0]
-        self._min_x_error = None if len(_non_zero_x_errors) == 0 else np.min(_non_zero_x_errors)
+        _min_x_error = None if len(_non_zero_x_errors) == 0 else np.min(_non_zero_x_errors)
+        if _min_x_error != self._min_x_error:
+            # the step size for the derivatives has changed
+            self._min_x_error = _min_x_error
+            for _name in self._derivative_names:
+                self._nexus.get(_name).mark_for_update()
 
     def _set_new_data(self, new_data):
         raise NotImplementedError()
@@ -510,6 +646,25 @@ class MultiFit(FitBase):
         """List of individual fits on which the MultiFit is based on."""
         return copy(self._fits)  # shallow copy
 
+    @property
+    def n_threads(self):
+        """Number of threads for evaluating the individual fits concurrently during :py:meth:`do_fit`.
+        If ``None``, the number of available CPUs is used."""
+        return self._n_threads
+
+    @n_threads.setter
+    def n_threads(self, n_threads):
+        self._n_threads = n_threads
+
+    @property
+    def min_thread_data_size(self):
+        """Individual fits with fewer data points are always evaluated in the main thread."""
+        return self._min_thread_data_size
+
+    @min_thread_data_size.setter
+    def min_thread_data_size(self, min_thread_data_size):
+        self._min_thread_data_size = min_thread_data_size
+
     @property
     def asymmetric_parameter_errors(self):
         """The current asymmetric parameter uncertainties."""
@@ -706,9 +861,25 @@ class MultiFit(FitBase):
                 continue  # skip if sub fit is not dependent on the given par
             fit.release_parameter(name)
 
-    def do_fit(self, asymmetric_parameter_errors=False):
-        _fit_result = super(MultiFit, self).do_fit(
-            asymmetric_parameter_errors=asymmetric_parameter_errors)
+    def update_data(self, *args, **kwargs):
+        raise NotImplementedError("Use update_data for individual fits instead.")
+
+    def clone(self, share_errors=True):
+        raise NotImplementedError("Clone the individual fits and combine them in a new MultiFit instead.")
+
+    def do_fit(self, asymmetric_parameter_errors=False, cache=None):
+        _cost_node = self._nexus.get(self._cost_function.name)
+        _cost_node.concurrent_nodes = self._get_concurrent_nodes()
+        _n_threads = self._n_threads if self._n_threads is not None else multiprocessing.cpu_count()
+        _n_threads = min(_n_threads, len(_cost_node.concurrent_nodes))
+        with thread_pool(n_threads=_n_threads) as _thread_map:
+            if _n_threads > 1:
+                _cost_node.thread_map = _thread_map
+            try:
+                _fit_result = super(MultiFit, self).do_fit(
+                    asymmetric_parameter_errors=asymmetric_parameter_errors, cache=cache)
+            finally:
+                _cost_node.thread_map = None
         self._update_singular_fits()
         return _fit_result
 
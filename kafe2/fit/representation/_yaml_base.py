@@ -1,7 +1,157 @@
+import base64
+import io
+import os
+import warnings
+
+import numpy as np
+import six
 import yaml
 
+from ...config import kc
+from ..io.handle import IOFileHandle
 from ._base import DReprReaderMixin, DReprWriterMixin
 
+# use the libyaml-based parser and emitter if available
+_SafeLoaderBase = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_SafeDumperBase = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+_LegacyLoaderBase = getattr(yaml, 'CLoader', yaml.Loader)
+
+_BASE64_LINE_LENGTH = 76
+
+# Python-specific tags which may be constructed by the legacy loader: files written by earlier versions of
+# kafe2 contain numpy arrays and scalars in this form
+_PYTHON_TAG_PREFIX = 'tag:yaml.org,2002:python/'
+_ALLOWED_LEGACY_PYTHON_TAGS = {
+    _PYTHON_TAG_PREFIX + _tag for _tag in (
+        'tuple',
+        'name:numpy.ndarray',
+        'name:numpy.matrix',
+        'object/apply:numpy.dtype',
+        'object/apply:numpy.core.multiarray._reconstruct',
+        'object/apply:numpy.core.multiarray.scalar',
+        'object/apply:numpy._core.multiarray._reconstruct',
+        'object/apply:numpy._core.multiarray.scalar',
+    )
+}
+
+
+def _construct_ndarray(loader, node):
+    """construct an array from a base64-encoded ``.npy`` block"""
+    _npy_bytes = base64.b64decode(loader.construct_scalar(node).encode('ascii'))
+    return np.load(io.BytesIO(_npy_bytes), allow_pickle=False)
+
+
+def _construct_npy(loader, node):
+    """construct an array from a ``.npy`` file, relative paths are relative to the directory of the yaml file"""
+    _path = os.path.join(loader._current_dir, loader.construct_scalar(node))
+    return np.load(_path, allow_pickle=False)
+
+
+def _get_stream_dir(stream):
+    """directory of the file underlying a stream, used to resolve relative paths of ``.npy`` files"""
+    _name = getattr(stream, 'name', None)
+    return os.path.dirname(_name) if isinstance(_name, six.string_types) else ''
+
+
+class YamlLoader(_SafeLoaderBase):
+    """
+    Safe yaml loader which also constructs numpy arrays stored in binary form, either inline as
+    base64-encoded ``.npy`` blocks (tag ``!ndarray``) or in separate ``.npy`` files (tag ``!npy``).
+    """
+
+    def __init__(self, stream):
+        self._current_dir = _get_stream_dir(stream)
+        super(YamlLoader, self).__init__(stream)
+
+
+class LegacyYamlLoader(_LegacyLoaderBase):
+    """
+    Unsafe yaml loader for files containing Python-specific tags, e.g. numpy arrays written by earlier
+    versions of *kafe2*.
+    """
+
+    def __init__(self, stream):
+        self._current_dir = _get_stream_dir(stream)
+        super(LegacyYamlLoader, self).__init__(stream)
+
+
+for _loader_class in (YamlLoader, LegacyYamlLoader):
+    _loader_class.add_constructor('!ndarray', _construct_ndarray)
+    _loader_class.add_constructor('!npy', _construct_npy)
+
+
+def _is_seekable(stream):
+    try:
+        return stream.seekable()
+    except AttributeError:  # Python 2 file objects
+        return hasattr(stream, 'seek')
+
+
+def _load_yaml(stream, loader_class, current_dir):
+    """load a single yaml document, relative paths of ``.npy`` files are relative to **current_dir**"""
+    _loader = loader_class(stream)
+    _loader._current_dir = current_dir
+    try:
+        return _loader.get_single_data()
+    finally:
+        _loader.dispose()
+
+
+def _get_python_tags(content, loader_class):
+    """return the Python-specific tags used in a yaml document without constructing any objects"""
+    _python_tags = set()
+    _nodes = [yaml.compose(content, loader_class)]
+    _visited_ids = set()
+    while _nodes:
+        _node = _nodes.pop()
+        if _node is None or id(_node) in _visited_ids:
+            continue
+        _visited_ids.add(id(_node))
+        if _node.tag.startswith(_PYTHON_TAG_PREFIX):
+            _python_tags.add(_node.tag)
+        if isinstance(_node, yaml.SequenceNode):
+            _nodes.extend(_node.value)
+        elif isinstance(_node, yaml.MappingNode):
+            for _key_node, _value_node in _node.value:
+                _nodes.extend((_key_node, _value_node))
+    return _python_tags
+
+
+class YamlDumper(_SafeDumperBase):
+    """
+    Safe yaml dumper which also represents numpy arrays and scalars. Arrays with at least
+    :py:attr:`binary_array_min_size` entries are stored in binary form: if :py:attr:`sidecar_path_prefix` is
+    set, they are written to separate ``.npy`` files, otherwise they are embedded as base64-encoded ``.npy``
+    blocks. Smaller arrays are written as (nested) lists.
+    """
+    binary_array_min_size = None  # never store arrays in binary form
+    sidecar_path_prefix = None  # embed binary arrays in the yaml file
+    _n_sidecar_files = 0
+
+    def represent_ndarray(self, array):
+        if (self.binary_array_min_size is None or array.size < self.binary_array_min_size
+                or array.dtype.hasobject):
+            return self.represent_data(array.tolist())
+        _array = np.ascontiguousarray(array)  # also converts numpy.matrix and memmap objects
+        if self.sidecar_path_prefix is None:
+            _buffer = io.BytesIO()
+            np.save(_buffer, _array, allow_pickle=False)
+            _base64 = base64.b64encode(_buffer.getvalue()).decode('ascii')
+            _lines = [_base64[_i:_i + _BASE64_LINE_LENGTH] for _i in range(0, len(_base64), _BASE64_LINE_LENGTH)]
+            return self.represent_scalar('!ndarray', '\n'.join(_lines) + '\n', style='|')
+        _path = '{}.{}.npy'.format(self.sidecar_path_prefix, self._n_sidecar_files)
+        self._n_sidecar_files += 1
+        np.save(_path, _array, allow_pickle=False)
+        return self.represent_scalar('!npy', os.path.basename(_path))
+
+    def represent_numpy_scalar(self, value):
+        return self.represent_data(value.item())
+
+
+YamlDumper.add_representer(tuple, YamlDumper.represent_list)
+YamlDumper.add_multi_representer(np.ndarray, YamlDumper.represent_ndarray)
+YamlDumper.add_multi_representer(np.generic, YamlDumper.represent_numpy_scalar)
+
 
 class YamlWriterException(Exception):
     pass
@@ -9,7 +159,7 @@ class YamlWriterException(Exception):
 
 class YamlWriterMixin(DReprWriterMixin):
     DREPR_FLAVOR_NAME = 'yaml'
-    DUMPER = yaml.Dumper
+    DUMPER = YamlDumper
 
     """
     A "mixin" class for creating a *yaml* representation writer.
@@ -31,7 +181,17 @@ class YamlWriterMixin(DReprWriterMixin):
                 # if truncate not available, ignore
                 pass
             _h.write(self._get_preface_comment())
-            yaml.dump(self._yaml_doc, _h, default_flow_style=False, sort_keys=False)
+            _dumper = self.DUMPER(_h, default_flow_style=False, sort_keys=False)
+            _dumper.binary_array_min_size = kc('fit', 'representation', 'yaml', 'binary_array_min_size')
+            if (kc('fit', 'representation', 'yaml', 'binary_array_storage') == 'sidecar'
+                    and isinstance(self._ohandle, IOFileHandle)):
+                _dumper.sidecar_path_prefix = os.path.splitext(self._ohandle.filename)[0]
+            try:
+                _dumper.open()
+                _dumper.represent(self._yaml_doc)
+                _dumper.close()
+            finally:
+                _dumper.dispose()
 
 
 class YamlReaderException(Exception):
@@ -40,7 +200,8 @@ class YamlReaderException(Exception):
 
 class YamlReaderMixin(DReprReaderMixin):
     DREPR_FLAVOR_NAME = 'yaml'
-    LOADER = yaml.Loader  # TODO SafeLoader
+    LOADER = YamlLoader
+    LEGACY_LOADER = LegacyYamlLoader
     """
     A "mixin" class for creating a *yaml* representation writer.
     Inheriting from this class in addition to a DRepr class for
@@ -140,5 +301,22 @@ class YamlReaderMixin(DReprReaderMixin):
 
     def read(self):
         with self._ihandle as _h:
-            self._yaml_doc = yaml.load(_h, self.LOADER)
+            _current_dir = _get_stream_dir(_h)
+            _seekable = _is_seekable(_h)
+            # a stream which cannot be rewound is only read once
+            _stream = _h if _seekable else _h.read()
+            try:
+                self._yaml_doc = _load_yaml(_stream, self.LOADER, _current_dir)
+            except yaml.constructor.ConstructorError:
+                # files written by earlier versions may contain Python-specific tags for numpy arrays,
+                # only these are constructed by the (unsafe) legacy loader
+                if _seekable:
+                    _h.seek(0)
+                    _stream = _h.read()
+                _python_tags = _get_python_tags(_stream, self.LOADER)
+                if not _python_tags or not _python_tags <= _ALLOWED_LEGACY_PYTHON_TAGS:
+                    raise
+                warnings.warn("Reading numpy arrays stored as Python objects is deprecated. Write the file "
+                              "again to store the arrays in a safe format.", DeprecationWarning)
+                self._yaml_doc = _load_yaml(_stream, self.LEGACY_LOADER, _current_dir)
         return self._make_object(self._yaml_doc)
@@ -1,18 +1,19 @@
 import numpy as np
 import re
-import yaml
+import six
 
 from ....core.error import SimpleGaussianError, MatrixGaussianError
 from ....fit import HistContainer, IndexedContainer, XYContainer, UnbinnedContainer
 from .. import _AVAILABLE_REPRESENTATIONS
 from ._base import DataContainerDReprBase
 from .._base import DReprError
-from .._yaml_base import YamlWriterMixin, YamlReaderMixin, YamlReaderException, YamlWriterException
+from .._yaml_base import YamlWriterMixin, YamlReaderMixin, YamlReaderException, YamlWriterException, \
+    YamlLoader, LegacyYamlLoader, YamlDumper
 
 __all__ = ["DataContainerYamlReader", "DataContainerYamlWriter"]
 
 
-class _DataContainerYamlLoader(yaml.Loader):
+class _DataContainerYamlLoader(YamlLoader):
 
     # custom directives for reading in matrices
 
@@ -42,11 +43,17 @@ class _DataContainerYamlLoader(yaml.Loader):
         return _np_mat
 
 
-_DataContainerYamlLoader.add_constructor('!matrix', _DataContainerYamlLoader.matrix)
-_DataContainerYamlLoader.add_constructor('!symmetric_matrix', _DataContainerYamlLoader.symmetric_matrix)
+class _DataContainerLegacyYamlLoader(LegacyYamlLoader):
+    pass
 
 
-class _DataContainerYamlDumper(yaml.Dumper):
+for _loader_class in (_DataContainerYamlLoader, _DataContainerLegacyYamlLoader):
+    _loader_class.add_constructor('!matrix', six.get_unbound_function(_DataContainerYamlLoader.matrix))
+    _loader_class.add_constructor('!symmetric_matrix',
+                                  six.get_unbound_function(_DataContainerYamlLoader.symmetric_matrix))
+
+
+class _DataContainerYamlDumper(YamlDumper):
 
     # custom directives for writing out matrices
 
@@ -115,7 +122,7 @@ class DataContainerYamlWriter(YamlWriterMixin, DataContainerDReprBase):
             if np.allclose(_err_val[0], _err_val):
                 _err_val = float(_err_val[0])
             else:
-                _err_val = _err_val.tolist()
+                _err_val = np.array(_err_val, dtype=float)
 
             # -- handle different error types
             #TODO shouldn't each error be wrapped inside an 'error' namespace?
@@ -137,11 +144,11 @@ class DataContainerYamlWriter(YamlWriterMixin, DataContainerDReprBase):
                 ))
                 if _mtype == 'covariance':
                     if _is_relative:
-                        _yaml_section[-1]['matrix'] = _err_obj.cov_mat_rel #.tolist()
+                        _yaml_section[-1]['matrix'] = np.array(_err_obj.cov_mat_rel, dtype=float)
                     else:
-                        _yaml_section[-1]['matrix'] = _err_obj.cov_mat #.tolist()
+                        _yaml_section[-1]['matrix'] = np.array(_err_obj.cov_mat, dtype=float)
                 elif _mtype == 'correlation':
-                    _yaml_section[-1]['matrix'] = _err_obj.cor_mat #.tolist()
+                    _yaml_section[-1]['matrix'] = np.array(_err_obj.cor_mat, dtype=float)
                     _yaml_section[-1]['error_value'] = _err_val
                 else:
                     raise DReprError("Unknown error matrix type '{}'. Valid: 'correlation' or 'covariance'.")
@@ -167,18 +174,18 @@ class DataContainerYamlWriter(YamlWriterMixin, DataContainerDReprBase):
 
         # -- write representation for container types
         if _class is HistContainer:
-            _yaml_doc['bin_edges'] = list(map(float, container.bin_edges))
+            _yaml_doc['bin_edges'] = np.array(container.bin_edges, dtype=float)
             if container._manual_heights:
-                _yaml_doc['bin_heights'] = list(map(float, container.data))  # float64 -> float
+                _yaml_doc['bin_heights'] = np.array(container.data, dtype=float)
                 _yaml_doc['underflow'] = float(container.underflow)
                 _yaml_doc['overflow'] = float(container.underflow)
             else:
-                _yaml_doc['raw_data'] = list(map(float, container.raw_data))  # float64 -> float
+                _yaml_doc['raw_data'] = np.array(container.raw_data, dtype=float)
         elif _class is IndexedContainer or _class is UnbinnedContainer:
-            _yaml_doc['data'] = container.data.tolist()
+            _yaml_doc['data'] = np.array(container.data, dtype=float)
         elif _class is XYContainer:
-            _yaml_doc['x_data'] = container.x.tolist()
-            _yaml_doc['y_data'] = container.y.tolist()
+            _yaml_doc['x_data'] = np.array(container.x, dtype=float)
+            _yaml_doc['y_data'] = np.array(container.y, dtype=float)
         else:
             raise DReprError("Container type unknown or not supported: {}".format(_type))
 
@@ -200,6 +207,7 @@ class DataContainerYamlWriter(YamlWriterMixin, DataContainerDReprBase):
 
 class DataContainerYamlReader(YamlReaderMixin, DataContainerDReprBase):
     LOADER = _DataContainerYamlLoader
+    LEGACY_LOADER = _DataContainerLegacyYamlLoader
 
     def __init__(self, input_io_handle):
         super(DataContainerYamlReader, self).__init__(input_io_handle=input_io_handle,
@@ -237,22 +245,22 @@ class DataContainerYamlReader(YamlReaderMixin, DataContainerDReprBase):
             _bin_edges = yaml_doc.pop('bin_edges', None)
             _n_bins = yaml_doc.pop('n_bins', None)
             _bin_range = yaml_doc.pop('bin_range', None)
-            if not _bin_edges and not (_n_bins and _bin_range):
+            if _bin_edges is None and not (_n_bins and _bin_range):
                 raise YamlReaderException("When reading in a histogram dataset either "
                                           "bin_edges or n_bins and bin_range has to be specified!")
-            if _bin_edges:
+            if _bin_edges is not None:
                 _n_bins = len(_bin_edges) - 1
                 _bin_range = (_bin_edges[0], _bin_edges[-1])
             _raw_data = yaml_doc.pop('raw_data', None)
             _bin_heights = yaml_doc.pop('bin_heights', None)
-            if _raw_data and _bin_heights:
+            if _raw_data is not None and _bin_heights is not None:
                 raise YamlReaderException("When reading in a histogram dataset only one out of "
                                           "raw_data and bin_heights can be specified!")
             _container_obj = HistContainer(n_bins=_n_bins,
                                            bin_range=_bin_range,
                                            bin_edges=_bin_edges,
                                            fill_data=_raw_data)
-            if _bin_heights:
+            if _bin_heights is not None:
                 _underflow = yaml_doc.pop('underflow', 0)
                 _overflow = yaml_doc.pop('overflow', 0)
                 _container_obj.set_bins(
@@ -100,7 +100,8 @@ class FitYamlWriter(YamlWriterMixin, FitDReprBase):
                 float(_fit_results['parameter_errors'][_pn]) for _pn in fit.parameter_names]
             _fit_results['parameter_cor_mat'] = _fit_results['parameter_cor_mat'].tolist()
         if _fit_results['asymmetric_parameter_errors'] is not None:
-            _fit_results['asymmetric_parameter_errors'] = _fit_results['asymmetric_parameter_errors'].tolist()
+            _fit_results['asymmetric_parameter_errors'] = [
+                list(map(float, _fit_results['asymmetric_parameter_errors'][_pn])) for _pn in fit.parameter_names]
         _yaml_doc['fit_results'] = _fit_results
         return _yaml_doc
 
@@ -1,6 +1,10 @@
+import hashlib
 import textwrap
+import threading
 import tokenize
 
+from collections import OrderedDict
+
 import numpy as np
 import six
 
@@ -22,8 +26,35 @@ KNOWN_PARAMETRIC_MODELS = (XYParametricModel, HistParametricModel, IndexedParame
                            UnbinnedParametricModel)
 
 
+# process-wide cache of parsed functions, maps a hash of the source code to the function object
+_PARSED_FUNCTION_CACHE = OrderedDict()
+_PARSED_FUNCTION_CACHE_MAX_SIZE = 1024
+_PARSED_FUNCTION_CACHE_LOCK = threading.Lock()
+
+
 def _parse_function(input_string):
-    """converts a string of python code into a python function object"""
+    """converts a string of python code into a python function object
+
+    Functions are only parsed once per process: parsing the same code again returns the cached function.
+    """
+    _hash = hashlib.sha256(input_string.encode('utf-8'))
+    _hash.update(repr(sorted(ModelFunctionYamlReader.FORBIDDEN_TOKENS)).encode('utf-8'))
+    _key = _hash.hexdigest()
+    with _PARSED_FUNCTION_CACHE_LOCK:
+        _function = _PARSED_FUNCTION_CACHE.get(_key, None)
+    if _function is not None:
+        return _function
+
+    _function = _parse_function_uncached(input_string)
+    with _PARSED_FUNCTION_CACHE_LOCK:
+        if len(_PARSED_FUNCTION_CACHE) >= _PARSED_FUNCTION_CACHE_MAX_SIZE:
+            _PARSED_FUNCTION_CACHE.popitem(last=False)  # discard the oldest entry
+        _PARSED_FUNCTION_CACHE[_key] = _function
+    return _function
+
+
+def _parse_function_uncached(input_string):
+    """converts a string of python code into a python function object without using the cache"""
     _tokens = tokenize.generate_tokens(six.StringIO(input_string).readline)
     for _toknum, _tokval, _spos, _epos, _line_string in _tokens:
         if _tokval in ModelFunctionYamlReader.FORBIDDEN_TOKENS:
@@ -194,23 +225,23 @@ class ParametricModelYamlWriter(YamlWriterMixin, ParametricModelDReprBase):
             _yaml_doc['bin_range'] = list(map(float, parametric_model.bin_range))
             _yaml_doc['model_density_function'] = ModelFunctionYamlWriter._make_representation(
                 parametric_model._model_function_object)
-            _yaml_doc['bin_edges'] = list(map(float, parametric_model.bin_edges))
+            _yaml_doc['bin_edges'] = np.array(parametric_model.bin_edges, dtype=float)
             if isinstance(parametric_model.bin_evaluation, str):
                 _yaml_doc['bin_evaluation'] = parametric_model.bin_evaluation_string
             else:
                 _yaml_doc['bin_evaluation'] = _process_function_code_for_dump(
                     parametric_model.bin_evaluation_string)
         elif _class is IndexedParametricModel:
-            _yaml_doc['shape_like'] = parametric_model.data.tolist()
+            _yaml_doc['shape_like'] = np.array(parametric_model.data, dtype=float)
             _yaml_doc['model_function'] = ModelFunctionYamlWriter._make_representation(
                 parametric_model._model_function_object)
         elif _class is UnbinnedParametricModel:
-            _yaml_doc['data'] = parametric_model.support.tolist()
+            _yaml_doc['data'] = np.array(parametric_model.support, dtype=float)
             _yaml_doc['model_function'] = ModelFunctionYamlWriter._make_representation(
                 parametric_model._model_function_object)
         elif _class is XYParametricModel:
-            _yaml_doc['x_data'] = parametric_model.x.tolist()
-            _yaml_doc['y_data'] = parametric_model.y.tolist()
+            _yaml_doc['x_data'] = np.array(parametric_model.x, dtype=float)
+            _yaml_doc['y_data'] = np.array(parametric_model.y, dtype=float)
             _yaml_doc['model_function'] = ModelFunctionYamlWriter._make_representation(
                 parametric_model._model_function_object)
         else:
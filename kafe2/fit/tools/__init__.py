@@ -1,4 +1,6 @@
 #TODO documentation
 
+from .batch import *
+from .cache import *
 from .contours_profiler import *
 from .ensemble import *
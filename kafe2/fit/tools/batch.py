@@ -0,0 +1,142 @@
+import multiprocessing
+
+import numpy as np
+import six
+
+from ...tools import worker_pool
+
+__all__ = ["FitBatch", "FitBatchException"]
+
+
+class FitBatchException(Exception):
+    pass
+
+
+def _fit_datasets(batch, datasets):
+    """worker function: fit a chunk of datasets using one copy of the template fit"""
+    return batch._fit_datasets(datasets)
+
+
+class FitBatch(object):
+    """
+    Object for fitting the same model with the same uncertainty model to many independent datasets.
+
+    A single copy of the configured template fit is made for each chunk of datasets. The data of this copy
+    is replaced in place for each dataset, so no new fit objects are constructed and cached quantities that
+    do not depend on the data (e.g. the inverse of an absolute covariance matrix) are only calculated once
+    per chunk. Each fit starts from the parameter values found for the previous dataset in the chunk. The
+    chunks can be distributed across worker processes.
+
+    The results are returned as a structured :py:obj:`numpy.ndarray` with one entry per dataset and the
+    fields ``'parameter_values'``, ``'parameter_errors'``, ``'parameter_cov_mat'``, ``'cost'`` and
+    ``'did_fit'``. If a dataset cannot be fitted, e.g. because the fit raises an exception, ``'did_fit'`` is
+    ``False`` and all other fields are NaN.
+    """
+
+    def __init__(self, fit, warm_start=True):
+        """
+        Construct a :py:obj:`~kafe2.fit.tools.FitBatch` object.
+
+        :param fit: the configured template fit. The template itself is not modified.
+        :type fit: :py:class:`~kafe2.fit._base.FitBase`-derived
+        :param warm_start: if ``True``, each fit starts from the result of the previous fit in the same
+                           chunk. Otherwise, each fit starts from the parameter values of the template fit.
+                           After a fit with non-finite results, the next fit always starts from the
+                           parameter values of the template fit.
+        :type warm_start: bool
+        """
+        self._fit = fit
+        self._warm_start = warm_start
+        self._initial_parameter_values = np.array(fit.parameter_values, dtype=float)
+        _n_par = len(self._initial_parameter_values)
+        self._result_dtype = np.dtype([
+            ('parameter_values', float, (_n_par,)),
+            ('parameter_errors', float, (_n_par,)),
+            ('parameter_cov_mat', float, (_n_par, _n_par)),
+            ('cost', float),
+            ('did_fit', bool),
+        ])
+
+    # -- private methods
+
+    def _fit_datasets(self, datasets):
+        _results = np.zeros(len(datasets), dtype=self._result_dtype)
+        _fit = self._fit.clone()
+        for _i, _dataset in enumerate(datasets):
+            if _i > 0:
+                _previous_fit_failed = not np.all(np.isfinite(_results['parameter_values'][_i - 1]))
+                if not self._warm_start or _previous_fit_failed:
+                    _fit.set_all_parameter_values(self._initial_parameter_values)
+            _result = _results[_i]
+            try:
+                _fit._set_batch_dataset(_dataset)
+                _fit.do_fit()
+            except Exception:
+                # continue with the other datasets, the next fit starts from the template parameter values
+                _result['parameter_values'] = np.nan
+                _result['parameter_errors'] = np.nan
+                _result['parameter_cov_mat'] = np.nan
+                _result['cost'] = np.nan
+                _result['did_fit'] = False
+                continue
+
+            _result['parameter_values'] = _fit.parameter_values
+            _result['cost'] = _fit.cost_function_value
+            _result['did_fit'] = _fit.did_fit
+            _cov_mat = _fit.parameter_cov_mat
+            if _cov_mat is None:
+                _result['parameter_errors'] = np.nan
+                _result['parameter_cov_mat'] = np.nan
+            else:
+                _result['parameter_errors'] = _fit.parameter_errors
+                _result['parameter_cov_mat'] = _cov_mat
+        return _results
+
+    # -- public properties
+
+    @property
+    def fit(self):
+        """the template fit"""
+        return self._fit
+
+    @property
+    def result_dtype(self):
+        """the data type of the result array"""
+        return self._result_dtype
+
+    # -- public methods
+
+    def run(self, datasets, n_workers=1, chunk_size=None):
+        """
+        Fit all datasets and return the results.
+
+        :param datasets: the datasets to fit. What constitutes a dataset depends on the type of the template
+                         fit: for :py:obj:`~kafe2.fit.XYFit` objects, a dataset is either an array of *y* values
+                         or an array of shape ``(2, N)`` containing *x* and *y* values. For histogram fits, a
+                         dataset is an array of bin heights. For all other fits, it is an array of data values.
+                         All datasets must have the same number of data points as the template fit.
+        :type datasets: iterable of array-like
+        :param n_workers: number of worker processes. If ``None``, use all available CPUs.
+        :type n_workers: int or None
+        :param chunk_size: number of datasets fitted one after another by the same copy of the template fit.
+                           If ``None``, the datasets are split evenly across the workers.
+        :type chunk_size: int or None
+        :return: array with one entry per dataset, see :py:attr:`result_dtype`
+        :rtype: numpy.ndarray
+        """
+        datasets = list(datasets)
+        if not datasets:
+            return np.zeros(0, dtype=self._result_dtype)
+        if chunk_size is None:
+            _n_chunks = multiprocessing.cpu_count() if n_workers is None else max(1, int(n_workers))
+            chunk_size = (len(datasets) + _n_chunks - 1) // _n_chunks
+        chunk_size = int(chunk_size)
+        if chunk_size < 1:
+            raise FitBatchException("Chunk size must be at least 1, got %d!" % (chunk_size,))
+
+        _args_list = [(datasets[_i:_i + chunk_size],) for _i in six.moves.range(0, len(datasets), chunk_size)]
+        if n_workers is not None:
+            n_workers = min(int(n_workers), len(_args_list))
+        with worker_pool(n_workers=n_workers, shared_state=self) as _map:
+            _chunk_results = _map(_fit_datasets, _args_list)
+        return np.concatenate(_chunk_results)
@@ -0,0 +1,272 @@
+import hashlib
+import inspect
+import marshal
+import numbers
+import os
+import types
+
+import numpy as np
+import scipy.stats
+import six
+
+from ..._version_info import __version__
+from .._base.cost import CostFunction
+from .._base.model import ModelFunctionBase
+
+__all__ = ["FitResultCache", "FitResultCacheException"]
+
+
+class FitResultCacheException(Exception):
+    pass
+
+
+def _get_function_code(func):
+    """return the source code of a function or, if it is not available, its compiled code"""
+    if isinstance(func, ModelFunctionBase):
+        try:
+            return func.source_code
+        except (IOError, OSError, TypeError):
+            func = func.func
+    func = getattr(func, 'pyfunc', func)  # unwrap numpy.vectorize
+    try:
+        return inspect.getsource(func)
+    except (IOError, OSError, TypeError):
+        pass
+    try:
+        return marshal.dumps(six.get_function_code(func))
+    except (AttributeError, ValueError):
+        raise FitResultCacheException("Cannot compute fingerprint: code of function %r is not available!" % (func,))
+
+
+def _get_referenced_values(func):
+    """return the values of the global names and closure variables referenced by the code of a function as
+    sorted (name, value) tuples"""
+    try:
+        _code = six.get_function_code(func)
+    except AttributeError:  # e.g. built-in functions or numpy ufuncs
+        return []
+    # the code of nested functions, lambdas and comprehensions is stored in the constants
+    _names = set()
+    _codes = [_code]
+    while _codes:
+        _current_code = _codes.pop()
+        _names.update(_current_code.co_names)
+        _codes += [_const for _const in _current_code.co_consts if isinstance(_const, types.CodeType)]
+    _globals = six.get_function_globals(func)
+    _values = [(_name, _globals[_name]) for _name in sorted(_names) if _name in _globals]
+    for _name, _cell in zip(_code.co_freevars, six.get_function_closure(func) or ()):
+        try:
+            _values.append((_name, _cell.cell_contents))
+        except ValueError:  # empty cell
+            pass
+    return _values
+
+
+def _is_library_function(func):
+    """the global names referenced by functions defined by kafe2 itself are covered by the kafe2 version"""
+    _module = getattr(func, '__module__', None) or ''
+    return _module.startswith('kafe2.') and not _module.startswith('kafe2.test')
+
+
+def _update_function_hash(hash_object, func):
+    """feed the code of a function into a hash object together with the values of the global names and closure
+    variables it references. Referenced functions are included recursively."""
+    _functions = [func]
+    _visited_ids = set()
+    while _functions:
+        _func = _functions.pop()
+        if id(_func) in _visited_ids:
+            continue
+        _visited_ids.add(id(_func))
+        _update_hash(hash_object, _get_function_code(_func))
+        if isinstance(_func, ModelFunctionBase):
+            _func = _func.func
+        _func = getattr(_func, 'pyfunc', _func)  # unwrap numpy.vectorize
+        if _is_library_function(_func):
+            continue
+        for _name, _value in _get_referenced_values(_func):
+            _update_hash(hash_object, _name)
+            if isinstance(_value, (types.ModuleType, type, types.BuiltinFunctionType, np.ufunc)):
+                _update_hash(hash_object, (getattr(_value, '__module__', None), _value.__name__))
+            elif isinstance(_value, (scipy.stats.rv_continuous, scipy.stats.rv_discrete)):
+                # distributions which are not frozen do not have a state
+                _update_hash(hash_object, ('scipy.stats', _value.name))
+            elif isinstance(_value, (types.FunctionType, ModelFunctionBase, np.vectorize)):
+                _functions.append(_value)  # the code is added to the hash separately
+            else:
+                try:
+                    _update_hash(hash_object, _value)
+                except FitResultCacheException:
+                    raise FitResultCacheException(
+                        "Cannot compute fingerprint: value of variable '%s' referenced by function %r is not "
+                        "supported: %r" % (_name, _func, _value))
+
+
+def _update_hash(hash_object, value):
+    """feed a value into a hash object, including its type so that e.g. ``1`` and ``'1'`` are distinguished"""
+    if value is None or isinstance(value, (bool, six.string_types, six.binary_type)):
+        hash_object.update(repr((type(value).__name__, value)).encode('utf-8'))
+    elif isinstance(value, (numbers.Number, np.generic, np.ndarray)):
+        _array = np.ascontiguousarray(value, dtype=float)
+        hash_object.update(repr(('array', _array.shape)).encode('utf-8'))
+        hash_object.update(_array.tobytes())
+    elif isinstance(value, dict):
+        hash_object.update(b'dict')
+        for _key in sorted(value):
+            _update_hash(hash_object, _key)
+            _update_hash(hash_object, value[_key])
+    elif isinstance(value, (list, tuple)):
+        hash_object.update(repr(('sequence', len(value))).encode('utf-8'))
+        for _item in value:
+            _update_hash(hash_object, _item)
+    elif isinstance(value, CostFunction):
+        # built-in cost functions are configured by flags set in the constructor
+        _flags = dict((_key, _value) for _key, _value in six.iteritems(vars(value))
+                      if isinstance(_value, (bool, six.string_types, list)))
+        _update_hash(hash_object, (type(value).__name__, _flags))
+        _update_function_hash(hash_object, value.func)
+    elif callable(value) or isinstance(value, ModelFunctionBase):
+        _update_function_hash(hash_object, value)
+    else:
+        raise FitResultCacheException("Cannot compute fingerprint: unsupported value %r!" % (value,))
+
+
+class FitResultCache(object):
+    """
+    On-disk cache of fit results.
+
+    The results are stored in a directory with one ``.npz`` file per fit. The file name is a fingerprint of
+    everything that determines the result of a fit: the data, the uncertainties, the model function, the
+    parameter settings and constraints, the cost function, the minimizer and the *kafe2* version. Repeating a
+    fit with identical inputs loads the stored result instead of running the minimizer again.
+
+    Functions are identified by their code and by the values of the global and closure variables they
+    reference, e.g. a constant defined at module level. Referenced functions are included recursively. If a
+    referenced value cannot be hashed, e.g. an instance of a custom class, a
+    :py:obj:`FitResultCacheException` is raised instead of risking a wrong cache hit.
+    """
+
+    def __init__(self, directory):
+        """
+        Construct a :py:obj:`~kafe2.fit.tools.FitResultCache` object.
+
+        :param directory: the cache directory. It is created if it does not exist.
+        :type directory: str
+        """
+        self._directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    # -- private methods
+
+    def _get_file_path(self, fingerprint):
+        return os.path.join(self._directory, fingerprint + '.npz')
+
+    # -- public properties
+
+    @property
+    def directory(self):
+        """the cache directory"""
+        return self._directory
+
+    # -- public methods
+
+    @staticmethod
+    def fingerprint(fit):
+        """
+        Compute the fingerprint of the inputs of a fit.
+
+        :param fit: the fit
+        :type fit: :py:class:`~kafe2.fit._base.FitBase`-derived
+        :return: hexadecimal SHA-256 digest
+        :rtype: str
+        """
+        _hash = hashlib.sha256()
+        _update_hash(_hash, ('kafe2', __version__))
+        for _name, _value in fit._get_fingerprint_items():
+            _update_hash(_hash, _name)
+            _update_hash(_hash, _value)
+        return _hash.hexdigest()
+
+    def load(self, fit, fingerprint=None, asymmetric_parameter_errors=False):
+        """
+        Load a cached result into a fit. The parameter values of the fit are set to the cached values and the
+        cached parameter uncertainties are used just like results loaded from a file.
+
+        :param fit: the fit
+        :type fit: :py:class:`~kafe2.fit._base.FitBase`-derived
+        :param fingerprint: the fingerprint of the fit inputs. If ``None``, it is computed.
+        :type fingerprint: str or ``None``
+        :param asymmetric_parameter_errors: if ``True``, only use cached results containing asymmetric
+                                            parameter errors
+        :type asymmetric_parameter_errors: bool
+        :return: ``True`` if a cached result was loaded, ``False`` otherwise
+        :rtype: bool
+        """
+        if fingerprint is None:
+            fingerprint = self.fingerprint(fit)
+        _file_path = self._get_file_path(fingerprint)
+        if not os.path.exists(_file_path):
+            return False
+        with np.load(_file_path) as _result:
+            if asymmetric_parameter_errors and 'asymmetric_parameter_errors' not in _result.files:
+                return False
+            fit.set_all_parameter_values(_result['parameter_values'])
+            fit._loaded_result_dict = dict(
+                did_fit=True,
+                parameter_errors=_result['parameter_errors'],
+                parameter_cov_mat=_result['parameter_cov_mat'],
+                parameter_cor_mat=_result['parameter_cor_mat'],
+                asymmetric_parameter_errors=(_result['asymmetric_parameter_errors']
+                                             if 'asymmetric_parameter_errors' in _result.files else None)
+            )
+        return True
+
+    def store(self, fit, fingerprint=None):
+        """
+        Store the result of a fit. Fits that did not converge or have no parameter covariance matrix are not
+        stored.
+
+        :param fit: the fit
+        :type fit: :py:class:`~kafe2.fit._base.FitBase`-derived
+        :param fingerprint: the fingerprint of the fit inputs before the fit. If ``None``, it is computed from
+                            the current state of the fit.
+        :type fingerprint: str or ``None``
+        :return: ``True`` if the result was stored, ``False`` otherwise
+        :rtype: bool
+        """
+        if fingerprint is None:
+            fingerprint = self.fingerprint(fit)
+        if not fit.did_fit or fit.parameter_cov_mat is None:
+            return False
+        _result = dict(
+            parameter_values=fit.parameter_values,
+            parameter_errors=fit.parameter_errors,
+            parameter_cov_mat=fit.parameter_cov_mat,
+            parameter_cor_mat=fit.parameter_cor_mat,
+        )
+        _asymmetric_parameter_errors = fit._fitter.asymmetric_fit_parameter_errors_if_calculated
+        if _asymmetric_parameter_errors is None and fit._loaded_result_dict is not None:
+            _asymmetric_parameter_errors = fit._loaded_result_dict['asymmetric_parameter_errors']
+        if _asymmetric_parameter_errors is not None:
+            _result['asymmetric_parameter_errors'] = _asymmetric_parameter_errors
+
+        # write to a temporary file first so that concurrent readers never see a partial file
+        _file_path = self._get_file_path(fingerprint)
+        _tmp_file = '{}.{}.tmp'.format(_file_path, os.getpid())
+        with open(_tmp_file, 'wb') as _f:
+            np.savez(_f, **_result)
+        try:
+            os.replace(_tmp_file, _file_path)
+        except AttributeError:
+            # Python 2
+            if os.path.exists(_file_path):
+                os.remove(_file_path)
+            os.rename(_tmp_file, _file_path)
+        return True
+
+    def clear(self):
+        """Remove all cached results from the cache directory."""
+        for _file_name in os.listdir(self._directory):
+            if _file_name.endswith('.npz'):
+                os.remove(os.path.join(self._directory, _file_name))
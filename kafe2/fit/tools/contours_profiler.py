@@ -4,6 +4,7 @@ import matplotlib as mpl
 
 from ...config import kafe2_rc
 from ...core.confidence import ConfidenceLevel
+from ...tools import parallel_map
 from .._base import FitBase
 from matplotlib import pyplot as plt, rcParams
 from matplotlib import gridspec as gs
@@ -36,6 +37,10 @@ def _linear_range_transform(range_, factor, asymmetry=0.0):
     return _m - factor*(2.0 - _asymm_factor) * _d, _m + factor*_asymm_factor*_d
 
 
+def _calculate_contours_for_parameter_pair(profiler, parameter_1, parameter_2):
+    return profiler.get_contours(parameter_1, parameter_2)
+
+
 def _maybe_set_tight_layout(figure):
     """Enable 'tight_layout' for a figure if the matplotlib version is high enough."""
     # older versions of matplotlib cause problems with 'tight_layout'
@@ -142,7 +147,7 @@ class ContoursProfiler(object):
     def __init__(self, fit_object,
                  profile_points=100, profile_subtract_min=True, profile_bound=2.45,
                  contour_points=100, contour_sigma_values=(1.0, 2.0), contour_smoothing_sigma=0.0,
-                 contour_method_kwargs=None):
+                 contour_method_kwargs=None, n_workers=1):
         """
         Construct a :py:obj:`~kafe2.fit._base.profile.ContoursProfiler` object:
 
@@ -162,6 +167,11 @@ class ContoursProfiler(object):
         :param contour_smoothing_sigma: apply a smoothing Gaussian filter with this sigma parameter to each contour
                                         (default is ``0.0``, meaning no smoothing)
         :type contour_smoothing_sigma: float
+        :param contour_method_kwargs: backend-specific keyword arguments passed on to the contour calculation
+        :type contour_method_kwargs: dict or None
+        :param n_workers: number of worker processes used for calculating contours. If ``None``, use all
+                          available CPUs.
+        :type n_workers: int or None
         """
         if not isinstance(fit_object, FitBase):
             raise ContoursProfilerException("Object %r is not a fit object!" % (fit_object,))
@@ -175,6 +185,9 @@ class ContoursProfiler(object):
                                     confidence_levels=_contour_confidence_levels,
                                     smoothing_sigma=contour_smoothing_sigma,
                                     method_kwargs=contour_method_kwargs)
+        self._n_workers = n_workers
+        # contours calculated in advance, mapped to their parameter pairs
+        self._precomputed_contours = dict()
 
         self._cost_function_formatted_name = "${}$".format(self._fit._cost_function.formatter.latex_name)
         # FIXME MultiFit does not have an internal _model_function field
@@ -282,16 +295,19 @@ class ContoursProfiler(object):
         :rtype: list of 2-tuples of float and 2d-array
         """
         if smoothing_sigma is None:
+            if (parameter_1, parameter_2) in self._precomputed_contours:
+                return self._precomputed_contours[(parameter_1, parameter_2)]
             smoothing_sigma = self._contour_kwargs['smoothing_sigma']
+        _contour_method_kwargs = self._contour_kwargs.get('method_kwargs', dict())
+        if _contour_method_kwargs is None:
+            _contour_method_kwargs = dict()
+        _cl_objs = self._contour_kwargs['confidence_levels']
+        # TODO fix for single fit inside multifit
+        _conts = self._fit._fitter.contours(parameter_1, parameter_2,
+                                            sigma_values=[_cl_obj.sigma for _cl_obj in _cl_objs],
+                                            n_workers=self._n_workers, **_contour_method_kwargs)
         _contours = []
-        for _cl_obj in self._contour_kwargs['confidence_levels']:
-            _contour_method_kwargs = self._contour_kwargs.get('method_kwargs', dict())
-            if _contour_method_kwargs is None:
-                _contour_method_kwargs = dict()
-            # TODO fix for single fit inside multifit
-            _cont = self._fit._fitter.contour(parameter_1, parameter_2, sigma=_cl_obj.sigma,
-                                              **_contour_method_kwargs)
-
+        for _cl_obj, _cont in zip(_cl_objs, _conts):
             # smooth contours if requested
             if smoothing_sigma > 0 and _cont is not None:
                 from scipy.ndimage.filters import gaussian_filter
@@ -302,6 +318,13 @@ class ContoursProfiler(object):
         self._fit._check_dynamic_error_compatibility()
         return _contours
 
+    def _precompute_contours(self, parameter_pairs):
+        """Calculate the contours for several parameter pairs, distributing the pairs across worker processes."""
+        parameter_pairs = [_pair for _pair in parameter_pairs if _pair not in self._precomputed_contours]
+        _results = parallel_map(_calculate_contours_for_parameter_pair, parameter_pairs,
+                                n_workers=self._n_workers, shared_state=self)
+        self._precomputed_contours.update(zip(parameter_pairs, _results))
+
     # - plot profiles/contours
 
     def plot_profile(self, parameter, target_axes=None,
@@ -646,27 +669,21 @@ class ContoursProfiler(object):
                     _all_legend_handles += tuple(_hs)
                     _all_legend_labels += tuple(_ls)
 
-            # draw contours to subplots in the lower (and possibly upper) triangle
+            # calculate the contours for all parameter pairs in advance
+            _parameter_pairs = []
             for row in six.moves.range(_npar):
                 for col in six.moves.range(row):
-                    _axes = _subplots[row, col] = _fig.add_subplot(_gs[row, col])
-                    self.plot_contours(_par_names[col], _par_names[row],
-                                       target_axes=_axes,
-                                       show_grid=_show_grid_contours,
-                                       show_legend=False,
-                                       show_fit_minimum=_show_minimum_contours,
-                                       show_ticks=_show_ticks_contours,
-                                       label_ticks_in_sigma=label_ticks_in_sigma,
-                                       naming_convention=contour_naming_convention)
-
-                    if show_legend:
-                        _hs, _ls = _axes.get_legend_handles_labels()
-                        _all_legend_handles += tuple(_hs)
-                        _all_legend_labels += tuple(_ls)
-
+                    _parameter_pairs.append((_par_names[col], _par_names[row]))
                     if full_matrix:
-                        _axes = _subplots[col, row] = _fig.add_subplot(_gs[col, row])
-                        self.plot_contours(_par_names[row], _par_names[col],
+                        _parameter_pairs.append((_par_names[row], _par_names[col]))
+            try:
+                self._precompute_contours(_parameter_pairs)
+
+                # draw contours to subplots in the lower (and possibly upper) triangle
+                for row in six.moves.range(_npar):
+                    for col in six.moves.range(row):
+                        _axes = _subplots[row, col] = _fig.add_subplot(_gs[row, col])
+                        self.plot_contours(_par_names[col], _par_names[row],
                                            target_axes=_axes,
                                            show_grid=_show_grid_contours,
                                            show_legend=False,
@@ -675,6 +692,24 @@ class ContoursProfiler(object):
                                            label_ticks_in_sigma=label_ticks_in_sigma,
                                            naming_convention=contour_naming_convention)
 
+                        if show_legend:
+                            _hs, _ls = _axes.get_legend_handles_labels()
+                            _all_legend_handles += tuple(_hs)
+                            _all_legend_labels += tuple(_ls)
+
+                        if full_matrix:
+                            _axes = _subplots[col, row] = _fig.add_subplot(_gs[col, row])
+                            self.plot_contours(_par_names[row], _par_names[col],
+                                               target_axes=_axes,
+                                               show_grid=_show_grid_contours,
+                                               show_legend=False,
+                                               show_fit_minimum=_show_minimum_contours,
+                                               show_ticks=_show_ticks_contours,
+                                               label_ticks_in_sigma=label_ticks_in_sigma,
+                                               naming_convention=contour_naming_convention)
+            finally:
+                self._precomputed_contours = dict()
+
             # post-processing: join column x axes and row y axes (where applicable)
             for i in six.moves.range(_npar):
                 _pf_axes = _subplots[i, i]
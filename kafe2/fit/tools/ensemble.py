@@ -142,26 +142,349 @@ class EnsembleError(Exception):
     pass
 
 
+def spawn_random_generators(seed, n_generators):
+    """
+    Create independent random number generators from a single seed. The generator with index `i`
+    only depends on the seed and on `i`, so streams of random numbers can be assigned to fixed
+    blocks of work and reproduced independently of the order in which the blocks are processed.
+
+    If ``numpy.random.Generator`` is not available (``numpy < 1.17``), ``numpy.random.RandomState``
+    objects are returned instead.
+
+    :param seed: seed for the random number generators. If ``None``, fresh entropy is used.
+    :type seed: int or None
+    :param n_generators: number of generators to create
+    :type n_generators: int
+    :return: list of random number generators
+    :rtype: list of ``numpy.random.Generator`` or ``numpy.random.RandomState``
+    """
+    try:
+        _seed_sequence = np.random.SeedSequence(seed)
+    except AttributeError:
+        # numpy < 1.17
+        if seed is None:
+            return [np.random.RandomState() for _ in six.moves.range(n_generators)]
+        return [np.random.RandomState([seed, _i]) for _i in six.moves.range(n_generators)]
+    return [np.random.default_rng(_child) for _child in _seed_sequence.spawn(n_generators)]
+
+
+def draw_random_seed():
+    """
+    Draw a fresh seed for :py:func:`spawn_random_generators` from the operating system's entropy source.
+    This is used to make runs without an explicit seed reproducible, e.g. when resuming from a checkpoint.
+
+    :rtype: int
+    """
+    try:
+        return int(np.random.SeedSequence().entropy)
+    except AttributeError:
+        # numpy < 1.17: `RandomState` seeds are limited to 32 bit
+        return int(np.random.RandomState().randint(2**31))
+
+
+class MultivariateNormalSampler(object):
+    """
+    Draw samples from a multivariate normal distribution with zero mean and a fixed covariance matrix.
+
+    The covariance matrix is factorized only once when the sampler is created. Diagonal covariance
+    matrices are handled without any factorization. Other matrices are factorized using a Cholesky
+    decomposition, with an eigendecomposition as fallback for singular (positive semi-definite) matrices.
+    """
+
+    def __init__(self, cov_mat):
+        """
+        :param cov_mat: covariance matrix of the distribution
+        :type cov_mat: ``numpy.ndarray`` of shape ``(n, n)``
+        """
+        cov_mat = np.asarray(cov_mat, dtype=float)
+        if cov_mat.ndim != 2 or cov_mat.shape[0] != cov_mat.shape[1]:
+            raise EnsembleError("Covariance matrix must be square, got shape {}!".format(cov_mat.shape))
+        self._size = cov_mat.shape[0]
+
+        _diagonal = np.diag(cov_mat)
+        if np.any(_diagonal < 0):
+            raise EnsembleError("Covariance matrix has negative diagonal entries!")
+        if np.count_nonzero(cov_mat - np.diag(_diagonal)) == 0:
+            # fast path: uncorrelated -> scale independent standard normal values
+            self._std = np.sqrt(_diagonal)
+            self._factor = None
+        else:
+            self._std = None
+            try:
+                self._factor = np.linalg.cholesky(cov_mat)
+            except np.linalg.LinAlgError:
+                # singular matrix, e.g. from fully correlated uncertainties
+                _eigenvalues, _eigenvectors = np.linalg.eigh(cov_mat)
+                if np.min(_eigenvalues) < -1e-8 * max(np.max(np.abs(_eigenvalues)), 1e-300):
+                    raise EnsembleError("Covariance matrix is not positive semi-definite!")
+                self._factor = _eigenvectors * np.sqrt(np.clip(_eigenvalues, 0.0, None))
+
+    @property
+    def size(self):
+        """the dimension of the distribution"""
+        return self._size
+
+    def sample(self, random_generator, n_samples):
+        """
+        Draw a block of samples.
+
+        :param random_generator: source of standard normal random numbers
+        :type random_generator: ``numpy.random.Generator`` or ``numpy.random.RandomState``
+        :param n_samples: number of samples to draw
+        :type n_samples: int
+        :return: array of samples with shape ``(n_samples, size)``
+        :rtype: ``numpy.ndarray``
+        """
+        _standard_normal = random_generator.standard_normal(size=(n_samples, self._size))
+        if self._factor is None:
+            return _standard_normal * self._std
+        return _standard_normal.dot(self._factor.T)
+
+
+class DensitySampler(object):
+    """
+    Draw samples from a one-dimensional probability density on a finite interval.
+
+    The density is evaluated once on a grid of points when the sampler is created. With the ``'accept_reject'``
+    method, uniformly distributed candidates are accepted with a probability proportional to the density,
+    using the maximum on the grid (with a safety margin) as the envelope. With the ``'inverse_cdf'`` method,
+    uniform random numbers are transformed with the inverse of the cumulative distribution function, which is
+    approximated by linear interpolation on the grid. In both cases the density need not be normalized.
+    """
+
+    METHODS = ('accept_reject', 'inverse_cdf')
+
+    # factor applied to the maximum of the density on the grid to obtain the envelope for accept-reject sampling
+    _ENVELOPE_MARGIN = 1.05
+
+    def __init__(self, density, x_range, method='accept_reject', n_grid_points=1001):
+        """
+        :param density: vectorized function returning the (not necessarily normalized) density for an array of *x*
+        :type density: callable
+        :param x_range: lower and upper limit of the interval to draw samples from
+        :type x_range: tuple of float
+        :param method: sampling method, either ``'accept_reject'`` or ``'inverse_cdf'``
+        :type method: str
+        :param n_grid_points: number of points at which the density is evaluated for setting up the sampler
+        :type n_grid_points: int
+        """
+        if method not in self.METHODS:
+            raise EnsembleError("Unknown sampling method '{}'! Available: {}".format(method, ', '.join(self.METHODS)))
+        self._density = density
+        self._method = method
+        self._low, self._high = float(x_range[0]), float(x_range[1])
+        if not self._low < self._high:
+            raise EnsembleError("Invalid sampling range {}: lower limit must be below upper limit!".format(x_range))
+
+        self._grid = np.linspace(self._low, self._high, int(n_grid_points))
+        _grid_values = np.asarray(self._evaluate(self._grid), dtype=float)
+        if not np.all(np.isfinite(_grid_values)) or np.any(_grid_values < 0):
+            raise EnsembleError("Density must be finite and non-negative on the sampling range!")
+        # cumulative integral of the density on the grid (trapezoidal rule)
+        self._cdf = np.concatenate([[0.0], np.cumsum(0.5 * (_grid_values[1:] + _grid_values[:-1])
+                                                     * np.diff(self._grid))])
+        _integral = self._cdf[-1]
+        if not _integral > 0:
+            raise EnsembleError("Density vanishes on the sampling range!")
+        self._cdf /= _integral
+        self._envelope = self._ENVELOPE_MARGIN * np.max(_grid_values)
+        # expected fraction of accepted candidates
+        self._efficiency = _integral / (self._envelope * (self._high - self._low))
+
+    def _evaluate(self, x):
+        with np.errstate(all='ignore'):
+            return np.broadcast_to(self._density(x), x.shape)
+
+    def _sample_accept_reject(self, random_generator, n_samples):
+        _samples = []
+        _n_missing = n_samples
+        while _n_missing > 0:
+            # draw enough candidates to (most likely) obtain the missing samples at once
+            _n_candidates = int(1.1 * _n_missing / self._efficiency) + 10
+            _candidates = random_generator.uniform(self._low, self._high, size=_n_candidates)
+            _heights = random_generator.uniform(0.0, self._envelope, size=_n_candidates)
+            _accepted = _candidates[_heights < self._evaluate(_candidates)][:_n_missing]
+            _samples.append(_accepted)
+            _n_missing -= len(_accepted)
+        return np.concatenate(_samples)
+
+    def _sample_inverse_cdf(self, random_generator, n_samples):
+        return np.interp(random_generator.uniform(0.0, 1.0, size=n_samples), self._cdf, self._grid)
+
+    @property
+    def method(self):
+        """the sampling method"""
+        return self._method
+
+    @property
+    def x_range(self):
+        """lower and upper limit of the interval to draw samples from"""
+        return self._low, self._high
+
+    def sample(self, random_generator, size):
+        """
+        Draw a block of samples.
+
+        :param random_generator: source of random numbers
+        :type random_generator: ``numpy.random.Generator`` or ``numpy.random.RandomState``
+        :param size: shape of the array of samples, e.g. ``(n_toys, n_events)``
+        :type size: int or tuple of int
+        :return: array of samples
+        :rtype: ``numpy.ndarray``
+        """
+        _shape = tuple(np.atleast_1d(size).astype(int))
+        _n_samples = int(np.prod(_shape))
+        if self._method == 'accept_reject':
+            _samples = self._sample_accept_reject(random_generator, _n_samples)
+        else:
+            _samples = self._sample_inverse_cdf(random_generator, _n_samples)
+        return _samples.reshape(_shape)
+
+
+class OnlineMoments(object):
+    """
+    Accumulate the mean and the central moments (up to fourth order) of a (possibly multidimensional)
+    random variable from a stream of realizations without storing them. For one-dimensional variables the
+    co-moment matrix can also be accumulated.
+
+    Blocks of realizations are merged into the running sums using the pairwise update formulas by Chan et
+    al. and Pébay, which generalize Welford's algorithm and are numerically stable.
+    """
+
+    _STATE_KEYS = ('n', 'mean', 'm2', 'm3', 'm4', 'comoments')
+
+    def __init__(self, variable_shape, with_comoments=False):
+        """
+        :param variable_shape: the shape of *one* realization of the random variable
+        :type variable_shape: tuple of int
+        :param with_comoments: if ``True``, accumulate the co-moment matrix (one-dimensional variables only)
+        :type with_comoments: bool
+        """
+        self._shape = tuple(variable_shape)
+        if with_comoments and len(self._shape) != 1:
+            raise EnsembleError("Co-moments can only be accumulated for one-dimensional variables, "
+                                "got shape {}!".format(self._shape))
+        self.n = 0
+        self.mean = np.zeros(self._shape)
+        self.m2 = np.zeros(self._shape)
+        self.m3 = np.zeros(self._shape)
+        self.m4 = np.zeros(self._shape)
+        self.comoments = np.zeros(self._shape * 2) if with_comoments else None
+
+    def update(self, values):
+        """
+        Add a block of realizations.
+
+        :param values: array of realizations with shape ``(n_values,) + variable_shape``
+        :type values: ``numpy.ndarray``
+        """
+        values = np.asarray(values, dtype=float).reshape((-1,) + self._shape)
+        _n_b = values.shape[0]
+        if _n_b == 0:
+            return
+        _mean_b = np.mean(values, axis=0)
+        _residuals = values - _mean_b
+        _m2_b = np.sum(_residuals ** 2, axis=0)
+        _m3_b = np.sum(_residuals ** 3, axis=0)
+        _m4_b = np.sum(_residuals ** 4, axis=0)
+
+        _n_a = self.n
+        _n = _n_a + _n_b
+        _delta = _mean_b - self.mean
+        _m2_a, _m3_a = self.m2, self.m3
+
+        self.m4 = (self.m4 + _m4_b
+                   + _delta ** 4 * _n_a * _n_b * (_n_a ** 2 - _n_a * _n_b + _n_b ** 2) / _n ** 3
+                   + 6 * _delta ** 2 * (_n_a ** 2 * _m2_b + _n_b ** 2 * _m2_a) / _n ** 2
+                   + 4 * _delta * (_n_a * _m3_b - _n_b * _m3_a) / _n)
+        self.m3 = (_m3_a + _m3_b
+                   + _delta ** 3 * _n_a * _n_b * (_n_a - _n_b) / _n ** 2
+                   + 3 * _delta * (_n_a * _m2_b - _n_b * _m2_a) / _n)
+        self.m2 = _m2_a + _m2_b + _delta ** 2 * _n_a * _n_b / _n
+        if self.comoments is not None:
+            self.comoments = (self.comoments + _residuals.T.dot(_residuals)
+                              + np.outer(_delta, _delta) * _n_a * _n_b / _n)
+        self.mean = self.mean + _delta * _n_b / _n
+        self.n = _n
+
+    @property
+    def variance(self):
+        """The (biased) variance of the realizations."""
+        return self.m2 / self.n
+
+    @property
+    def skew(self):
+        """The (biased) skewness of the realizations, as calculated by ``scipy.stats.skew``."""
+        return (self.m3 / self.n) / (self.m2 / self.n) ** 1.5
+
+    @property
+    def kurtosis(self):
+        """The (biased) excess kurtosis of the realizations, as calculated by ``scipy.stats.kurtosis``."""
+        return (self.m4 / self.n) / (self.m2 / self.n) ** 2 - 3.0
+
+    @property
+    def cov_mat(self):
+        """The (unbiased) sample covariance matrix, as calculated by ``numpy.cov``."""
+        if self.comoments is None:
+            raise EnsembleError("Cannot calculate covariance matrix: co-moments were not accumulated! "
+                                "Pass `with_comoments=True` to accumulate them.")
+        return self.comoments / (self.n - 1)
+
+    def get_state(self):
+        """Return the accumulated sums as a dictionary of arrays, e.g. for saving a checkpoint."""
+        _state = dict(n=np.array(self.n), mean=self.mean, m2=self.m2, m3=self.m3, m4=self.m4)
+        if self.comoments is not None:
+            _state['comoments'] = self.comoments
+        return _state
+
+    def set_state(self, state):
+        """Restore the accumulated sums from a dictionary created by :py:meth:`get_state`."""
+        self.n = int(state['n'])
+        self.mean = np.array(state['mean'], dtype=float)
+        self.m2 = np.array(state['m2'], dtype=float)
+        self.m3 = np.array(state['m3'], dtype=float)
+        self.m4 = np.array(state['m4'], dtype=float)
+        if self.comoments is not None:
+            self.comoments = np.array(state['comoments'], dtype=float)
+
+
 class EnsembleVariable(object):
     """
     Object for storing a finite sample of realizations of a single (possibly multidimensional) random variable,
     forming a statistical ensemble.
     """
 
-    def __init__(self, ensemble_array, dtype=float,
-                 distribution=None, distribution_parameters=None):
+    # largest one-dimensional variable for which the co-moment matrix is accumulated by default
+    MAX_AUTO_COMOMENTS_SIZE = 100
+
+    def __init__(self, ensemble_array=None, dtype=float,
+                 distribution=None, distribution_parameters=None,
+                 sample_size=None, variable_shape=None, with_comoments=None):
         """
         Create an ensemble of realizations of random variables.
 
+        If no **ensemble_array** is given, the realizations are not stored. Instead, the statistics of the
+        ensemble variable are accumulated online as values are set (see :py:class:`OnlineMoments`). In this
+        case, **sample_size** and **variable_shape** must be specified.
+
         :param ensemble_array: a statistical ensemble containing all realizations of the random variable.
                                **Note**: the size of the first axis is taken to be the sample size. Any
                                remaining array axes are understood to be part of the (multidimensional)
-                               random variable itself.
-        :type ensemble_array: `numpy.ndarray`
-        :param sample_size: the size of the ensemble (number of realizations of the variable)
+                               random variable itself. A ``numpy.memmap`` can be passed to store the
+                               realizations on disk.
+        :type ensemble_array: `numpy.ndarray` or ``None``
+        :param sample_size: the size of the ensemble (number of realizations of the variable). Only used
+                            if **ensemble_array** is ``None``.
         :type sample_size: int
-        :param variable_shape: the ndarray shape for *one* realization of the random variable
+        :param variable_shape: the ndarray shape for *one* realization of the random variable. Only used
+                               if **ensemble_array** is ``None``.
         :typle variable_shape: tuple of int (pass an empty `tuple()` or list `[]` for a scalar variable)
+        :param with_comoments: if ``True``, accumulate the co-moment matrix needed for :py:attr:`cov_mat`
+                               and :py:attr:`cor_mat` of a one-dimensional variable. The matrix has
+                               ``n**2`` entries for a variable with ``n`` components. If ``None``, it is only
+                               accumulated for variables with at most ``MAX_AUTO_COMOMENTS_SIZE`` components.
+                               Only used if **ensemble_array** is ``None``.
+        :type with_comoments: bool or ``None``
         :param dtype: underlying dtype of ensemble variable
         :type dtype: type
         :param distribution: probability distribution of the variable (e.g. `scipy.stats.norm`)
@@ -170,12 +493,27 @@ class EnsembleVariable(object):
                                          sequences/arrays, the shape must match the `variable_shape`
         :type distribution_parameters: dict or ``None``
         """
-        self._array = np.asarray(ensemble_array)
-        self._total_shape = self._array.shape
-        self._size = self._total_shape[0]
-        self._shape = tuple()
-        if self._array.ndim > 1:
-            self._shape = self._total_shape[1:]
+        self._moments = None
+        if ensemble_array is None:
+            if sample_size is None or variable_shape is None:
+                raise EnsembleError("Need either an `ensemble_array` or both `sample_size` and "
+                                    "`variable_shape`!")
+            self._array = None
+            self._size = int(sample_size)
+            self._shape = tuple(variable_shape)
+            if with_comoments is None:
+                with_comoments = len(self._shape) == 1 and self._shape[0] <= self.MAX_AUTO_COMOMENTS_SIZE
+            self._moments = OnlineMoments(self._shape, with_comoments=with_comoments)
+        else:
+            if isinstance(ensemble_array, np.memmap):
+                self._array = ensemble_array
+            else:
+                self._array = np.asarray(ensemble_array)
+            self._total_shape = self._array.shape
+            self._size = self._total_shape[0]
+            self._shape = tuple()
+            if self._array.ndim > 1:
+                self._shape = self._total_shape[1:]
 
         self._dist = None
         if distribution is not None:
@@ -198,36 +536,69 @@ class EnsembleVariable(object):
     @property
     def ndim(self):
         """The dimensionality of the random variable."""
-        return self._array.ndim - 1  # do not include the sample size dimension
+        return len(self._shape)  # do not include the sample size dimension
+
+    @property
+    def _n_realizations(self):
+        """number of realizations which have been set so far (equal to `size` if the realizations are stored)"""
+        if self._array is None:
+            return self._moments.n
+        return self._size
+
+    @property
+    def stores_values(self):
+        """``True`` if the realizations are stored, ``False`` if only online statistics are kept."""
+        return self._array is not None
+
+    @property
+    def moments(self):
+        """The online accumulator of the ensemble statistics, or ``None`` if the realizations are stored."""
+        return self._moments
 
     @property
     def values(self):
         """A (possibly) multidimensional array containing all realization of the ensemble variable."""
+        if self._array is None:
+            raise EnsembleError("Realizations of the ensemble variable are not available: only online "
+                                "statistics were accumulated!")
         return self._array
 
     @property
     def mean(self):
         """The mean of the ensemble variable across all realizations."""
+        if self._array is None:
+            return self._moments.mean
         return np.mean(self._array, axis=0)
 
     @property
     def mean_error(self):
         """The standard error of the mean -> standard deviation/sqrt(N)"""
-        return self.std / np.sqrt(self.size)
+        return self.std / np.sqrt(self._n_realizations)
 
     @property
     def std(self):
         """The standard deviation of the ensemble variable across all realizations."""
+        if self._array is None:
+            return np.sqrt(self._moments.variance)
         return np.std(self._array, axis=0)
 
+    @property
+    def std_error(self):
+        """The (asymptotic) standard error of the standard deviation -> standard deviation*sqrt((kurtosis+2)/(4N))"""
+        return self.std * np.sqrt(np.maximum(self.kurtosis + 2.0, 0.0) / (4.0 * self._n_realizations))
+
     @property
     def skew(self):
         """The skew of the ensemble variable across all realizations."""
+        if self._array is None:
+            return self._moments.skew
         return scipy.stats.skew(self._array, axis=0)
 
     @property
     def kurtosis(self):
         """The kurtosis of the ensemble variable across all realizations."""
+        if self._array is None:
+            return self._moments.kurtosis
         return scipy.stats.kurtosis(self._array, axis=0)
 
     @property
@@ -237,6 +608,8 @@ class EnsembleVariable(object):
             # trivial covariance matrix
             return np.array([[self.std**2]])
         if self.ndim == 1:
+            if self._array is None:
+                return self._moments.cov_mat
             return np.cov(self._array.T)
 
         raise EnsembleError("Cannot calculate covariance matrix: ensemble variable must "
@@ -260,7 +633,15 @@ class EnsembleVariable(object):
         return self._dist  # can be ``None``
 
     def set_value(self, index, variable_value):
-        """Set the value of the `index`-th realization of the ensemble variable."""
+        """Set the value of the `index`-th realization of the ensemble variable.
+
+        If the realizations are not stored, the value is added to the online statistics instead. In this
+        case, each realization must be set exactly once. A slice can be passed as `index` to set a block
+        of realizations at once.
+        """
+        if self._array is None:
+            self._moments.update(variable_value)
+            return
         # TODO (?) validate index and/or value shape?
         try:
             self._array[index, :] = variable_value
@@ -268,6 +649,25 @@ class EnsembleVariable(object):
             # for scalar ensemble variables
             self._array[index] = variable_value
 
+    def flush(self):
+        """Write any changes to the realizations to disk (only relevant if stored in a ``numpy.memmap``)."""
+        if isinstance(self._array, np.memmap):
+            self._array.flush()
+
+    def truncate(self, size):
+        """Reduce the size of the ensemble to the first `size` realizations, e.g. after stopping early.
+
+        :param size: new size of the ensemble
+        :type size: int
+        """
+        size = int(size)
+        if size > self._size:
+            raise EnsembleError("Cannot truncate ensemble of size {} to larger size {}!".format(self._size, size))
+        self._size = size
+        if self._array is not None:
+            self._array = self._array[:size]
+            self._total_shape = self._array.shape
+
 
 class EnsembleVariableProbabilityDistribution(object):
     """
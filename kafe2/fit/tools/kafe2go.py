@@ -1,7 +1,12 @@
 #!/usr/bin/env python
 import argparse
+import csv
+import json
+import multiprocessing
 import sys
+import time
 
+import numpy as np
 import matplotlib.pyplot as plt
 
 # do not use relative imports here as the working directory of kafe2go can be anywhere on the system
@@ -9,12 +14,252 @@ from kafe2 import Plot
 from kafe2.fit._base.fit import FitBase
 from kafe2.fit.tools.contours_profiler import ContoursProfiler
 from kafe2.fit.xy.plot import XYPlotAdapter
+from kafe2.tools import _get_fork_context
 
 
 class Kafe2GoException(Exception):
     pass
 
 
+_SUMMARY_COLUMNS = ['file', 'success', 'error', 'did_fit', 'cost', 'ndf', 'load_time', 'fit_time', 'total_time']
+_PARAMETER_COLUMN_PREFIX = 'par_'
+
+
+def _make_row(filename):
+    return dict(file=filename, success=False, error=None, did_fit=False, cost=None, ndf=None,
+                load_time=None, fit_time=None, total_time=None)
+
+
+def _fit_file(options, filename):
+    """Load, fit and plot a single input file and return a summary row. Exceptions are recorded in the row."""
+    _start_time = time.time()
+    _row = _make_row(filename)
+    _basename = filename.rsplit('.', 1)[0]
+    try:
+        _fit = FitBase.from_file(filename, file_format=options['input_format'])
+        _row['load_time'] = time.time() - _start_time
+
+        _fit.do_fit(asymmetric_parameter_errors=options['asymmetric'])
+        _row['fit_time'] = time.time() - _start_time - _row['load_time']
+        _row['did_fit'] = _fit.did_fit
+        _row['cost'] = float(_fit.cost_function_value)
+        _row['ndf'] = int(_fit.ndf)
+        _asymmetric_errors = _fit.asymmetric_parameter_errors if options['asymmetric'] else None
+        for _i, (_par_name, _par_value, _par_error) in enumerate(
+                zip(_fit.parameter_names, _fit.parameter_values, _fit.parameter_errors)):
+            # prefix the parameter columns so that they cannot collide with the fixed columns
+            _column = _PARAMETER_COLUMN_PREFIX + _par_name
+            _row[_column] = float(_par_value)
+            _row[_column + '_error'] = float(_par_error)
+            if _asymmetric_errors is not None:
+                _row[_column + '_error_down'] = float(_asymmetric_errors[_i, 0])
+                _row[_column + '_error_up'] = float(_asymmetric_errors[_i, 1])
+
+        _fit.to_file('{}_result.yml'.format(_basename))
+
+        if options['save_plot']:
+            _plot = Plot(fit_objects=_fit)
+            _plot.plot(fit_info=options['infobox'], asymmetric_parameter_errors=options['asymmetric'],
+                       ratio=options['ratio'])
+            for _fig in _plot.figures:
+                _fig.savefig(fname='{}.{}'.format(_basename, options['plot_format']),
+                             format=options['plot_format'])
+                plt.close(_fig)
+            if options['contours']:
+                _profiler = ContoursProfiler(_fit)
+                _profiler.plot_profiles_contours_matrix(show_grid_for=options['grid'])
+                for _i, _fig in enumerate(_profiler.figures):
+                    _fig.savefig(fname='{}_contours_{}.{}'.format(_basename, _i, options['plot_format']),
+                                 format=options['plot_format'])
+                    plt.close(_fig)
+        _row['success'] = True
+    except Exception as _e:  # continue with the other files
+        _row['error'] = '{}: {}'.format(type(_e).__name__, _e)
+    _row['total_time'] = time.time() - _start_time
+    return _row
+
+
+def _fit_file_in_child(options, filename, connection):
+    """target of the worker processes: fit a single file and send the summary row to the parent process"""
+    try:
+        connection.send(_fit_file(options, filename))
+    finally:
+        connection.close()
+
+
+def _make_failed_row(filename, message, start_time):
+    _row = _make_row(filename)
+    _row['error'] = '{}: {}'.format(Kafe2GoException.__name__, message)
+    _row['total_time'] = time.time() - start_time
+    return _row
+
+
+def _iter_rows(options, filenames, n_jobs, timeout):
+    """Fit the input files and yield ``(index, row)`` for each file as soon as its fit is done. Each file is
+    fitted in a separate worker process, so a worker which is killed or exceeds the timeout only affects
+    the file it is fitting."""
+    _context = _get_fork_context()
+    if not n_jobs:
+        n_jobs = multiprocessing.cpu_count()
+    if n_jobs <= 1 or _context is None or multiprocessing.current_process().daemon:
+        for _i, _filename in enumerate(filenames):
+            yield _i, _fit_file(options, _filename)
+        return
+
+    _pending = list(enumerate(filenames))[::-1]
+    _running = dict()  # index -> (process, connection, start time)
+    try:
+        while _pending or _running:
+            while _pending and len(_running) < n_jobs:
+                _i, _filename = _pending.pop()
+                _receiver, _sender = _context.Pipe(duplex=False)
+                _process = _context.Process(target=_fit_file_in_child, args=(options, _filename, _sender))
+                _process.daemon = True
+                _process.start()
+                _sender.close()  # otherwise, the end of the pipe is not detected if the worker dies
+                _running[_i] = (_process, _receiver, time.time())
+
+            _finished = []
+            for _i, (_process, _receiver, _start_time) in _running.items():
+                if _receiver.poll():
+                    try:
+                        _row = _receiver.recv()
+                    except EOFError:
+                        _process.join()
+                        _row = _make_failed_row(filenames[_i], 'worker process exited with code {} before '
+                                                'returning a result'.format(_process.exitcode), _start_time)
+                elif timeout is not None and time.time() - _start_time > timeout:
+                    _process.terminate()
+                    _row = _make_failed_row(filenames[_i], 'fit did not finish within {} s'.format(timeout),
+                                            _start_time)
+                else:
+                    continue
+                _process.join()
+                _receiver.close()
+                _finished.append((_i, _row))
+
+            for _i, _row in _finished:
+                del _running[_i]
+                yield _i, _row
+            if not _finished:
+                time.sleep(0.01)
+    finally:
+        for _process, _receiver, _ in _running.values():
+            _process.terminate()
+            _process.join()
+            _receiver.close()
+
+
+class _SummaryWriter(object):
+    """Write summary rows to a file as they are added, see :py:func:`write_summary`."""
+
+    def __init__(self, filename):
+        self._json_lines = filename.endswith('.json') or filename.endswith('.jsonl')
+        self._columns = list(_SUMMARY_COLUMNS)
+        self._rows = []
+        self._csv_writer = None
+        self._file = open(filename, 'w')
+        if not self._json_lines:
+            self._rewrite_csv()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _rewrite_csv(self):
+        """write the header and all rows added so far, needed whenever new columns are added"""
+        self._file.seek(0)
+        self._file.truncate()
+        self._csv_writer = csv.DictWriter(self._file, fieldnames=self._columns, lineterminator='\n')
+        self._csv_writer.writeheader()
+        self._csv_writer.writerows(self._rows)
+
+    def add_row(self, row):
+        self._rows.append(row)
+        if self._json_lines:
+            # non-finite floats are not valid JSON
+            _row = dict((_key, None if isinstance(_value, float) and not np.isfinite(_value) else _value)
+                        for _key, _value in row.items())
+            self._file.write(json.dumps(_row, sort_keys=False) + '\n')
+        else:
+            # parameter columns in the order of their first appearance
+            _new_columns = [_key for _key in row if _key not in self._columns]
+            if _new_columns:
+                self._columns += _new_columns
+                self._rewrite_csv()
+            else:
+                self._csv_writer.writerow(row)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def write_summary(rows, filename):
+    """Write the summary rows of a batch run to a CSV file or, if **filename** ends with ``.json`` or
+    ``.jsonl``, to a JSON lines file.
+
+    :param rows: one dictionary per input file
+    :type rows: list of dict
+    :param filename: name of the summary file
+    :type filename: str
+    """
+    with _SummaryWriter(filename) as _writer:
+        for _row in rows:
+            _writer.add_row(_row)
+
+
+def run_batch(filenames, n_jobs=1, summary_filename='kafe2go_summary.csv', input_format='yaml',
+              save_plot=False, plot_format='pdf', contours=False, grid=None, asymmetric=False,
+              infobox=True, ratio=False, verbose=True, timeout=None):
+    """Fit each input file independently, using a separate worker process for each file. For every input
+    file the fit result is written to ``<basename>_result.yml`` and, if requested, the plots are saved with
+    the non-interactive *Agg* backend. Files which cannot be loaded or fitted, whose worker process dies or
+    which exceed the timeout are recorded in the summary and do not stop the batch run.
+
+    The summary rows are written as soon as the fits are done, so the summary file shows the progress of
+    the batch run. At the end, the summary file is rewritten in the order of the input files.
+
+    :param filenames: names of the input files
+    :type filenames: list of str
+    :param n_jobs: number of worker processes. If ``None`` or ``0``, use the number of available CPUs.
+                   If ``1``, the files are fitted one after another in the current process.
+    :type n_jobs: int or None
+    :param summary_filename: name of the summary file, see :py:func:`write_summary`
+    :type summary_filename: str
+    :param verbose: if ``True``, print a status line for every input file as soon as its fit is done
+    :type verbose: bool
+    :param timeout: maximum time in seconds for a single file. Only used if **n_jobs** is not ``1``.
+    :type timeout: float or None
+    :return: one summary row per input file
+    :rtype: list of dict
+    """
+    if save_plot:
+        plt.switch_backend('Agg')  # no plots are shown in batch mode
+    _options = dict(input_format=input_format, save_plot=save_plot, plot_format=plot_format,
+                    contours=contours, grid=grid, asymmetric=asymmetric, infobox=infobox, ratio=ratio)
+    _rows = [None] * len(filenames)
+    _writer = _SummaryWriter(summary_filename) if summary_filename else None
+    try:
+        for _n_done, (_i, _row) in enumerate(_iter_rows(_options, filenames, n_jobs, timeout)):
+            _rows[_i] = _row
+            if _writer is not None:
+                _writer.add_row(_row)
+            if verbose:
+                _status = 'ok' if _row['success'] else 'FAILED ({})'.format(_row['error'].split('\n')[0])
+                print('[{}/{}] {}: {} ({:.2f} s)'.format(_n_done + 1, len(filenames), _row['file'], _status,
+                                                        _row['total_time']))
+                sys.stdout.flush()
+    finally:
+        if _writer is not None:
+            _writer.close()
+    if summary_filename:
+        write_summary(_rows, summary_filename)
+    return _rows
+
+
 # TODO documentation
 def kafe2go():
     _parser = argparse.ArgumentParser(
@@ -68,6 +313,22 @@ def kafe2go():
     _parser.add_argument('--noreport',
                          action='store_true',
                          help="Don't print fit report(s) to the terminal after fitting.")
+    _parser.add_argument('-j', '--jobs',
+                         type=int, default=None,
+                         help="Batch mode: fit the input files independently using JOBS worker processes "
+                              "(0: number of CPUs). The result of each fit is written to "
+                              "<basename>_result.yml, plots are only saved (with --saveplot) and "
+                              "a summary table is written instead of the fit reports. Files that "
+                              "cannot be fitted are recorded in the summary.")
+    _parser.add_argument('--summary',
+                         type=str, default='kafe2go_summary.csv',
+                         help="Name of the summary file written in batch mode. The file is written in the "
+                              "JSON lines format if the name ends with .json or .jsonl and as CSV otherwise. "
+                              "The default is kafe2go_summary.csv.")
+    _parser.add_argument('--timeout',
+                         type=float, default=None,
+                         help="Batch mode: maximum time in seconds for fitting a single file. Files which "
+                              "exceed it are recorded as failed in the summary.")
 
     if len(sys.argv) == 1:  # print help message if no input given
         _parser.print_help()
@@ -88,6 +349,16 @@ def kafe2go():
     _show_plot = not _args.noplot
     _grid = _args.grid[0]
 
+    if not _band:
+        XYPlotAdapter.PLOT_SUBPLOT_TYPES.pop('model_error_band')
+
+    if _args.jobs is not None:
+        _rows = run_batch(_filenames, n_jobs=_args.jobs, summary_filename=_args.summary,
+                          input_format=_input_format, save_plot=_save_plot, plot_format=_plot_format,
+                          contours=_contours, grid=_grid, asymmetric=_asymmetric, infobox=_infobox,
+                          ratio=_ratio, timeout=_args.timeout)
+        sys.exit(0 if all(_row['success'] for _row in _rows) else 1)
+
     _fits = []
 
     for _fname in _filenames:
@@ -97,9 +368,6 @@ def kafe2go():
             _fit.report(asymmetric_parameter_errors=_asymmetric)
         _fits.append(_fit)
 
-    if not _band:
-        XYPlotAdapter.PLOT_SUBPLOT_TYPES.pop('model_error_band')
-
     _plot = Plot(fit_objects=_fits, separate_figures=_separate)
     _plot.plot(fit_info=_infobox, asymmetric_parameter_errors=_asymmetric, ratio=_ratio)
 
@@ -10,6 +10,7 @@ unbinned fit can take much longer than a histogram fit, where each bin is consid
 
 from .container import *
 from .cost import *
+from .ensemble import *
 from .fit import *
 from .model import *
 from .plot import *
@@ -1,4 +1,5 @@
 from ..indexed import IndexedContainer
+from ..io.columns import read_columns
 from ..indexed.container import IndexedContainerException
 
 __all__ = ['UnbinnedContainer', 'UnbinnedContainerException']
@@ -24,6 +25,28 @@ class UnbinnedContainer(IndexedContainer):
         """
         super(UnbinnedContainer, self).__init__(data, dtype)
 
+    @classmethod
+    def from_columns(cls, file_path, data_column=0, file_format=None, delimiter=None, chunk_size=None):
+        """
+        Construct a container from a column of a text, ``.npy``, ``.npz`` or HDF5 file. See
+        :py:func:`~kafe2.fit.io.iter_column_chunks` for details on the supported file formats.
+
+        :param file_path: path of the file
+        :type file_path: str
+        :param data_column: name or zero-based index of the column containing the data
+        :type data_column: str or int
+        :param file_format: file format. If ``None``, it is inferred from the file name extension.
+        :type file_format: str or None
+        :param delimiter: column delimiter for text files. If ``None``, detect it automatically.
+        :type delimiter: str or None
+        :param chunk_size: number of rows to parse at once, see :py:func:`~kafe2.fit.io.read_columns`
+        :type chunk_size: int or None
+        :return: the new container
+        """
+        _data, = read_columns(file_path, [data_column], file_format=file_format, delimiter=delimiter,
+                              chunk_size=chunk_size)
+        return cls(_data)
+
     def add_error(self):
         raise NotImplementedError("Unbinned fits don't support errors")
 
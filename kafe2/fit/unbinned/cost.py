@@ -6,6 +6,8 @@ from ..util import function_library
 
 __all__ = [
     "UnbinnedCostFunction_NegLogLikelihood",
+    "UnbinnedCostFunction_BinnedNegLogLikelihood",
+    "UnbinnedCostFunction_ChunkedNegLogLikelihood",
 ]
 
 
@@ -37,6 +39,64 @@ class UnbinnedCostFunction_NegLogLikelihood(CostFunction):
         return -2.0 * _total_log_likelihood
 
 
+class UnbinnedCostFunction_BinnedNegLogLikelihood(CostFunction):
+    def __init__(self):
+        r"""
+        Negative log-likelihood cost function approximating the unbinned negative log-likelihood of data which
+        has been filled into a fine histogram.
+
+        All :math:`n_j` data points in bin :math:`j` are assigned the model density averaged over the bin,
+        :math:`\bar{f}_j = \frac{1}{w_j} \int_{\mathrm{bin}\,j} f(x) \mathrm{d}x`:
+
+        .. math::
+            C = -2 \sum_j n_j \ln \bar{f}_j
+
+        Up to a constant this is the multinomial likelihood of the bin contents. The model only has to be
+        integrated over the bins instead of being evaluated at every data point. For bins which are narrow
+        compared to the scale on which the density changes the cost converges to the unbinned negative
+        log-likelihood.
+        """
+        super(UnbinnedCostFunction_BinnedNegLogLikelihood, self).__init__(cost_function=self.nll)
+        self._needs_errors = False
+        self._formatter.latex_name = "-2\\ln\\mathcal{L}"
+        self._formatter.name = "nll"
+        self._formatter.description = "binned approximation of the negative log-likelihood"
+
+    @staticmethod
+    def nll(binned_data, binned_model):
+        # empty bins do not contribute, even if the model vanishes there
+        _non_empty = binned_data > 0
+        _total_log_likelihood = np.sum(binned_data[_non_empty] * np.log(binned_model[_non_empty]))
+        # guard against returning NaN
+        if np.isnan(_total_log_likelihood):
+            return np.inf
+        return -2.0 * _total_log_likelihood
+
+
+class UnbinnedCostFunction_ChunkedNegLogLikelihood(CostFunction):
+    def __init__(self):
+        r"""
+        Built-in negative log-likelihood cost function for *Unbinned* data which receives the sum of the logarithms
+        of the model density instead of the model density at every data point.
+
+        The sum is calculated by the fit in chunks of data points and optionally in several worker processes, so
+        the model density at all data points never has to be held in memory at once. The result is the same as
+        for :py:class:`UnbinnedCostFunction_NegLogLikelihood`.
+        """
+        super(UnbinnedCostFunction_ChunkedNegLogLikelihood, self).__init__(cost_function=self.nll)
+        self._needs_errors = False
+        self._formatter.latex_name = "-2\\ln\\mathcal{L}"
+        self._formatter.name = "nll"
+        self._formatter.description = "negative log-likelihood"
+
+    @staticmethod
+    def nll(log_density_sum):
+        # guard against returning NaN
+        if np.isnan(log_density_sum):
+            return np.inf
+        return -2.0 * log_density_sum
+
+
 STRING_TO_COST_FUNCTION = {
     'nll': UnbinnedCostFunction_NegLogLikelihood,
     'negloglikelihood': UnbinnedCostFunction_NegLogLikelihood,
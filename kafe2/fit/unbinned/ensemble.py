@@ -0,0 +1,166 @@
+import numpy as np
+import scipy.stats
+
+from .._base import FitEnsembleBase, FitEnsembleException
+from ..tools.ensemble import DensitySampler, EnsembleVariablePlotter
+from .cost import UnbinnedCostFunction_NegLogLikelihood
+from .fit import UnbinnedFit
+
+
+__all__ = ["UnbinnedFitEnsemble"]
+
+
+class UnbinnedFitEnsembleException(FitEnsembleException):
+    pass
+
+
+class UnbinnedFitEnsemble(FitEnsembleBase):
+    """
+    Object for generating ensembles of fits to unbinned pseudo-data drawn from the specified model density.
+
+    The events of a whole block of pseudo-experiments are drawn at once, either by accept-reject sampling
+    or by transforming uniform random numbers with the (numerically approximated) inverse of the cumulative
+    distribution function. A single :py:obj:`~kafe2.fit.UnbinnedFit` object is reused for all toy fits.
+
+    The fit ensemble is generated by using the :py:meth:`~kafe2.fit.UnbinnedFitEnsemble.run` method.
+    """
+    FIT_TYPE = UnbinnedFit
+    EXCEPTION_TYPE = UnbinnedFitEnsembleException
+
+    def __init__(self, n_experiments, n_events, model_density_function, model_parameters, x_range,
+                 cost_function=UnbinnedCostFunction_NegLogLikelihood(), sampling='accept_reject',
+                 requested_results=None, store_values=True, storage_dir=None):
+        """
+        Construct an :py:obj:`~kafe2.fit.UnbinnedFitEnsemble` object.
+
+        :param n_experiments: number of pseudoexperiments to perform
+        :type n_experiments: int
+        :param n_events: number of events in each pseudo-experiment
+        :type n_events: int
+        :param model_density_function: the model density
+        :type model_density_function: :py:class:`~kafe2.fit._base.ModelFunctionBase` or unwrapped native Python
+            function
+        :param model_parameters: parameters of the "true" model
+        :type model_parameters: iterable of float
+        :param x_range: lower and upper limit of the interval from which the events are drawn. The model density
+            should be normalized on this interval.
+        :type x_range: tuple of float
+        :param cost_function: the cost function
+        :type cost_function: :py:class:`~kafe2.fit._base.CostFunctionBase`-derived or unwrapped native Python
+            function
+        :param sampling: how the events are drawn, either ``'accept_reject'`` or ``'inverse_cdf'``
+        :type sampling: str
+        :param requested_results: list of result variables to collect for each toy fit
+        :type requested_results: iterable of str
+        :param store_values: if ``False``, the results of the individual toy fits are not stored. Only the
+                             statistics of the result variables are accumulated online.
+        :type store_values: bool
+        :param storage_dir: if given, the results of the individual toy fits are stored in ``.npy`` files
+                            in this directory (one file per result variable) instead of in memory
+        :type storage_dir: str or ``None``
+        """
+        if sampling not in DensitySampler.METHODS:
+            raise UnbinnedFitEnsembleException("Unknown sampling method '{}'! Available: {}".format(
+                sampling, ', '.join(DensitySampler.METHODS)))
+        self._sampling = sampling
+        self._n_events = int(n_events)
+        self._x_range = tuple(x_range)
+        self._model_parameters = np.asarray(model_parameters, dtype=float)
+        self._n_par = len(self._model_parameters)
+
+        # initialize an `UnbinnedFit` object for performing the toy fits
+        # need some dummy initial data values in order to initialize a Fit object
+        self._toy_fit = UnbinnedFit(data=np.linspace(self._x_range[0], self._x_range[1], self._n_events),
+                                    model_density_function=model_density_function,
+                                    cost_function=cost_function)
+
+        # set the model parameters of the toy fit to the reference values
+        self._set_toy_fit_parameters_to_reference()
+        # initial step sizes of the minimizer, restored before each toy fit
+        self._toy_fit_initial_step_sizes = self._toy_fit._fitter.minimizer.parameter_errors
+
+        self._update_reference_quantities_from_toy_fit()
+
+        super(UnbinnedFitEnsemble, self).__init__(n_experiments=n_experiments, requested_results=requested_results,
+                                                  store_values=store_values, storage_dir=storage_dir)
+
+    # -- private methods
+
+    def _eval_reference_density(self, x):
+        return self._toy_fit.eval_model_function(x=x, model_parameters=self._model_parameters)
+
+    def _update_reference_quantities_from_toy_fit(self):
+        self._sampler = DensitySampler(self._eval_reference_density, self._x_range, method=self._sampling)
+
+    def _generate_pseudodata_block(self, random_generator, n_toys):
+        """draw the events for a block of pseudo-experiments at once"""
+        return self._sampler.sample(random_generator, (n_toys, self._n_events))
+
+    def _set_toy_fit_pseudodata(self, pseudodata_block, i_toy):
+        self._toy_fit.update_data(pseudodata_block[i_toy])
+
+    def _initialize_ensemble_variables(self, resume=False, open_storage=True):
+        self._ensemble_variables = {}
+        self._ensemble_variable_plotters = {}
+        if 'parameter_pulls' in self._requested_results:
+            self._ensemble_variables['parameter_pulls'] = self._make_ensemble_variable(
+                'parameter_pulls', (self._n_par,), resume=resume, open_storage=open_storage,
+                with_comoments=True,
+                distribution=scipy.stats.norm,
+                distribution_parameters=dict(loc=0, scale=1)
+            )
+            self._ensemble_variable_plotters['parameter_pulls'] = EnsembleVariablePlotter(
+                ensemble_variable=self._ensemble_variables['parameter_pulls'],
+                value_ranges=(-3, 3),
+                variable_labels=["Pull ${}$".format(_arg_formatter.latex_name)
+                                 for _arg_formatter in self._toy_fit._model_function.formatter.arg_formatters]
+            )
+
+        # the distributions of the negative log-likelihood and of the events are not known in general
+        if 'cost' in self._requested_results:
+            self._ensemble_variables['cost'] = self._make_ensemble_variable(
+                'cost', (), resume=resume, open_storage=open_storage)
+
+        if 'data' in self._requested_results:
+            self._ensemble_variables['data'] = self._make_ensemble_variable(
+                'data', (self._n_events,), resume=resume, open_storage=open_storage)
+
+    def _prepare_run(self):
+        self._set_toy_fit_parameters_to_reference()
+        self._update_reference_quantities_from_toy_fit()
+
+    # -- private properties
+
+    @property
+    def _parameter_pulls(self):
+        """property for ensemble variable 'parameter_pulls'"""
+        return (self._toy_fit.parameter_values - self._model_parameters)/self._toy_fit.parameter_errors
+
+    @property
+    def _data(self):
+        """property for ensemble variable 'data'"""
+        return self._toy_fit.data
+
+    @property
+    def _cost(self):
+        """property for ensemble variable 'cost'"""
+        return self._toy_fit.cost_function_value
+
+    # -- public properties
+
+    @property
+    def n_events(self):
+        """the number of events in each pseudo-experiment"""
+        return self._n_events
+
+    @property
+    def sampling(self):
+        """how the events of the pseudo-experiments are drawn"""
+        return self._sampling
+
+    AVAILABLE_RESULTS = {
+        'parameter_pulls': _parameter_pulls,
+        'cost': _cost,
+        'data': _data,
+    }
+    _DEFAULT_RESULTS = {'parameter_pulls', 'cost'}
@@ -1,13 +1,19 @@
+from collections import OrderedDict
 from copy import deepcopy
 
+import multiprocessing
+import numpy as np
 import sys
 
 from .._base import FitException, FitBase, DataContainerBase, ModelFunctionBase
+from ..histogram.model import HistParametricModel
 from .container import UnbinnedContainer
-from .cost import UnbinnedCostFunction_NegLogLikelihood
+from .cost import UnbinnedCostFunction_NegLogLikelihood, UnbinnedCostFunction_BinnedNegLogLikelihood, \
+    UnbinnedCostFunction_ChunkedNegLogLikelihood
 from .model import UnbinnedParametricModel
 from .plot import UnbinnedPlotAdapter
 from ..util import collect
+from ...tools import print_dict_as_table, worker_pool
 
 __all__ = ['UnbinnedFit', 'UnbinnedFitException']
 
@@ -16,6 +22,12 @@ class UnbinnedFitException(FitException):
     pass
 
 
+def _eval_log_density_sum(param_model, start, stop, parameter_values, chunk_size):
+    """evaluate the log-density sum for one slice of the data points in a worker process"""
+    return param_model.eval_log_density_sum(
+        model_parameters=parameter_values, chunk_size=chunk_size, start=start, stop=stop)
+
+
 class UnbinnedFit(FitBase):
     CONTAINER_TYPE = UnbinnedContainer
     MODEL_TYPE = UnbinnedParametricModel
@@ -23,17 +35,41 @@ class UnbinnedFit(FitBase):
     PLOT_ADAPTER_TYPE = UnbinnedPlotAdapter
     EXCEPTION_TYPE = UnbinnedFitException
     RESERVED_NODE_NAMES = {'data', 'model', 'cost', 'parameter_values', 'parameter_constraints'}
+    _DATA_NODE_NAMES = ('x', 'data', 'model')  # TODO: make 'Alias' nodes pass on 'mark_for_update'
+    _BINNED_DATA_NODE_NAMES = ('binned_data', 'binned_model')
+    _BINNING_METHODS = ('uniform', 'quantile')
 
     def __init__(self,
                  data,
                  model_density_function='normal_distribution_pdf',
                  cost_function=UnbinnedCostFunction_NegLogLikelihood(),
                  minimizer=None,
-                 minimizer_kwargs=None):
+                 minimizer_kwargs=None,
+                 n_bins=None,
+                 binning='uniform',
+                 bin_evaluation='simpson',
+                 chunk_size=None,
+                 n_workers=1):
         """
         Construct a fit to a model of *unbinned* data.
 
-        :param data: the data points
+        If **n_bins** is given, the data is filled into a fine histogram and the unbinned negative
+        log-likelihood is approximated by
+        :py:obj:`~kafe2.fit.unbinned.cost.UnbinnedCostFunction_BinnedNegLogLikelihood`. The model density is
+        then only integrated over the bins instead of being evaluated at every data point on each evaluation
+        of the cost function. Use :py:meth:`get_binning_bias` to check the effect of the binning on the fit
+        result.
+
+        If **chunk_size** is given or **n_workers** is not 1, the exact unbinned negative log-likelihood is
+        calculated by :py:obj:`~kafe2.fit.unbinned.cost.UnbinnedCostFunction_ChunkedNegLogLikelihood` from the
+        sum of the logarithms of the model density. The sum is evaluated in chunks of data points, so the
+        temporary memory does not grow with the number of data points. During :py:meth:`do_fit` the data
+        points are split evenly across a pool of worker processes which each return the partial sum for their
+        slice of the data. The workers are forked from the current process and share the data with it.
+
+        :param data: the data points. A memory-mapped array or the path of a ``.npy`` file is used without
+            loading the data into memory.
+        :type data: iterable of float or str
         :param model_density_function: the model density
         :type model_density_function: :py:class:`~kafe2.fit._base.ModelFunctionBase` or unwrapped native Python function
         :param cost_function: the cost function
@@ -41,7 +77,58 @@ class UnbinnedFit(FitBase):
         :type minimizer: None, "iminuit", "tminuit", or "scipy".
         :param minimizer_kwargs: dictionary with kwargs for the minimizer.
         :type minimizer_kwargs: dict
+        :param n_bins: number of bins for the binned approximation of the likelihood. If ``None``, the exact
+            unbinned likelihood is used.
+        :type n_bins: int or None
+        :param binning: ``'uniform'`` for bins of equal width spanning the data range or ``'quantile'`` for bins
+            containing roughly the same number of data points.
+        :type binning: str
+        :param bin_evaluation: how the model density is integrated over the bins, see
+            :py:obj:`~kafe2.fit.histogram.HistParametricModel`.
+        :type bin_evaluation: str
+        :param chunk_size: maximum number of data points for which the model density is evaluated at once. If
+            ``None``, all data points (of a worker) are evaluated at once.
+        :type chunk_size: int or None
+        :param n_workers: number of worker processes for evaluating the negative log-likelihood in
+            :py:meth:`do_fit`. If ``None``, use the number of available CPUs.
+        :type n_workers: int or None
         """
+        _chunked = chunk_size is not None or n_workers != 1
+        if chunk_size is not None and int(chunk_size) < 1:
+            raise UnbinnedFitException("Invalid chunk size: %r! Must be at least 1." % (chunk_size,))
+        if n_bins is not None and _chunked:
+            raise UnbinnedFitException("The binned approximation of the likelihood cannot be combined with a "
+                                       "chunked evaluation of the unbinned likelihood!")
+        if _chunked:
+            if isinstance(cost_function, UnbinnedCostFunction_NegLogLikelihood):
+                cost_function = UnbinnedCostFunction_ChunkedNegLogLikelihood()
+            elif not isinstance(cost_function, UnbinnedCostFunction_ChunkedNegLogLikelihood):
+                raise UnbinnedFitException("The chunked evaluation of the likelihood cannot be used with "
+                                           "the custom cost function %r!" % (cost_function,))
+        if n_bins is not None:
+            if int(n_bins) < 1:
+                raise UnbinnedFitException("Invalid number of bins: %r! Must be at least 1." % (n_bins,))
+            if binning not in self._BINNING_METHODS:
+                raise UnbinnedFitException("Unknown binning %r! Expected one of %r."
+                                           % (binning, self._BINNING_METHODS))
+            if isinstance(cost_function, UnbinnedCostFunction_NegLogLikelihood):
+                cost_function = UnbinnedCostFunction_BinnedNegLogLikelihood()
+            elif not isinstance(cost_function, UnbinnedCostFunction_BinnedNegLogLikelihood):
+                raise UnbinnedFitException("The binned approximation of the likelihood cannot be used with "
+                                           "the custom cost function %r!" % (cost_function,))
+            n_bins = int(n_bins)
+        elif isinstance(cost_function, UnbinnedCostFunction_BinnedNegLogLikelihood):
+            raise UnbinnedFitException("The cost function %r needs binned data, specify 'n_bins'!"
+                                       % (cost_function,))
+        self._n_bins = n_bins
+        self._binning = binning
+        self._bin_evaluation = bin_evaluation
+        self._bin_edges = None
+        self._binned_data = None
+        self._binned_param_model = None
+        self._chunk_size = int(chunk_size) if chunk_size is not None else None
+        self._n_workers = n_workers
+        self._worker_map = None  # only set during do_fit
         super(UnbinnedFit, self).__init__(
             data=data, model_function=model_density_function, cost_function=cost_function,
             minimizer=minimizer, minimizer_kwargs=minimizer_kwargs)
@@ -61,6 +148,15 @@ class UnbinnedFit(FitBase):
             )
         )
 
+        if self._n_bins is not None:
+            # replace the empty nodes created for the arguments of the binned cost function
+            self._add_property_to_nexus('binned_data', existing_behavior='replace_if_empty')
+            self._add_property_to_nexus('binned_model', depends_on='parameter_values',
+                                        existing_behavior='replace_if_empty')
+        if isinstance(self._cost_function, UnbinnedCostFunction_ChunkedNegLogLikelihood):
+            self._add_property_to_nexus('log_density_sum', depends_on='parameter_values',
+                                        existing_behavior='replace_if_empty')
+
     # -- private methods
 
     def _set_new_data(self, new_data):
@@ -76,6 +172,9 @@ class UnbinnedFit(FitBase):
         self._nexus.get('x').mark_for_update()
         # TODO: make 'Alias' nodes pass on 'mark_for_update'
         self._nexus.get('data').mark_for_update()
+        if self._n_bins is not None:
+            self._bin_data()
+            self._nexus.get('binned_data').mark_for_update()
 
     def _set_new_parametric_model(self):
         self._param_model = UnbinnedParametricModel(
@@ -83,6 +182,93 @@ class UnbinnedFit(FitBase):
             model_density_function=self._model_function,
             model_parameters=self.parameter_values
         )
+        if self._n_bins is not None:
+            self._set_new_binned_parametric_model()
+
+    def _bin_data(self):
+        """fill the data into the histogram used for the binned approximation of the likelihood"""
+        _data = self.data
+        _low, _high = np.min(_data), np.max(_data)
+        if not _low < _high:
+            raise UnbinnedFitException("Cannot bin data with a range of zero width: %r!" % ((_low, _high),))
+        if self._binning == 'uniform':
+            self._bin_edges = np.linspace(_low, _high, self._n_bins + 1)
+            # equal bin widths allow numpy to calculate the bin indices directly instead of searching
+            self._binned_data = np.histogram(_data, bins=self._n_bins, range=(_low, _high))[0]
+        else:
+            # tied data points may produce identical quantiles -> merge the corresponding bins
+            self._bin_edges = np.unique(np.quantile(_data, np.linspace(0.0, 1.0, self._n_bins + 1)))
+            self._binned_data = np.histogram(_data, bins=self._bin_edges)[0]
+
+    def _set_new_binned_parametric_model(self):
+        self._binned_param_model = HistParametricModel(
+            n_bins=len(self._bin_edges) - 1,
+            bin_range=(self._bin_edges[0], self._bin_edges[-1]),
+            model_density_func=self._model_function.func,
+            model_parameters=self.parameter_values,
+            bin_edges=self._bin_edges,
+            bin_evaluation=self._bin_evaluation
+        )
+
+    def _on_data_values_change(self, data_node_names=None):
+        if data_node_names is None:
+            data_node_names = self._DATA_NODE_NAMES
+            if self._n_bins is not None:
+                data_node_names += self._BINNED_DATA_NODE_NAMES
+            if isinstance(self._cost_function, UnbinnedCostFunction_ChunkedNegLogLikelihood):
+                data_node_names += ('log_density_sum',)
+        if self._n_bins is not None:
+            self._bin_data()
+            self._set_new_binned_parametric_model()
+        super(UnbinnedFit, self)._on_data_values_change(data_node_names=data_node_names)
+
+    def _get_binned_cost_difference(self, parameter_values):
+        """difference between the exact and the binned negative log-likelihood for the given parameter values"""
+        _exact_nll = UnbinnedCostFunction_NegLogLikelihood.nll(
+            self._param_model.eval_model_function(support=self.data, model_parameters=parameter_values))
+        self._binned_param_model.parameters = parameter_values
+        _binned_nll = UnbinnedCostFunction_BinnedNegLogLikelihood.nll(
+            self._binned_data, self._binned_param_model.data / self._binned_param_model.bin_widths)
+        return _exact_nll - _binned_nll
+
+    def _get_n_workers(self):
+        if self._n_workers is None:
+            return min(multiprocessing.cpu_count(), self._data_container.size)
+        return min(int(self._n_workers), self._data_container.size)
+
+    def _get_node_names_to_freeze(self, first_fit):
+        # the unbinned cost functions do not use uncertainties -> don't build the (N, N) model error matrices
+        return []
+
+    def _get_input_fingerprint_items(self):
+        return super(UnbinnedFit, self)._get_input_fingerprint_items() + [
+            ('n_bins', self._n_bins),
+            ('binning', self._binning),
+            ('bin_evaluation', self._bin_evaluation),
+        ]
+
+    def _report_fit_results(self, output_stream, indent, indentation_level, asymmetric_parameter_errors):
+        super(UnbinnedFit, self)._report_fit_results(
+            output_stream=output_stream, indent=indent, indentation_level=indentation_level,
+            asymmetric_parameter_errors=asymmetric_parameter_errors)
+        if self._n_bins is None:
+            return
+
+        output_stream.write(indent * (indentation_level + 1) + "Binned Approximation\n")
+        output_stream.write(indent * (indentation_level + 1) + "====================\n\n")
+        output_stream.write(indent * (indentation_level + 2) + "Bins: %d (%s)\n\n"
+                            % (len(self._bin_edges) - 1, self._binning))
+        if not self.did_fit or self.parameter_cov_mat is None:
+            output_stream.write(indent * (indentation_level + 2) + 'Bias estimate: <not available>\n\n')
+            return
+        _bias = self.get_binning_bias()
+        _errors = self.parameter_errors
+        _bias_table = OrderedDict()
+        _bias_table['parameter'] = list(self.parameter_names)
+        _bias_table['bias'] = list(_bias)
+        _bias_table['bias/error'] = [_b / _e if _e > 0 else 0.0 for _b, _e in zip(_bias, _errors)]
+        print_dict_as_table(_bias_table, output_stream=output_stream, indent_level=indentation_level + 2)
+        output_stream.write('\n')
 
     @property
     def data_range(self):
@@ -99,6 +285,63 @@ class UnbinnedFit(FitBase):
     def goodness_of_fit(self):
         return None
 
+    @property
+    def n_bins(self):
+        """number of bins of the binned approximation of the likelihood or ``None`` if the data is not binned"""
+        if self._bin_edges is None:
+            return None
+        return len(self._bin_edges) - 1
+
+    @property
+    def bin_edges(self):
+        """bin edges of the binned approximation of the likelihood or ``None`` if the data is not binned"""
+        return self._bin_edges
+
+    @property
+    def binned_data(self):
+        """number of data points in each bin or ``None`` if the data is not binned"""
+        return self._binned_data
+
+    @property
+    def binned_model(self):
+        """model density averaged over each bin or ``None`` if the data is not binned"""
+        if self._binned_param_model is None:
+            return None
+        self._binned_param_model.parameters = self.parameter_values  # this is lazy, so just do it
+        return self._binned_param_model.data / self._binned_param_model.bin_widths
+
+    @property
+    def log_density_sum(self):
+        """sum of the logarithms of the model density at the data points"""
+        _par_values = list(self.parameter_values)
+        if self._worker_map is None:
+            return self._param_model.eval_log_density_sum(model_parameters=_par_values,
+                                                          chunk_size=self._chunk_size)
+        _n_slices = self._get_n_workers()
+        _slice_edges = np.linspace(0, self._data_container.size, _n_slices + 1).astype(int)
+        return np.sum(self._worker_map(
+            _eval_log_density_sum,
+            [(_start, _stop, _par_values, self._chunk_size)
+             for _start, _stop in zip(_slice_edges[:-1], _slice_edges[1:])]
+        ))
+
+    @property
+    def chunk_size(self):
+        """maximum number of data points for which the model density is evaluated at once"""
+        return self._chunk_size
+
+    @property
+    def n_workers(self):
+        """number of worker processes for evaluating the negative log-likelihood in :py:meth:`do_fit`"""
+        return self._n_workers
+
+    def update_data(self, data, copy=False):
+        super(UnbinnedFit, self).update_data(data, copy=copy)
+        self._param_model.support = self.data
+
+    # "inherit" docstring
+    update_data.__doc__ = FitBase.update_data.__doc__
+
     def eval_model_function(self, x=None, model_parameters=None):
         """
         Evaluate the model function.
@@ -114,6 +357,58 @@ class UnbinnedFit(FitBase):
         self._param_model.support = self.data
         return self._param_model.eval_model_function(support=x, model_parameters=model_parameters)
 
+    def do_fit(self, asymmetric_parameter_errors=False, cache=None):
+        _n_workers = self._get_n_workers()
+        if not isinstance(self._cost_function, UnbinnedCostFunction_ChunkedNegLogLikelihood) or _n_workers <= 1:
+            return super(UnbinnedFit, self).do_fit(
+                asymmetric_parameter_errors=asymmetric_parameter_errors, cache=cache)
+        # the workers are forked here with the current data and live until the end of the fit
+        with worker_pool(n_workers=_n_workers, shared_state=self._param_model) as _worker_map:
+            self._worker_map = _worker_map
+            try:
+                return super(UnbinnedFit, self).do_fit(
+                    asymmetric_parameter_errors=asymmetric_parameter_errors, cache=cache)
+            finally:
+                self._worker_map = None
+
+    # "inherit" docstring
+    do_fit.__doc__ = FitBase.do_fit.__doc__
+
+    def get_binning_bias(self, step_size=0.1):
+        """
+        Estimate the bias of the fit parameters caused by the binned approximation of the likelihood.
+
+        Starting from the current parameter values, one Newton step of the minimization of the exact unbinned
+        negative log-likelihood is estimated. The gradient is calculated numerically from the difference
+        between the exact and the binned cost function and the parameter covariance matrix of the binned fit
+        is used as the inverse Hessian. This requires evaluating the model at every data point twice per fit
+        parameter.
+
+        :param step_size: step size of the numerical differentiation in units of the parameter errors
+        :type step_size: float
+        :return: estimated difference between the binned and the unbinned fit results for each parameter
+        :rtype: numpy.ndarray
+        """
+        if self._n_bins is None:
+            raise UnbinnedFitException("Cannot estimate the binning bias: the data is not binned!")
+        _cov_mat = self.parameter_cov_mat
+        if _cov_mat is None:
+            raise UnbinnedFitException("Cannot estimate the binning bias: parameter covariance matrix not "
+                                       "available! Did you forget to run fit.do_fit()?")
+        _par_values = np.array(self.parameter_values, dtype=float)
+        _fixed_par_names = self._fitter.fixed_parameters
+        _gradient = np.zeros(len(_par_values))
+        for _i, (_par_name, _par_error) in enumerate(zip(self.parameter_names, self.parameter_errors)):
+            if _par_name in _fixed_par_names or not _par_error > 0:
+                continue
+            _step = np.zeros(len(_par_values))
+            _step[_i] = step_size * _par_error
+            _gradient[_i] = (self._get_binned_cost_difference(_par_values + _step)
+                             - self._get_binned_cost_difference(_par_values - _step)) / (2.0 * _step[_i])
+        # the gradient of the binned cost vanishes at its minimum and the cost is -2 ln L,
+        # so the Newton step towards the unbinned minimum is -1/2 * V * gradient
+        return 0.5 * np.asarray(_cov_mat).dot(_gradient)
+
     def report(self, output_stream=sys.stdout, asymmetric_parameter_errors=False):
         super(UnbinnedFit, self).report(output_stream=output_stream,
                                         asymmetric_parameter_errors=asymmetric_parameter_errors)
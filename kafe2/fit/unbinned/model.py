@@ -1,4 +1,5 @@
 import numpy as np
+import six
 
 from .._base import ParametricModelBaseMixin
 from .container import UnbinnedContainer, UnbinnedContainerException
@@ -15,7 +16,7 @@ class UnbinnedParametricModel(ParametricModelBaseMixin, UnbinnedContainer):
     def __init__(self, data, model_density_function=function_library.normal_distribution_pdf,
                  model_parameters=[1.0, 1.0]):
 
-        self.support = np.array(data)
+        self.support = np.asarray(data)  # don't copy memory-mapped data
 
         super(UnbinnedParametricModel, self).__init__(
             # this gets passed to ParametricModelBaseMixin.__init__
@@ -66,3 +67,32 @@ class UnbinnedParametricModel(ParametricModelBaseMixin, UnbinnedContainer):
         _x = support if support is not None else self.support
         _pars = model_parameters if model_parameters is not None else self.parameters
         return self._model_function_object(_x, *_pars)
+
+    def eval_log_density_sum(self, model_parameters=None, chunk_size=None, start=0, stop=None):
+        """
+        Evaluate the sum of the logarithms of the model density at the support points.
+
+        The model function is evaluated for at most **chunk_size** support points at once, so the memory needed
+        for temporary arrays does not grow with the number of support points.
+
+        :param model_parameters: values of the model parameters (if ``None``, the current values are used)
+        :type model_parameters: list or ``None``
+        :param chunk_size: maximum number of support points per evaluation of the model function (if ``None``,
+            all support points are evaluated at once)
+        :type chunk_size: int or ``None``
+        :param start: index of the first support point to include
+        :type start: int
+        :param stop: index after the last support point to include (if ``None``, include all remaining points)
+        :type stop: int or ``None``
+        :return: sum of the logarithms of the model density
+        :rtype: float
+        """
+        _pars = model_parameters if model_parameters is not None else self.parameters
+        _support = self.support[start:stop]
+        if chunk_size is None:
+            chunk_size = max(len(_support), 1)
+        _log_density_sum = 0.0
+        for _chunk_start in six.moves.range(0, len(_support), chunk_size):
+            _chunk = _support[_chunk_start:_chunk_start + chunk_size]
+            _log_density_sum += np.sum(np.log(self._model_function_object(_chunk, *_pars)))
+        return _log_density_sum
@@ -1,9 +1,12 @@
+from functools import partial
+
 import numpy as np
 import six
 
 from ...core.error import MatrixGaussianError, SimpleGaussianError
 from ..indexed import IndexedContainer
 from ..indexed.container import IndexedContainerException
+from ..io.columns import read_columns
 
 
 __all__ = ['XYContainer', 'XYContainerException']
@@ -22,22 +25,32 @@ class XYContainer(IndexedContainer):
     
     #TODO Why does the XYContainer constructor require data while
     #     HistContainer and IndexedContainer don't?
-    def __init__(self, x_data, y_data, dtype=float):
+    def __init__(self, x_data, y_data=None, dtype=float):
         """
         Construct a container for *xy* data:
 
-        :param x_data: a one-dimensional array of measurement *x* values
-        :type x_data: iterable of type <dtype>
+        :param x_data: a one-dimensional array of measurement *x* values. If **y_data** is ``None``, a
+            two-dimensional array containing the *x* values in the first and the *y* values in the second row.
+            A memory-mapped two-dimensional array (e.g. opened with ``numpy.load(file_path, mmap_mode='r')``)
+            or the path of a ``.npy`` file is used without loading the data into memory.
+        :type x_data: iterable of type <dtype> or str
         :param y_data: a one-dimensional array of measurement *y* values
-        :type y_data: iterable of type <dtype>
+        :type y_data: iterable of type <dtype> or None
         :param dtype: data type of the measurements
         :type dtype: type
         """
         # TODO: check user input (?)
-        if len(x_data) != len(y_data):
-            raise XYContainerException("x_data and y_data must have the same length!")
-        super(XYContainer, self).__init__(np.zeros(len(x_data)))  # super constructor doesn't allow 2D arrays
-        self._data = np.array([x_data, y_data], dtype=dtype)  # overwrite internal data storage
+        if y_data is None:
+            _data = self._as_data_array(x_data, dtype=dtype)
+            if _data.ndim != 2 or _data.shape[0] != 2:
+                raise XYContainerException("xy data must be a 2-d array with two rows! Got shape: %r..."
+                                           % (_data.shape,))
+        else:
+            if len(x_data) != len(y_data):
+                raise XYContainerException("x_data and y_data must have the same length!")
+            _data = np.array([x_data, y_data], dtype=dtype)
+        super(XYContainer, self).__init__(np.zeros(_data.shape[1]))  # super constructor doesn't allow 2D arrays
+        self._data = _data  # overwrite internal data storage
 
 
     # -- private methods
@@ -55,6 +68,8 @@ class XYContainer(IndexedContainer):
         return _axis_id
 
     def _get_data_for_axis(self, axis_id):
+        if not self._data.flags.writeable:
+            return self._data[axis_id]  # read-only data cannot be modified by the user, don't load it into memory
         return np.array(self._data[axis_id])
 
     def _calculate_total_error(self):
@@ -78,6 +93,39 @@ class XYContainer(IndexedContainer):
         """recalculate total errors next time they are needed"""
         self._total_error = None
 
+    def _set_axis_data_in_place(self, axis_id, data):
+        """
+        Write new data values for one axis into the existing data array. The error objects are kept and
+        only quantities depending on the data values (e.g. relative errors) are recalculated.
+
+        :param axis_id: ``0`` for *x* or ``1`` for *y*
+        :type axis_id: int
+        :param data: the new data values, must have the same length as the current data
+        :type data: iterable of float
+        """
+        _data = np.asarray(data, dtype=self._data.dtype)
+        if _data.shape != (self.size,):
+            raise XYContainerException("Cannot replace data of shape %r in place with data of shape %r!"
+                                       % ((self.size,), _data.shape))
+        self._make_data_writeable()
+        self._data[axis_id, :] = _data
+        self._update_error_references(axis_id=axis_id)
+
+    def _update_error_references(self, axis_id=None):
+        """reset member error references for one axis (or both axes if ``None``) to the current data values"""
+        for _axis_id in ((0, 1) if axis_id is None else (axis_id,)):
+            _axis_data = self._get_data_for_axis(_axis_id)
+            _has_relative_errors = False
+            for _err_dict in self._error_dicts.values():
+                if _err_dict['axis'] == _axis_id:
+                    _err_dict['err'].reference = _axis_data
+                    _has_relative_errors = _has_relative_errors or _err_dict['err'].relative
+            if _has_relative_errors:
+                self._clear_total_error_cache()
+            elif self._total_error is not None:
+                # the absolute total error does not depend on the data values
+                self._total_error[_axis_id].reference = _axis_data
+
     # -- public properties
 
     @property
@@ -88,6 +136,8 @@ class XYContainer(IndexedContainer):
     @property
     def data(self):
         """container data (both *x* and *y*, two-dimensional :py:obj:`numpy.ndarray`)"""
+        if not self._data.flags.writeable:
+            return self._data  # read-only data cannot be modified by the user, don't load it into memory
         return self._data.copy()  # copy to ensure no modification by user
 
     @data.setter
@@ -114,6 +164,7 @@ class XYContainer(IndexedContainer):
         _new_x_data = np.squeeze(np.array(new_x))
         if len(_new_x_data.shape) > 1:
             raise XYContainerException("XYContainer 'x' data must be 1-d array of floats! Got shape: %r..." % (_new_x_data.shape,))
+        self._make_data_writeable()
         self._data[0, :] = new_x
         for _err_dict in self._error_dicts.values():
             if _err_dict['axis'] == 0:
@@ -154,6 +205,7 @@ class XYContainer(IndexedContainer):
         _new_y_data = np.squeeze(np.array(new_y))
         if len(_new_y_data.shape) > 1:
             raise XYContainerException("XYContainer 'y' data must be 1-d array of floats! Got shape: %r..." % (_new_y_data.shape,))
+        self._make_data_writeable()
         self._data[1, :] = new_y
         for _err_dict in self._error_dicts.values():
             if _err_dict['axis'] == 1:
@@ -198,6 +250,42 @@ class XYContainer(IndexedContainer):
 
     # -- public methods
 
+    @classmethod
+    def from_columns(cls, file_path, x_column=0, y_column=1, x_error_column=None, y_error_column=None,
+                     file_format=None, delimiter=None, chunk_size=None):
+        """
+        Construct a container from the columns of a text, ``.npy``, ``.npz`` or HDF5 file. See
+        :py:func:`~kafe2.fit.io.iter_column_chunks` for details on the supported file formats.
+
+        :param file_path: path of the file
+        :type file_path: str
+        :param x_column: name or zero-based index of the column containing the *x* values
+        :type x_column: str or int
+        :param y_column: name or zero-based index of the column containing the *y* values
+        :type y_column: str or int
+        :param x_error_column: name or index of a column containing pointwise *x* uncertainties. If not
+                               ``None``, they are added as an uncorrelated *x* error.
+        :type x_error_column: str or int or None
+        :param y_error_column: name or index of a column containing pointwise *y* uncertainties. If not
+                               ``None``, they are added as an uncorrelated *y* error.
+        :type y_error_column: str or int or None
+        :param file_format: file format. If ``None``, it is inferred from the file name extension.
+        :type file_format: str or None
+        :param delimiter: column delimiter for text files. If ``None``, detect it automatically.
+        :type delimiter: str or None
+        :param chunk_size: number of rows to parse at once, see :py:func:`~kafe2.fit.io.read_columns`
+        :type chunk_size: int or None
+        :return: the new container
+        """
+        _error_columns = [(_axis, _column) for _axis, _column in (('x', x_error_column), ('y', y_error_column))
+                          if _column is not None]
+        _arrays = read_columns(file_path, [x_column, y_column] + [_column for _, _column in _error_columns],
+                               file_format=file_format, delimiter=delimiter, chunk_size=chunk_size)
+        _container = cls(_arrays[0], _arrays[1])
+        for (_axis, _), _err_val in zip(_error_columns, _arrays[2:]):
+            _container.add_error(axis=_axis, err_val=_err_val)
+        return _container
+
     def add_error(self, axis, err_val, name=None, correlation=0, relative=False):
         """
         Add an uncertainty source for an axis to the data container.
@@ -227,7 +315,7 @@ class XYContainer(IndexedContainer):
             err_val = np.ones(self.size) * err_val
 
         _err = SimpleGaussianError(err_val=err_val, corr_coeff=correlation,
-                                   relative=relative, reference=lambda: self._get_data_for_axis(_axis))
+                                   relative=relative, reference=partial(self._get_data_for_axis, _axis))
         _name = self._add_error_object(name=name, error_object=_err, axis=_axis)
         return _name
 
@@ -254,7 +342,7 @@ class XYContainer(IndexedContainer):
         _axis = self._find_axis_raise(axis)
         _err = MatrixGaussianError(
             err_matrix=err_matrix, matrix_type=matrix_type, err_val=err_val,
-            relative=relative, reference=lambda: self._get_data_for_axis(_axis)
+            relative=relative, reference=partial(self._get_data_for_axis, _axis)
         )
         _name = self._add_error_object(name=name, error_object=_err, axis=_axis)
         return _name
@@ -3,38 +3,14 @@ import scipy.stats
 import six
 
 from .._base import FitEnsembleBase, FitEnsembleException
-from ..tools.ensemble import EnsembleVariable, EnsembleVariablePlotter
+from ..tools.ensemble import EnsembleVariablePlotter, MultivariateNormalSampler
 from .cost import XYCostFunction_Chi2
 from .fit import XYFit
 
-import matplotlib as mpl
-from matplotlib import pyplot as plt
-from matplotlib import gridspec as gs
-
 
 __all__ = ["XYFitEnsemble"]
 
 
-def _heuristic_optimal_subplot_grid_size(n_subplots, aspect_ratio_priority=0.5):
-    def f2(s, k):
-        if n_subplots > s * (s + k):
-            return 100000
-        return ((s * (s + k) - n_subplots) ** 2 * (1.0 - aspect_ratio_priority)
-                + (float(k) / float(s)) ** 2 * (aspect_ratio_priority))
-
-    _optimal_f = np.inf
-    _optimal_sk = n_subplots, 0
-    for s in six.moves.range(1, n_subplots):
-        for k in six.moves.range(0, n_subplots):
-            _f = f2(s, k)
-            if _f < _optimal_f:
-                _optimal_f = _f
-                _optimal_sk = s, k
-
-    s, k = _optimal_sk
-    return s, s+k
-
-
 class XYFitEnsembleException(FitEnsembleException):
     pass
 
@@ -61,21 +37,17 @@ class XYFitEnsemble(FitEnsembleBase):
     .. TODO Expand section
     """
     FIT_TYPE = XYFit
+    EXCEPTION_TYPE = XYFitEnsembleException
 
-    AVAILABLE_STATISTICS = {
-        'mean': EnsembleVariable.mean,
-        'mean_error': EnsembleVariable.mean_error,
-        'std': EnsembleVariable.std,
-        'skew': EnsembleVariable.skew,
-        'kurtosis': EnsembleVariable.kurtosis,
-        'cor_mat': EnsembleVariable.cor_mat,
-        'cov_mat': EnsembleVariable.cov_mat,
-    }
-    _DEFAULT_STATISTICS = {'mean', 'std'}
+    # methods for performing the toy fits (see `run`)
+    _TOY_FIT_ENGINES = ('auto', 'minimizer', 'linear', 'batched')
+    # convergence criteria for the 'batched' toy fit engine
+    _BATCHED_TOY_FIT_MAX_ITERATIONS = 100
+    _BATCHED_TOY_FIT_EDM_TOLERANCE = 1e-10
 
     def __init__(self, n_experiments, x_support, model_function, model_parameters,
                  cost_function=XYCostFunction_Chi2(axes_to_use='y', errors_to_use='covariance'),
-                 requested_results=None):
+                 requested_results=None, store_values=True, storage_dir=None):
         """
         Construct an :py:obj:`~kafe2.fit.XYFitEnsemble` object.
 
@@ -91,13 +63,24 @@ class XYFitEnsemble(FitEnsembleBase):
         :type cost_function: :py:class:`~kafe2.fit._base.CostFunctionBase`-derived or unwrapped native Python function
         :param requested_results: list of result variables to collect for each toy fit
         :type requested_results: iterable of str
+        :param store_values: if ``False``, the results of the individual toy fits are not stored. Only the
+                             statistics of the result variables are accumulated online, so the memory
+                             needed does not grow with **n_experiments**.
+        :type store_values: bool
+        :param storage_dir: if given, the results of the individual toy fits are stored in ``.npy`` files
+                            in this directory (one file per result variable) instead of in memory
+        :type storage_dir: str or ``None``
         """
-        self._n_exp = n_experiments
         self._ref_x_data = np.asarray(x_support, dtype=float)
         self._model_function = model_function
         self._model_parameters = np.asarray(model_parameters)
         self._cost_function = cost_function
         self._n_par = len(self._model_parameters)
+        # matrices for solving toy fits of linear models in closed form, set by `run` if applicable
+        self._linear_toy_fit_matrices = None
+        # quantities for performing the toy fits of a block in lockstep, set by `run` if applicable
+        self._batched_toy_fit_setup = None
+        self._toy_fit_engine = 'auto'
 
         # initialize an `XYFit` object for performing the toy fits
         # need some dummy initial data values in order to initialize a Fit object
@@ -110,78 +93,333 @@ class XYFitEnsemble(FitEnsembleBase):
 
         # set the model parameters of the toy fit to the reference values
         self._set_toy_fit_parameters_to_reference()
+        # initial step sizes of the minimizer, restored before each toy fit
+        self._toy_fit_initial_step_sizes = self._toy_fit._fitter.minimizer.parameter_errors
 
         # get reference quantities (y data, covariance matrices...) from toy fit
         self._update_reference_quantities_from_toy_fit()
 
-        # store and validate names of requested ensemble variables
-        self._requested_results = requested_results
-        if self._requested_results is None:
-            self._requested_results = self._DEFAULT_RESULTS
-        else:
-            # validate list of results requested by user
-            _unavailable_results = set(self._requested_results) - set(self.AVAILABLE_RESULTS.keys())
-            if _unavailable_results:
-                raise ValueError("Requested unavailable result variable(s): %r"
-                                 % (_unavailable_results,))
-
-        # initialize `EnsembleVariable` objects to store ensembles
-        self._initialize_ensemble_variables()
+        super(XYFitEnsemble, self).__init__(n_experiments=n_experiments, requested_results=requested_results,
+                                            store_values=store_values, storage_dir=storage_dir)
 
-    def _set_toy_fit_parameters_to_reference(self):
-        """set the model parameters of the toy fit to the reference values"""
-        self._toy_fit._param_model._model_parameters = self._model_parameters
-        self._toy_fit._param_model._pm_calculation_stale = True
-
-    def _generate_pseudodata(self):
-        """generate new pseudo-data according to fit error model and commit to data container"""
+    def _generate_pseudodata_block(self, random_generator, n_toys):
+        """draw the 'x' and 'y' jitter for a block of pseudo-experiments at once"""
+        # TODO: only gaussian smearing is implemented -> more?
+        _x_jitter = None
+        if self._toy_fit.data_container.has_x_errors:
+            _x_jitter = self._x_jitter_sampler.sample(random_generator, n_toys)
+        _y_jitter = self._y_jitter_sampler.sample(random_generator, n_toys)
+        return _x_jitter, _y_jitter
 
-        if not self._toy_fit.has_errors:
-            raise FitEnsembleException("Cannot generate fit ensemble: no error model specified!")
+    def _generate_pseudodata(self, x_jitter, y_jitter):
+        """generate new pseudo-data from pre-drawn jitter values and commit to data container"""
 
         # -- generate 'x' data
         _x_data = self._ref_x_data.copy()
 
-        if self._toy_fit.data_container.has_x_errors:
+        if x_jitter is not None:
             # smear x data according to the total 'x' covariance matrix
-            # TODO: only gaussian smearing is implemented -> more?
-            _x_jitter = np.random.multivariate_normal(
-                np.zeros_like(_x_data),
-                self._ref_x_cov_mat)
-            _x_data += _x_jitter
+            _x_data += x_jitter
 
         _y_data = self._toy_fit.eval_model_function(x=_x_data,
                                                     model_parameters=self._model_parameters)
 
         # smear y data according to the total 'y' covariance matrix
-        # TODO: only gaussian smearing is implemented -> more?
-        _y_jitter = np.random.multivariate_normal(
-            np.zeros_like(_y_data),
-            self._ref_y_cov_mat)
-        _y_data += _y_jitter
-
-        # update toy fit data container
-        self._toy_fit.data_container.x = _x_data
-        self._toy_fit.data_container.y = _y_data
+        _y_data += y_jitter
 
-    def _gather_results_from_toy_fit(self, i_exp):
-        for _var_name in self._requested_results:
-            self._ensemble_variables[_var_name].set_value(index=i_exp, variable_value=self._get_var(_var_name))
+        # update toy fit data in place
+        self._toy_fit.update_data(x=_x_data, y=_y_data)
 
-    def _do_toy_fit(self):
-        """run fit with current pseudo-data"""
-        self._toy_fit.do_fit()
+    def _set_toy_fit_pseudodata(self, pseudodata_block, i_toy):
+        _x_jitter, _y_jitter = pseudodata_block
+        self._generate_pseudodata(None if _x_jitter is None else _x_jitter[i_toy], _y_jitter[i_toy])
 
-    def _get_var(self, var_name):
-        """get the value of the result variables for the current fit"""
-        return self.AVAILABLE_RESULTS[var_name].fget(self)
+    def _eval_toy_model(self, parameter_values):
+        """
+        evaluate the model at the reference 'x' values for one parameter vector or for a batch of
+        parameter vectors with shape ``(n_toys, n_par)``
+        """
+        parameter_values = np.asarray(parameter_values, dtype=float)
+        _n_toys = None
+        if parameter_values.ndim == 2:
+            # pass parameter columns, relying on the model function to broadcast over the leading axis
+            _n_toys = parameter_values.shape[0]
+            parameter_values = [_column[:, np.newaxis] for _column in parameter_values.T]
+        with np.errstate(all='ignore'):
+            _values = np.asarray(self._toy_fit.eval_model_function(x=self._ref_x_data,
+                                                                   model_parameters=parameter_values),
+                                 dtype=float)
+        if _n_toys is not None:
+            _values = np.broadcast_to(_values, (_n_toys, self.n_dat))
+        return _values
+
+    def _get_toy_fit_weights(self):
+        """
+        Check if the chi2 of the toy fits is a quadratic form of the residuals with a weight matrix which is the
+        same for all pseudo-experiments and return the weight matrix and the pointwise 'y' errors.
+        Raise an exception stating the reason if this is not the case.
+        """
+        if self._toy_fit.has_x_errors:
+            raise XYFitEnsembleException("the uncertainty model contains 'x' errors")
+        if self._toy_fit.get_matching_errors(dict(relative=True)):
+            raise XYFitEnsembleException("the uncertainty model contains relative errors")
+        if self._toy_fit.parameter_constraints:
+            raise XYFitEnsembleException("the fit has parameter constraints")
+
+        _cost_function = self._toy_fit._cost_function
+        _chi2_variant = getattr(getattr(_cost_function, '_cost_function_handle', None), '__name__', None)
+        if not isinstance(_cost_function, XYCostFunction_Chi2) or _chi2_variant not in (
+                'chi2_covariance', 'chi2_pointwise_errors', 'chi2_no_errors'):
+            raise XYFitEnsembleException("the cost function is not a built-in chi2 cost function")
+
+        _y_errors = np.asarray(self._toy_fit.y_total_error, dtype=float)
+        if _chi2_variant == 'chi2_covariance':
+            _weights = self._toy_fit.y_total_cov_mat_inverse
+            if _weights is None:
+                raise XYFitEnsembleException("the 'y' covariance matrix is singular")
+            _weights = np.asarray(_weights, dtype=float)
+        elif _chi2_variant == 'chi2_pointwise_errors':
+            if np.any(_y_errors == 0):
+                raise XYFitEnsembleException("some 'y' errors are zero")
+            _weights = np.diag(1.0 / _y_errors ** 2)
+        else:
+            _weights = np.eye(self.n_dat)
+        return _weights, _y_errors
 
-    def _initialize_ensemble_variables(self):
+    def _get_linear_toy_fit_matrices(self):
+        """
+        Check if the toy fits can be performed as a single generalized least-squares solve for a whole block
+        of pseudo-experiments and return the matrices needed for this. Raise an exception stating the reason
+        if this is not possible.
+        """
+        _weights, _y_errors = self._get_toy_fit_weights()
+
+        # determine the design matrix of the model and check that it is linear in the parameters
+        _model = self._eval_toy_model
+        try:
+            _offset = _model(np.zeros(self._n_par))
+            _design_matrix = np.column_stack([_model(_unit_vector) - _offset
+                                              for _unit_vector in np.eye(self._n_par)])
+            for _test_parameters in (self._model_parameters, 2 * self._model_parameters + 1,
+                                     np.random.RandomState(0).standard_normal(self._n_par)):
+                _values = _model(_test_parameters)
+                _expected_values = _offset + _design_matrix.dot(_test_parameters)
+                if not np.all(np.isfinite(_values)) or not np.allclose(
+                        _values, _expected_values, rtol=1e-9, atol=1e-9 * np.max(np.abs(_expected_values))):
+                    raise XYFitEnsembleException("the model function is not linear in its parameters")
+        except XYFitEnsembleException:
+            raise
+        except Exception as _e:
+            raise XYFitEnsembleException("the model function could not be evaluated for "
+                                         "all parameter values: {}".format(_e))
+
+        _weighted_design_matrix = _weights.dot(_design_matrix)
+        try:
+            _parameter_cov_mat = np.linalg.inv(_design_matrix.T.dot(_weighted_design_matrix))
+        except np.linalg.LinAlgError:
+            raise XYFitEnsembleException("the model parameters are not determined by the data")
+
+        return dict(
+            offset=_offset,
+            design_matrix=_design_matrix,
+            weights=_weights,
+            estimator=_parameter_cov_mat.dot(_weighted_design_matrix.T),
+            parameter_errors=np.sqrt(np.diag(_parameter_cov_mat)),
+            y_errors=_y_errors,
+        )
+
+    def _run_linear_toy_fit_block(self, random_generator, n_toys):
+        """perform a block of pseudo-experiments for a linear model without invoking the minimizer"""
+        _matrices = self._linear_toy_fit_matrices
+        _, _y_jitter = self._generate_pseudodata_block(random_generator, n_toys)
+
+        _y_data = self._ref_y_data + _y_jitter
+        _parameter_values = (_y_data - _matrices['offset']).dot(_matrices['estimator'].T)
+        _y_model = _matrices['offset'] + _parameter_values.dot(_matrices['design_matrix'].T)
+        _residuals = _y_data - _y_model
+
+        _all_results = dict(
+            x_data=lambda: np.tile(self._ref_x_data, (n_toys, 1)),
+            y_data=lambda: _y_data,
+            y_model=lambda: _y_model,
+            y_pulls=lambda: _residuals / _matrices['y_errors'],
+            parameter_pulls=lambda: (_parameter_values - self._model_parameters) / _matrices['parameter_errors'],
+            cost=lambda: np.sum(_residuals.dot(_matrices['weights']) * _residuals, axis=1),
+        )
+        return dict((_var_name, _all_results[_var_name]()) for _var_name in self._requested_results)
+
+    def _get_batched_toy_fit_setup(self):
+        """
+        Check if the toy fits for a block of pseudo-experiments can be performed in lockstep, evaluating the
+        model for all of them at once, and return the quantities needed for this. Raise an exception stating
+        the reason if this is not possible.
+        """
+        _weights, _y_errors = self._get_toy_fit_weights()
+
+        _test_parameters = np.array([self._model_parameters,
+                                     1.01 * self._model_parameters + 0.01,
+                                     0.99 * self._model_parameters - 0.01])
+        try:
+            _batch_values = self._eval_toy_model(_test_parameters)
+            _values = np.array([self._eval_toy_model(_p) for _p in _test_parameters])
+        except Exception as _e:
+            raise XYFitEnsembleException("the model function does not support evaluation for a batch of "
+                                         "parameter values: {}".format(_e))
+        if not np.all(np.isfinite(_values)) or not np.allclose(_batch_values, _values, rtol=1e-12, atol=0):
+            raise XYFitEnsembleException("the model function does not broadcast over a batch of "
+                                         "parameter values")
+
+        # scales for the finite-difference steps
+        _parameter_scales = np.maximum(np.abs(self._model_parameters),
+                                       np.abs(self._toy_fit_initial_step_sizes))
+        _parameter_scales[_parameter_scales == 0] = 1.0
+        return dict(weights=_weights, y_errors=_y_errors, parameter_scales=_parameter_scales)
+
+    def _eval_toy_model_jacobian(self, parameter_values):
+        """
+        evaluate the derivatives of the model by the parameters for a batch of parameter vectors using
+        central finite differences, returning an array with shape ``(n_toys, n_dat, n_par)``
+        """
+        _steps = 1e-6 * self._batched_toy_fit_setup['parameter_scales']
+        _jacobian = np.empty(parameter_values.shape[:1] + (self.n_dat, self._n_par))
+        for _j, _step_vector in enumerate(np.diag(_steps)):
+            _jacobian[:, :, _j] = (self._eval_toy_model(parameter_values + _step_vector)
+                                   - self._eval_toy_model(parameter_values - _step_vector)) / (2 * _steps[_j])
+        return _jacobian
+
+    def _eval_toy_model_hessian(self, parameter_values):
+        """
+        evaluate the second derivatives of the model by the parameters for a batch of parameter vectors using
+        central finite differences, returning an array with shape ``(n_toys, n_dat, n_par, n_par)``
+        """
+        _steps = 1e-4 * self._batched_toy_fit_setup['parameter_scales']
+        _step_vectors = np.diag(_steps)
+        _hessian = np.empty(parameter_values.shape[:1] + (self.n_dat, self._n_par, self._n_par))
+        for _j in six.moves.range(self._n_par):
+            for _k in six.moves.range(_j + 1):
+                _hessian[:, :, _j, _k] = _hessian[:, :, _k, _j] = (
+                    self._eval_toy_model(parameter_values + _step_vectors[_j] + _step_vectors[_k])
+                    - self._eval_toy_model(parameter_values + _step_vectors[_j] - _step_vectors[_k])
+                    - self._eval_toy_model(parameter_values - _step_vectors[_j] + _step_vectors[_k])
+                    + self._eval_toy_model(parameter_values - _step_vectors[_j] - _step_vectors[_k])
+                ) / (4 * _steps[_j] * _steps[_k])
+        return _hessian
+
+    def _run_batched_toy_fit_block(self, random_generator, n_toys):
+        """
+        perform a block of pseudo-experiments, advancing all toy fits in lockstep with the Levenberg-Marquardt
+        algorithm. Toy fits which fail to converge are repeated with the minimizer.
+        """
+        _weights = self._batched_toy_fit_setup['weights']
+        _, _y_jitter = self._generate_pseudodata_block(random_generator, n_toys)
+        _y_data = self._ref_y_data + _y_jitter
+
+        def _chi2(residuals):
+            return np.sum(residuals.dot(_weights) * residuals, axis=1)
+
+        # start all toy fits from the reference parameter values
+        _parameter_values = np.tile(self._model_parameters, (n_toys, 1))
+        _residuals = _y_data - self._eval_toy_model(_parameter_values)
+        _cost = _chi2(_residuals)
+        _damping = np.full(n_toys, 1e-3)
+        _active = np.isfinite(_cost)
+        _converged = np.zeros(n_toys, dtype=bool)
+
+        for _ in six.moves.range(self._BATCHED_TOY_FIT_MAX_ITERATIONS):
+            _idx = np.flatnonzero(_active)
+            if not len(_idx):
+                break
+            _jacobian = self._eval_toy_model_jacobian(_parameter_values[_idx])
+            _weighted_jacobian_t = np.einsum('mdp,de->mpe', _jacobian, _weights)
+            _normal_matrix = np.matmul(_weighted_jacobian_t, _jacobian)
+            _gradient = np.einsum('mpd,md->mp', _weighted_jacobian_t, _residuals[_idx])
+            try:
+                _gauss_newton_step = np.linalg.solve(_normal_matrix, _gradient[..., np.newaxis])[..., 0]
+            except np.linalg.LinAlgError:
+                break  # singular normal matrix: let the minimizer handle the remaining toy fits
+
+            # expected decrease of the cost function, as for the Minuit EDM criterion
+            _edm = np.sum(_gradient * _gauss_newton_step, axis=1)
+            _newly_converged = _edm < self._BATCHED_TOY_FIT_EDM_TOLERANCE
+            _converged[_idx[_newly_converged]] = True
+            _active[_idx[_newly_converged]] = False
+
+            _step_idx = ~_newly_converged
+            _idx = _idx[_step_idx]
+            if not len(_idx):
+                break
+            _normal_matrix = _normal_matrix[_step_idx]
+            _diagonal = np.diagonal(_normal_matrix, axis1=1, axis2=2)
+            _damped_matrix = _normal_matrix + (_damping[_idx, np.newaxis] * _diagonal)[..., np.newaxis] * np.eye(
+                self._n_par)
+            try:
+                _step = np.linalg.solve(_damped_matrix, _gradient[_step_idx][..., np.newaxis])[..., 0]
+            except np.linalg.LinAlgError:
+                break
+
+            _new_parameter_values = _parameter_values[_idx] + _step
+            _new_residuals = _y_data[_idx] - self._eval_toy_model(_new_parameter_values)
+            _new_cost = _chi2(_new_residuals)
+            _accept = _new_cost <= _cost[_idx]
+            _accepted_idx = _idx[_accept]
+            _parameter_values[_accepted_idx] = _new_parameter_values[_accept]
+            _residuals[_accepted_idx] = _new_residuals[_accept]
+            _cost[_accepted_idx] = _new_cost[_accept]
+            _damping[_accepted_idx] *= 0.3
+            _damping[_idx[~_accept]] *= 10.0
+            # give up on toy fits for which no step leads to a decrease
+            _active[_idx[_damping[_idx] > 1e10]] = False
+
+        # parameter errors from the full Hessian of the cost function at the minimum
+        _parameter_errors = np.full((n_toys, self._n_par), np.nan)
+        _idx = np.flatnonzero(_converged)
+        if len(_idx):
+            _jacobian = self._eval_toy_model_jacobian(_parameter_values[_idx])
+            _half_cost_hessian = (np.einsum('mdp,de,meq->mpq', _jacobian, _weights, _jacobian)
+                                  - np.einsum('md,mdpq->mpq', _residuals[_idx].dot(_weights),
+                                              self._eval_toy_model_hessian(_parameter_values[_idx])))
+            with np.errstate(invalid='ignore'):
+                try:
+                    _parameter_errors[_idx] = np.sqrt(np.diagonal(np.linalg.inv(_half_cost_hessian),
+                                                                  axis1=1, axis2=2))
+                except np.linalg.LinAlgError:
+                    _converged[_idx] = False
+            _converged &= np.all(np.isfinite(_parameter_errors), axis=1) & np.all(_parameter_errors > 0, axis=1)
+
+        _y_model = _y_data - _residuals
+        _all_results = dict(
+            x_data=lambda: np.tile(self._ref_x_data, (n_toys, 1)),
+            y_data=lambda: _y_data,
+            y_model=lambda: _y_model,
+            y_pulls=lambda: _residuals / self._batched_toy_fit_setup['y_errors'],
+            parameter_pulls=lambda: (_parameter_values - self._model_parameters) / _parameter_errors,
+            cost=lambda: _cost,
+        )
+        _block_results = dict((_var_name, np.array(_all_results[_var_name]()))
+                              for _var_name in self._requested_results)
+
+        # fall back to the minimizer for toy fits which did not converge
+        for _i_toy in np.flatnonzero(~_converged):
+            self._generate_pseudodata(None, _y_jitter[_i_toy])
+            self._do_toy_fit()
+            for _var_name in self._requested_results:
+                _block_results[_var_name][_i_toy] = self._get_var(_var_name)
+        return _block_results
+
+    def _run_toy_fit_block(self, random_generator, n_toys):
+        """perform a block of pseudo-experiments and return the requested result variables for each of them"""
+        if self._linear_toy_fit_matrices is not None:
+            return self._run_linear_toy_fit_block(random_generator, n_toys)
+        if self._batched_toy_fit_setup is not None:
+            return self._run_batched_toy_fit_block(random_generator, n_toys)
+        return super(XYFitEnsemble, self)._run_toy_fit_block(random_generator, n_toys)
+
+    def _initialize_ensemble_variables(self, resume=False, open_storage=True):
         self._ensemble_variables = {}
         self._ensemble_variable_plotters = {}
         if 'y_pulls' in self._requested_results:
-            self._ensemble_variables['y_pulls'] = EnsembleVariable(
-                ensemble_array=np.zeros((self._n_exp, self.n_dat)),
+            self._ensemble_variables['y_pulls'] = self._make_ensemble_variable(
+                'y_pulls', (self.n_dat,), resume=resume, open_storage=open_storage,
                 distribution=scipy.stats.norm,
                 distribution_parameters=dict(loc=0, scale=1)
             )
@@ -192,8 +430,8 @@ class XYFitEnsemble(FitEnsembleBase):
             )
 
         if 'x_data' in self._requested_results:
-            self._ensemble_variables['x_data'] = EnsembleVariable(
-                ensemble_array=np.zeros((self._n_exp, self.n_dat)),
+            self._ensemble_variables['x_data'] = self._make_ensemble_variable(
+                'x_data', (self.n_dat,), resume=resume, open_storage=open_storage,
                 distribution=scipy.stats.norm,
                 distribution_parameters=dict(loc=self._ref_x_data, scale=self._toy_fit.x_total_error)
             )
@@ -205,8 +443,8 @@ class XYFitEnsemble(FitEnsembleBase):
             )
 
         if 'y_data' in self._requested_results:
-            self._ensemble_variables['y_data'] = EnsembleVariable(
-                ensemble_array=np.zeros((self._n_exp, self.n_dat)),
+            self._ensemble_variables['y_data'] = self._make_ensemble_variable(
+                'y_data', (self.n_dat,), resume=resume, open_storage=open_storage,
                 distribution=scipy.stats.norm,
                 distribution_parameters=dict(loc=self._ref_y_data, scale=self._ref_projected_xy_err)
             )
@@ -218,8 +456,8 @@ class XYFitEnsemble(FitEnsembleBase):
             )
 
         if 'y_model' in self._requested_results:
-            self._ensemble_variables['y_model'] = EnsembleVariable(
-                ensemble_array=np.zeros((self._n_exp, self.n_dat)),
+            self._ensemble_variables['y_model'] = self._make_ensemble_variable(
+                'y_model', (self.n_dat,), resume=resume, open_storage=open_storage,
                 distribution=scipy.stats.norm,
                 distribution_parameters=dict(loc=self._ref_y_data, scale=self._ref_projected_xy_err)
             )
@@ -231,8 +469,9 @@ class XYFitEnsemble(FitEnsembleBase):
             )
 
         if 'parameter_pulls' in self._requested_results:
-            self._ensemble_variables['parameter_pulls'] = EnsembleVariable(
-                ensemble_array=np.zeros((self._n_exp, self._n_par)),
+            self._ensemble_variables['parameter_pulls'] = self._make_ensemble_variable(
+                'parameter_pulls', (self._n_par,), resume=resume, open_storage=open_storage,
+                with_comoments=True,
                 distribution=scipy.stats.norm,
                 distribution_parameters=dict(loc=0, scale=1)
             )
@@ -244,8 +483,8 @@ class XYFitEnsemble(FitEnsembleBase):
             )
 
         if 'cost' in self._requested_results:
-            self._ensemble_variables['cost'] = EnsembleVariable(
-                ensemble_array=np.zeros((self._n_exp,)),
+            self._ensemble_variables['cost'] = self._make_ensemble_variable(
+                'cost', (), resume=resume, open_storage=open_storage,
                 distribution=scipy.stats.chi2,  # FIXME: assume chi2 for all cost functions -> change
                 distribution_parameters=dict(loc=0, df=self.n_df)
             )
@@ -255,21 +494,29 @@ class XYFitEnsemble(FitEnsembleBase):
                 variable_labels="${}$".format(self._toy_fit._cost_function.formatter.latex_name)
             )
 
-    def _make_figure_gs(self, figsize=(8, 8), nrows=1, ncols=1,
-                        left=0.1, bottom=0.1,
-                        right=0.9, top=0.9):
-        """create a new matplotlib figure with a GridSpec controlling the subplot layout"""
-        _fig = plt.figure(figsize=figsize)  # defaults from matplotlibrc
-        _gs = gs.GridSpec(nrows=nrows,
-                          ncols=ncols,
-                          left=left,
-                          bottom=bottom,
-                          right=right,
-                          top=top,
-                          wspace=None,
-                          hspace=None,
-                          height_ratios=None)
-        return _fig, _gs
+    def _prepare_run(self):
+        if not self._toy_fit.has_errors:
+            raise XYFitEnsembleException("Cannot generate fit ensemble: no error model specified!")
+
+        self._set_toy_fit_parameters_to_reference()
+        self._update_reference_quantities_from_toy_fit()
+
+        # select the toy fit engine
+        _engine = self._toy_fit_engine
+        self._linear_toy_fit_matrices = None
+        self._batched_toy_fit_setup = None
+        if _engine in ('auto', 'linear'):
+            try:
+                self._linear_toy_fit_matrices = self._get_linear_toy_fit_matrices()
+            except XYFitEnsembleException as _e:
+                if _engine == 'linear':
+                    raise XYFitEnsembleException("Cannot use 'linear' toy fit engine: {}!".format(_e))
+        if _engine == 'batched' or (_engine == 'auto' and self._linear_toy_fit_matrices is None):
+            try:
+                self._batched_toy_fit_setup = self._get_batched_toy_fit_setup()
+            except XYFitEnsembleException as _e:
+                if _engine == 'batched':
+                    raise XYFitEnsembleException("Cannot use 'batched' toy fit engine: {}!".format(_e))
 
     def _update_reference_quantities_from_toy_fit(self):
         self._ref_y_data = self._toy_fit.eval_model_function(x=self._ref_x_data,
@@ -280,13 +527,16 @@ class XYFitEnsemble(FitEnsembleBase):
         self._ref_x_err = self._toy_fit.x_total_error
         self._ref_y_err = self._toy_fit.y_total_error
         self._ref_projected_xy_err = self._toy_fit.total_error
+        # factorize the covariance matrices once for generating the pseudo-data
+        self._x_jitter_sampler = MultivariateNormalSampler(self._ref_x_cov_mat)
+        self._y_jitter_sampler = MultivariateNormalSampler(self._ref_y_cov_mat)
 
     # -- private properties
 
     @property
     def _x_data(self):
         """property for ensemble variable 'x_data'"""
-        return self._toy_fit.x
+        return self._toy_fit.x_data
 
     @property
     def _parameter_pulls(self):
@@ -316,16 +566,6 @@ class XYFitEnsemble(FitEnsembleBase):
 
     # -- public properties
 
-    @property
-    def n_exp(self):
-        """the number of pseudo-experiments to perform"""
-        return self._n_exp
-
-    @property
-    def n_par(self):
-        """the number of parameters"""
-        return self._n_par
-
     @property
     def n_dat(self):
         """the number of degrees of freedom for the fit"""
@@ -358,254 +598,33 @@ class XYFitEnsemble(FitEnsembleBase):
     # "inherit" docstring
     add_matrix_error.__doc__ = XYFit.add_matrix_error.__doc__
 
-    def run(self):
-        """Perform the pseudo-experiments. Retrieve and store the requested fit result variables."""
-        self._set_toy_fit_parameters_to_reference()
-        self._update_reference_quantities_from_toy_fit()
-        self._initialize_ensemble_variables()
-        for _i_exp in six.moves.range(self.n_exp):
-            self._generate_pseudodata()
-            self._do_toy_fit()
-            self._gather_results_from_toy_fit(_i_exp)
-
-    def get_results(self, *results):
+    def run(self, seed=None, n_workers=1, checkpoint_file=None, checkpoint_interval=10, resume=False,
+            target_precision=None, precision_check_interval=10, engine='auto'):
+        """Perform the pseudo-experiments. Retrieve and store the requested fit result variables.
+
+        See :py:meth:`~kafe2.fit._base.FitEnsembleBase.run` for the description of the common arguments.
+
+        :param engine: how to perform the toy fits. With ``'minimizer'``, each toy fit is performed by
+                       the minimizer. With ``'linear'``, the toy fits for a whole block of pseudo-experiments
+                       are solved in closed form as a generalized least-squares problem. This requires a
+                       model which is linear in its parameters, a built-in chi2 cost function and an
+                       uncertainty model without *x* or relative errors. With ``'batched'``, the toy fits
+                       for a block of pseudo-experiments are advanced in lockstep by the Levenberg-Marquardt
+                       algorithm, evaluating the model for all of them at once. This requires a model function
+                       which broadcasts over a leading axis of the parameter values and the same cost function
+                       and uncertainty model as ``'linear'``. Toy fits which do not converge are repeated with
+                       the minimizer. With ``'auto'``, the first engine in the order ``'linear'``,
+                       ``'batched'``, ``'minimizer'`` whose conditions are met is used.
+        :type engine: str
         """
-        Return a dictionary containing the ensembles of result variables.
-
-        :param results: names of result variables to retrieve
-        :type results: iterable of str. Calling without arguments retrieves *all* collected results.
-        :return: dict
-        """
-        if not results:
-            results = self._requested_results
-        else:
-            # validate list of results requested by user
-            _unavailable_results = set(self._requested_results) - set(self.AVAILABLE_RESULTS.keys())
-            if _unavailable_results:
-                raise ValueError("Requested unavailable result variable(s): %r"
-                                 % (_unavailable_results,))
-
-        _dict_to_return = dict()
-        for _result_name in results:
-            _var = self._ensemble_variables.get(_result_name, None)
-            if _var is None:
-                raise FitEnsembleException("Cannot retrieve result '{}': "
-                                           "variable not collected!".format(_result_name))
-            _dict_to_return[_result_name] = _var.values
-
-        return _dict_to_return
-
-    def get_results_statistics(self, results='all', statistics='all'):
-        """
-        Return a dictionary containing statistics (e.g. mean) of the result variables.
-
-        :param results: names of retrieved fit variable for which to return statistics
-        :type results: iterable of str or ``'all'`` (get statistics for all retrieved variables)
-        :param statistics: names of statistics to retrieve for each result variable
-        :type statistics: iterable of str or ``'all'`` (get all statistics for each retrieved variable)
-        :return: dict
-        """
-        if results == 'all':
-            results = self._requested_results
-
-        if statistics == 'all':
-            statistics = self.__class__._DEFAULT_STATISTICS
-
-        _dict_to_return = dict()
-        for _result_name in results:
-            #_result_array = self._result_array_dicts.get(_result_name, None)
-            _result_variable = self._ensemble_variables.get(_result_name, None)
-            if _result_variable is None:
-                raise FitEnsembleException("Cannot retrieve statistics for result "
-                                           "variable '{}': variable not collected!".format(_result_name))
-
-            _current_result_dict = _dict_to_return[_result_name] = dict()
-
-            # calculate and store statistics
-            for _stat_name in statistics:
-                _stat_unbound_method = self.__class__.AVAILABLE_STATISTICS.get(_stat_name, None)
-                if _stat_unbound_method is None:
-                    raise FitEnsembleException(
-                        "Unknown statistic '%s' requested!" % (_stat_name,))
-                _stat = _stat_unbound_method.__get__(_result_variable, EnsembleVariable)
-                _current_result_dict[_stat_name] = _stat
-
-        return _dict_to_return
-
-    def plot_result_distributions(self, results='all',
-                                  show_legend=True):
-        """
-        Make plots with histograms of the requested fit variable values across all pseudo-experiments.
-
-        :param results: names of retrieved fit variable for which to generate plots
-        :type results: iterable of str or ``'all'`` (make plots for all retrieved variables)
-        :param show_legend: if ``True``, show a plot legend on each figure
-        :type show_legend: bool
-        """
-        if results == 'all':
-            results = self._requested_results
-        else:
-            # validate list of results requested by user
-            _unavailable_results = set(self._requested_results) - set(self.AVAILABLE_RESULTS.keys())
-            if _unavailable_results:
-                raise ValueError("Requested unavailable result variable(s): %r"
-                                 % (_unavailable_results,))
-
-        for _result_name in results:
-            _result_variable = self._ensemble_variables.get(_result_name, None)
-
-            if _result_variable is None:
-                raise FitEnsembleException("Cannot plot result for variable '%s': "
-                                           "variable not collected!" % (_result_name,))
-
-            _result_variable_plotter = self._ensemble_variable_plotters.get(_result_name, None)
-
-            if _result_variable_plotter is None:
-                raise FitEnsembleException("Cannot plot result for variable '%s': "
-                                           "no plotter defined!" % (_result_name,))
-
-            # -- decide how to lay out plots depending on the result variable dimensionality
-            if _result_variable.ndim == 0:
-                # if the ensemble variable is a scalar,
-                # plot it into a single `Axes` object
-                _fig, _gs = self._make_figure_gs(figsize=(8, 8), nrows=1, ncols=1)
-                _ax = plt.subplot(_gs[0, 0])
-                # call the plotting routine on the axes grid
-                _plot_result_dict = _result_variable_plotter.plot_hist(_ax)
-
-            elif _result_variable.ndim == 1:
-                # if the ensemble variable is a one-dimensional vector,
-                # plot each entry into a separate `Axes` object and display
-                # them in a grid-like layout
-                _nplots = int(_result_variable.shape[0])
-                _nrows, _ncols = _heuristic_optimal_subplot_grid_size(_nplots, aspect_ratio_priority=0.8)
-                _fig, _gs = self._make_figure_gs(figsize=(8, 8), nrows=_nrows, ncols=_ncols)
-
-                # create an array 'a' with a[i, j] = [i, j]
-                _axes_grid = np.dstack((np.meshgrid(np.arange(_nrows), np.arange(_ncols))))
-                # replace [i, j] by the `Axes` object for _gs[i, j] -> array of `Axes`
-                _axes_grid = np.apply_along_axis(
-                    lambda irow_icol: plt.subplot(_gs[irow_icol[0], irow_icol[1]]) if irow_icol[0]*_ncols+irow_icol[1] < _nplots else None,
-                    -1, _axes_grid)
-                # reshape the `Axes` array to match the variable shape
-                _axes_grid = _axes_grid.T.flatten()[:_result_variable.shape[0]]
-                # call the plotting routine on the axes grid
-                _plot_result_dict = _result_variable_plotter.plot_hist(_axes_grid)
-
-            elif _result_variable.ndim == 2:
-                # if the ensemble variable is a two-dimensional vector,
-                # plot the (i,j)-th entry into a an `Axes` object at the
-                # (i,j)-th position in a grid
-
-                _nrows = _result_variable.shape[0]
-                _ncols = _result_variable.shape[1]
-
-                _fig, _gs = self._make_figure_gs(figsize=(8, 8), nrows=_nrows, ncols=_ncols)
-
-                # create an array 'a' with a[i, j] = [i, j]
-                _axes_grid = np.dstack(reversed(np.meshgrid(np.arange(_nrows), np.arange(_ncols))))
-                # replace [i, j] by the `Axes` object for _gs[i, j] -> array of `Axes`
-                _axes_grid = np.apply_along_axis(
-                    lambda irow_icol: plt.subplot(_gs[irow_icol[0], irow_icol[1]]),
-                    -1, _axes_grid)
-                # do not reshape _axes_grid -> its shape already matches variable shape
-
-                # call the plotting routine on the axes grid
-                _plot_result_dict = _result_variable_plotter.plot_hist(_axes_grid)
-            else:
-                # cannot plot variables with 3 or more dimensions...
-                raise FitEnsembleException("Cannot plot result for variable '%s': variable entry dimensionality "
-                                           "too high (%d)!" % (_result_name, _result_variable.ndim))
-
-            if show_legend:
-                _fig.legend(_plot_result_dict['legend_handles'],
-                            _plot_result_dict['legend_labels'], loc='lower center')
-                # add extra space at figure bottom for legend
-                _figure_extra_bottom = 0.05 * len(_plot_result_dict['legend_labels'])
-            else:
-                # no extra space at figure bottom
-                _figure_extra_bottom = 0.0
-
-            _fig.canvas.set_window_title(_result_name)
-
-            _gs.tight_layout(_fig,
-                             pad=0.0, w_pad=0, h_pad=-0.2,
-                             rect=(0.01, 0.02+_figure_extra_bottom, 0.98, 0.98))
-
-        return _plot_result_dict
-
-    def plot_result_scatter(self, results='all',
-                                  show_legend=True):
-        """
-        Make plots with histograms of the requested fit variable values across all pseudo-experiments.
-
-        :param results: names of retrieved fit variable for which to generate plots
-        :type results: iterable of str or ``'all'`` (make plots for all retrieved variables)
-        :param show_legend: if ``True``, show a plot legend on each figure
-        :type show_legend: bool
-        """
-        if results == 'all':
-            results = self._requested_results
-        else:
-            # validate list of results requested by user
-            _unavailable_results = set(self._requested_results) - set(self.AVAILABLE_RESULTS.keys())
-            if _unavailable_results:
-                raise ValueError("Requested unavailable result variable(s): %r"
-                                 % (_unavailable_results,))
-
-        for _result_name in results:
-            _result_variable = self._ensemble_variables.get(_result_name, None)
-
-            if _result_variable is None:
-                raise FitEnsembleException("Cannot plot result for variable '%s': "
-                                           "variable not collected!" % (_result_name,))
-
-            _result_variable_plotter = self._ensemble_variable_plotters.get(_result_name, None)
-
-            if _result_variable_plotter is None:
-                raise FitEnsembleException("Cannot plot result for variable '%s': "
-                                           "no plotter defined!" % (_result_name,))
-
-            # -- decide how to lay out plots depending on the result variable dimensionality
-            if _result_variable.ndim != 1:
-                raise ValueError()
-
-            # if the ensemble variable is a one-dimensional vector,
-            # plot each entry into a separate `Axes` object and display
-            # them in a grid-like layout
-            _nrows = _ncols = int(_result_variable.shape[0])
-            if _nrows <= 1:
-                raise FitEnsembleException("Cannot create scatter plot for result variable '%s': "
-                                           "vector has less than two entries!" % (_result_name,))
-            _fig, _gs = self._make_figure_gs(figsize=(8, 8), nrows=_nrows-1, ncols=_ncols-1)
-
-            # create an array 'a' with a[i, j] = [i, j]
-            _axes_grid = np.dstack((np.meshgrid(np.arange(_nrows), np.arange(_ncols))))
-            # replace [i, j] by the `Axes` object for _gs[i, j] -> array of `Axes`
-            _axes_grid = np.apply_along_axis(
-                lambda irow_icol: plt.subplot(_gs[irow_icol[0] - 1, irow_icol[1]]) if irow_icol[0] > irow_icol[1] else None,
-                -1, _axes_grid)
-
-            # call the plotting routine on the axes grid
-            _plot_result_dict = _result_variable_plotter.plot_scatter(_axes_grid)
-
-            if show_legend:
-                _fig.legend(_plot_result_dict['legend_handles'],
-                            _plot_result_dict['legend_labels'], loc='lower center')
-                # add extra space at figure bottom for legend
-                _figure_extra_bottom = 0.05 * len(_plot_result_dict['legend_labels'])
-            else:
-                # no extra space at figure bottom
-                _figure_extra_bottom = 0.0
-
-            _fig.canvas.set_window_title(_result_name)
-
-            _gs.tight_layout(_fig,
-                             pad=0.0, w_pad=0, h_pad=-0.2,
-                             rect=(0.01, 0.02+_figure_extra_bottom, 0.98, 0.98))
-
-        return _plot_result_dict
-
+        if engine not in self._TOY_FIT_ENGINES:
+            raise XYFitEnsembleException("Unknown toy fit engine '{}'! Available: {}".format(
+                engine, ', '.join(self._TOY_FIT_ENGINES)))
+        self._toy_fit_engine = engine
+        super(XYFitEnsemble, self).run(seed=seed, n_workers=n_workers, checkpoint_file=checkpoint_file,
+                                       checkpoint_interval=checkpoint_interval, resume=resume,
+                                       target_precision=target_precision,
+                                       precision_check_interval=precision_check_interval)
 
     AVAILABLE_RESULTS = {
         'parameter_pulls': _parameter_pulls,
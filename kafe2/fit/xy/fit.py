@@ -2,6 +2,7 @@ from collections import OrderedDict
 from copy import deepcopy
 
 import numpy as np
+import six
 
 from ...core.error import CovMat
 from ...tools import print_dict_as_table
@@ -42,6 +43,7 @@ class XYFit(FitBase):
     _AXES = (None, "x", "y")
     _MODEL_NAME = "y_model"
     _MODEL_ERROR_NODE_NAMES = ["y_model_error", "y_model_cov_mat"]
+    _DATA_NODE_NAMES = ("x_data", "y_data")
     _PROJECTED_NODE_NAMES = ["total_error", "total_cov_mat"]
 
     def __init__(self,
@@ -54,8 +56,9 @@ class XYFit(FitBase):
         """
         Construct a fit of a model to *xy* data.
 
-        :param xy_data: the x and y measurement values
-        :type xy_data: (2, N)-array of float
+        :param xy_data: the x and y measurement values. A memory-mapped array or the path of a ``.npy`` file
+            is used without loading the data into memory.
+        :type xy_data: (2, N)-array of float or str
         :param model_function: the model function
         :type model_function: :py:class:`~kafe2.fit.xy.XYModelFunction` or unwrapped native Python function
         :param cost_function: the cost function
@@ -115,6 +118,9 @@ class XYFit(FitBase):
         elif isinstance(new_data, DataContainerBase):
             raise XYFitException("Incompatible container type '%s' (expected '%s')"
                                  % (type(new_data), self.CONTAINER_TYPE))
+        elif isinstance(new_data, (six.string_types, np.memmap)):
+            # path of a .npy file or memory-mapped array -> don't load the data into memory
+            self._data_container = XYContainer(new_data, dtype=float)
         else:
             _x_data = new_data[0]
             _y_data = new_data[1]
@@ -530,6 +536,43 @@ class XYFit(FitBase):
                                                    reference=reference,
                                                    axis=axis)
 
+    def update_data(self, x=None, y=None, copy=False):
+        """Replace the *x* and/or *y* data values of this fit in place.
+
+        Unlike setting :py:attr:`~data`, the data container, its error objects and the nexus are kept.
+        Cached quantities which do not depend on the data values (e.g. absolute error matrices and
+        their inverses) are reused and the next call to :py:meth:`do_fit` starts from the current
+        parameter values. This makes refitting a stream of same-shaped datasets considerably cheaper.
+
+        :param x: the new *x* data values (if ``None``, the *x* data is not changed). Must have the same
+            length as the current data.
+        :type x: iterable of float
+        :param y: the new *y* data values (if ``None``, the *y* data is not changed). Must have the same
+            length as the current data.
+        :type y: iterable of float
+        :param bool copy: accepted for compatibility with the other fit types. The *x* and *y* data share a
+            single array, so the new values are always written into the existing data array.
+        """
+        _data_node_names = []
+        for _axis_id, (_node_name, _new_data) in enumerate(zip(self._DATA_NODE_NAMES, (x, y))):
+            if _new_data is None:
+                continue
+            if np.shape(_new_data) != (self.data_size,):
+                raise XYFitException("Cannot update %s of shape %r with data of shape %r! "
+                                     "Use the 'data' setter to change the number of data points."
+                                     % (_node_name, (self.data_size,), np.shape(_new_data)))
+            self._data_container._set_axis_data_in_place(_axis_id, _new_data)
+            _data_node_names.append(_node_name)
+        self._check_data_compatible_with_cost_function()
+        self._on_data_values_change(data_node_names=_data_node_names)
+
+    def _set_batch_dataset(self, dataset):
+        _dataset = np.asarray(dataset)
+        if _dataset.ndim == 2:
+            self.update_data(x=_dataset[0], y=_dataset[1])
+        else:
+            self.update_data(y=_dataset)
+
     def eval_model_function(self, x=None, model_parameters=None):
         """
         Evaluate the model function.
@@ -298,6 +298,22 @@ class TestMinimizerMixin:
         self.assertTrue(np.allclose(
             self._ref_par_val_fcn3, self.m3.parameter_values, rtol=0, atol=1e-6))
 
+    def test_warm_restart_minimize_fcn3(self):
+        self.m3.minimize()
+        self.m3.warm_restart()
+        self.assertFalse(self.m3.did_fit)
+        self.assertTrue(np.allclose(
+            self._ref_par_val_fcn3, self.m3.parameter_values, rtol=0, atol=1e-6))
+        _n_calls_before = self.m3.n_function_calls
+        self.m3.minimize()
+        self.assertTrue(self.m3.did_fit)
+        self.assertGreater(self.m3.n_function_calls, _n_calls_before)
+        self.assertTrue(np.allclose(
+            self._ref_par_val_fcn3, self.m3.parameter_values, rtol=0, atol=1e-6))
+        self.assertTrue(
+            np.allclose(self.m3.cov_mat, self._ref_cov_mat_fcn3, rtol=0, atol=1e-6)
+        )
+
     def test_compare_cov_mat_minimize_fcn3(self):
         self.m3.minimize()
         self.assertTrue(
@@ -521,3 +537,7 @@ class TestMinimizerMixin:
     def test_contour_raise_no_fit(self):
         with self.assertRaises(MinimizerException):
             self.m3.contour("x", "y")
+
+    def test_contours_raise_no_fit(self):
+        with self.assertRaises(MinimizerException):
+            self.m3.contours("x", "y", sigma_values=(1.0, 2.0))
@@ -259,6 +259,24 @@ class AbstractTestNexusFitter(object):
         c = self.fitter.contour('x', 'y')
         # TODO: test result?
 
+    def test_contours_without_do_fit(self):
+        with self.assertRaises(NexusFitterException):
+            self.fitter.contours('x', 'y', sigma_values=(1.0, 2.0))
+
+    def test_contours_parallel_same_as_serial(self):
+        self.fitter.do_fit()
+        _serial = self.fitter.contours('x', 'y', sigma_values=(1.0, 2.0), n_workers=1)
+        _parallel = self.fitter.contours('x', 'y', sigma_values=(1.0, 2.0), n_workers=2)
+        self.assertEqual(len(_serial), 2)
+        self.assertEqual(len(_parallel), 2)
+        for _c_serial, _c_parallel, _sigma in zip(_serial, _parallel, (1.0, 2.0)):
+            self.assertEqual(_c_serial.sigma, _sigma)
+            self.assertEqual(_c_parallel.sigma, _sigma)
+            if _c_serial.xy_points is not None:
+                self.assertTrue(np.allclose(_c_serial.xy_points, _c_parallel.xy_points))
+            else:
+                self.assertTrue(np.allclose(_c_serial.grid_z, _c_parallel.grid_z))
+
 
 if 'scipy' in AVAILABLE_MINIMIZERS:
     class TestNexusFitterScipy(AbstractTestNexusFitter, unittest.TestCase):
@@ -0,0 +1,114 @@
+import unittest2 as unittest
+import numpy as np
+
+from kafe2.fit import FitBatch, HistContainer, HistFit, XYFit
+from kafe2.fit.tools.batch import FitBatchException
+
+
+def line_model(x, a=1.0, b=0.0):
+    return a * x + b
+
+
+def sqrt_model(x, a=1.0, b=0.0):
+    if np.any(x < 0):
+        raise ValueError("x must not be negative")
+    return a * np.sqrt(x) + b
+
+
+def normal_pdf(x, mu=0.0, sigma=1.0):
+    return np.exp(-0.5 * ((x - mu) / sigma) ** 2) / np.sqrt(2 * np.pi) / sigma
+
+
+class TestXYFitBatch(unittest.TestCase):
+
+    def _get_fit(self, y_data):
+        _fit = XYFit(xy_data=[self._x_data, y_data], model_function=line_model)
+        _fit.add_error('y', 0.1)
+        _fit.add_error('y', 0.02, relative=True)
+        return _fit
+
+    def setUp(self):
+        _random_state = np.random.RandomState(0)
+        self._x_data = np.linspace(0, 1, 10)
+        self._y_datasets = [2.0 * self._x_data + 1.0 + _random_state.normal(0, 0.1, 10) for _ in range(6)]
+        self._template_fit = self._get_fit(self._y_datasets[0])
+
+    def test_results_same_as_individual_fits(self):
+        _results = self._template_fit.fit_many(self._y_datasets)
+
+        self.assertEqual(_results.shape, (len(self._y_datasets),))
+        self.assertTrue(np.all(_results['did_fit']))
+        for _result, _y_data in zip(_results, self._y_datasets):
+            _fit = self._get_fit(_y_data)
+            _fit.do_fit()
+            self.assertTrue(np.allclose(_result['parameter_values'], _fit.parameter_values, rtol=1e-4))
+            self.assertTrue(np.allclose(_result['parameter_errors'], _fit.parameter_errors, rtol=1e-2))
+            self.assertTrue(np.allclose(_result['parameter_cov_mat'], _fit.parameter_cov_mat, rtol=2e-2))
+            self.assertAlmostEqual(_result['cost'], _fit.cost_function_value, places=6)
+
+    def test_template_fit_unchanged(self):
+        _parameter_values = self._template_fit.parameter_values
+        self._template_fit.fit_many(self._y_datasets)
+        self.assertFalse(self._template_fit.did_fit)
+        self.assertTrue(np.all(self._template_fit.parameter_values == _parameter_values))
+        self.assertTrue(np.all(self._template_fit.y_data == self._y_datasets[0]))
+
+    def test_chunks_and_workers_same_result(self):
+        _batch = FitBatch(self._template_fit, warm_start=False)
+        _results_serial = _batch.run(self._y_datasets)
+        _results_chunked = _batch.run(self._y_datasets, n_workers=2, chunk_size=4)
+        self.assertTrue(np.allclose(_results_serial['parameter_values'], _results_chunked['parameter_values']))
+        self.assertTrue(np.allclose(_results_serial['cost'], _results_chunked['cost']))
+
+    def test_xy_datasets(self):
+        _x_data = self._x_data + 0.5
+        _results = self._template_fit.fit_many([np.array([_x_data, self._y_datasets[1]])])
+        _fit = self._get_fit(self._y_datasets[1])
+        _fit.update_data(x=_x_data)
+        _fit.do_fit()
+        self.assertTrue(np.allclose(_results['parameter_values'][0], _fit.parameter_values, rtol=1e-4))
+
+    def test_failed_fit(self):
+        _template_fit = XYFit(xy_data=[self._x_data, self._y_datasets[0]], model_function=sqrt_model)
+        _template_fit.add_error('y', 0.1)
+        _datasets = [np.array([self._x_data, _y_data]) for _y_data in self._y_datasets[:3]]
+        _datasets[1][0] -= 1.0
+        for _n_workers in (1, 2):
+            _results = FitBatch(_template_fit).run(_datasets, n_workers=_n_workers, chunk_size=3)
+            self.assertEqual(list(_results['did_fit']), [True, False, True])
+            for _field in ('parameter_values', 'parameter_errors', 'parameter_cov_mat', 'cost'):
+                self.assertTrue(np.all(np.isnan(_results[_field][1])))
+                self.assertTrue(np.all(np.isfinite(_results[_field][[0, 2]])))
+            _fit = XYFit(xy_data=_datasets[2], model_function=sqrt_model)
+            _fit.add_error('y', 0.1)
+            _fit.do_fit()
+            self.assertTrue(np.allclose(_results['parameter_values'][2], _fit.parameter_values, rtol=1e-4))
+
+    def test_empty(self):
+        _results = self._template_fit.fit_many([])
+        self.assertEqual(_results.shape, (0,))
+        self.assertEqual(_results.dtype, FitBatch(self._template_fit).result_dtype)
+
+    def test_raise_chunk_size(self):
+        with self.assertRaises(FitBatchException):
+            self._template_fit.fit_many(self._y_datasets, chunk_size=0)
+
+
+class TestHistFitBatch(unittest.TestCase):
+
+    def test_results_same_as_individual_fits(self):
+        _random_state = np.random.RandomState(1)
+        _datasets = [np.histogram(_random_state.normal(size=200), bins=8, range=(-3, 3))[0] for _ in range(3)]
+        _template_container = HistContainer(8, (-3, 3))
+        _template_container.set_bins(_datasets[0])
+        _template_fit = HistFit(_template_container, model_density_function=normal_pdf)
+
+        _results = _template_fit.fit_many(_datasets)
+
+        for _result, _bin_heights in zip(_results, _datasets):
+            _container = HistContainer(8, (-3, 3))
+            _container.set_bins(_bin_heights)
+            _fit = HistFit(_container, model_density_function=normal_pdf)
+            _fit.do_fit()
+            self.assertTrue(np.allclose(_result['parameter_values'], _fit.parameter_values, rtol=1e-3))
+            self.assertAlmostEqual(_result['cost'], _fit.cost_function_value, places=4)
@@ -0,0 +1,164 @@
+import os
+import shutil
+import tempfile
+
+import unittest2 as unittest
+import numpy as np
+
+from kafe2.fit import FitResultCache, HistContainer, HistFit, XYFit
+from kafe2.fit.tools.cache import FitResultCacheException
+
+
+def line_model(x, a=1.0, b=0.0):
+    return a * x + b
+
+
+def normal_pdf(x, mu=0.0, sigma=1.0):
+    return np.exp(-0.5 * ((x - mu) / sigma) ** 2) / np.sqrt(2 * np.pi) / sigma
+
+
+POWER = 1.0
+SCALE = [1.0]
+
+
+def _scale(x):
+    return SCALE[0] * x
+
+
+def power_model(x, a=1.0):
+    return a * x ** POWER
+
+
+def scaled_model(x, a=1.0):
+    return a * _scale(x)
+
+
+def make_closure_model(power):
+    def closure_model(x, a=1.0):
+        return a * x ** power
+    return closure_model
+
+
+class TestXYFitResultCache(unittest.TestCase):
+
+    def _get_fit(self, y_data=None):
+        _fit = XYFit(xy_data=[self._x_data, self._y_data if y_data is None else y_data], model_function=line_model)
+        _fit.add_error('y', 0.1)
+        _fit.add_error('y', 0.02, relative=True, reference='model')
+        _fit.add_parameter_constraint('a', 2.0, 0.5)
+        return _fit
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self._cache_dir = os.path.join(self._tmp_dir, 'cache')
+        self._x_data = np.linspace(1, 2, 10)
+        self._y_data = 2.0 * self._x_data + 1.0 + np.random.RandomState(0).normal(0, 0.1, 10)
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_hit_same_result(self):
+        _fit = self._get_fit()
+        _result = _fit.do_fit(cache=self._cache_dir)
+        self.assertEqual(len(os.listdir(self._cache_dir)), 1)
+
+        _cached_fit = self._get_fit()
+        _cached_result = _cached_fit.do_fit(cache=self._cache_dir)
+        self.assertEqual(_cached_fit.fit_iteration_function_calls, [])
+        self.assertTrue(_cached_fit.did_fit)
+        self.assertTrue(np.all(_cached_fit.parameter_values == _fit.parameter_values))
+        self.assertTrue(np.all(_cached_fit.parameter_errors == _fit.parameter_errors))
+        self.assertTrue(np.all(_cached_result['parameter_cov_mat'] == _result['parameter_cov_mat']))
+        self.assertTrue(np.all(_cached_result['parameter_cor_mat'] == _result['parameter_cor_mat']))
+        self.assertAlmostEqual(_cached_result['cost'], _result['cost'])
+
+    def test_miss_different_inputs(self):
+        _fingerprint = FitResultCache.fingerprint(self._get_fit())
+        self.assertEqual(FitResultCache.fingerprint(self._get_fit()), _fingerprint)
+
+        _fit = self._get_fit(y_data=self._y_data + 1e-9)
+        self.assertNotEqual(FitResultCache.fingerprint(_fit), _fingerprint)
+        _fit = self._get_fit()
+        _fit.add_error('x', 0.01)
+        self.assertNotEqual(FitResultCache.fingerprint(_fit), _fingerprint)
+        _fit = self._get_fit()
+        _fit.fix_parameter('b', 1.0)
+        self.assertNotEqual(FitResultCache.fingerprint(_fit), _fingerprint)
+        _fit = self._get_fit()
+        _fit.set_parameter_values(b=0.5)
+        self.assertNotEqual(FitResultCache.fingerprint(_fit), _fingerprint)
+        _fit = self._get_fit()
+        _fit.add_parameter_constraint('b', 1.0, 0.5)
+        self.assertNotEqual(FitResultCache.fingerprint(_fit), _fingerprint)
+
+    def test_miss_different_referenced_values(self):
+        global POWER, SCALE
+        _fingerprints = set()
+        for _model_function in (power_model, scaled_model):
+            _fit = XYFit(xy_data=[self._x_data, self._y_data], model_function=_model_function)
+            _fingerprints.add(FitResultCache.fingerprint(_fit))
+            POWER, SCALE = 2.0, [2.0]
+            try:
+                _fit = XYFit(xy_data=[self._x_data, self._y_data], model_function=_model_function)
+                _fingerprints.add(FitResultCache.fingerprint(_fit))
+            finally:
+                POWER, SCALE = 1.0, [1.0]
+        for _power in (1.0, 2.0):
+            _fit = XYFit(xy_data=[self._x_data, self._y_data], model_function=make_closure_model(_power))
+            _fingerprints.add(FitResultCache.fingerprint(_fit))
+        self.assertEqual(len(_fingerprints), 6)
+
+    def test_raise_unsupported_referenced_value(self):
+        _data = dict(power=1.0)
+
+        def _model_function(x, a=1.0):
+            return a * x ** _data['power']
+        _fit = XYFit(xy_data=[self._x_data, self._y_data], model_function=_model_function)
+        _fingerprint = FitResultCache.fingerprint(_fit)
+        _data['power'] = 2.0
+        self.assertNotEqual(FitResultCache.fingerprint(_fit), _fingerprint)
+        _data['power'] = object()
+        with self.assertRaises(FitResultCacheException):
+            FitResultCache.fingerprint(_fit)
+
+    def test_disabled_error_same_as_no_error(self):
+        _fit = self._get_fit()
+        _fingerprint = FitResultCache.fingerprint(_fit)
+        _fit.add_error('x', 0.01, name='extra')
+        _fit.disable_error('extra')
+        self.assertEqual(FitResultCache.fingerprint(_fit), _fingerprint)
+
+    def test_asymmetric_errors(self):
+        self._get_fit().do_fit(cache=self._cache_dir)
+        _fit = self._get_fit()
+        _result = _fit.do_fit(asymmetric_parameter_errors=True, cache=self._cache_dir)
+        self.assertNotEqual(_fit.fit_iteration_function_calls, [])
+
+        _cached_fit = self._get_fit()
+        _cached_result = _cached_fit.do_fit(asymmetric_parameter_errors=True, cache=self._cache_dir)
+        self.assertEqual(_cached_fit.fit_iteration_function_calls, [])
+        for _par_name in _fit.parameter_names:
+            self.assertTrue(np.all(_cached_result['asymmetric_parameter_errors'][_par_name]
+                                   == _result['asymmetric_parameter_errors'][_par_name]))
+
+    def test_clear(self):
+        _cache = FitResultCache(self._cache_dir)
+        self._get_fit().do_fit(cache=_cache)
+        _cache.clear()
+        self.assertEqual(os.listdir(self._cache_dir), [])
+        _fit = self._get_fit()
+        _fit.do_fit(cache=_cache)
+        self.assertNotEqual(_fit.fit_iteration_function_calls, [])
+
+
+class TestHistFitResultCache(unittest.TestCase):
+
+    def _get_fit(self, bin_evaluation='simpson'):
+        _container = HistContainer(8, (-3, 3))
+        _container.fill(np.random.RandomState(1).normal(size=200))
+        return HistFit(_container, model_density_function=normal_pdf, bin_evaluation=bin_evaluation)
+
+    def test_fingerprint(self):
+        _fingerprint = FitResultCache.fingerprint(self._get_fit())
+        self.assertEqual(FitResultCache.fingerprint(self._get_fit()), _fingerprint)
+        self.assertNotEqual(FitResultCache.fingerprint(self._get_fit(bin_evaluation='midpoint')), _fingerprint)
@@ -1,3 +1,8 @@
+import os
+import shutil
+import tempfile
+from copy import deepcopy
+
 import unittest2 as unittest
 import numpy as np
 import scipy.stats as stats
@@ -145,6 +150,58 @@ class TestDatastoreHistogram(unittest.TestCase):
             self.hist_cont_binedges_manual_equal.rebin(self._ref_bin_edges_manual_variablespacing)
 
 
+class TestDatastoreHistogramMemoryMapped(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self._file_path = os.path.join(self._tmp_dir, 'entries.npy')
+        self._ref_entries = np.array([-9999., -8279., 0., 3.3, 5.5, 2.2, 8.5, 9.0, 10., 10.2, 10000., 1e7])
+        np.save(self._file_path, self._ref_entries)
+        self._ref_bin_edges = [0, 2, 3, 3.1, 3.2, 3.3, 3.4, 7, 8.5, 9, 10]
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_fill_same_as_in_memory(self):
+        _hist = HistContainer(n_bins=10, bin_range=(0., 10.), fill_data=self._file_path)
+        _ref_hist = HistContainer(n_bins=10, bin_range=(0., 10.), fill_data=self._ref_entries)
+        self.assertTrue(np.all(_hist.data == _ref_hist.data))
+        # compare underflow and overflow bins too
+        self.assertTrue(np.all(_hist._data == _ref_hist._data))
+        self.assertEqual(_hist.n_entries, _ref_hist.n_entries)
+
+    def test_fill_in_chunks(self):
+        _hist = HistContainer(n_bins=10, bin_range=(0., 10.))
+        _hist._FILL_CHUNK_SIZE = 5
+        _hist.fill(np.load(self._file_path, mmap_mode='r'))
+        _ref_hist = HistContainer(n_bins=10, bin_range=(0., 10.), fill_data=self._ref_entries)
+        self.assertTrue(np.all(_hist.data == _ref_hist.data))
+        # compare underflow and overflow bins too
+        self.assertTrue(np.all(_hist._data == _ref_hist._data))
+
+    def test_rebin(self):
+        _hist = HistContainer(n_bins=10, bin_range=(0., 10.), fill_data=self._file_path)
+        _hist.fill([1.5, 3.35])
+        _ref_hist = HistContainer(n_bins=10, bin_range=(0., 10.), fill_data=self._ref_entries)
+        _ref_hist.fill([1.5, 3.35])
+        _hist.rebin(self._ref_bin_edges)
+        _ref_hist.rebin(self._ref_bin_edges)
+        self.assertTrue(np.all(_hist.data == _ref_hist.data))
+        self.assertEqual(sorted(_hist.raw_data), sorted(_ref_hist.raw_data))
+
+    def test_raw_data_memory_mapped(self):
+        _hist = HistContainer(n_bins=10, bin_range=(0., 10.), fill_data=self._file_path)
+        _hist.fill([1.5, 3.35])
+        self.assertIsInstance(_hist.raw_data, np.ndarray)
+        self.assertTrue(np.all(_hist.raw_data == np.concatenate([[1.5, 3.35], self._ref_entries])))
+
+    def test_deepcopy_shares_entries(self):
+        _hist = HistContainer(n_bins=10, bin_range=(0., 10.), fill_data=self._file_path)
+        _copy = deepcopy(_hist)
+        self.assertIs(_copy._memory_mapped_entries[0], _hist._memory_mapped_entries[0])
+        self.assertTrue(np.all(_copy.data == _hist.data))
+
+
 class TestDatastoreHistParametricModel(unittest.TestCase):
     @staticmethod
     def _ref_model_func(x, mu, sigma):
@@ -1,3 +1,8 @@
+import os
+import shutil
+import tempfile
+from copy import deepcopy
+
 import unittest2 as unittest
 import numpy as np
 
@@ -164,3 +169,51 @@ class TestDatastoreIndexedParametricModel(unittest.TestCase):
     def test_raise_set_data(self):
         with self.assertRaises(IndexedParametricModelException):
             self.idx_param_model.data = self._ref_test_data
+
+
+class TestDatastoreIndexedMemoryMapped(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self._file_path = os.path.join(self._tmp_dir, 'data.npy')
+        self._ref_data = np.array([3.3, 5.5, 2.2, 8.5, 10.2])
+        np.save(self._file_path, self._ref_data)
+        self.idx_cont = IndexedContainer(data=self._file_path)
+        self.idx_cont.add_error(0.5, relative=True)
+
+    def tearDown(self):
+        del self.idx_cont
+        shutil.rmtree(self._tmp_dir)
+
+    def test_data_not_copied(self):
+        self.assertTrue(self.idx_cont.is_memory_mapped)
+        self.assertTrue(np.all(self.idx_cont.data == self._ref_data))
+        self.assertIsInstance(self.idx_cont.data, np.memmap)
+        self.assertFalse(self.idx_cont.data.flags.writeable)
+        self.assertTrue(np.allclose(self.idx_cont.err, 0.5 * self._ref_data))
+
+    def test_construct_from_memmap(self):
+        _memmap = np.load(self._file_path, mmap_mode='r+')
+        _cont = IndexedContainer(data=_memmap)
+        self.assertTrue(_cont.is_memory_mapped)
+        self.assertFalse(_cont.data.flags.writeable)
+        self.assertFalse(IndexedContainer(data=np.load(self._file_path, mmap_mode='r'), dtype=int).is_memory_mapped)
+
+    def test_deepcopy_shares_data(self):
+        _copy = deepcopy(self.idx_cont)
+        self.assertTrue(_copy.is_memory_mapped)
+        self.assertIs(_copy._data, self.idx_cont._data)
+
+    def test_set_data_loads_into_memory(self):
+        _new_data = self._ref_data + 1.0
+        self.idx_cont.data = _new_data
+        self.assertFalse(self.idx_cont.is_memory_mapped)
+        self.assertTrue(np.all(self.idx_cont.data == _new_data))
+        self.assertTrue(np.allclose(self.idx_cont.err, 0.5 * _new_data))
+        self.assertTrue(np.all(np.load(self._file_path) == self._ref_data))
+
+    def test_set_data_in_place_loads_into_memory(self):
+        _new_data = self._ref_data + 1.0
+        self.idx_cont._set_data_in_place(_new_data)
+        self.assertTrue(np.all(self.idx_cont.data == _new_data))
+        self.assertTrue(np.all(np.load(self._file_path) == self._ref_data))
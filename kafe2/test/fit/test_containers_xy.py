@@ -1,3 +1,8 @@
+import os
+import shutil
+import tempfile
+from copy import deepcopy
+
 import unittest2 as unittest
 import numpy as np
 
@@ -247,3 +252,37 @@ class TestDatastoreXYParametricModel(unittest.TestCase):
     def test_raise_set_y(self):
         with self.assertRaises(XYParametricModelException):
             self.xy_param_model.y = self._ref_data_ref_x_test_params
+
+
+class TestDatastoreXYMemoryMapped(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self._file_path = os.path.join(self._tmp_dir, 'xy_data.npy')
+        self._ref_x_data = np.array([0., 1., 2., 3., 4.])
+        self._ref_y_data = np.array([3.3, 5.5, 2.2, 8.5, 10.2])
+        np.save(self._file_path, np.array([self._ref_x_data, self._ref_y_data]))
+        self.data_xy = XYContainer(x_data=self._file_path)
+
+    def tearDown(self):
+        del self.data_xy
+        shutil.rmtree(self._tmp_dir)
+
+    def test_data_not_copied(self):
+        self.assertTrue(self.data_xy.is_memory_mapped)
+        self.assertEqual(self.data_xy.size, 5)
+        self.assertTrue(np.all(self.data_xy.x == self._ref_x_data))
+        self.assertTrue(np.all(self.data_xy.y == self._ref_y_data))
+        self.assertIsInstance(self.data_xy.y, np.memmap)
+        self.assertIs(deepcopy(self.data_xy)._data, self.data_xy._data)
+
+    def test_set_y_loads_into_memory(self):
+        self.data_xy.y = self._ref_y_data + 1.0
+        self.assertFalse(self.data_xy.is_memory_mapped)
+        self.assertTrue(np.all(self.data_xy.x == self._ref_x_data))
+        self.assertTrue(np.all(self.data_xy.y == self._ref_y_data + 1.0))
+        self.assertTrue(np.all(np.load(self._file_path)[1] == self._ref_y_data))
+
+    def test_construct_wrong_shape_raise(self):
+        with self.assertRaises(XYContainerException):
+            XYContainer(x_data=np.zeros((3, 5)))
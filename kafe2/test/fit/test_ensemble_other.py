@@ -0,0 +1,147 @@
+import unittest2 as unittest
+import numpy as np
+
+from kafe2.fit import HistFitEnsemble, IndexedFitEnsemble, UnbinnedFitEnsemble
+from kafe2.fit._base import FitEnsembleException
+
+
+def normal_pdf(x, mu=0.5, sigma=1.5):
+    return np.exp(-0.5 * ((x - mu) / sigma) ** 2) / np.sqrt(2 * np.pi) / sigma
+
+
+def exponential_pdf(x, tau=2.0):
+    return np.exp(-x / tau) / tau / (1.0 - np.exp(-10.0 / tau))
+
+
+def line_indexed_model(a=1.0, b=0.0):
+    return a * np.arange(6) + b
+
+
+class _FitEnsembleTestMixin(object):
+
+    N_EXP = 40
+
+    def _get_ensemble(self, **kwargs):
+        raise NotImplementedError
+
+    def test_results_shape(self):
+        _ensemble = self._get_ensemble()
+        _ensemble.run(seed=1)
+        _results = _ensemble.get_results()
+        self.assertEqual(_results['cost'].shape, (self.N_EXP,))
+        self.assertEqual(_results['parameter_pulls'].shape, (self.N_EXP, _ensemble.n_par))
+
+    def test_toy_fits_use_pseudodata(self):
+        _ensemble = self._get_ensemble()
+        _ensemble.run(seed=1)
+        _results = _ensemble.get_results()
+        # every pseudo-experiment has a different fit result
+        self.assertEqual(len(np.unique(_results['cost'])), self.N_EXP)
+        self.assertGreater(np.min(np.std(_results['parameter_pulls'], axis=0)), 0.5)
+        self.assertLess(np.max(np.abs(np.mean(_results['parameter_pulls'], axis=0))), 0.6)
+
+    def test_run_reproducible_with_seed(self):
+        _ensemble = self._get_ensemble()
+        _ensemble.run(seed=12345)
+        _results_1 = _ensemble.get_results()
+        _ensemble.run(seed=12345)
+        _results_2 = _ensemble.get_results()
+        for _name in _results_1:
+            self.assertTrue(np.all(_results_1[_name] == _results_2[_name]))
+        _ensemble.run(seed=54321)
+        self.assertFalse(np.all(_results_1['cost'] == _ensemble.get_results()['cost']))
+
+    def test_run_parallel_same_as_serial(self):
+        _ensemble = self._get_ensemble()
+        _ensemble._PSEUDODATA_BLOCK_SIZE = 8  # multiple blocks per run
+        _ensemble.run(seed=12345, n_workers=1)
+        _results_serial = _ensemble.get_results()
+        _ensemble.run(seed=12345, n_workers=3)
+        _results_parallel = _ensemble.get_results()
+        for _name in _results_serial:
+            self.assertTrue(np.all(_results_serial[_name] == _results_parallel[_name]))
+
+    def test_online_statistics_same_as_stored(self):
+        _ensemble = self._get_ensemble()
+        _ensemble.run(seed=12345)
+        _ref_statistics = _ensemble.get_results_statistics()
+        _ensemble_online = self._get_ensemble(store_values=False)
+        _ensemble_online.run(seed=12345)
+        _statistics_online = _ensemble_online.get_results_statistics()
+        for _name in _ref_statistics:
+            for _stat_name in _ref_statistics[_name]:
+                self.assertTrue(np.allclose(_statistics_online[_name][_stat_name],
+                                            _ref_statistics[_name][_stat_name]))
+
+
+class TestHistFitEnsemble(_FitEnsembleTestMixin, unittest.TestCase):
+
+    def _get_ensemble(self, **kwargs):
+        return HistFitEnsemble(n_experiments=self.N_EXP, n_bins=8, bin_range=(-3.0, 4.0),
+                               model_density_function=normal_pdf, model_parameters=[0.5, 1.5],
+                               n_entries=500, **kwargs)
+
+    def test_data_poisson(self):
+        _ensemble = self._get_ensemble(requested_results=['data', 'model'])
+        _ensemble.run(seed=1)
+        _results = _ensemble.get_results()
+        self.assertEqual(_results['data'].shape, (self.N_EXP, 8))
+        self.assertTrue(np.all(_results['data'] == np.round(_results['data'])))
+        # the total number of entries (in the bin range) fluctuates
+        self.assertGreater(len(np.unique(np.sum(_results['data'], axis=1))), 1)
+
+    def test_data_multinomial(self):
+        _ensemble = HistFitEnsemble(n_experiments=self.N_EXP, n_bins=8, bin_range=(-10.0, 11.0),
+                                    model_density_function=normal_pdf, model_parameters=[0.5, 1.5],
+                                    n_entries=500, bin_evaluation='numerical', sampling='multinomial',
+                                    requested_results=['data'])
+        _ensemble.run(seed=1)
+        # practically all entries are inside the bin range -> total number of entries is fixed
+        self.assertTrue(np.all(np.sum(_ensemble.get_results()['data'], axis=1) == 500))
+
+    def test_raise_unknown_sampling(self):
+        with self.assertRaises(FitEnsembleException):
+            self._get_ensemble(sampling='binomial')
+
+
+class TestIndexedFitEnsemble(_FitEnsembleTestMixin, unittest.TestCase):
+
+    def _get_ensemble(self, **kwargs):
+        _ensemble = IndexedFitEnsemble(n_experiments=self.N_EXP, model_function=line_indexed_model,
+                                       model_parameters=[1.5, -0.5], **kwargs)
+        _ensemble.add_error(0.5)
+        _ensemble.add_error(0.2, correlation=0.5)
+        return _ensemble
+
+    def test_raise_run_without_errors(self):
+        _ensemble = IndexedFitEnsemble(n_experiments=self.N_EXP, model_function=line_indexed_model,
+                                       model_parameters=[1.5, -0.5])
+        with self.assertRaises(FitEnsembleException):
+            _ensemble.run()
+
+    def test_data_result(self):
+        _ensemble = self._get_ensemble(requested_results=['data', 'pulls'])
+        _ensemble.run(seed=1)
+        _results = _ensemble.get_results()
+        self.assertEqual(_results['data'].shape, (self.N_EXP, 6))
+        self.assertEqual(_results['pulls'].shape, (self.N_EXP, 6))
+
+
+class TestUnbinnedFitEnsemble(_FitEnsembleTestMixin, unittest.TestCase):
+
+    def _get_ensemble(self, **kwargs):
+        return UnbinnedFitEnsemble(n_experiments=self.N_EXP, n_events=100,
+                                   model_density_function=exponential_pdf, model_parameters=[2.0],
+                                   x_range=(0.0, 10.0), **kwargs)
+
+    def test_data_inverse_cdf(self):
+        _ensemble = self._get_ensemble(sampling='inverse_cdf', requested_results=['data', 'parameter_pulls'])
+        _ensemble.run(seed=1)
+        _data = _ensemble.get_results()['data']
+        self.assertEqual(_data.shape, (self.N_EXP, 100))
+        self.assertTrue(np.all((_data >= 0.0) & (_data <= 10.0)))
+        self.assertAlmostEqual(np.mean(_data), 2.0 - 10.0 / (np.exp(5.0) - 1.0), delta=0.2)
+
+    def test_raise_unknown_sampling(self):
+        with self.assertRaises(FitEnsembleException):
+            self._get_ensemble(sampling='metropolis')
@@ -2,9 +2,10 @@ import unittest2 as unittest
 import numpy as np
 import scipy.stats
 
-from kafe2.fit.tools.ensemble import (broadcast_to_shape,
+from kafe2.fit.tools.ensemble import (broadcast_to_shape, DensitySampler,
                                      EnsembleVariable, EnsembleVariableProbabilityDistribution,
-                                     EnsembleError)
+                                     EnsembleError, MultivariateNormalSampler, OnlineMoments,
+                                     spawn_random_generators)
 
 
 class TestCustomBroadcast(unittest.TestCase):
@@ -215,3 +216,171 @@ class TestEnsembleVariable(unittest.TestCase):
                 _eval_y_compare
             )
         )
+
+
+class TestMultivariateNormalSampler(unittest.TestCase):
+
+    def setUp(self):
+        self._ref_n_samples = 200000
+        self._ref_cov_mat_diagonal = np.diag([1.0, 4.0, 0.25])
+        self._ref_cov_mat_dense = np.array([
+            [1.0, 0.5, 0.2],
+            [0.5, 2.0, 0.3],
+            [0.2, 0.3, 0.5]
+        ])
+        # fully correlated -> singular
+        self._ref_cov_mat_singular = np.outer([1.0, 2.0, 3.0], [1.0, 2.0, 3.0])
+
+    def _assert_sample_cov_mat(self, cov_mat):
+        _sampler = MultivariateNormalSampler(cov_mat)
+        _samples = _sampler.sample(spawn_random_generators(123, 1)[0], self._ref_n_samples)
+        self.assertEqual(_samples.shape, (self._ref_n_samples, 3))
+        self.assertTrue(np.allclose(np.mean(_samples, axis=0), 0.0, atol=2e-2))
+        self.assertTrue(np.allclose(np.cov(_samples.T), cov_mat, rtol=2e-2, atol=2e-2))
+
+    def test_sample_cov_mat_diagonal(self):
+        self._assert_sample_cov_mat(self._ref_cov_mat_diagonal)
+
+    def test_sample_cov_mat_dense(self):
+        self._assert_sample_cov_mat(self._ref_cov_mat_dense)
+
+    def test_sample_cov_mat_singular(self):
+        self._assert_sample_cov_mat(self._ref_cov_mat_singular)
+
+    def test_raise_not_positive_semidefinite(self):
+        with self.assertRaises(EnsembleError):
+            MultivariateNormalSampler(np.array([[1.0, 2.0], [2.0, 1.0]]))
+
+    def test_raise_not_square(self):
+        with self.assertRaises(EnsembleError):
+            MultivariateNormalSampler(np.ones((2, 3)))
+
+    def test_spawn_random_generators_reproducible(self):
+        _samples_1 = [_rg.standard_normal(size=5) for _rg in spawn_random_generators(42, 3)]
+        _samples_2 = [_rg.standard_normal(size=5) for _rg in spawn_random_generators(42, 4)]
+        for _s_1, _s_2 in zip(_samples_1, _samples_2):
+            self.assertTrue(np.all(_s_1 == _s_2))
+        self.assertFalse(np.all(_samples_1[0] == _samples_1[1]))
+
+
+class TestDensitySampler(unittest.TestCase):
+
+    def setUp(self):
+        self._ref_n_samples = 100000
+        self._ref_x_range = (0.0, 5.0)
+        # truncated exponential distribution (not normalized)
+        self._ref_density = lambda x: np.exp(-x)
+        self._ref_dist = scipy.stats.truncexpon(b=self._ref_x_range[1])
+
+    def _assert_samples(self, method):
+        _sampler = DensitySampler(self._ref_density, self._ref_x_range, method=method)
+        _samples = _sampler.sample(spawn_random_generators(123, 1)[0], (4, self._ref_n_samples // 4))
+        self.assertEqual(_samples.shape, (4, self._ref_n_samples // 4))
+        self.assertTrue(np.all(_samples >= self._ref_x_range[0]))
+        self.assertTrue(np.all(_samples <= self._ref_x_range[1]))
+        self.assertAlmostEqual(np.mean(_samples), self._ref_dist.mean(), delta=1e-2)
+        self.assertAlmostEqual(np.std(_samples), self._ref_dist.std(), delta=1e-2)
+        self.assertGreater(scipy.stats.kstest(_samples.flatten(), self._ref_dist.cdf).pvalue, 1e-3)
+
+    def test_sample_accept_reject(self):
+        self._assert_samples('accept_reject')
+
+    def test_sample_inverse_cdf(self):
+        self._assert_samples('inverse_cdf')
+
+    def test_raise_unknown_method(self):
+        with self.assertRaises(EnsembleError):
+            DensitySampler(self._ref_density, self._ref_x_range, method='rejection')
+
+    def test_raise_negative_density(self):
+        with self.assertRaises(EnsembleError):
+            DensitySampler(lambda x: x - 1.0, self._ref_x_range)
+
+
+class TestEnsembleVariableOnlineStatistics(unittest.TestCase):
+
+    def setUp(self):
+        _rng = np.random.RandomState(7)
+        # skewed distribution with a large offset to test numerical stability
+        self._ref_values_1d = 1e4 + _rng.exponential(size=(1000, 3))
+        self._ref_values_scalar = _rng.gamma(2.0, size=1000)
+
+    def _get_online_variable(self, values, block_sizes):
+        _var = EnsembleVariable(sample_size=values.shape[0], variable_shape=values.shape[1:])
+        _i_first = 0
+        for _block_size in block_sizes:
+            _var.set_value(slice(_i_first, _i_first + _block_size), values[_i_first:_i_first + _block_size])
+            _i_first += _block_size
+        return _var
+
+    def _assert_same_statistics(self, values, block_sizes):
+        _ref_var = EnsembleVariable(values)
+        _var = self._get_online_variable(values, block_sizes)
+        self.assertFalse(_var.stores_values)
+        self.assertEqual(_var.size, _ref_var.size)
+        self.assertEqual(_var.shape, _ref_var.shape)
+        for _stat_name in ('mean', 'mean_error', 'std', 'std_error', 'skew', 'kurtosis', 'cov_mat', 'cor_mat'):
+            self.assertTrue(np.allclose(getattr(_var, _stat_name), getattr(_ref_var, _stat_name),
+                                        rtol=1e-8, atol=1e-10), _stat_name)
+
+    def test_statistics_1d_blocks(self):
+        self._assert_same_statistics(self._ref_values_1d, [100, 1, 399, 500])
+
+    def test_statistics_1d_single_values(self):
+        self._assert_same_statistics(self._ref_values_1d[:50], [1] * 50)
+
+    def test_statistics_scalar(self):
+        self._assert_same_statistics(self._ref_values_scalar, [300, 700])
+
+    def test_truncate(self):
+        _ref_var = EnsembleVariable(self._ref_values_1d[:400])
+        _var = EnsembleVariable(self._ref_values_1d.copy())
+        _var.truncate(400)
+        self.assertEqual(_var.size, 400)
+        self.assertTrue(np.all(_var.values == _ref_var.values))
+        # online statistics only use the values set so far
+        _var_online = self._get_online_variable(self._ref_values_1d[:400], [400])
+        _var_online.truncate(400)
+        for _stat_name in ('mean_error', 'std_error'):
+            self.assertTrue(np.allclose(getattr(_var, _stat_name), getattr(_ref_var, _stat_name)))
+            self.assertTrue(np.allclose(getattr(_var_online, _stat_name), getattr(_ref_var, _stat_name)))
+        with self.assertRaises(EnsembleError):
+            _var.truncate(401)
+
+    def test_std_error_normal(self):
+        _var = EnsembleVariable(np.random.RandomState(3).standard_normal(size=100000))
+        self.assertAlmostEqual(_var.std_error, 1.0 / np.sqrt(2 * 100000), delta=1e-4)
+
+    def test_values_not_available(self):
+        _var = self._get_online_variable(self._ref_values_scalar, [1000])
+        with self.assertRaises(EnsembleError):
+            _var.values
+
+    def test_comoments_opt_in(self):
+        _n_large = EnsembleVariable.MAX_AUTO_COMOMENTS_SIZE + 1
+        _var_large = EnsembleVariable(sample_size=10, variable_shape=(_n_large,))
+        _var_large.set_value(slice(0, 10), np.ones((10, _n_large)))
+        self.assertTrue(np.allclose(_var_large.mean, 1.0))
+        with self.assertRaises(EnsembleError):
+            _var_large.cov_mat
+        _var_small = EnsembleVariable(sample_size=10, variable_shape=(3,), with_comoments=False)
+        with self.assertRaises(EnsembleError):
+            _var_small.cov_mat
+        _var_large = EnsembleVariable(sample_size=10, variable_shape=(_n_large,), with_comoments=True)
+        _var_large.set_value(slice(0, 10), np.ones((10, _n_large)))
+        self.assertEqual(_var_large.cov_mat.shape, (_n_large, _n_large))
+
+    def test_raise_missing_size(self):
+        with self.assertRaises(EnsembleError):
+            EnsembleVariable(variable_shape=(3,))
+
+    def test_moments_state_round_trip(self):
+        _moments = OnlineMoments((3,), with_comoments=True)
+        _moments.update(self._ref_values_1d[:500])
+        _restored_moments = OnlineMoments((3,), with_comoments=True)
+        _restored_moments.set_state(_moments.get_state())
+        _moments.update(self._ref_values_1d[500:])
+        _restored_moments.update(self._ref_values_1d[500:])
+        self.assertEqual(_restored_moments.n, 1000)
+        self.assertTrue(np.all(_restored_moments.cov_mat == _moments.cov_mat))
+        self.assertTrue(np.all(_restored_moments.kurtosis == _moments.kurtosis))
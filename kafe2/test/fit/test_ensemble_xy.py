@@ -0,0 +1,344 @@
+import math
+import os
+import shutil
+import tempfile
+import unittest2 as unittest
+import numpy as np
+
+from kafe2.fit import XYFitEnsemble
+from kafe2.fit._base import FitEnsembleException
+
+
+def line_xy_model(x, a=1.0, b=0.0):
+    return a * x + b
+
+
+def exponential_xy_model(x, a=1.0, b=0.1):
+    return a * np.exp(b * x)
+
+
+def non_broadcasting_xy_model(x, a=1.0, b=0.1):
+    return a * np.exp(b * x) + 0 * math.exp(b)
+
+
+class TestXYFitEnsemble(unittest.TestCase):
+
+    def setUp(self):
+        self._ref_n_exp = 50
+        self._ref_x_support = np.linspace(0, 10, 12)
+        self._ref_parameters = [1.5, -0.5]
+
+    def _get_ensemble(self, x_error=None, **kwargs):
+        _ensemble = XYFitEnsemble(
+            n_experiments=self._ref_n_exp,
+            x_support=self._ref_x_support,
+            model_function=line_xy_model,
+            model_parameters=self._ref_parameters,
+            **kwargs
+        )
+        _ensemble.add_error('y', 0.5)
+        if x_error is not None:
+            _ensemble.add_error('x', x_error)
+        return _ensemble
+
+    def test_raise_run_without_errors(self):
+        _ensemble = XYFitEnsemble(
+            n_experiments=self._ref_n_exp,
+            x_support=self._ref_x_support,
+            model_function=line_xy_model,
+            model_parameters=self._ref_parameters
+        )
+        with self.assertRaises(FitEnsembleException):
+            _ensemble.run()
+
+    def test_results_shape(self):
+        _ensemble = self._get_ensemble()
+        _ensemble.run(seed=1)
+        _results = _ensemble.get_results()
+        self.assertEqual(_results['cost'].shape, (self._ref_n_exp,))
+        self.assertEqual(_results['parameter_pulls'].shape, (self._ref_n_exp, 2))
+        self.assertEqual(_results['y_pulls'].shape, (self._ref_n_exp, len(self._ref_x_support)))
+
+    def test_toy_fits_use_pseudodata(self):
+        _ensemble = self._get_ensemble()
+        _ensemble.run(seed=1)
+        _results = _ensemble.get_results()
+        # every pseudo-experiment has a different fit result
+        self.assertEqual(len(np.unique(_results['cost'])), self._ref_n_exp)
+        self.assertGreater(np.std(_results['parameter_pulls'][:, 0]), 0.5)
+
+    def test_run_reproducible_with_seed(self):
+        _ensemble = self._get_ensemble(x_error=0.1)
+        _ensemble.run(seed=12345)
+        _results_1 = _ensemble.get_results()
+        _ensemble.run(seed=12345)
+        _results_2 = _ensemble.get_results()
+        for _name in _results_1:
+            self.assertTrue(np.all(_results_1[_name] == _results_2[_name]))
+        _ensemble.run(seed=54321)
+        _results_3 = _ensemble.get_results()
+        self.assertFalse(np.all(_results_1['cost'] == _results_3['cost']))
+
+    def test_run_parallel_same_as_serial(self):
+        _ensemble = self._get_ensemble(x_error=0.1)
+        _ensemble._PSEUDODATA_BLOCK_SIZE = 8  # multiple blocks per run
+        _ensemble.run(seed=12345, n_workers=1)
+        _results_serial = _ensemble.get_results()
+        _ensemble.run(seed=12345, n_workers=3)
+        _results_parallel = _ensemble.get_results()
+        for _name in _results_serial:
+            self.assertTrue(np.all(_results_serial[_name] == _results_parallel[_name]))
+
+    def test_x_data_result(self):
+        _ensemble = XYFitEnsemble(
+            n_experiments=self._ref_n_exp,
+            x_support=self._ref_x_support,
+            model_function=line_xy_model,
+            model_parameters=self._ref_parameters,
+            requested_results=['x_data', 'y_data']
+        )
+        _ensemble.add_error('y', 0.5)
+        _ensemble.run(seed=1)
+        _results = _ensemble.get_results()
+        self.assertTrue(np.all(_results['x_data'] == self._ref_x_support))
+        self.assertEqual(_results['y_data'].shape, (self._ref_n_exp, len(self._ref_x_support)))
+
+    def test_online_statistics_same_as_stored(self):
+        _statistics = ['mean', 'std', 'skew', 'kurtosis', 'cov_mat']
+        _ensemble = self._get_ensemble()
+        _ensemble._PSEUDODATA_BLOCK_SIZE = 8
+        _ensemble.run(seed=12345)
+        _ref_statistics = _ensemble.get_results_statistics(statistics=_statistics)
+        _ensemble_online = self._get_ensemble(store_values=False)
+        _ensemble_online._PSEUDODATA_BLOCK_SIZE = 8
+        _ensemble_online.run(seed=12345)
+        _statistics_online = _ensemble_online.get_results_statistics(statistics=_statistics)
+        for _name in _ref_statistics:
+            for _stat_name in _statistics:
+                self.assertTrue(np.allclose(_statistics_online[_name][_stat_name],
+                                            _ref_statistics[_name][_stat_name]))
+        with self.assertRaises(Exception):
+            _ensemble_online.get_results()
+
+
+    def test_linear_engine_same_as_minimizer(self):
+        _requested_results = ['parameter_pulls', 'cost', 'y_pulls', 'y_model', 'y_data', 'x_data']
+        _ensemble = self._get_ensemble(requested_results=_requested_results)
+        _ensemble.add_error('y', 0.2, correlation=0.5)
+        _ensemble.run(seed=12345, engine='minimizer')
+        _results_minimizer = _ensemble.get_results()
+        _ensemble.run(seed=12345, engine='linear')
+        _results_linear = _ensemble.get_results()
+        for _name in _requested_results:
+            self.assertTrue(np.allclose(_results_linear[_name], _results_minimizer[_name], rtol=1e-4, atol=1e-4))
+
+    def test_auto_engine_linear(self):
+        _ensemble = self._get_ensemble()
+        _ensemble.run(seed=1)
+        self.assertIsNotNone(_ensemble._linear_toy_fit_matrices)
+
+    def test_auto_engine_nonlinear_model(self):
+        _ensemble = XYFitEnsemble(
+            n_experiments=10,
+            x_support=self._ref_x_support,
+            model_function=exponential_xy_model,
+            model_parameters=[1.0, 0.2]
+        )
+        _ensemble.add_error('y', 0.5)
+        _ensemble.run(seed=1)
+        self.assertIsNone(_ensemble._linear_toy_fit_matrices)
+        self.assertIsNotNone(_ensemble._batched_toy_fit_setup)
+        with self.assertRaises(FitEnsembleException):
+            _ensemble.run(seed=1, engine='linear')
+
+    def _get_nonlinear_ensemble(self, model_function=exponential_xy_model):
+        _ensemble = XYFitEnsemble(
+            n_experiments=20,
+            x_support=self._ref_x_support,
+            model_function=model_function,
+            model_parameters=[1.0, 0.2],
+            requested_results=['parameter_pulls', 'cost', 'y_pulls', 'y_model']
+        )
+        _ensemble.add_error('y', 0.5)
+        _ensemble.add_error('y', 0.2, correlation=0.5)
+        return _ensemble
+
+    def test_batched_engine_same_as_minimizer(self):
+        _ensemble = self._get_nonlinear_ensemble()
+        _ensemble.run(seed=12345, engine='minimizer')
+        _results_minimizer = _ensemble.get_results()
+        _ensemble.run(seed=12345, engine='batched')
+        _results_batched = _ensemble.get_results()
+        self.assertTrue(np.allclose(_results_batched['cost'], _results_minimizer['cost'], rtol=1e-6))
+        self.assertTrue(np.allclose(_results_batched['y_model'], _results_minimizer['y_model'], atol=1e-3))
+        self.assertTrue(np.allclose(_results_batched['y_pulls'], _results_minimizer['y_pulls'], atol=1e-3))
+        # the parameter errors of the minimizer are only approximate
+        self.assertTrue(np.allclose(_results_batched['parameter_pulls'], _results_minimizer['parameter_pulls'],
+                                    rtol=1e-2, atol=1e-3))
+
+    def test_batched_engine_fallback_to_minimizer(self):
+        _ensemble = self._get_nonlinear_ensemble()
+        _ensemble.run(seed=12345, engine='minimizer')
+        _results_minimizer = _ensemble.get_results()
+        # no iterations -> no toy fit converges
+        _ensemble._BATCHED_TOY_FIT_MAX_ITERATIONS = 0
+        _ensemble.run(seed=12345, engine='batched')
+        _results_batched = _ensemble.get_results()
+        for _name in _results_minimizer:
+            self.assertTrue(np.all(_results_batched[_name] == _results_minimizer[_name]))
+
+    def test_auto_engine_non_broadcasting_model(self):
+        _ensemble = self._get_nonlinear_ensemble(model_function=non_broadcasting_xy_model)
+        _ensemble.run(seed=1)
+        self.assertIsNone(_ensemble._linear_toy_fit_matrices)
+        self.assertIsNone(_ensemble._batched_toy_fit_setup)
+        with self.assertRaises(FitEnsembleException):
+            _ensemble.run(seed=1, engine='batched')
+
+    def test_auto_engine_x_errors(self):
+        _ensemble = self._get_ensemble(x_error=0.1)
+        _ensemble.run(seed=1)
+        self.assertIsNone(_ensemble._linear_toy_fit_matrices)
+        with self.assertRaises(FitEnsembleException):
+            _ensemble.run(seed=1, engine='linear')
+
+    def test_auto_engine_relative_errors(self):
+        _ensemble = self._get_ensemble()
+        _ensemble.add_error('y', 0.1, relative=True)
+        _ensemble.run(seed=1)
+        self.assertIsNone(_ensemble._linear_toy_fit_matrices)
+
+    def test_stop_at_target_precision(self):
+        self._ref_n_exp = 100000
+        _ensemble = self._get_ensemble()
+        _ensemble.run(seed=1, target_precision={'parameter_pulls': {'mean': 0.05, 'std': 0.04}},
+                      precision_check_interval=1)
+        _n_performed = _ensemble.n_exp_performed
+        # mean error ~ 1/sqrt(N) and std error ~ 1/sqrt(2N) -> about 400 toys
+        self.assertGreaterEqual(_n_performed, 300)
+        self.assertLessEqual(_n_performed, 700)
+        self.assertEqual(_n_performed % _ensemble._PSEUDODATA_BLOCK_SIZE, 0)
+        self.assertEqual(_ensemble.get_results()['parameter_pulls'].shape, (_n_performed, 2))
+        _statistics = _ensemble.get_results_statistics(results=['parameter_pulls'],
+                                                       statistics=['mean_error', 'std_error'])
+        self.assertTrue(np.all(_statistics['parameter_pulls']['mean_error'] <= 0.05))
+        self.assertTrue(np.all(_statistics['parameter_pulls']['std_error'] <= 0.04))
+
+        # same number of toys with online statistics
+        _ensemble_online = self._get_ensemble(store_values=False)
+        _ensemble_online.run(seed=1, target_precision={'parameter_pulls': {'mean': 0.05, 'std': 0.04}},
+                             precision_check_interval=1)
+        self.assertEqual(_ensemble_online.n_exp_performed, _n_performed)
+
+    def test_target_precision_not_reached(self):
+        _ensemble = self._get_ensemble()
+        _ensemble.run(seed=1, target_precision={'cost': {'mean': 1e-6}}, precision_check_interval=1)
+        self.assertEqual(_ensemble.n_exp_performed, self._ref_n_exp)
+        self.assertEqual(_ensemble.get_results()['cost'].shape, (self._ref_n_exp,))
+
+    def test_raise_target_precision_unknown(self):
+        _ensemble = self._get_ensemble()
+        with self.assertRaises(FitEnsembleException):
+            _ensemble.run(seed=1, target_precision={'cost': {'kurtosis': 0.1}})
+        with self.assertRaises(FitEnsembleException):
+            _ensemble.run(seed=1, target_precision={'y_data': {'mean': 0.1}})
+
+    def test_raise_unknown_engine(self):
+        _ensemble = self._get_ensemble()
+        with self.assertRaises(FitEnsembleException):
+            _ensemble.run(seed=1, engine='magic')
+
+class TestXYFitEnsembleCheckpoints(unittest.TestCase):
+
+    class _Interrupt(Exception):
+        pass
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self._checkpoint_file = os.path.join(self._tmp_dir, 'checkpoint.npz')
+        self._ref_n_blocks_before_interrupt = 3
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def _get_ensemble(self, **kwargs):
+        _ensemble = XYFitEnsemble(
+            n_experiments=50,
+            x_support=np.linspace(0, 10, 12),
+            model_function=line_xy_model,
+            model_parameters=[1.5, -0.5],
+            **kwargs
+        )
+        _ensemble.add_error('y', 0.5)
+        _ensemble.add_error('x', 0.1)
+        _ensemble._PSEUDODATA_BLOCK_SIZE = 4
+        return _ensemble
+
+    def _run_interrupted(self, ensemble, **kwargs):
+        # simulate a crash after a few blocks of pseudo-experiments
+        _gather = ensemble._gather_results_from_toy_fit_block
+        _n_calls = [0]
+
+        def _gather_and_interrupt(*args):
+            if _n_calls[0] == self._ref_n_blocks_before_interrupt:
+                raise self._Interrupt()
+            _n_calls[0] += 1
+            _gather(*args)
+
+        ensemble._gather_results_from_toy_fit_block = _gather_and_interrupt
+        with self.assertRaises(self._Interrupt):
+            ensemble.run(checkpoint_file=self._checkpoint_file, checkpoint_interval=2, **kwargs)
+        del ensemble._gather_results_from_toy_fit_block
+
+    def _assert_resume_same_as_uninterrupted(self, **kwargs):
+        _ensemble = self._get_ensemble(**kwargs)
+        _ensemble.run(seed=12345)
+        _ref_statistics = _ensemble.get_results_statistics(statistics=['mean', 'std', 'kurtosis'])
+
+        _ensemble = self._get_ensemble(**kwargs)
+        self._run_interrupted(_ensemble, seed=12345)
+        _ensemble = self._get_ensemble(**kwargs)
+        _ensemble.run(checkpoint_file=self._checkpoint_file, resume=True)
+        _statistics = _ensemble.get_results_statistics(statistics=['mean', 'std', 'kurtosis'])
+        for _name in _ref_statistics:
+            for _stat_name in _ref_statistics[_name]:
+                self.assertTrue(np.allclose(_statistics[_name][_stat_name], _ref_statistics[_name][_stat_name],
+                                            rtol=1e-12, atol=1e-12))
+        return _ensemble
+
+    def test_resume_in_memory(self):
+        self._assert_resume_same_as_uninterrupted()
+
+    def test_resume_online(self):
+        self._assert_resume_same_as_uninterrupted(store_values=False)
+
+    def test_resume_storage_dir(self):
+        _storage_dir = os.path.join(self._tmp_dir, 'results')
+        _ensemble = self._assert_resume_same_as_uninterrupted(storage_dir=_storage_dir)
+        _stored_cost = np.load(os.path.join(_storage_dir, 'cost.npy'))
+        self.assertTrue(np.all(_stored_cost == _ensemble.get_results('cost')['cost']))
+
+    def test_resume_without_seed(self):
+        _ensemble = self._get_ensemble()
+        self._run_interrupted(_ensemble)
+        _ensemble.run(checkpoint_file=self._checkpoint_file, resume=True)
+        _results_resumed = _ensemble.get_results()
+        _ensemble.run(checkpoint_file=os.path.join(self._tmp_dir, 'other.npz'),
+                      seed=int(str(np.load(self._checkpoint_file)['seed'])))
+        _results = _ensemble.get_results()
+        for _name in _results:
+            self.assertTrue(np.all(_results[_name] == _results_resumed[_name]))
+
+    def test_raise_resume_different_seed(self):
+        _ensemble = self._get_ensemble()
+        self._run_interrupted(_ensemble, seed=12345)
+        with self.assertRaises(FitEnsembleException):
+            _ensemble.run(checkpoint_file=self._checkpoint_file, seed=1, resume=True)
+
+    def test_raise_resume_different_n_exp(self):
+        _ensemble = self._get_ensemble()
+        self._run_interrupted(_ensemble, seed=12345)
+        _ensemble = self._get_ensemble()
+        _ensemble._n_exp = 60
+        with self.assertRaises(FitEnsembleException):
+            _ensemble.run(checkpoint_file=self._checkpoint_file, resume=True)
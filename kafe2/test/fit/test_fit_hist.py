@@ -246,6 +246,72 @@ class TestHistFitBasicInterface(AbstractTestFit, unittest.TestCase):
             rtol=1e-2
         )
 
+    def test_update_data_in_place(self):
+        _fit = self._get_fit(bin_evaluation=hist_model_density_antideriv)
+        _fit.do_fit()
+        _container = _fit.data_container
+        _new_bin_heights = self._ref_hist_cont.data * 2
+
+        _fit.update_data(_new_bin_heights, overflow=3)
+
+        self.assertIs(_fit.data_container, _container)
+        self.assertEqual(_fit.data_container.n_entries, np.sum(_new_bin_heights) + 3)
+
+        _fit.do_fit()
+
+        _ref_hist_cont = HistContainer(self._ref_n_bins, self._ref_n_bin_range)
+        _ref_hist_cont.set_bins(_new_bin_heights, overflow=3)
+        _ref_fit = HistFit(
+            data=_ref_hist_cont,
+            model_density_function=hist_model_density,
+            bin_evaluation=hist_model_density_antideriv,
+            cost_function=HistCostFunction_NegLogLikelihood(data_point_distribution='poisson'),
+            minimizer=self.MINIMIZER
+        )
+        _ref_fit.do_fit()
+
+        self._assert_fit_properties(
+            _fit,
+            dict(
+                data=_new_bin_heights,
+                model=_ref_fit.model,
+                parameter_values=_ref_fit.parameter_values,
+                cost_function_value=_ref_fit.cost_function_value,
+            ),
+            rtol=1e-3
+        )
+
+    def test_update_data_in_place_length_mismatch_raise(self):
+        _fit = self._get_fit(bin_evaluation=hist_model_density_antideriv)
+        with self.assertRaises(HistFitException):
+            _fit.update_data(self._ref_hist_cont.data[:-1])
+
+    def test_clone(self):
+        _fit = self._get_fit(bin_evaluation=hist_model_density_antideriv)
+        _fit.do_fit()
+        _new_bin_heights = self._ref_hist_cont.data * 2
+
+        _clone = _fit.clone()
+        _clone.update_data(_new_bin_heights)
+        _clone.do_fit()
+
+        _ref_fit = self._get_fit(bin_evaluation=hist_model_density_antideriv)
+        _ref_fit.update_data(_new_bin_heights)
+        _ref_fit.do_fit()
+
+        self._assert_fit_properties(
+            _clone,
+            dict(
+                data=_new_bin_heights,
+                model=_ref_fit.model,
+                parameter_values=_ref_fit.parameter_values,
+                cost_function_value=_ref_fit.cost_function_value,
+            ),
+            rtol=1e-3
+        )
+        # the original fit is unaffected
+        self._assert_fit_properties(_fit, dict(data=self._ref_hist_cont.data))
+
     def test_reserved_parameter_names_raise(self):
         def dummy_model(x, data):
             pass
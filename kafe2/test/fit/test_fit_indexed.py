@@ -249,6 +249,52 @@ class TestIndexedFitBasicInterface(AbstractTestFit, unittest.TestCase):
         with self.assertRaises(IndexedParametricModelException):
             _fit.data = np.arange(self._n_points + 1)
 
+    def test_update_data_in_place(self):
+        _fit = self._get_fit()
+        _fit.do_fit()
+        _container = _fit.data_container
+
+        _fit.update_data(self._ref_data * 2)
+
+        self.assertIs(_fit.data_container, _container)
+        self._assert_fit_properties(
+            _fit,
+            dict(
+                data=self._ref_data * 2,
+                data_error=self._ref_error,
+            )
+        )
+
+        _fit.do_fit()
+        _new_estimates = np.array(self._nominal_fit_result_pars) * 2
+
+        self._assert_fit_properties(
+            _fit,
+            dict(
+                data=self._ref_data * 2,
+                parameter_values=_new_estimates,
+            ),
+            rtol=1e-2
+        )
+
+    def test_update_data_in_place_relative_errors(self):
+        _fit = self._get_fit(errors=[dict(err_val=0.1, relative=True)])
+
+        _fit.update_data(self._ref_data * 2, copy=False)
+
+        self._assert_fit_properties(
+            _fit,
+            dict(
+                data=self._ref_data * 2,
+                data_error=np.abs(self._ref_data * 2) * 0.1,
+            )
+        )
+
+    def test_update_data_in_place_length_mismatch_raise(self):
+        _fit = self._get_fit()
+        with self.assertRaises(IndexedFitException):
+            _fit.update_data(np.arange(self._n_points + 1))
+
     def test_reserved_parameter_names_raise(self):
         def dummy_model(data):
             pass
@@ -1,3 +1,6 @@
+import pickle
+import threading
+
 import numpy as np
 from scipy.stats import norm
 import unittest2 as unittest
@@ -7,6 +10,7 @@ from abc import ABCMeta
 from kafe2 import HistContainer, HistFit, IndexedFit, MultiFit, XYFit
 from kafe2.test.tools import calculate_expected_fit_parameters_xy
 from kafe2.test.fit.test_fit import AbstractTestFit
+from kafe2.fit.multi.cov_mat import BlockLowRankCovMat
 from kafe2.fit.util.function_library import quadratic_model, quadratic_model_derivative
 from kafe2.core.minimizers import MinimizerException
 
@@ -121,6 +125,42 @@ class TestSharedErrorLogic(AbstractTestFit, unittest.TestCase):
 
         self._assert_fit_results_equal(_multifit, _multifit_permuted)
 
+    def test_pickle_same_result(self):
+        _multifit = self._get_multifit()
+        _multifit.add_error(err_val=1.0, fits=[1, 2, 3], axis="y")
+        _multifit.add_error(err_val=0.1, fits=[1, 3], axis="x")
+        _multifit_unpickled = pickle.loads(pickle.dumps(_multifit))
+        self.assertEqual(_multifit_unpickled.cost_function_value, _multifit.cost_function_value)
+
+        _multifit.do_fit()
+        _multifit_unpickled.do_fit()
+        self._assert_fit_results_equal(_multifit, _multifit_unpickled)
+
+        _multifit_unpickled = pickle.loads(pickle.dumps(_multifit))
+        self.assertTrue(_multifit_unpickled.did_fit)
+        self._assert_fit_results_equal(_multifit, _multifit_unpickled)
+
+    def test_shared_error_cost_same_as_dense(self):
+        _multifit = self._get_multifit(hist_fit=False)
+        _multifit.add_error(err_val=0.5, fits="all", axis="y", correlation=0.3)
+        _multifit.add_error(err_val=0.2, fits=[0, 2], axis="y", correlation=1.0)
+        _multifit.set_all_parameter_values([2.0, 4.0])
+
+        _sizes = [_fit.data_size for _fit in _multifit.fits]
+        _edges = np.cumsum([0] + _sizes)
+        _cov_mat = np.zeros((_edges[-1], _edges[-1]))
+        for _i, _fit in enumerate(_multifit.fits):
+            _cov_mat[_edges[_i]:_edges[_i + 1], _edges[_i]:_edges[_i + 1]] = _fit.total_cov_mat
+        for _fit_indices, _error in [([0, 1, 2], 0.5 ** 2 * (0.7 * np.eye(10) + 0.3)),
+                                     ([0, 2], 0.2 ** 2 * np.ones((10, 10)))]:
+            for _j in _fit_indices:
+                for _k in _fit_indices:
+                    if _j != _k:
+                        _cov_mat[_edges[_j]:_edges[_j + 1], _edges[_k]:_edges[_k + 1]] += _error
+        _res = np.concatenate([_fit.y_data - _fit.y_model if isinstance(_fit, XYFit) else _fit.data - _fit.model
+                               for _fit in _multifit.fits])
+        self.assertAlmostEqual(_multifit.cost_function_value, _res.dot(np.linalg.inv(_cov_mat)).dot(_res))
+
     def test_add_shared_error_raise(self):
         _multifit = self._get_multifit()
         with self.assertRaises(ValueError):
@@ -143,6 +183,151 @@ class TestSharedErrorLogic(AbstractTestFit, unittest.TestCase):
                 err_val=1.0, fits=[1, 3], axis="y", relative=True, reference="data")
 
 
+class TestBlockLowRankCovMat(unittest.TestCase):
+
+    def setUp(self):
+        _random_state = np.random.RandomState(0)
+        self._blocks = []
+        for _size in (3, 5, 4):
+            _a = _random_state.normal(size=(_size, _size))
+            self._blocks.append(_a.dot(_a.T) + np.eye(_size))
+        self._low_rank_factor = _random_state.normal(size=(12, 2))
+        self._vector = _random_state.normal(size=12)
+
+    def _get_dense_result(self, cov_mat):
+        return self._vector.dot(np.linalg.inv(cov_mat.mat)).dot(self._vector)
+
+    def test_inv_quad(self):
+        _cov_mat = BlockLowRankCovMat(self._blocks, self._low_rank_factor)
+        self.assertAlmostEqual(_cov_mat.inv_quad(self._vector), self._get_dense_result(_cov_mat))
+
+    def test_inv_quad_singular_block(self):
+        self._blocks[1] = np.zeros((5, 5))
+        self._low_rank_factor = np.random.RandomState(1).normal(size=(12, 6))
+        _cov_mat = BlockLowRankCovMat(self._blocks, self._low_rank_factor)
+        self.assertAlmostEqual(_cov_mat.inv_quad(self._vector), self._get_dense_result(_cov_mat))
+
+    def test_inv_quad_singular(self):
+        self._blocks[1] = np.zeros((5, 5))
+        _cov_mat = BlockLowRankCovMat(self._blocks, self._low_rank_factor)
+        self.assertIsNone(_cov_mat.inv_quad(self._vector))
+
+
+class TestMultiFitSubFitEvaluation(unittest.TestCase):
+    N_FITS = 20
+
+    @staticmethod
+    def _get_counting_model_function(index, counter):
+        # every fit needs its own parameter names -> create the function from source code
+        _namespace = dict(counter=counter)
+        six.exec_(
+            "def line_{0}(x, a_{0}=1.0, b_{0}=0.0, c=0.0):\n"
+            "    counter[{0}] += 1\n"
+            "    return a_{0} * x + b_{0} + c * x ** 2\n".format(index),
+            _namespace)
+        return _namespace["line_%s" % index]
+
+    def setUp(self):
+        _random_state = np.random.RandomState(0)
+        _x = np.linspace(0, 1, 10)
+        self._counter = [0] * self.N_FITS
+        self._fits = []
+        for _i in range(self.N_FITS):
+            _fit = XYFit([_x, 2.0 * _x + 1.0 + _random_state.normal(0, 0.1, 10)],
+                         self._get_counting_model_function(_i, self._counter))
+            _fit.add_error('y', 0.1)
+            self._fits.append(_fit)
+        self._multifit = MultiFit(self._fits)
+        self._parameter_values = self._multifit.parameter_values
+        self._evaluate_cost(self._parameter_values)
+
+    def _evaluate_cost(self, parameter_values):
+        """evaluate the cost like the minimizer does and return the number of model evaluations per fit"""
+        _counter_before = list(self._counter)
+        self._multifit._fitter._fcn_wrapper(*parameter_values)
+        return [_after - _before for _after, _before in zip(self._counter, _counter_before)]
+
+    def test_unchanged_parameters(self):
+        self.assertEqual(self._evaluate_cost(self._parameter_values), [0] * self.N_FITS)
+
+    def test_fit_parameter_changed(self):
+        self._parameter_values[self._multifit.parameter_names.index('a_3')] += 0.1
+        _evaluations = self._evaluate_cost(self._parameter_values)
+        self.assertGreater(_evaluations.pop(3), 0)
+        self.assertEqual(_evaluations, [0] * (self.N_FITS - 1))
+
+    def test_shared_parameter_changed(self):
+        self._parameter_values[self._multifit.parameter_names.index('c')] += 0.1
+        _evaluations = self._evaluate_cost(self._parameter_values)
+        self.assertTrue(all(_n > 0 for _n in _evaluations))
+
+    def test_cost_same_as_sum(self):
+        self._parameter_values[self._multifit.parameter_names.index('b_7')] += 0.1
+        self._evaluate_cost(self._parameter_values)
+        self.assertAlmostEqual(self._multifit.cost_function_value,
+                               sum(_fit.cost_function_value for _fit in self._fits))
+
+    def test_sub_fit_results(self):
+        self._multifit.do_fit()
+        _names = self._multifit.parameter_names
+        for _fit in self._fits:
+            _indices = [_names.index(_name) for _name in _fit.parameter_names]
+            self.assertTrue(np.all(_fit.parameter_values == self._multifit.parameter_values[_indices]))
+            self.assertTrue(np.all(_fit.parameter_errors == self._multifit.parameter_errors[_indices]))
+            self.assertTrue(np.all(
+                _fit.parameter_cov_mat == self._multifit.parameter_cov_mat[_indices][:, _indices]))
+            self.assertTrue(np.all(
+                _fit.parameter_cor_mat == self._multifit.parameter_cor_mat[_indices][:, _indices]))
+
+
+class TestMultiFitThreads(unittest.TestCase):
+
+    def setUp(self):
+        self._threads = set()
+
+    def _get_multifit(self, **kwargs):
+        def _line(x, a=1.0, b=0.0):
+            self._threads.add(threading.current_thread().name)
+            return a * x + b
+
+        def _quadratic(x, a=1.0, c=0.0):
+            self._threads.add(threading.current_thread().name)
+            return a * x + c * x ** 2
+
+        _random_state = np.random.RandomState(0)
+        _x = np.linspace(0, 1, 10)
+        _fits = []
+        for _model_function in (_line, _quadratic):
+            _fit = XYFit([_x, 2.0 * _x + 1.0 + _random_state.normal(0, 0.1, 10)], _model_function)
+            _fit.add_error('y', 0.1)
+            _fits.append(_fit)
+        _histogram = HistContainer(5, (-2, 2))
+        _histogram.fill(_random_state.normal(size=100))
+        _fits.append(HistFit(_histogram))
+
+        _multifit = MultiFit(_fits, **kwargs)
+        _multifit.add_error(0.05, fits=[0, 1], axis='y')
+        return _multifit
+
+    def test_same_result_as_serial(self):
+        _multifit = self._get_multifit()
+        _multifit.do_fit()
+        _parameter_values = _multifit.parameter_values
+        _cost = _multifit.cost_function_value
+        self.assertEqual(self._threads, {threading.current_thread().name})
+
+        _multifit = self._get_multifit(n_threads=3, min_thread_data_size=0)
+        _multifit.do_fit()
+        self.assertTrue(np.allclose(_multifit.parameter_values, _parameter_values))
+        self.assertAlmostEqual(_multifit.cost_function_value, _cost)
+        self.assertGreater(len(self._threads), 1)
+
+    def test_min_thread_data_size(self):
+        _multifit = self._get_multifit(n_threads=3, min_thread_data_size=11)
+        _multifit.do_fit()
+        self.assertEqual(self._threads, {threading.current_thread().name})
+
+
 @six.add_metaclass(ABCMeta)
 class TestMultiFit(AbstractTestFit, unittest.TestCase):
 
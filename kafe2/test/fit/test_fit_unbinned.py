@@ -1,4 +1,7 @@
 import abc
+import os
+import shutil
+import tempfile
 import unittest2 as unittest
 import numpy as np
 import six
@@ -13,7 +16,7 @@ from kafe2.config import kc
 from kafe2.fit import UnbinnedFit, UnbinnedContainer
 from kafe2.fit._base import ModelFunctionException
 from kafe2.fit.unbinned.fit import UnbinnedFitException
-from kafe2.fit.unbinned.cost import UnbinnedCostFunction_NegLogLikelihood
+from kafe2.fit.unbinned.cost import UnbinnedCostFunction_NegLogLikelihood, UnbinnedCostFunction_ChunkedNegLogLikelihood
 
 from kafe2.test.fit.test_fit import AbstractTestFit
 
@@ -157,6 +160,40 @@ class TestUnbinnedFitBasicInterface(AbstractTestFit, unittest.TestCase):
             rtol=1e-2
         )
 
+    def test_update_data_in_place(self):
+        _fit = self._get_fit()
+        _fit.do_fit()
+        _container = _fit.data_container
+        _new_data = self._ref_data * 0.8 + 0.2
+
+        _fit.update_data(_new_data)
+
+        self.assertIs(_fit.data_container, _container)
+        _fit.do_fit()
+
+        _ref_fit = UnbinnedFit(
+            data=_new_data,
+            model_density_function=unbinned_model_density,
+            minimizer=self.MINIMIZER
+        )
+        _ref_fit.do_fit()
+
+        self._assert_fit_properties(
+            _fit,
+            dict(
+                data=_new_data,
+                model=_ref_fit.model,
+                parameter_values=_ref_fit.parameter_values,
+                cost_function_value=_ref_fit.cost_function_value,
+            ),
+            rtol=1e-3
+        )
+
+    def test_update_data_in_place_length_mismatch_raise(self):
+        _fit = self._get_fit()
+        with self.assertRaises(UnbinnedFitException):
+            _fit.update_data(self._ref_data[:-1])
+
     def test_reserved_parameter_names_raise(self):
         def dummy_model(x, data):
             pass
@@ -250,3 +287,162 @@ class TestUnbinnedFitBasicInterface(AbstractTestFit, unittest.TestCase):
         _fit.do_fit()
         _fit.report(output_stream=_buffer)
         self.assertNotEqual(_buffer.getvalue(), "")
+
+
+class TestUnbinnedFitBinnedApproximation(unittest.TestCase):
+
+    MINIMIZER = 'scipy'
+
+    @staticmethod
+    def _normal_pdf(x, mu=0.5, sigma=1.2):
+        return np.exp(-0.5 * ((x - mu) / sigma) ** 2) / np.sqrt(2 * np.pi) / sigma
+
+    def setUp(self):
+        self._data = np.random.RandomState(0).normal(0.3, 1.0, 100000)
+        self._exact_fit = UnbinnedFit(self._data, self._normal_pdf, minimizer=self.MINIMIZER)
+        self._exact_fit.do_fit()
+
+    def _get_fit(self, **kwargs):
+        return UnbinnedFit(self._data, self._normal_pdf, minimizer=self.MINIMIZER, **kwargs)
+
+    def test_binned_data(self):
+        _fit = self._get_fit(n_bins=50)
+        self.assertEqual(_fit.n_bins, 50)
+        self.assertEqual(np.sum(_fit.binned_data), len(self._data))
+        self.assertTrue(np.allclose(np.diff(_fit.bin_edges), np.diff(_fit.bin_edges)[0]))
+        self.assertEqual(_fit.bin_edges[0], np.min(self._data))
+        self.assertEqual(_fit.bin_edges[-1], np.max(self._data))
+        self.assertEqual(len(_fit.binned_model), 50)
+
+    def test_quantile_binning(self):
+        _fit = self._get_fit(n_bins=50, binning='quantile')
+        self.assertEqual(np.sum(_fit.binned_data), len(self._data))
+        self.assertTrue(np.all(np.abs(_fit.binned_data - len(self._data) / 50) <= 1))
+
+    def test_not_binned(self):
+        self.assertIsNone(self._exact_fit.n_bins)
+        self.assertIsNone(self._exact_fit.binned_data)
+        self.assertIsNone(self._exact_fit.binned_model)
+        with self.assertRaises(UnbinnedFitException):
+            self._exact_fit.get_binning_bias()
+
+    def test_fit_result_close_to_unbinned(self):
+        _fit = self._get_fit(n_bins=200)
+        _fit.do_fit()
+        self.assertTrue(np.allclose(_fit.parameter_values, self._exact_fit.parameter_values,
+                                    rtol=0, atol=0.05 * self._exact_fit.parameter_errors))
+        self.assertTrue(np.allclose(_fit.parameter_errors, self._exact_fit.parameter_errors, rtol=1e-2))
+
+    def test_binning_bias(self):
+        for _binning in ('uniform', 'quantile'):
+            _fit = self._get_fit(n_bins=40, binning=_binning)
+            _fit.do_fit()
+            _bias = _fit.parameter_values - self._exact_fit.parameter_values
+            self.assertTrue(np.allclose(_fit.get_binning_bias(), _bias,
+                                        rtol=0.2, atol=0.01 * self._exact_fit.parameter_errors))
+
+    def test_update_data(self):
+        _fit = self._get_fit(n_bins=50)
+        _new_data = self._data * 0.5 + 1.0
+        _fit.update_data(_new_data)
+        _fit.do_fit()
+        self.assertEqual(_fit.bin_edges[-1], np.max(_new_data))
+        _ref_fit = UnbinnedFit(_new_data, self._normal_pdf, minimizer=self.MINIMIZER, n_bins=50)
+        _ref_fit.do_fit()
+        self.assertTrue(np.allclose(_fit.parameter_values, _ref_fit.parameter_values, rtol=1e-3))
+        self.assertAlmostEqual(_fit.cost_function_value, _ref_fit.cost_function_value, places=3)
+
+    def test_report(self):
+        _buffer = six.StringIO()
+        _fit = self._get_fit(n_bins=50)
+        _fit.do_fit()
+        _fit.report(output_stream=_buffer)
+        self.assertIn('Binned Approximation', _buffer.getvalue())
+
+    def test_custom_cost_function_raise(self):
+        def _cost(model):
+            return -2.0 * np.sum(np.log(model))
+        with self.assertRaises(UnbinnedFitException):
+            self._get_fit(n_bins=50, cost_function=_cost)
+
+    def test_invalid_binning_raise(self):
+        with self.assertRaises(UnbinnedFitException):
+            self._get_fit(n_bins=50, binning='adaptive')
+        with self.assertRaises(UnbinnedFitException):
+            self._get_fit(n_bins=0)
+
+
+class TestUnbinnedFitChunkedEvaluation(unittest.TestCase):
+
+    MINIMIZER = 'scipy'
+
+    def setUp(self):
+        _random_state = np.random.RandomState(0)
+        _signal = 1.0 + _random_state.exponential(2.2, 1000)
+        _background = _random_state.uniform(1.0, 11.5, 100)
+        self._data = np.concatenate([_signal[_signal < 11.5], _background])
+        self._exact_fit = UnbinnedFit(self._data, unbinned_model_density, minimizer=self.MINIMIZER)
+
+    def _get_fit(self, **kwargs):
+        return UnbinnedFit(self._data, unbinned_model_density, minimizer=self.MINIMIZER, **kwargs)
+
+    def test_log_density_sum_chunks(self):
+        _param_model = self._exact_fit._param_model
+        _ref_sum = np.sum(np.log(unbinned_model_density(self._data)))
+        for _chunk_size in (None, 1, 100, 1001, 5000):
+            self.assertAlmostEqual(_param_model.eval_log_density_sum(chunk_size=_chunk_size), _ref_sum)
+        _ref_slice_sum = np.sum(np.log(unbinned_model_density(self._data[100:250], 2.0, 0.2)))
+        self.assertAlmostEqual(
+            _param_model.eval_log_density_sum(model_parameters=[2.0, 0.2], chunk_size=40, start=100, stop=250),
+            _ref_slice_sum)
+
+    def test_cost_same_as_exact(self):
+        _fit = self._get_fit(chunk_size=64)
+        self.assertIsInstance(_fit._cost_function, UnbinnedCostFunction_ChunkedNegLogLikelihood)
+        self.assertAlmostEqual(_fit.cost_function_value, self._exact_fit.cost_function_value)
+        _fit.set_parameter_values(tau=1.8)
+        self._exact_fit.set_parameter_values(tau=1.8)
+        self.assertAlmostEqual(_fit.cost_function_value, self._exact_fit.cost_function_value)
+
+    def test_fit_results_same_as_exact(self):
+        self._exact_fit.do_fit()
+        for _kwargs in (dict(chunk_size=64), dict(chunk_size=64, n_workers=3), dict(n_workers=2)):
+            _fit = self._get_fit(**_kwargs)
+            _fit.do_fit()
+            self.assertTrue(np.allclose(_fit.parameter_values, self._exact_fit.parameter_values, rtol=1e-6))
+            self.assertTrue(np.allclose(_fit.parameter_errors, self._exact_fit.parameter_errors, rtol=1e-4))
+            self.assertAlmostEqual(_fit.cost_function_value, self._exact_fit.cost_function_value, places=6)
+
+    def test_update_data(self):
+        _fit = self._get_fit(chunk_size=64, n_workers=2)
+        _fit.do_fit()
+        _new_data = self._data[::-1] * 0.9 + 0.1
+        _fit.update_data(_new_data)
+        _fit.do_fit()
+        _ref_fit = UnbinnedFit(_new_data, unbinned_model_density, minimizer=self.MINIMIZER)
+        _ref_fit.do_fit()
+        self.assertTrue(np.allclose(_fit.parameter_values, _ref_fit.parameter_values, rtol=1e-4))
+        self.assertAlmostEqual(_fit.cost_function_value, _ref_fit.cost_function_value, places=4)
+
+    def test_memory_mapped_data(self):
+        self._exact_fit.do_fit()
+        _tmp_dir = tempfile.mkdtemp()
+        try:
+            _file_path = os.path.join(_tmp_dir, 'data.npy')
+            np.save(_file_path, self._data)
+            _fit = UnbinnedFit(_file_path, unbinned_model_density, minimizer=self.MINIMIZER,
+                               chunk_size=64, n_workers=2)
+            self.assertTrue(_fit.data_container.is_memory_mapped)
+            _fit.do_fit()
+            self.assertTrue(np.allclose(_fit.parameter_values, self._exact_fit.parameter_values, rtol=1e-6))
+            del _fit
+        finally:
+            shutil.rmtree(_tmp_dir)
+
+    def test_invalid_arguments_raise(self):
+        with self.assertRaises(UnbinnedFitException):
+            self._get_fit(chunk_size=0)
+        with self.assertRaises(UnbinnedFitException):
+            self._get_fit(chunk_size=64, n_bins=20)
+        with self.assertRaises(UnbinnedFitException):
+            self._get_fit(n_workers=2, cost_function=lambda model: -2.0 * np.sum(np.log(model)))
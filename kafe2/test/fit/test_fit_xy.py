@@ -1,4 +1,5 @@
 import abc
+import pickle
 import unittest2 as unittest
 import numpy as np
 import six
@@ -357,6 +358,144 @@ class TestXYFitBasicInterface(AbstractTestFit, unittest.TestCase):
             rtol=1e-2
         )
 
+    def test_update_data_in_place(self):
+        _fit = self._get_fit()
+        _fit.do_fit()
+        _container = _fit.data_container
+
+        _fit.update_data(y=self._ref_y_data * 2)
+
+        self.assertIs(_fit.data_container, _container)
+        self._assert_fit_properties(
+            _fit,
+            dict(
+                data=np.array([self._ref_x, self._ref_y_data * 2]),
+                x_data=self._ref_x,
+                y_data=self._ref_y_data * 2,
+                y_data_error=np.ones_like(self._ref_x),
+            )
+        )
+
+        _fit.do_fit()
+        _new_estimates = np.array(self._nominal_fit_result_pars) * 2
+
+        self._assert_fit_properties(
+            _fit,
+            dict(
+                y_data=self._ref_y_data * 2,
+                parameter_values=_new_estimates,
+            ),
+            rtol=1e-2
+        )
+
+    def test_update_data_in_place_relative_errors(self):
+        _errors = [dict(axis='x', err_val=0.1), dict(axis='y', err_val=0.1, relative=True)]
+        _fit = self._get_fit(errors=_errors)
+        _fit.do_fit()
+
+        _new_x = self._ref_x + 0.5
+        _new_y = self._ref_y_data * 2
+        _fit.update_data(x=_new_x, y=_new_y)
+        _fit.do_fit()
+
+        _ref_fit = self._get_fit(errors=_errors)
+        _ref_fit.data = np.array([_new_x, _new_y])
+        for _err in _errors:
+            _ref_fit.add_error(**_err)
+        _ref_fit.do_fit()
+
+        self._assert_fit_properties(
+            _fit,
+            dict(
+                x_data=_new_x,
+                y_data=_new_y,
+                y_data_error=_ref_fit.y_data_error,
+                total_cov_mat=_ref_fit.total_cov_mat,
+                parameter_values=_ref_fit.parameter_values,
+                cost_function_value=_ref_fit.cost_function_value,
+            ),
+            rtol=1e-3
+        )
+
+    def test_update_data_in_place_length_mismatch_raise(self):
+        _fit = self._get_fit()
+        with self.assertRaises(XYFitException):
+            _fit.update_data(y=self._ref_y_data[:-1])
+
+    def test_clone(self):
+        _fit = self._get_fit(errors=[dict(axis='y', err_val=1.0), dict(axis='y', err_val=0.1, relative=True)])
+        _fit.fix_parameter('c', 3.0)
+        _fit.limit_parameter('a', 0.0, 5.0)
+        _fit.do_fit()
+
+        _clone = _fit.clone()
+
+        self.assertIsNot(_clone.data_container, _fit.data_container)
+        self.assertEqual(_clone._fitter.fixed_parameters, {'c': 3.0})
+        self.assertEqual(_clone._fitter.limited_parameters, {'a': (0.0, 5.0)})
+        self._assert_fit_properties(
+            _clone,
+            dict(
+                y_data=self._ref_y_data,
+                total_cov_mat=_fit.total_cov_mat,
+                parameter_values=_fit.parameter_values,
+                cost_function_value=_fit.cost_function_value,
+            )
+        )
+
+        _clone.update_data(y=self._ref_y_data * 2)
+        _clone.do_fit()
+
+        _ref_fit = self._get_fit(errors=[dict(axis='y', err_val=1.0), dict(axis='y', err_val=0.1, relative=True)])
+        _ref_fit.fix_parameter('c', 3.0)
+        _ref_fit.limit_parameter('a', 0.0, 5.0)
+        _ref_fit.update_data(y=self._ref_y_data * 2)
+        _ref_fit.do_fit()
+
+        self._assert_fit_properties(
+            _clone,
+            dict(
+                total_cov_mat=_ref_fit.total_cov_mat,
+                parameter_values=_ref_fit.parameter_values,
+                cost_function_value=_ref_fit.cost_function_value,
+            ),
+            rtol=1e-3
+        )
+        # the original fit is unaffected
+        self._assert_fit_properties(_fit, dict(y_data=self._ref_y_data))
+
+    def test_pickle(self):
+        _fit = self._get_fit(errors=[dict(axis='x', err_val=0.1), dict(axis='y', err_val=0.1, relative=True)])
+        _fit.fix_parameter('c', 3.0)
+        _fit.limit_parameter('a', 0.0, 5.0)
+        _fit_unpickled = pickle.loads(pickle.dumps(_fit))
+
+        self.assertEqual(_fit_unpickled._fitter.fixed_parameters, {'c': 3.0})
+        self.assertEqual(_fit_unpickled._fitter.limited_parameters, {'a': (0.0, 5.0)})
+        self.assertEqual(_fit_unpickled.cost_function_value, _fit.cost_function_value)
+
+        _fit.do_fit()
+        _fit_unpickled.do_fit()
+        self._assert_fit_results_equal(_fit, _fit_unpickled)
+
+        _fit_unpickled = pickle.loads(pickle.dumps(_fit))
+        self.assertTrue(_fit_unpickled.did_fit)
+        self._assert_fit_results_equal(_fit, _fit_unpickled)
+
+    def test_clone_share_errors(self):
+        _fit = self._get_fit(errors=[dict(axis='y', err_val=1.0, correlation=0.5, name='y_err')])
+        _fit.cost_function_value  # calculate covariance matrices
+        _shared_clone = _fit.clone(share_errors=True)
+        _copied_clone = _fit.clone(share_errors=False)
+
+        _errs = [_f.data_container.get_error('y_err')['err'] for _f in (_fit, _shared_clone, _copied_clone)]
+        self.assertIsNot(_errs[1], _errs[0])
+        self.assertIs(_errs[1]._cov_mat, _errs[0]._cov_mat)
+        self.assertIsNot(_errs[2]._cov_mat, _errs[0]._cov_mat)
+        self.assertTrue(np.allclose(_errs[2].cov_mat, _errs[0].cov_mat))
+        self.assertEqual(_shared_clone.cost_function_value, _fit.cost_function_value)
+        self.assertEqual(_copied_clone.cost_function_value, _fit.cost_function_value)
+
     def test_reserved_parameter_names_raise(self):
         def dummy_model(x, y_data):
             pass
@@ -922,6 +1061,28 @@ class TestXYFitWithXYErrors(AbstractTestFit, unittest.TestCase):
             # string representations of numerics should also fail
             self._get_fit().limit_parameter("a", "0.3", "14")
 
+    def test_iterative_warm_restart(self):
+        _errors = [
+            dict(axis="x", err_val=0.1, relative=False, reference="data"),
+            dict(axis="y", err_val=1.0, relative=False, reference="data"),
+            dict(axis="y", err_val=0.1, relative=True, reference="model")
+        ]
+        _iterative_config = kc("fit", "iterative_do_fit")
+        _warm_restart = _iterative_config["warm_restart"]
+        try:
+            _iterative_config["warm_restart"] = False
+            _fit_cold = self._get_fit(errors=_errors, dynamic_error_algorithm="iterative")
+            _fit_cold.do_fit()
+            _iterative_config["warm_restart"] = True
+            _fit_warm = self._get_fit(errors=_errors, dynamic_error_algorithm="iterative")
+            _fit_warm.do_fit()
+        finally:
+            _iterative_config["warm_restart"] = _warm_restart
+        self._assert_fit_results_equal(_fit_cold, _fit_warm, rtol=1e-3)
+        _calls = _fit_warm.fit_iteration_function_calls
+        self.assertGreater(len(_calls), 1)
+        self.assertTrue(all(_n_calls > 0 for _n_calls in _calls))
+
     def test_iterative_linear_and_relative_model_error(self):
         _constraints = [
             dict(name="a", value=1.0, uncertainty=0.1),
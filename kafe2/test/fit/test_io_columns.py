@@ -0,0 +1,153 @@
+import os
+import shutil
+import tempfile
+
+import unittest2 as unittest
+import numpy as np
+
+from kafe2.fit import HistContainer, IndexedContainer, UnbinnedContainer, XYContainer
+from kafe2.fit.io import ColumnReaderException, iter_column_chunks, read_columns
+
+
+class TestReadColumns(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        _random_state = np.random.RandomState(0)
+        self._ref_x = np.round(_random_state.uniform(0, 10, 25), 3)
+        self._ref_y = np.round(_random_state.normal(0, 1, 25), 3)
+        self._ref_y_err = np.round(_random_state.uniform(0.1, 0.2, 25), 3)
+        self._ref_columns = [self._ref_x, self._ref_y, self._ref_y_err]
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def _write_text(self, file_name, content):
+        _file_path = os.path.join(self._tmp_dir, file_name)
+        with open(_file_path, 'w') as _f:
+            _f.write(content)
+        return _file_path
+
+    def _write_rows(self, file_name, header, delimiter):
+        _rows = [delimiter.join(repr(float(_value)) for _value in _row) for _row in zip(*self._ref_columns)]
+        return self._write_text(file_name, header + '\n'.join(_rows) + '\n')
+
+    def _assert_columns_equal(self, columns, ref_columns):
+        self.assertEqual(len(columns), len(ref_columns))
+        for _column, _ref_column in zip(columns, ref_columns):
+            self.assertTrue(np.array_equal(_column, _ref_column))
+
+    def test_whitespace_header_line(self):
+        _file_path = self._write_rows('data.txt', 'x  y\ty_err\n', '  ')
+        self._assert_columns_equal(read_columns(_file_path, ['y_err', 'x']), [self._ref_y_err, self._ref_x])
+
+    def test_csv_header_line(self):
+        _file_path = self._write_rows('data.csv', 'x,y,y_err\n', ',')
+        self._assert_columns_equal(read_columns(_file_path, ['x', 'y', 'y_err']), self._ref_columns)
+
+    def test_comment_header(self):
+        _file_path = self._write_rows('data.dat', '# some description\n# x y y_err\n', ' ')
+        self._assert_columns_equal(read_columns(_file_path, ['y', 2]), [self._ref_y, self._ref_y_err])
+
+    def test_comments_and_blank_lines(self):
+        _file_path = self._write_text('data.txt', '1 2  # first row\n\n# comment\n3 4\n')
+        self._assert_columns_equal(read_columns(_file_path, [0, 1]), [[1, 3], [2, 4]])
+
+    def test_comma_in_comment(self):
+        _file_path = self._write_text('data.txt', '1 2  # comment, with comma\n3 4\n')
+        self._assert_columns_equal(read_columns(_file_path, [1]), [[2, 4]])
+
+    def test_explicit_delimiter(self):
+        _file_path = self._write_rows('data.txt', '', ';')
+        self._assert_columns_equal(read_columns(_file_path, [0, 1, 2], delimiter=';'), self._ref_columns)
+
+    def test_chunked_text(self):
+        _file_path = self._write_rows('data.csv', 'x,y,y_err\n', ',')
+        _chunks = list(iter_column_chunks(_file_path, ['x', 'y'], chunk_size=10))
+        self.assertEqual([len(_chunk[0]) for _chunk in _chunks], [10, 10, 5])
+        self._assert_columns_equal(read_columns(_file_path, ['x', 'y'], chunk_size=10), self._ref_columns[:2])
+
+    def test_npy_2d(self):
+        _file_path = os.path.join(self._tmp_dir, 'data.npy')
+        np.save(_file_path, np.array(self._ref_columns).T)
+        self._assert_columns_equal(read_columns(_file_path, [0, 1, 2], chunk_size=7), self._ref_columns)
+
+    def test_npy_structured(self):
+        _file_path = os.path.join(self._tmp_dir, 'data.npy')
+        _array = np.zeros(25, dtype=[('x', float), ('y', float)])
+        _array['x'], _array['y'] = self._ref_x, self._ref_y
+        np.save(_file_path, _array)
+        self._assert_columns_equal(read_columns(_file_path, ['y', 'x']), [self._ref_y, self._ref_x])
+
+    def test_npz(self):
+        _file_path = os.path.join(self._tmp_dir, 'data.npz')
+        np.savez(_file_path, x=self._ref_x, y=self._ref_y, y_err=self._ref_y_err)
+        self._assert_columns_equal(read_columns(_file_path, ['x', 'y', 'y_err'], chunk_size=10),
+                                   self._ref_columns)
+
+    def test_hdf5(self):
+        try:
+            import h5py
+        except ImportError:
+            self.skipTest("h5py not installed")
+        _file_path = os.path.join(self._tmp_dir, 'data.h5')
+        with h5py.File(_file_path, 'w') as _f:
+            _f['x'], _f['y'] = self._ref_x, self._ref_y
+        self._assert_columns_equal(read_columns(_file_path, ['y', 'x'], chunk_size=10), [self._ref_y, self._ref_x])
+
+    def test_raise_unknown_column(self):
+        _file_path = self._write_rows('data.csv', 'x,y,y_err\n', ',')
+        with self.assertRaises(ColumnReaderException):
+            read_columns(_file_path, ['z'])
+        with self.assertRaises(ColumnReaderException):
+            read_columns(_file_path, [3])
+
+    def test_raise_missing_value(self):
+        with self.assertRaises(ColumnReaderException):
+            read_columns(self._write_text('data.txt', '1 2\n3\n'), [0])
+        with self.assertRaises(ColumnReaderException):
+            read_columns(self._write_text('data.csv', '1,2\n3,,4\n'), [0])
+
+    def test_raise_row_errors_cancel_out(self):
+        with self.assertRaises(ColumnReaderException):
+            read_columns(self._write_text('data.txt', '# x y z\n1 2 3\n4 5\n6 7 8 9\n'), ['x'])
+        with self.assertRaises(ColumnReaderException):
+            read_columns(self._write_text('data.csv', '1,2,3\n4,5\n6,7,8,9\n'), [0], chunk_size=2)
+
+    def test_raise_not_a_number(self):
+        with self.assertRaises(ColumnReaderException):
+            read_columns(self._write_text('data.txt', '1 2\n3 abc\n'), [0])
+
+
+class TestContainersFromColumns(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self._file_path = os.path.join(self._tmp_dir, 'data.csv')
+        with open(self._file_path, 'w') as _f:
+            _f.write('x,y,x_err,y_err\n1.0,2.0,0.1,0.3\n2.0,4.5,0.1,0.4\n3.0,5.5,0.2,0.5\n')
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_indexed(self):
+        _container = IndexedContainer.from_columns(self._file_path, 'y', error_column='y_err')
+        self.assertTrue(np.array_equal(_container.data, [2.0, 4.5, 5.5]))
+        self.assertTrue(np.allclose(_container.err, [0.3, 0.4, 0.5]))
+
+    def test_unbinned(self):
+        _container = UnbinnedContainer.from_columns(self._file_path, 'x', chunk_size=2)
+        self.assertTrue(np.array_equal(_container.data, [1.0, 2.0, 3.0]))
+
+    def test_xy(self):
+        _container = XYContainer.from_columns(self._file_path, 'x', 'y', x_error_column='x_err',
+                                              y_error_column='y_err')
+        self.assertTrue(np.array_equal(_container.x, [1.0, 2.0, 3.0]))
+        self.assertTrue(np.array_equal(_container.y, [2.0, 4.5, 5.5]))
+        self.assertTrue(np.allclose(_container.x_err, [0.1, 0.1, 0.2]))
+        self.assertTrue(np.allclose(_container.y_err, [0.3, 0.4, 0.5]))
+
+    def test_hist(self):
+        _container = HistContainer.from_columns(self._file_path, 3, (0, 6), column='y', chunk_size=1)
+        self.assertTrue(np.array_equal(_container.data, [0, 1, 2]))
+        self.assertEqual(_container.n_entries, 3)
@@ -0,0 +1,129 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import unittest2 as unittest
+import numpy as np
+
+from kafe2.fit import XYFit
+from kafe2.fit.tools import kafe2go
+from kafe2.fit.tools.kafe2go import run_batch
+
+
+def linear_model(x, a=1.0, b=0.0):
+    return a * x + b
+
+
+def _fit_file_crash_or_hang(options, filename):
+    """replacement for the worker function which kills the worker or blocks for some files"""
+    if 'crash' in filename:
+        os._exit(1)
+    if 'hang' in filename:
+        time.sleep(60)
+    return _fit_file(options, filename)
+
+
+_fit_file = kafe2go._fit_file
+
+
+TEST_FIT_XY = """
+type: xy
+x_data: [1.0, 2.0, 3.0, 4.0, 5.0]
+y_data: [2.1, 3.9, 6.2, 7.8, 10.1]
+y_errors: 0.2
+model_function: |
+    def linear_model(x, a=1.0, b=0.0):
+        return a * x + b
+"""
+
+
+class TestKafe2GoBatch(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self._filenames = []
+        for _name, _content in (('fit_1.yml', TEST_FIT_XY), ('broken.yml', 'type: [xy\n'),
+                                ('fit_2.yml', TEST_FIT_XY.replace('10.1', '9.9'))):
+            _filename = os.path.join(self._tmp_dir, _name)
+            with open(_filename, 'w') as _f:
+                _f.write(_content)
+            self._filenames.append(_filename)
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def _run(self, summary_name, **kwargs):
+        _summary_filename = os.path.join(self._tmp_dir, summary_name)
+        _rows = run_batch(self._filenames, n_jobs=2, summary_filename=_summary_filename, verbose=False,
+                          **kwargs)
+        return _rows, _summary_filename
+
+    def test_rows_continue_past_failure(self):
+        _rows, _ = self._run('summary.csv')
+        self.assertEqual([_row['file'] for _row in _rows], self._filenames)
+        self.assertEqual([_row['success'] for _row in _rows], [True, False, True])
+        self.assertIn('Error', _rows[1]['error'])
+
+        _fit = XYFit(xy_data=[[1.0, 2.0, 3.0, 4.0, 5.0], [2.1, 3.9, 6.2, 7.8, 10.1]],
+                     model_function=linear_model)
+        _fit.add_error('y', 0.2)
+        _fit.do_fit()
+        self.assertAlmostEqual(_rows[0]['par_a'], _fit.parameter_values[0], places=4)
+        self.assertAlmostEqual(_rows[0]['par_b_error'], _fit.parameter_errors[1], places=4)
+        self.assertAlmostEqual(_rows[0]['cost'], _fit.cost_function_value, places=4)
+        self.assertEqual(_rows[0]['ndf'], 3)
+
+    def test_parameter_names_same_as_columns(self):
+        for _filename in self._filenames[::2]:
+            with open(_filename, 'w') as _f:
+                _f.write(TEST_FIT_XY.replace('a=1.0, b=0.0', 'ndf=1.0, error=0.0').replace(
+                    'a * x + b', 'ndf * x + error'))
+        _rows, _ = self._run('summary.csv')
+        self.assertEqual([_row['error'] for _row in _rows[::2]], [None, None])
+        self.assertEqual([_row['ndf'] for _row in _rows[::2]], [3, 3])
+        self.assertGreater(_rows[0]['par_ndf'], 1.5)
+        self.assertIn('par_error_error', _rows[0])
+
+    def test_result_files(self):
+        self._run('summary.csv', asymmetric=True)
+        _result_filename = os.path.join(self._tmp_dir, 'fit_1_result.yml')
+        self.assertTrue(os.path.exists(_result_filename))
+        self.assertFalse(os.path.exists(os.path.join(self._tmp_dir, 'broken_result.yml')))
+        _fit = XYFit.from_file(_result_filename)
+        self.assertTrue(_fit.did_fit)
+        self.assertEqual(np.shape(_fit.asymmetric_parameter_errors), (2, 2))
+
+    def test_summary_csv(self):
+        _rows, _summary_filename = self._run('summary.csv')
+        with open(_summary_filename) as _f:
+            _csv_rows = list(csv.DictReader(_f))
+        self.assertEqual(len(_csv_rows), 3)
+        self.assertEqual([_row['success'] for _row in _csv_rows], ['True', 'False', 'True'])
+        self.assertAlmostEqual(float(_csv_rows[2]['par_a']), _rows[2]['par_a'])
+        self.assertEqual(_csv_rows[1]['par_a'], '')
+
+    def test_summary_json_lines(self):
+        _rows, _summary_filename = self._run('summary.jsonl')
+        with open(_summary_filename) as _f:
+            _json_rows = [json.loads(_line) for _line in _f]
+        self.assertEqual(_json_rows, _rows)
+
+    def test_worker_killed_or_timed_out(self):
+        self._filenames.insert(1, os.path.join(self._tmp_dir, 'crash.yml'))
+        self._filenames.insert(3, os.path.join(self._tmp_dir, 'hang.yml'))
+        kafe2go._fit_file = _fit_file_crash_or_hang
+        try:
+            _start_time = time.time()
+            _rows, _summary_filename = self._run('summary.csv', timeout=5)
+        finally:
+            kafe2go._fit_file = _fit_file
+        self.assertLess(time.time() - _start_time, 30)
+        self.assertEqual([_row['file'] for _row in _rows], self._filenames)
+        self.assertEqual([_row['success'] for _row in _rows], [True, False, False, False, True])
+        self.assertIn('exited with code 1', _rows[1]['error'])
+        self.assertIn('did not finish within 5', _rows[3]['error'])
+        with open(_summary_filename) as _f:
+            self.assertEqual([_row['file'] for _row in csv.DictReader(_f)], self._filenames)
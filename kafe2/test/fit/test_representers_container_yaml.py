@@ -1,8 +1,14 @@
+import os
+import shutil
+import tempfile
+
 import unittest2 as unittest
 import numpy as np
+import yaml
 
 from six import StringIO
 
+from kafe2.config import kc
 from kafe2.fit import IndexedContainer, XYContainer, HistContainer
 from kafe2.fit.representation import DataContainerYamlWriter, DataContainerYamlReader, DReprError
 from kafe2.fit.io.handle import IOStreamHandle
@@ -772,3 +778,95 @@ class TestHistContainerYamlRepresentation(unittest.TestCase):
             set(self._container._error_dicts.keys()),
             set(_read_container._error_dicts.keys())
         )
+
+
+class _NonSeekableStringIO(StringIO):
+    """string stream behaving like a pipe"""
+
+    def seekable(self):
+        return False
+
+    def seek(self, *args, **kwargs):
+        raise IOError("Stream is not seekable!")
+
+
+class TestContainerYamlBinaryArrays(unittest.TestCase):
+
+    def setUp(self):
+        self._yaml_config = kc('fit', 'representation', 'yaml')
+        self._saved_yaml_config = dict(self._yaml_config)
+        self._yaml_config['binary_array_min_size'] = 10
+
+        _random_state = np.random.RandomState(0)
+        self._container = XYContainer(x_data=np.linspace(0, 1, 20), y_data=_random_state.normal(size=20))
+        self._container.add_error(axis='y', err_val=_random_state.uniform(0.1, 0.2, size=20))
+        self._container.add_matrix_error(axis='y', err_matrix=np.eye(20) * 0.01 + 0.001,
+                                         matrix_type='covariance', name='MCov')
+
+        self._tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self._yaml_config.update(self._saved_yaml_config)
+        shutil.rmtree(self._tmp_dir)
+
+    def _assert_containers_equal(self, read_container):
+        self.assertTrue(np.array_equal(self._container.x, read_container.x))
+        self.assertTrue(np.array_equal(self._container.y, read_container.y))
+        self.assertTrue(np.allclose(self._container.y_cov_mat, read_container.y_cov_mat, rtol=1e-15, atol=0))
+
+    def test_round_trip_inline(self):
+        _stream = IOStreamHandle(StringIO())
+        DataContainerYamlWriter(self._container, _stream).write()
+        _stream.seek(0)
+        _yaml_string = _stream.read()
+        self.assertEqual(_yaml_string.count('!ndarray'), 4)
+        self.assertNotIn('!!python', _yaml_string)
+        _stream.seek(0)
+        self._assert_containers_equal(DataContainerYamlReader(_stream).read())
+
+    def test_round_trip_sidecar(self):
+        self._yaml_config['binary_array_storage'] = 'sidecar'
+        _file_path = os.path.join(self._tmp_dir, 'data.yml')
+        self._container.to_file(_file_path)
+        with open(_file_path) as _f:
+            self.assertEqual(_f.read().count('!npy'), 4)
+        self.assertEqual(sorted(os.listdir(self._tmp_dir)),
+                         ['data.0.npy', 'data.1.npy', 'data.2.npy', 'data.3.npy', 'data.yml'])
+        self._assert_containers_equal(XYContainer.from_file(_file_path))
+
+    def test_sidecar_stream_falls_back_to_inline(self):
+        self._yaml_config['binary_array_storage'] = 'sidecar'
+        _stream = IOStreamHandle(StringIO())
+        DataContainerYamlWriter(self._container, _stream).write()
+        _stream.seek(0)
+        self.assertEqual(_stream.read().count('!ndarray'), 4)
+
+    def test_read_python_tags(self):
+        # files written by earlier versions contain numpy arrays as Python objects
+        _yaml_string = yaml.dump(dict(type='indexed', data=[1.0, 2.0], errors=[dict(
+            type='matrix', matrix_type='covariance', matrix=np.eye(2) * 0.04)]), Dumper=yaml.Dumper)
+        self.assertIn('!!python', _yaml_string)
+        with self.assertWarns(DeprecationWarning):
+            _read_container = DataContainerYamlReader(IOStreamHandle(StringIO(_yaml_string))).read()
+        self.assertTrue(np.allclose(_read_container.err, 0.2))
+        # streams which cannot be rewound are only read once
+        with self.assertWarns(DeprecationWarning):
+            _read_container = DataContainerYamlReader(IOStreamHandle(_NonSeekableStringIO(_yaml_string))).read()
+        self.assertTrue(np.allclose(_read_container.err, 0.2))
+
+    def test_raise_unsafe_python_tags(self):
+        _yaml_string = TEST_DATASET_INDEXED + "label: !!python/object/apply:os.system ['echo unsafe']\n"
+        with self.assertRaises(yaml.constructor.ConstructorError):
+            DataContainerYamlReader(IOStreamHandle(StringIO(_yaml_string))).read()
+        # numpy tags do not allow other Python-specific tags
+        _yaml_string = yaml.dump(dict(type='indexed', data=np.array([1.0, 2.0]),
+                                      label=yaml.Dumper), Dumper=yaml.Dumper)
+        with self.assertRaises(yaml.constructor.ConstructorError):
+            DataContainerYamlReader(IOStreamHandle(StringIO(_yaml_string))).read()
+
+    def test_read_non_seekable_stream(self):
+        _stream = IOStreamHandle(StringIO())
+        DataContainerYamlWriter(self._container, _stream).write()
+        _stream.seek(0)
+        _read_container = DataContainerYamlReader(IOStreamHandle(_NonSeekableStringIO(_stream.read()))).read()
+        self._assert_containers_equal(_read_container)
@@ -5,6 +5,7 @@ import six
 from six import StringIO
 import abc
 
+from kafe2.config import kc
 from kafe2.fit.representation import FitYamlWriter, FitYamlReader
 from kafe2.fit.io.handle import IOStreamHandle
 from kafe2.fit.histogram import HistFit
@@ -727,6 +728,23 @@ class TestXYFitYamlRepresenter(unittest.TestCase, AbstractTestFitRepresenter):
             )
         )
 
+    def test_round_trip_binary_arrays(self):
+        _yaml_config = kc('fit', 'representation', 'yaml')
+        _saved_min_size = _yaml_config['binary_array_min_size']
+        _yaml_config['binary_array_min_size'] = 10
+        try:
+            self._roundtrip_streamwriter.write()
+        finally:
+            _yaml_config['binary_array_min_size'] = _saved_min_size
+        self._roundtrip_stringstream.seek(0)
+        _yaml_string = self._roundtrip_stringstream.read()
+        # x and y values of both the dataset and the parametric model
+        self.assertEqual(_yaml_string.count('!ndarray'), 4)
+        self._roundtrip_stringstream.seek(0)
+        _read_fit = self._roundtrip_streamreader.read()
+        self.assertTrue(np.all(_read_fit.x_model == self._fit.x_model))
+        self.assertTrue(np.allclose(_read_fit.y_model, self._fit.y_model))
+
 
 TEST_FIT_UNBINNED = """
 dataset:
@@ -7,7 +7,9 @@ from kafe2.fit.histogram import HistModelFunction
 from kafe2.fit.indexed import IndexedModelFunction, IndexedModelFunctionFormatter
 from kafe2.fit.representation import ModelFunctionYamlWriter, ModelFunctionYamlReader
 from kafe2.fit.io.handle import IOStreamHandle
+from kafe2.fit.representation._base import DReprError
 from kafe2.fit.representation._yaml_base import YamlReaderException
+from kafe2.fit.representation.model.yaml_drepr import _parse_function
 
 TEST_MODEL_FUNCTION_HIST = """
 type: histogram
@@ -418,3 +420,31 @@ class TestModelFunctionBaseYamlRepresenter(unittest.TestCase):
         self.assertTrue(_read_arg_formatters[1].latex_name == _given_arg_formatters[1].latex_name)
         self.assertTrue(_read_formatter.expression_format_string ==  _given_formatter.expression_format_string)
         self.assertTrue(_read_formatter.latex_expression_format_string ==  _given_formatter.latex_expression_format_string)
+
+
+class TestParseFunctionCache(unittest.TestCase):
+
+    def setUp(self):
+        self._source_code = "def cached_model(x, a=2.0):\n    return a * x\n"
+
+    def test_same_code_parsed_once(self):
+        _function = _parse_function(self._source_code)
+        self.assertIs(_parse_function(self._source_code), _function)
+        self.assertEqual(_function(3.0), 6.0)
+
+    def test_read_from_stream_reuses_function(self):
+        _yaml_string = "type: base\npython_code: |\n    def cached_model(x, a=2.0):\n        return a * x\n"
+        _model_functions = [ModelFunctionYamlReader(IOStreamHandle(StringIO(_yaml_string))).read()
+                            for _ in range(2)]
+        self.assertIsNot(_model_functions[0], _model_functions[1])
+        self.assertIs(_model_functions[0].func, _model_functions[1].func)
+
+    def test_different_code_parsed_again(self):
+        _other_source_code = self._source_code.replace('2.0', '3.0')
+        self.assertIsNot(_parse_function(_other_source_code), _parse_function(self._source_code))
+        self.assertEqual(_parse_function(_other_source_code)(3.0), 9.0)
+
+    def test_forbidden_token_raises_every_time(self):
+        for _ in range(2):
+            with self.assertRaises(DReprError):
+                _parse_function("def bad_model(x):\n    return eval('x')\n")
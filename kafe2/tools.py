@@ -1,13 +1,130 @@
 from __future__ import print_function
 
 import contextlib
+import multiprocessing
 import numpy as np
+import os
 import six
 import sys
 
+from multiprocessing.pool import ThreadPool
 from string import ascii_letters
 
 
+# state shared with worker processes of `parallel_map` (inherited by forking)
+_WORKER_SHARED_STATE = None
+
+
+def _get_fork_context():
+    """Return a multiprocessing context which starts workers by forking, or ``None`` if unavailable."""
+    if not hasattr(os, 'fork'):
+        return None
+    try:
+        return multiprocessing.get_context('fork')
+    except AttributeError:
+        # Python 2: multiprocessing always forks on POSIX
+        return multiprocessing
+    except ValueError:
+        return None
+
+
+def _call_with_shared_state(func_and_args):
+    _func, _args = func_and_args
+    return _func(_WORKER_SHARED_STATE, *_args)
+
+
+@contextlib.contextmanager
+def worker_pool(n_workers=1, shared_state=None):
+    """Context providing a function ``map(func, args_list)`` which calls ``func(shared_state, *args)``
+    for every ``args`` in ``args_list`` and returns the results in order.
+
+    If **n_workers** is greater than one the calls are distributed across a pool of worker processes which
+    is kept alive for the duration of the context. The workers are forked from the current process, so
+    **shared_state** (e.g. a fit object) is inherited by the workers without being pickled. Only ``func``,
+    the entries of ``args_list`` and the return values have to be picklable. Any changes made to
+    **shared_state** inside the workers are discarded.
+    If forking is not supported by the platform or the context is entered from inside a worker process,
+    the calls are made serially in the current process.
+
+    :param n_workers: number of worker processes. If ``None``, use the number of available CPUs.
+    :type n_workers: int or None
+    :param shared_state: object passed as the first argument to every call.
+    """
+    global _WORKER_SHARED_STATE
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+    _context = _get_fork_context()
+    if int(n_workers) <= 1 or _context is None or multiprocessing.current_process().daemon:
+        def _serial_map(func, args_list, chunk_size=1):
+            return [func(shared_state, *_args) for _args in args_list]
+        yield _serial_map
+        return
+
+    _WORKER_SHARED_STATE = shared_state
+    _pool = _context.Pool(processes=int(n_workers))
+
+    def _pool_map(func, args_list, chunk_size=1):
+        return _pool.map(_call_with_shared_state, [(func, tuple(_args)) for _args in args_list],
+                         chunksize=chunk_size)
+
+    try:
+        yield _pool_map
+    finally:
+        _pool.terminate()
+        _pool.join()
+        _WORKER_SHARED_STATE = None
+
+
+def parallel_map(func, args_list, n_workers=1, shared_state=None, chunk_size=1):
+    """Call ``func(shared_state, *args)`` for every ``args`` in **args_list** and return the results in order,
+    using a temporary :py:func:`worker_pool`.
+
+    :param func: module-level function to call.
+    :param args_list: iterable of argument tuples.
+    :param n_workers: number of worker processes. If ``None``, use the number of available CPUs.
+    :type n_workers: int or None
+    :param shared_state: object passed as the first argument to every call.
+    :param chunk_size: number of calls to send to a worker at once.
+    :type chunk_size: int
+    :return: list of return values.
+    :rtype: list
+    """
+    args_list = list(args_list)
+    if n_workers is not None:
+        n_workers = min(int(n_workers), len(args_list))
+    with worker_pool(n_workers=n_workers, shared_state=shared_state) as _map:
+        return _map(func, args_list, chunk_size=chunk_size)
+
+
+@contextlib.contextmanager
+def thread_pool(n_threads=1):
+    """Context providing a function ``map(func, args_list)`` which calls ``func(args)`` for every ``args`` in
+    ``args_list`` and returns the results in order.
+
+    If **n_threads** is greater than one the calls are distributed across a pool of threads which is kept
+    alive for the duration of the context. Unlike :py:func:`worker_pool`, the threads share all objects with
+    the calling thread, so this only pays off for functions spending most of their time in code releasing the
+    global interpreter lock (e.g. large *NumPy* or *LAPACK* operations).
+
+    :param n_threads: number of threads. If ``None``, use the number of available CPUs.
+    :type n_threads: int or None
+    """
+    if n_threads is None:
+        n_threads = multiprocessing.cpu_count()
+    if int(n_threads) <= 1:
+        def _serial_map(func, args_list):
+            return [func(_args) for _args in args_list]
+        yield _serial_map
+        return
+
+    _pool = ThreadPool(processes=int(n_threads))
+    try:
+        yield _pool.map
+    finally:
+        _pool.terminate()
+        _pool.join()
+
+
 @contextlib.contextmanager
 def numpy_print_options(*args, **kwargs):
     """Context for fine-tuning the printout of numpy arrays"""